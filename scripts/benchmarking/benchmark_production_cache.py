@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark ProductionCache set/get/invalidate latency
+
+Fills the cache to --entries entries spread over --tables tables with the memory
+limit engaged (so every set() runs the eviction check), then times set(), get() and
+invalidate_table(). No database is needed.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.cache_eviction import DEFAULT_EVICTION_POLICY, EVICTION_POLICIES  # noqa: E402
+from src.production_cache import ProductionCache  # noqa: E402
+
+DEFAULT_ENTRIES = 100_000
+DEFAULT_TABLES = 100
+
+
+def _query(i: int, tables: int) -> str:
+    return f"SELECT * FROM table_{i % tables} WHERE id = {i}"
+
+
+def _summary(samples_ns: list[int]) -> str:
+    samples_us = sorted(sample / 1000 for sample in samples_ns)
+    p99 = samples_us[min(len(samples_us) - 1, int(len(samples_us) * 0.99))]
+    return (
+        f"mean {statistics.fmean(samples_us):8.2f}us  "
+        f"p50 {statistics.median(samples_us):8.2f}us  p99 {p99:8.2f}us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ProductionCache latency")
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRIES, help="Cache entries")
+    parser.add_argument("--tables", type=int, default=DEFAULT_TABLES, help="Distinct tables")
+    parser.add_argument(
+        "--max-memory-mb",
+        type=int,
+        default=None,
+        help="Memory limit (default: just below the filled size, so set() evicts)",
+    )
+    parser.add_argument(
+        "--policy",
+        choices=list(EVICTION_POLICIES),
+        default=DEFAULT_EVICTION_POLICY,
+        help="Eviction policy",
+    )
+    args = parser.parse_args()
+
+    value = [{"id": 1, "name": "example", "email": "user@example.com"}]
+    tables = [f"table_{t}" for t in range(args.tables)]
+
+    # Size the limit so the cache is full and every further set() has to evict
+    probe = ProductionCache(max_size=args.entries + 1, max_memory_mb=None)
+    probe.set(_query(0, args.tables), None, value)
+    entry_bytes = probe._total_bytes
+    max_memory_mb = args.max_memory_mb or max(1, (entry_bytes * args.entries) // (1024 * 1024))
+
+    cache = ProductionCache(
+        default_ttl=3600,
+        max_size=args.entries + 1,
+        max_memory_mb=max_memory_mb,
+        eviction_policy=args.policy,
+    )
+    set_samples: list[int] = []
+    for i in range(args.entries):
+        query = _query(i, args.tables)
+        start = time.perf_counter_ns()
+        cache.set(query, None, value, tables=(tables[i % args.tables],))
+        set_samples.append(time.perf_counter_ns() - start)
+
+    get_samples: list[int] = []
+    for i in range(args.entries):
+        query = _query(i, args.tables)
+        start = time.perf_counter_ns()
+        cache.get(query)
+        get_samples.append(time.perf_counter_ns() - start)
+
+    stats = cache.get_stats()
+    entries_before = stats["size"]
+    invalidate_samples: list[int] = []
+    for table in tables:
+        start = time.perf_counter_ns()
+        cache.invalidate_table(table)
+        invalidate_samples.append(time.perf_counter_ns() - start)
+
+    print(
+        f"{args.entries:,} sets into {entries_before:,} live entries over {args.tables} tables "
+        f"(limit {max_memory_mb}MB, {args.policy}, {stats['evictions']:,} evictions)"
+    )
+    print(f"  set()               {_summary(set_samples)}")
+    print(f"  get()               {_summary(get_samples)}")
+    print(
+        f"  invalidate_table()  {_summary(invalidate_samples)}  "
+        f"(~{entries_before // args.tables:,} entries per table)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark interceptor whitelist/blacklist matching
+
+Loads --patterns patterns (mostly plain substrings, some regexes) into the
+blacklist and whitelist, then times _check_query_lists() on queries that match
+nothing (the common case: every pattern has to be ruled out) against the
+previous per-pattern loop. No database is needed.
+"""
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import query_interceptor  # noqa: E402
+
+DEFAULT_PATTERNS = 1000
+DEFAULT_QUERIES = 2000
+REGEX_EVERY = 10  # Every Nth pattern is a regex
+
+
+def _patterns(count: int) -> list[str]:
+    return [
+        f"from audit_archive_{i} .*where" if i % REGEX_EVERY == 0 else f"from legacy_table_{i} "
+        for i in range(count)
+    ]
+
+
+def _queries(count: int) -> list[str]:
+    return [
+        f"SELECT id, email FROM contacts WHERE tenant_id = {i} AND created_at > now() - "
+        f"interval '7 days' ORDER BY created_at DESC LIMIT 50"
+        for i in range(count)
+    ]
+
+
+def _loop_check(query: str, blacklist: set[str], whitelist: set[str]):
+    """The per-pattern loop _check_query_lists() used before the compiled matcher"""
+    query_lower = query.lower()
+    for pattern in blacklist:
+        if pattern in query_lower or re.search(pattern, query_lower, re.IGNORECASE):
+            return True, "BLACKLISTED"
+    for pattern in whitelist:
+        if pattern in query_lower or re.search(pattern, query_lower, re.IGNORECASE):
+            return False, "WHITELISTED"
+    return None
+
+
+def _time(check, queries: list[str]) -> list[int]:
+    samples = []
+    for query in queries:
+        start = time.perf_counter_ns()
+        check(query)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def _summary(samples_ns: list[int]) -> str:
+    samples_us = sorted(sample / 1000 for sample in samples_ns)
+    p99 = samples_us[min(len(samples_us) - 1, int(len(samples_us) * 0.99))]
+    return (
+        f"mean {statistics.fmean(samples_us):9.2f}us  "
+        f"p50 {statistics.median(samples_us):9.2f}us  p99 {p99:9.2f}us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark interceptor list matching")
+    parser.add_argument("--patterns", type=int, default=DEFAULT_PATTERNS, help="Patterns per list")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES, help="Queries to check")
+    args = parser.parse_args()
+
+    patterns = _patterns(args.patterns)
+    queries = _queries(args.queries)
+
+    start = time.perf_counter()
+    for pattern in patterns:
+        query_interceptor.add_query_to_blacklist(f"{pattern}blocked")
+        query_interceptor.add_query_to_whitelist(pattern)
+    update_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    query_interceptor._check_query_lists(queries[0])  # Compiles both lists
+    compile_ms = (time.perf_counter() - start) * 1000
+    blacklist = set(query_interceptor._query_blacklist)
+    whitelist = set(query_interceptor._query_whitelist)
+
+    # Both implementations agree on a matching query
+    matching = f"SELECT * {patterns[-1].upper()} WHERE id = 1"
+    assert query_interceptor._check_query_lists(matching) == _loop_check(
+        matching, blacklist, whitelist
+    )
+
+    loop_samples = _time(lambda query: _loop_check(query, blacklist, whitelist), queries)
+    compiled_samples = _time(query_interceptor._check_query_lists, queries)
+
+    print(
+        f"{args.queries:,} non-matching queries against {args.patterns:,} blacklist + "
+        f"{args.patterns:,} whitelist patterns (1 in {REGEX_EVERY} a regex)"
+    )
+    print(f"  per-pattern loop  {_summary(loop_samples)}")
+    print(f"  compiled matcher  {_summary(compiled_samples)}")
+    print(
+        f"  ({2 * args.patterns:,} list updates took {update_ms:.0f}ms; "
+        f"compiling both lists on the next check took {compile_ms:.0f}ms)"
+    )
+
+
+if __name__ == "__main__":
+    main()
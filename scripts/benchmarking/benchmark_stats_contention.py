@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark log_query_stat() throughput under thread contention
+
+Compares a single-lock buffer (1 stripe, the old global-lock layout) with the
+lock-striped buffer at 1..64 threads. Database flushes are replaced with a no-op,
+so no database is needed and only the in-process buffering cost is measured.
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import stats  # noqa: E402
+from src.stats_buffer import DEFAULT_STRIPES, StripedStatsBuffer  # noqa: E402
+
+DEFAULT_THREAD_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def run_once(thread_count: int, calls_per_thread: int, stripes: int) -> float:
+    """Return log_query_stat calls per second for one configuration"""
+    stats._stats_buffer = StripedStatsBuffer(stripes=stripes, max_size=stats._max_buffer_size)
+    start_barrier = threading.Barrier(thread_count + 1)
+
+    def worker():
+        start_barrier.wait()
+        for i in range(calls_per_thread):
+            stats.log_query_stat(
+                1, "contacts", "email", "READ", float(i % 50), skip_validation=True
+            )
+
+    threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return (thread_count * calls_per_thread) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark stats buffer contention")
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_THREAD_COUNTS),
+        help="Thread counts to test (default: 1 2 4 8 16 32 64)",
+    )
+    parser.add_argument("--calls", type=int, default=20_000, help="Calls per thread")
+    parser.add_argument("--stripes", type=int, default=DEFAULT_STRIPES, help="Striped layout")
+    args = parser.parse_args()
+
+    with (
+        patch.object(stats, "flush_query_stats_buffer", lambda _buffer: None),
+        patch.object(stats, "is_background_flush_enabled", lambda: False),
+        patch("src.rollback.is_stats_collection_enabled", lambda: True),
+    ):
+        print(f"{'threads':>7}  {'1 stripe (calls/s)':>20}  {args.stripes} stripes (calls/s)")
+        print("-" * 56)
+        for thread_count in args.threads:
+            single = run_once(thread_count, args.calls, stripes=1)
+            striped = run_once(thread_count, args.calls, stripes=args.stripes)
+            print(f"{thread_count:>7}  {single:>20,.0f}  {striped:>20,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark query_stats flush backends (executemany vs execute_values vs COPY)
+
+Each flush runs inside a transaction that is rolled back, so query_stats is left
+untouched. Requires a reachable database with the IndexPilot schema initialized.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import psycopg2  # noqa: E402
+
+from src.db import get_db_config  # noqa: E402
+from src.stats import FLUSH_METHODS, insert_query_stats_rows  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+QUERY_TYPES = ("READ", "WRITE")
+FIELDS = ("email", "name", "phone", "custom_text_1", None)
+
+
+def build_rows(count: int, seed: int = 42):
+    """Build synthetic stats buffer rows shaped like log_query_stat() output"""
+    rng = random.Random(seed)
+    return [
+        (
+            "",  # tenant_id: NULL avoids depending on rows in tenants
+            "contacts",
+            rng.choice(FIELDS),
+            rng.choice(QUERY_TYPES),
+            round(rng.uniform(0.1, 250.0), 3),
+        )
+        for _ in range(count)
+    ]
+
+
+def time_flush(conn, rows, method: str, repeats: int) -> float:
+    """Return the best wall-clock time (seconds) of one flush over N repeats"""
+    best = float("inf")
+    for _ in range(repeats):
+        cursor = conn.cursor()
+        try:
+            start = time.perf_counter()
+            insert_query_stats_rows(cursor, rows, method)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            conn.rollback()
+            cursor.close()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark query_stats flush backends")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Rows per flush (default: 1000 10000 100000)",
+    )
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        choices=FLUSH_METHODS,
+        default=list(FLUSH_METHODS),
+        help="Flush backends to compare",
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per size/method (best kept)")
+    parser.add_argument(
+        "--max-executemany-rows",
+        type=int,
+        default=10_000,
+        help="Skip executemany above this size (one round trip per row is very slow)",
+    )
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**get_db_config())
+    try:
+        print(f"{'rows':>8}  {'method':<15} {'seconds':>9} {'rows/s':>12}")
+        print("-" * 48)
+        for size in args.sizes:
+            rows = build_rows(size)
+            for method in args.methods:
+                if method == "executemany" and size > args.max_executemany_rows:
+                    print(f"{size:>8}  {method:<15} {'skipped':>9}")
+                    continue
+                elapsed = time_flush(conn, rows, method, args.repeats)
+                print(f"{size:>8}  {method:<15} {elapsed:>9.3f} {size / elapsed:>12,.0f}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
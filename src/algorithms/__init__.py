@@ -13,6 +13,7 @@ from typing import Any
 
 _EXPORTS = {
     "validate_cardinality_with_cert": ("src.algorithms.cert", "validate_cardinality_with_cert"),
+    "cert_result_from_counts": ("src.algorithms.cert", "cert_result_from_counts"),
     "enhance_plan_analysis": ("src.algorithms.qpg", "enhance_plan_analysis"),
     "identify_bottlenecks": ("src.algorithms.qpg", "identify_bottlenecks"),
     "analyze_plan_diversity": ("src.algorithms.qpg", "analyze_plan_diversity"),
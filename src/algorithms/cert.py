@@ -30,6 +30,66 @@ except Exception as e:
     _config_loader = ConfigLoader()
 
 
+def cert_result_from_counts(
+    estimated_selectivity: float, total_rows: int, actual_distinct: int
+) -> dict[str, Any]:
+    """
+    Score a selectivity estimate against already-known actual counts.
+
+    This is the comparison step of validate_cardinality_with_cert() without the
+    database round trips, for callers that prefetched the counts.
+
+    Args:
+        estimated_selectivity: Estimated selectivity ratio (0.0 to 1.0)
+        total_rows: Actual row count of the table
+        actual_distinct: Actual distinct value count of the field
+
+    Returns:
+        dict with the same keys as validate_cardinality_with_cert()
+    """
+    if not total_rows:
+        return {
+            "is_valid": False,
+            "actual_selectivity": 0.0,
+            "error_pct": 100.0,
+            "statistics_stale": False,
+            "confidence": 0.0,
+            "reason": "empty_table",
+        }
+
+    actual_selectivity = float(actual_distinct / total_rows) if total_rows > 0 else 0.0
+
+    # Calculate error percentage
+    if estimated_selectivity > 0:
+        error_pct = abs(actual_selectivity - estimated_selectivity) / estimated_selectivity * 100.0
+    else:
+        error_pct = 100.0 if actual_selectivity > 0 else 0.0
+
+    # CERT validation: Acceptable error threshold (configurable, default 10%)
+    max_error_pct = _config_loader.get_float("features.auto_indexer.cert_max_error_pct", 10.0)
+    is_valid = error_pct <= max_error_pct
+
+    # Detect stale statistics: Large error suggests statistics are outdated
+    statistics_stale = error_pct > max_error_pct * 2  # 2x threshold = likely stale
+
+    # Calculate confidence based on error
+    if error_pct == 0:
+        confidence = 1.0
+    elif error_pct <= max_error_pct:
+        confidence = 1.0 - (error_pct / max_error_pct) * 0.2  # 0.8 to 1.0
+    else:
+        confidence = max(0.0, 1.0 - (error_pct / (max_error_pct * 2)))  # 0.0 to 0.8
+
+    return {
+        "is_valid": is_valid,
+        "actual_selectivity": actual_selectivity,
+        "error_pct": error_pct,
+        "statistics_stale": statistics_stale,
+        "confidence": confidence,
+        "reason": "validated" if is_valid else "high_error",
+    }
+
+
 def validate_cardinality_with_cert(
     table_name: str, field_name: str, estimated_selectivity: float
 ) -> dict[str, Any]:
@@ -104,42 +164,9 @@ def validate_cardinality_with_cert(
                     "reason": "could_not_calculate",
                 }
 
-            actual_distinct = distinct_result["distinct_count"]
-            actual_selectivity = float(actual_distinct / total_rows) if total_rows > 0 else 0.0
-
-            # Calculate error percentage
-            if estimated_selectivity > 0:
-                error_pct = (
-                    abs(actual_selectivity - estimated_selectivity) / estimated_selectivity * 100.0
-                )
-            else:
-                error_pct = 100.0 if actual_selectivity > 0 else 0.0
-
-            # CERT validation: Acceptable error threshold (configurable, default 10%)
-            max_error_pct = _config_loader.get_float(
-                "features.auto_indexer.cert_max_error_pct", 10.0
+            return cert_result_from_counts(
+                estimated_selectivity, total_rows, distinct_result["distinct_count"]
             )
-            is_valid = error_pct <= max_error_pct
-
-            # Detect stale statistics: Large error suggests statistics are outdated
-            statistics_stale = error_pct > max_error_pct * 2  # 2x threshold = likely stale
-
-            # Calculate confidence based on error
-            if error_pct == 0:
-                confidence = 1.0
-            elif error_pct <= max_error_pct:
-                confidence = 1.0 - (error_pct / max_error_pct) * 0.2  # 0.8 to 1.0
-            else:
-                confidence = max(0.0, 1.0 - (error_pct / (max_error_pct * 2)))  # 0.0 to 0.8
-
-            return {
-                "is_valid": is_valid,
-                "actual_selectivity": actual_selectivity,
-                "error_pct": error_pct,
-                "statistics_stale": statistics_stale,
-                "confidence": confidence,
-                "reason": "validated" if is_valid else "high_error",
-            }
     except Exception as e:
         # Handle all exceptions gracefully - return low confidence result
         error_str = str(e).lower()
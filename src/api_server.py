@@ -18,7 +18,10 @@ from src.api_auth import api_auth_is_configured, enforce_api_auth, get_api_auth_
 from src.config_loader import ConfigLoader
 from src.db import get_connection, safe_get_row_value
 from src.index_health import monitor_index_health
+from src.production_cache import get_production_cache_stats
 from src.query_analyzer import get_explain_stats
+from src.query_interceptor import get_interceptor_metrics
+from src.stats import get_hourly_latency_stats, get_stats_flusher_metrics
 from src.type_definitions import JSONDict, JSONValue
 
 logger = logging.getLogger(__name__)
@@ -231,27 +234,21 @@ async def get_performance_data() -> JSONDict:
         with get_connection() as conn:
             cursor = conn.cursor()
             try:
-                # Get hourly query performance metrics
+                # Get hourly query performance metrics; p95 comes from the rolled-up
+                # latency sketches instead of sorting a day of raw rows
                 # Note: query_stats doesn't track index usage directly, so we estimate based on query patterns
-                cursor.execute(
-                    """
-                    SELECT
-                        DATE_TRUNC('hour', created_at) as hour,
-                        COUNT(*) as query_count,
-                        AVG(duration_ms) as avg_latency,
-                        PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY duration_ms) as p95_latency,
-                        0 as index_hits,  -- Would need EXPLAIN analysis to determine actual index usage
-                        0 as index_misses  -- Would need EXPLAIN analysis to determine actual index usage
-                    FROM query_stats
-                    WHERE created_at >= NOW() - INTERVAL '24 hours'
-                    GROUP BY DATE_TRUNC('hour', created_at)
-                    ORDER BY hour DESC
-                    LIMIT 24
-                """
-                )
-
-                rows = cursor.fetchall()
-                for row in rows:
+                hourly_rows = [
+                    {
+                        "timestamp": hourly["bucket_start"],
+                        "query_count": hourly["query_count"],
+                        "avg_latency": hourly["avg_duration_ms"],
+                        "p95_latency": hourly["p95_duration_ms"],
+                        "index_hits": 0,  # Would need EXPLAIN analysis to determine actual index usage
+                        "index_misses": 0,  # Would need EXPLAIN analysis to determine actual index usage
+                    }
+                    for hourly in get_hourly_latency_stats(time_window_hours=24)[:24]
+                ]
+                for row in hourly_rows:
                     # Use safe helper to prevent "tuple index out of range" errors
                     timestamp_val = safe_get_row_value(
                         row, "timestamp", None
@@ -426,6 +423,9 @@ async def get_performance_data() -> JSONDict:
             "performance": performance_data_list,
             "indexImpact": index_impact_data_list,
             "explainStats": explain_stats,
+            "statsFlusher": get_stats_flusher_metrics(),
+            "cacheStats": get_production_cache_stats(),
+            "interceptorMetrics": get_interceptor_metrics(),
         }
 
     except Exception as e:
@@ -844,6 +844,24 @@ async def get_lifecycle_status_endpoint() -> JSONDict:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@app.get("/api/index-builds")
+async def get_index_builds_endpoint() -> JSONDict:
+    """
+    Get the parallel index build queue.
+
+    Returns:
+        Queued, running and recently finished builds, with pg_stat_progress_create_index
+        progress for running builds
+    """
+    try:
+        from src.index_build_executor import get_index_build_status
+
+        return get_index_build_status()
+    except Exception as e:
+        logger.error(f"Failed to get index build status: {e}")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
 @app.post("/api/lifecycle/weekly")
 async def run_weekly_lifecycle_endpoint(dry_run: bool = True) -> JSONDict:
     """
@@ -4,22 +4,36 @@ import logging
 import math
 import threading
 import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
 from typing import Any, cast
 
 from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
 
-from src.algorithms.cert import validate_cardinality_with_cert
+from src.algorithms.cert import cert_result_from_counts, validate_cardinality_with_cert
 from src.config_loader import ConfigLoader
 from src.db import get_connection, get_cursor
 from src.error_handler import IndexCreationError, handle_errors
+from src.index_build_executor import (
+    get_build_collect_timeout_seconds,
+    get_index_build_executor,
+    is_index_build_executor_enabled,
+)
+from src.index_candidate_catalog import (
+    TableCatalog,
+    fetch_distinct_count,
+    prefetch_candidate_catalog,
+)
 from src.lock_manager import create_index_with_lock_management
 from src.maintenance_window import is_in_maintenance_window, should_wait_for_maintenance_window
 from src.monitoring import get_monitoring
-from src.pattern_detection import should_create_index_based_on_pattern
+from src.pattern_detection import detect_sustained_patterns, should_create_index_based_on_pattern
 from src.query_analyzer import (
     analyze_query_plan,
     analyze_query_plan_fast,
+    invalidate_explain_cache_for_tables,
     measure_query_performance,
 )
 from src.query_patterns import detect_query_patterns, get_null_ratio
@@ -30,7 +44,11 @@ from src.stats import (
     get_table_size_info,
 )
 from src.type_definitions import JSONDict, QueryParams
-from src.write_performance import can_create_index_for_table, monitor_write_performance
+from src.write_performance import (
+    can_create_index_for_table,
+    get_index_count_for_table,
+    monitor_write_performance,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -1083,6 +1101,56 @@ def get_field_selectivity(table_name, field_name, validate_with_cert: bool = Tru
         return 0.0
 
 
+def _catalog_field_selectivity(table_catalog: TableCatalog, field_name: str) -> float | None:
+    """
+    get_field_selectivity() computed from prefetched catalog data.
+
+    The pg_stats estimate is CERT-validated against the field's exact distinct
+    count, which is read here on first use; the exact selectivity is used when the
+    estimate is missing or off.
+
+    Returns:
+        Selectivity ratio, or None if neither pg_stats nor an exact count is available
+    """
+    table_name = table_catalog.table_name
+    estimated_selectivity = table_catalog.estimated_selectivity(field_name)
+    fetch_distinct_count(table_catalog, field_name)
+    actual_selectivity = table_catalog.actual_selectivity(field_name)
+    if actual_selectivity is None:
+        return estimated_selectivity
+    if estimated_selectivity is None:
+        return actual_selectivity
+
+    logger.info(
+        f"[ALGORITHM] Calling CERT for {table_name}.{field_name} "
+        f"(selectivity: {estimated_selectivity:.4f})"
+    )
+    cert_result = cert_result_from_counts(
+        estimated_selectivity,
+        table_catalog.row_count,
+        table_catalog.distinct_counts.get(field_name, 0),
+    )
+    if cert_result.get("statistics_stale", False):
+        logger.warning(
+            f"CERT: Stale statistics detected for {table_name}.{field_name} "
+            f"(error: {cert_result.get('error_pct', 0):.1f}%)"
+        )
+    is_valid = cert_result.get("is_valid", True)
+    try:
+        from src.algorithm_tracking import track_algorithm_usage
+
+        track_algorithm_usage(
+            table_name=table_name,
+            field_name=field_name,
+            algorithm_name="cert",
+            recommendation=cert_result,
+            used_in_decision=True,
+        )
+    except Exception as e:
+        logger.warning(f"Could not track CERT usage: {e}", exc_info=True)
+    return estimated_selectivity if is_valid else actual_selectivity
+
+
 def get_sample_query_for_field(
     table_name, field_name, tenant_id=None
 ) -> tuple[str, QueryParams] | None:
@@ -1313,7 +1381,9 @@ def estimate_build_cost(
     return float(estimated_cost) if estimated_cost else 0.0
 
 
-def estimate_query_cost_without_index(table_name, field_name, row_count=None, use_real_plans=True):
+def estimate_query_cost_without_index(
+    table_name, field_name, row_count=None, use_real_plans=True, selectivity=None
+):
     """
     Estimate the cost per query without an index.
 
@@ -1324,6 +1394,7 @@ def estimate_query_cost_without_index(table_name, field_name, row_count=None, us
         field_name: Field name
         row_count: Optional row count (will fetch if not provided)
         use_real_plans: Whether to use real query plans (default: True)
+        selectivity: Optional field selectivity (will calculate if not provided)
 
     Returns:
         Estimated cost per query without index
@@ -1445,7 +1516,8 @@ def estimate_query_cost_without_index(table_name, field_name, row_count=None, us
 
     # Factor in field selectivity (skip DB query if use_real_plans=False)
     # Use default selectivity for testing/estimation when real plans disabled
-    selectivity = get_field_selectivity(table_name, field_name) if use_real_plans else 0.1
+    if selectivity is None:
+        selectivity = get_field_selectivity(table_name, field_name) if use_real_plans else 0.1
 
     if selectivity > 0:
         # Low selectivity fields (e.g., boolean flags) have lower query cost
@@ -1556,7 +1628,7 @@ def _has_tenant_field(table_name: str, use_cache: bool = True) -> bool:
                 SELECT field_name
                 FROM genome_catalog
                 WHERE table_name = %s
-                  AND (field_name = 'tenant_id' OR field_name LIKE 'tenant_%')
+                  AND (field_name = 'tenant_id' OR field_name LIKE 'tenant_%%')
             """,
                 (table_name,),
             )
@@ -1572,7 +1644,7 @@ def _has_tenant_field(table_name: str, use_cache: bool = True) -> bool:
                         SELECT column_name
                         FROM information_schema.columns
                         WHERE table_name = %s
-                          AND (column_name = 'tenant_id' OR column_name LIKE 'tenant_%')
+                          AND (column_name = 'tenant_id' OR column_name LIKE 'tenant_%%')
                     """,
                         (table_name,),
                     )
@@ -1733,8 +1805,561 @@ def create_smart_index(table_name, field_name, row_count, query_patterns, _strat
             return index_sql, index_name, index_type
 
 
-@require_enabled
-@handle_errors("analyze_and_create_indexes", default_return={"created": [], "skipped": []})
+def _finalize_created_index(
+    created_indexes: list[JSONDict],
+    *,
+    table_name: str,
+    field_name: str,
+    index_name: str,
+    index_sql: str,
+    index_type: str,
+    table_catalog: TableCatalog | None,
+    sample_query,
+    before_perf,
+    build_cost: float,
+    confidence: float,
+    field_selectivity,
+    total_queries: float,
+    query_cost_without_index,
+    row_count,
+    reason,
+    strategy,
+    write_stats,
+) -> None:
+    """
+    Post-creation bookkeeping for an index that was just built.
+
+    Invalidates cached plans, records safeguards and version history, validates the
+    improvement (rolling the index back if it made things worse), writes the audit
+    event and appends the index to created_indexes.
+    """
+    # Plans cached before the index existed are now stale
+    invalidate_explain_cache_for_tables([table_name])
+    if table_catalog is not None:
+        table_catalog.record_index(index_name, index_sql)
+
+    # Track successful creation
+    try:
+        from src.safeguard_monitoring import track_index_creation_attempt
+
+        track_index_creation_attempt(success=True, throttled=False, blocked=False)
+    except Exception:
+        pass
+
+    # Record circuit breaker success
+    try:
+        from src.adaptive_safeguards import record_circuit_success
+
+        circuit_breaker_name = f"index_creation_{table_name}"
+        record_circuit_success(circuit_breaker_name)
+    except Exception:
+        pass
+
+    # Track index version (Phase 3)
+    try:
+        from src.index_lifecycle_advanced import track_index_version
+
+        track_index_version(
+            index_name=index_name,
+            table_name=table_name,
+            index_definition=index_sql,
+            created_by="auto_indexer",
+            metadata={
+                "index_type": index_type,
+                "build_cost": build_cost,
+                "confidence": confidence,
+            },
+        )
+    except Exception as e:
+        logger.debug(f"Could not track index version: {e}")
+
+    # Validate index effectiveness using EXPLAIN before/after
+    validation_result = None
+    try:
+        if sample_query:
+            from src.composite_index_detection import (
+                validate_index_effectiveness,
+            )
+
+            query_str, params = sample_query
+            validation_result = validate_index_effectiveness(
+                table_name=table_name,
+                field_name=field_name,
+                index_name=index_name,
+                sample_query=(query_str, params),
+            )
+
+            if validation_result.get("status") == "success":
+                improvement_pct = validation_result.get("improvement_percent", 0.0)
+                effective = validation_result.get("effective", False)
+
+                # ✅ ENHANCEMENT: Use EXPLAIN-based comparison for rollback decision
+                explain_comparison = None
+                try:
+                    from src.query_analyzer import compare_explain_before_after
+
+                    # Get sample query for comparison
+                    sample_query = get_sample_query_for_field(table_name, field_name)
+                    if sample_query:
+                        query_str, query_params = sample_query
+                        explain_comparison = compare_explain_before_after(
+                            query=query_str,
+                            params=query_params,
+                            index_name=index_name,
+                        )
+
+                        # Use EXPLAIN comparison if available and reliable
+                        if explain_comparison.get("is_effective") is not None:
+                            is_effective_explain = explain_comparison.get("is_effective", False)
+                            improvement_pct_explain = explain_comparison.get("improvement_pct", 0.0)
+
+                            # Prefer EXPLAIN-based decision over simple validation
+                            # EXPLAIN provides more accurate cost-based analysis
+                            effective = is_effective_explain
+                            improvement_pct = improvement_pct_explain
+
+                            cost_reduction_val = explain_comparison.get("cost_reduction_pct", 0.0)
+                            cost_reduction = (
+                                float(cost_reduction_val)
+                                if isinstance(cost_reduction_val, int | float)
+                                else 0.0
+                            )
+
+                            logger.info(
+                                f"EXPLAIN-based validation for {index_name}: "
+                                f"improvement={improvement_pct_explain:.2f}%, "
+                                f"effective={is_effective_explain}, "
+                                f"cost_reduction={cost_reduction:.2f}%"
+                            )
+                        else:
+                            logger.debug(
+                                f"EXPLAIN comparison returned inconclusive for {index_name}, "
+                                "falling back to performance validation"
+                            )
+                except Exception as e:
+                    logger.debug(f"EXPLAIN comparison failed: {e}")
+                    # Fall back to validation_result
+
+                # Enhanced rollback decision based on EXPLAIN and validation results
+                should_rollback = False
+                rollback_reason = ""
+
+                # Ensure improvement_pct is a float for comparisons
+                improvement_pct_float = (
+                    float(improvement_pct) if isinstance(improvement_pct, int | float) else 0.0
+                )
+
+                if not effective:
+                    if improvement_pct_float < -10.0:  # Significant degradation (>10% worse)
+                        should_rollback = True
+                        rollback_reason = (
+                            f"significant performance degradation ({improvement_pct_float:.2f}%)"
+                        )
+                    elif improvement_pct_float < 0 and explain_comparison:
+                        # EXPLAIN shows negative impact
+                        explain_cost_reduction_val = explain_comparison.get(
+                            "cost_reduction_pct", 0.0
+                        )
+                        explain_cost_reduction = (
+                            float(explain_cost_reduction_val)
+                            if isinstance(explain_cost_reduction_val, int | float)
+                            else 0.0
+                        )
+                        if explain_cost_reduction < -5.0:  # EXPLAIN shows >5% cost increase
+                            should_rollback = True
+                            rollback_reason = (
+                                f"EXPLAIN shows cost increase ({explain_cost_reduction:.2f}%)"
+                            )
+                    elif improvement_pct_float < 0:
+                        # Minor degradation but no improvement
+                        should_rollback = True
+                        rollback_reason = f"no performance improvement ({improvement_pct:.2f}%)"
+
+                if should_rollback:
+                    logger.warning(f"Index {index_name} will be rolled back: {rollback_reason}")
+
+                    # Auto-rollback if enabled
+                    auto_rollback_enabled = (
+                        _config_loader.get_bool("features.auto_rollback.enabled", False)
+                        if _config_loader
+                        else False
+                    )
+
+                    if auto_rollback_enabled:
+                        try:
+                            logger.warning(
+                                f"Auto-rolling back index {index_name} due to negative improvement"
+                            )
+                            with get_connection() as rollback_conn:
+                                rollback_cursor = rollback_conn.cursor(
+                                    cursor_factory=RealDictCursor
+                                )
+                                try:
+                                    rollback_cursor.execute(
+                                        f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'
+                                    )
+                                    rollback_conn.commit()
+                                    invalidate_explain_cache_for_tables([table_name])
+                                    if table_catalog is not None:
+                                        table_catalog.forget_index(index_name)
+                                    logger.info(f"Successfully rolled back index {index_name}")
+
+                                    # Log rollback to audit
+                                    from src.audit import log_audit_event
+
+                                    log_audit_event(
+                                        "ROLLBACK_INDEX",
+                                        table_name=table_name,
+                                        field_name=field_name,
+                                        details={
+                                            "index_name": index_name,
+                                            "reason": "negative_improvement",
+                                            "improvement_pct": improvement_pct,
+                                        },
+                                        severity="warning",
+                                    )
+
+                                    # Skip adding to created_indexes
+                                    return
+                                except Exception as rollback_error:
+                                    logger.error(
+                                        f"Failed to rollback index {index_name}: {rollback_error}"
+                                    )
+                                    rollback_conn.rollback()
+                        except Exception as e:
+                            logger.error(f"Auto-rollback failed for {index_name}: {e}")
+                    # Note: If auto-rollback disabled, index is kept but warning is logged
+            elif validation_result.get("status") == "theoretical":
+                # Index doesn't exist yet, theoretical analysis
+                recommended = validation_result.get("recommended", False)
+                if not recommended:
+                    logger.debug(
+                        f"Index {index_name} theoretical analysis suggests limited benefit"
+                    )
+    except Exception as e:
+        logger.debug(f"Could not validate index effectiveness: {e}")
+
+    # Measure performance after index creation
+    after_perf = None
+    improvement_pct = 0.0
+    try:
+        if sample_query and before_perf:
+            query_str, params = sample_query
+            # Wait a moment for index to be ready
+            time.sleep(0.5)
+
+            sample_runs_val = _COST_CONFIG.get("SAMPLE_QUERY_RUNS", 5)
+            sample_runs = int(sample_runs_val) if isinstance(sample_runs_val, int | float) else 5
+            after_perf = measure_query_performance(query_str, params, num_runs=sample_runs)
+            # Note: after_plan analysis removed as it was unused
+
+            # Calculate improvement
+            if before_perf["median_ms"] > 0:
+                improvement_pct = (
+                    (before_perf["median_ms"] - after_perf["median_ms"]) / before_perf["median_ms"]
+                ) * 100.0
+
+            # If improvement is below threshold, consider removing index
+            min_improvement_val = _COST_CONFIG.get("MIN_IMPROVEMENT_PCT", 20.0)
+            min_improvement = (
+                min_improvement_val if isinstance(min_improvement_val, int | float) else 20.0
+            )
+            if improvement_pct < min_improvement:
+                logger.warning(
+                    f"Index {index_name} shows only {improvement_pct:.1f}% improvement "
+                    f"(below {min_improvement}% threshold)"
+                )
+                # Auto-rollback if improvement is negative and enabled
+                auto_rollback_enabled = (
+                    _config_loader.get_bool("features.auto_rollback.enabled", False)
+                    if _config_loader
+                    else False
+                )
+
+                if auto_rollback_enabled and improvement_pct < 0:
+                    # Only auto-rollback if improvement is negative (not just below threshold)
+                    try:
+                        logger.warning(
+                            f"Auto-rolling back index {index_name} due to negative improvement"
+                        )
+                        with get_connection() as rollback_conn:
+                            rollback_cursor = rollback_conn.cursor(cursor_factory=RealDictCursor)
+                            try:
+                                rollback_cursor.execute(
+                                    f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'
+                                )
+                                rollback_conn.commit()
+                                invalidate_explain_cache_for_tables([table_name])
+                                if table_catalog is not None:
+                                    table_catalog.forget_index(index_name)
+                                logger.info(f"Successfully rolled back index {index_name}")
+
+                                # Log rollback to audit
+                                from src.audit import log_audit_event
+
+                                log_audit_event(
+                                    "ROLLBACK_INDEX",
+                                    table_name=table_name,
+                                    field_name=field_name,
+                                    details={
+                                        "index_name": index_name,
+                                        "reason": "below_threshold_negative",
+                                        "improvement_pct": improvement_pct,
+                                        "threshold": min_improvement,
+                                    },
+                                    severity="warning",
+                                )
+
+                                # Skip adding to created_indexes
+                                return
+                            except Exception as rollback_error:
+                                logger.error(
+                                    f"Failed to rollback index {index_name}: {rollback_error}"
+                                )
+                                rollback_conn.rollback()
+                    except Exception as e:
+                        logger.error(f"Auto-rollback failed for {index_name}: {e}")
+                # Note: If auto-rollback disabled or improvement >= 0, index is kept but warning is logged
+    except Exception as e:
+        logger.debug(f"Could not measure after performance: {e}")
+
+    # Log the mutation to audit trail
+    from src.audit import log_audit_event
+
+    log_audit_event(
+        "CREATE_INDEX",
+        table_name=table_name,
+        field_name=field_name,
+        details={
+            "index_name": index_name,
+            "index_type": index_type,
+            "build_cost_estimate": build_cost,
+            "queries_analyzed": total_queries,
+            "query_cost_without_index": query_cost_without_index,
+            "row_count": row_count,
+            "field_selectivity": field_selectivity,
+            "confidence": confidence,
+            "reason": reason,
+            "strategy": strategy["primary"],
+            "before_perf_ms": before_perf["median_ms"] if before_perf else None,
+            "after_perf_ms": after_perf["median_ms"] if after_perf else None,
+            "improvement_pct": improvement_pct if after_perf else None,
+            "mode": "apply",  # Index was actually created
+        },
+        severity="info",
+    )
+
+    # Monitor write performance after creating
+    monitor_write_performance(table_name)
+
+    created_indexes.append(
+        {
+            "table": table_name,
+            "field": field_name,
+            "index_name": index_name,
+            "index_type": index_type,
+            "queries": total_queries,
+            "build_cost": build_cost,
+            "confidence": confidence,
+            "field_selectivity": field_selectivity,
+            "improvement_pct": improvement_pct if after_perf else None,
+            "write_overhead_estimate": write_stats.get("estimated_write_overhead", 0),
+        }
+    )
+    write_overhead_val = write_stats.get("estimated_write_overhead", 0)
+    write_overhead = (
+        float(write_overhead_val) if isinstance(write_overhead_val, int | float) else 0.0
+    )
+    improvement_str = f"improvement: {improvement_pct:.1f}%, " if after_perf else ""
+    print(
+        f"Created index {index_name} on {table_name}.{field_name} "
+        f"(type: {index_type}, queries: {total_queries}, "
+        f"build_cost: {build_cost:.2f}, confidence: {confidence:.2f}, "
+        f"{improvement_str}"
+        f"write overhead: {write_overhead * 100:.1f}%)"
+    )
+
+    # Register newly created index with lifecycle management
+    try:
+        from src.index_lifecycle_manager import is_lifecycle_management_enabled
+
+        if is_lifecycle_management_enabled():
+            logger.debug(f"Index {index_name} registered with lifecycle management")
+    except Exception as lifecycle_error:
+        logger.debug(f"Could not register index {index_name} with lifecycle: {lifecycle_error}")
+
+
+def _record_parallel_build(
+    build_future: Future,
+    finalize_args: JSONDict,
+    created_indexes: list[JSONDict],
+    skipped_indexes: list[JSONDict],
+) -> None:
+    """
+    Record the outcome of a finished build from the index build executor.
+
+    Outcomes are recorded the same way as in the sequential path: successful builds
+    go through _finalize_created_index(), builds that ran but did not complete and
+    build errors count as circuit breaker failures, and builds rejected by an
+    admission gate or cancelled before they started are only skipped. Unsuccessful builds give back the per-table
+    slot reserved when they were queued.
+    """
+    table_name = finalize_args["table_name"]
+    field_name = finalize_args["field_name"]
+    index_name = finalize_args["index_name"]
+    table_catalog = finalize_args["table_catalog"]
+    if build_future.cancelled():
+        # Cancelled before it started (executor shutdown); not a build failure
+        if table_catalog is not None:
+            table_catalog.forget_index(index_name)
+        skipped_indexes.append(
+            {
+                "table": table_name,
+                "field": field_name,
+                "queries": finalize_args["total_queries"],
+                "reason": "build_cancelled",
+            }
+        )
+        return
+    try:
+        build_result = build_future.result(timeout=0)
+        if not build_result.get("success", False):
+            build_reason = build_result.get("reason") or "build_not_completed"
+            logger.warning(f"Index build not completed for {index_name}: {build_reason}")
+            if table_catalog is not None:
+                table_catalog.forget_index(index_name)
+            try:
+                from src.safeguard_monitoring import track_index_creation_attempt
+
+                track_index_creation_attempt(
+                    success=False,
+                    throttled=str(build_reason).startswith("cpu_throttled"),
+                    blocked=False,
+                )
+            except Exception:
+                pass
+
+            if build_result.get("attempted", False):
+                try:
+                    from src.adaptive_safeguards import record_circuit_failure
+
+                    record_circuit_failure(f"index_creation_{table_name}")
+                except Exception:
+                    pass
+
+            skipped_indexes.append(
+                {
+                    "table": table_name,
+                    "field": field_name,
+                    "queries": finalize_args["total_queries"],
+                    "reason": build_reason,
+                }
+            )
+            return
+
+        if build_result.get("retries", 0) > 0:
+            logger.info(
+                f"Index {index_name} created after {build_result.get('retries', 0)} retries"
+            )
+        _finalize_created_index(created_indexes, **finalize_args)
+    except (IndexCreationError, Exception) as e:
+        logger.error(f"Failed to create index {index_name}: {e}")
+        if table_catalog is not None:
+            table_catalog.forget_index(index_name)
+        try:
+            from src.adaptive_safeguards import record_circuit_failure
+
+            record_circuit_failure(f"index_creation_{table_name}")
+        except Exception:
+            pass
+        monitoring = get_monitoring()
+        monitoring.alert("warning", f"Failed to create index {index_name}: {e}")
+        skipped_indexes.append(
+            {
+                "table": table_name,
+                "field": field_name,
+                "queries": finalize_args["total_queries"],
+                "reason": f"creation_failed: {str(e)}",
+            }
+        )
+
+
+def _finalize_pending_build(finalize_args: JSONDict, build_future: Future) -> None:
+    """Done-callback for a build that outlived its auto-indexer cycle"""
+    created: list[JSONDict] = []
+    skipped: list[JSONDict] = []
+    _record_parallel_build(build_future, finalize_args, created, skipped)
+    for entry in skipped:
+        logger.info(
+            f"Background build for {entry['table']}.{entry['field']} not created: {entry['reason']}"
+        )
+
+
+def _collect_parallel_builds(
+    pending_builds: list[tuple[Future, JSONDict]],
+    created_indexes: list[JSONDict],
+    skipped_indexes: list[JSONDict],
+    pending_indexes: list[JSONDict],
+    wait_seconds: float,
+) -> None:
+    """
+    Wait up to wait_seconds in total for builds queued on the index build executor.
+
+    Must be called after the cycle's transaction is committed: admission gates can
+    hold a build for up to max_queue_wait_seconds. Builds still queued or running
+    when the wait runs out are added to pending_indexes and finalized by a
+    done-callback when they finish.
+    """
+    deadline = time.time() + wait_seconds
+    for build_future, finalize_args in pending_builds:
+        try:
+            build_future.result(timeout=max(0.0, deadline - time.time()))
+        except FutureTimeoutError:
+            logger.info(
+                f"Index build {finalize_args['index_name']} still pending, "
+                "finalizing in the background"
+            )
+            pending_indexes.append(
+                {
+                    "table": finalize_args["table_name"],
+                    "field": finalize_args["field_name"],
+                    "index_name": finalize_args["index_name"],
+                    "queries": finalize_args["total_queries"],
+                    "reason": "build_pending",
+                }
+            )
+            build_future.add_done_callback(partial(_finalize_pending_build, finalize_args))
+            continue
+        except Exception:
+            # Recorded as a failure below
+            pass
+        _record_parallel_build(build_future, finalize_args, created_indexes, skipped_indexes)
+
+
+def _candidate_index_names(
+    table_name: str, field_name: str, has_tenant: bool
+) -> tuple[str, str, str]:
+    """Standard, partial and expression index names the auto-indexer uses for a field"""
+    if has_tenant:
+        # Multi-tenant index patterns
+        return (
+            f"idx_{table_name}_{field_name}_tenant",
+            f"idx_{table_name}_{field_name}_partial_tenant",
+            f"idx_{table_name}_{field_name}_lower_tenant",
+        )
+    # Single-tenant index patterns
+    return (
+        f"idx_{table_name}_{field_name}",
+        f"idx_{table_name}_{field_name}_partial",
+        f"idx_{table_name}_{field_name}_lower",
+    )
+
+
+@require_enabled(disabled_return={"created": [], "skipped": [], "pending": []})
+@handle_errors(
+    "analyze_and_create_indexes",
+    default_return={"created": [], "skipped": [], "pending": []},
+)
 def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
     """
     Analyze query stats and create indexes for fields that meet the threshold.
@@ -1761,6 +2386,7 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
 
     created_indexes = []
     skipped_indexes = []
+    pending_indexes: list[JSONDict] = []
 
     # OPTIMIZATION: Early exit check for small workloads
     # Check total query count before expensive analysis
@@ -1849,7 +2475,7 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
 
     if not field_stats:
         print("  No query statistics found. Skipping index creation.")
-        return {"created": [], "skipped": []}
+        return {"created": [], "skipped": [], "pending": []}
 
     # Validate all table/field names before processing
     from src.validation import validate_field_name, validate_table_name
@@ -1875,7 +2501,29 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
 
     if not validated_stats:
         print("  No valid query statistics found after validation.")
-        return {"created": [], "skipped": []}
+        return {"created": [], "skipped": [], "pending": []}
+
+    # Planning phase: read indexes, sizes, pg_stats, tenant columns and row counts
+    # for every candidate table up front, so per-candidate checks below run in
+    # memory instead of issuing their own catalog queries
+    fields_by_table: dict[str, set[str]] = {}
+    for stat in validated_stats:
+        fields_by_table.setdefault(stat["table_name"], set()).add(stat["field_name"])
+    candidate_catalog = prefetch_candidate_catalog(fields_by_table, _candidate_index_names)
+    unindexed_fields_by_table = (
+        {table: catalog.candidate_fields for table, catalog in candidate_catalog.items()}
+        if candidate_catalog
+        else fields_by_table
+    )
+    # Sustained/spike analysis for every unindexed candidate from one grouped query
+    candidate_patterns = detect_sustained_patterns(unindexed_fields_by_table, time_window_hours)
+    # Per-cycle memo for lookups that don't depend on the candidate field
+    workload_info_by_table: dict[str, JSONDict | None] = {}
+    fk_without_indexes: list[JSONDict] | None = None
+    # With the build executor enabled, apply-mode builds are queued and run in parallel
+    # across tables; their results are collected once every candidate has been scored
+    use_build_executor = is_index_build_executor_enabled()
+    pending_builds: list[tuple[Future, JSONDict]] = []
 
     with get_connection() as conn:
         cursor = conn.cursor(cursor_factory=RealDictCursor)
@@ -1885,50 +2533,53 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
                 field_name = stat["field_name"]
                 # Convert to float immediately to avoid Decimal * float errors
                 total_queries = float(stat["total_queries"]) if stat.get("total_queries") else 0.0
+                table_catalog = candidate_catalog.get(table_name)
 
                 # Check if any index already exists for this field
                 # (could be standard, partial, or expression index)
                 # Check if table has tenant field to determine index name patterns
-                has_tenant = _has_tenant_field(table_name)
-
-                if has_tenant:
-                    # Multi-tenant index patterns
-                    standard_index = f"idx_{table_name}_{field_name}_tenant"
-                    partial_index = f"idx_{table_name}_{field_name}_partial_tenant"
-                    expr_index = f"idx_{table_name}_{field_name}_lower_tenant"
-                else:
-                    # Single-tenant index patterns
-                    standard_index = f"idx_{table_name}_{field_name}"
-                    partial_index = f"idx_{table_name}_{field_name}_partial"
-                    expr_index = f"idx_{table_name}_{field_name}_lower"
-
-                # Validate table name to prevent SQL injection
-                from src.validation import validate_table_name
-
-                validated_table_name = validate_table_name(table_name)
-
-                # Use PostgreSQL-specific query (could be abstracted via adapter in future)
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) as count
-                    FROM pg_indexes
-                    WHERE tablename = %s
-                      AND (indexname = %s OR indexname = %s OR indexname = %s
-                           OR indexdef LIKE %s)
-                """,
-                    (
-                        validated_table_name,
-                        standard_index,
-                        partial_index,
-                        expr_index,
-                        f"%{field_name}%",
-                    ),
+                has_tenant = (
+                    table_catalog.has_tenant_field
+                    if table_catalog is not None
+                    else _has_tenant_field(table_name)
                 )
-                result = cursor.fetchone()
-                exists = (
-                    result.get("count", 0) > 0 if result and isinstance(result, dict) else False
+
+                standard_index, partial_index, expr_index = _candidate_index_names(
+                    table_name, field_name, has_tenant
                 )
 
+                if table_catalog is not None:
+                    exists = table_catalog.has_index_for_field(
+                        field_name, (standard_index, partial_index, expr_index)
+                    )
+                else:
+                    # Validate table name to prevent SQL injection
+                    from src.validation import validate_table_name
+
+                    validated_table_name = validate_table_name(table_name)
+
+                    # Use PostgreSQL-specific query (could be abstracted via adapter in future)
+                    cursor.execute(
+                        """
+                        SELECT COUNT(*) as count
+                        FROM pg_indexes
+                        WHERE tablename = %s
+                          AND (indexname = %s OR indexname = %s OR indexname = %s
+                               OR indexdef LIKE %s)
+                    """,
+                        (
+                            validated_table_name,
+                            standard_index,
+                            partial_index,
+                            expr_index,
+                            f"%{field_name}%",
+                        ),
+                    )
+                    result = cursor.fetchone()
+                    exists = (
+                        result.get("count", 0) > 0 if result and isinstance(result, dict) else False
+                    )
+
                 if exists:
                     logger.info(
                         f"[SKIP] {table_name}.{field_name}: Index already exists "
@@ -1945,7 +2596,10 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
                     continue
 
                 # Check if we can create index (write performance limits)
-                can_create, limit_reason = can_create_index_for_table(table_name)
+                can_create, limit_reason = can_create_index_for_table(
+                    table_name,
+                    current_count=table_catalog.index_count if table_catalog is not None else None,
+                )
                 if not can_create:
                     logger.info(
                         f"[SKIP] {table_name}.{field_name}: {limit_reason} "
@@ -1963,7 +2617,11 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
 
                 # Check for sustained pattern (not a spike)
                 pattern_ok, pattern_reason = should_create_index_based_on_pattern(
-                    table_name, field_name, int(total_queries), time_window_hours=time_window_hours
+                    table_name,
+                    field_name,
+                    int(total_queries),
+                    time_window_hours=time_window_hours,
+                    pattern=candidate_patterns.get((table_name, field_name)),
                 )
                 if not pattern_ok:
                     logger.info(
@@ -2020,8 +2678,12 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
                         continue
 
                 # Get table size information and strategy
-                row_count = get_table_row_count(table_name)
-                table_size_info = get_table_size_info(table_name)
+                if table_catalog is not None:
+                    row_count = table_catalog.row_count
+                    table_size_info = table_catalog.size_info()
+                else:
+                    row_count = get_table_row_count(table_name)
+                    table_size_info = get_table_size_info(table_name)
                 # Ensure row_count is int for strategy
                 row_count = int(row_count) if row_count else 0
                 strategy = get_optimization_strategy(table_name, row_count, table_size_info)
@@ -2078,7 +2740,16 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
                 )
 
                 # Get field selectivity for better cost estimation
-                field_selectivity = get_field_selectivity(table_name, field_name)
+                catalog_selectivity = (
+                    _catalog_field_selectivity(table_catalog, field_name)
+                    if table_catalog is not None
+                    else None
+                )
+                field_selectivity = (
+                    catalog_selectivity
+                    if catalog_selectivity is not None
+                    else get_field_selectivity(table_name, field_name)
+                )
 
                 # Determine index type based on patterns (preview)
                 strategy = get_optimization_strategy(table_name, row_count, table_size_info)
@@ -2091,7 +2762,11 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
                     table_name, field_name, row_count, preview_index_type
                 )
                 query_cost_without_index = estimate_query_cost_without_index(
-                    table_name, field_name, row_count, use_real_plans=True
+                    table_name,
+                    field_name,
+                    row_count,
+                    use_real_plans=True,
+                    selectivity=field_selectivity,
                 )
 
                 # Get tenant-specific config if available
@@ -2119,54 +2794,51 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
                 if tenant_config:
                     max_indexes = tenant_config.get("max_indexes_per_table", 10)
                     try:
-                        with get_cursor() as cursor:
-                            cursor.execute(
-                                """
-                                SELECT COUNT(*) as index_count
-                                FROM pg_indexes
-                                WHERE schemaname = 'public'
-                                  AND tablename = %s
-                                """,
-                                (table_name,),
-                            )
-                            result = cursor.fetchone()
-                            current_index_count = result["index_count"] if result else 0
+                        current_index_count = (
+                            table_catalog.index_count
+                            if table_catalog is not None
+                            else get_index_count_for_table(table_name)
+                        )
 
-                            if current_index_count >= max_indexes:
-                                logger.info(
-                                    f"Skipping index for {table_name}: "
-                                    f"tenant {tenant_id} has reached max indexes ({current_index_count}/{max_indexes})"
-                                )
-                                skipped_indexes.append(
-                                    {
-                                        "table": table_name,
-                                        "field": field_name,
-                                        "reason": f"max_indexes_per_table_reached_{current_index_count}_{max_indexes}",
-                                    }
-                                )
-                                continue
+                        if current_index_count >= max_indexes:
+                            logger.info(
+                                f"Skipping index for {table_name}: "
+                                f"tenant {tenant_id} has reached max indexes ({current_index_count}/{max_indexes})"
+                            )
+                            skipped_indexes.append(
+                                {
+                                    "table": table_name,
+                                    "field": field_name,
+                                    "reason": f"max_indexes_per_table_reached_{current_index_count}_{max_indexes}",
+                                }
+                            )
+                            continue
                     except Exception as e:
                         logger.debug(f"Could not check tenant index count: {e}")
 
-                # Get workload info for decision making
-                workload_info = None
-                try:
-                    from src.workload_analysis import analyze_workload, get_workload_config
+                # Get workload info for decision making (per table, so once per cycle)
+                if table_name not in workload_info_by_table:
+                    workload_info = None
+                    try:
+                        from src.workload_analysis import analyze_workload, get_workload_config
 
-                    workload_config = get_workload_config()
-                    if workload_config.get("enabled", True):
-                        workload_result = analyze_workload(
-                            table_name=table_name,
-                            time_window_hours=workload_config.get("time_window_hours", 24),
-                        )
-                        if workload_result and not workload_result.get("skipped"):
-                            tables_data = workload_result.get("tables", [])
-                            table_workload = next(
-                                (t for t in tables_data if t.get("table_name") == table_name), None
+                        workload_config = get_workload_config()
+                        if workload_config.get("enabled", True):
+                            workload_result = analyze_workload(
+                                table_name=table_name,
+                                time_window_hours=workload_config.get("time_window_hours", 24),
                             )
-                            workload_info = table_workload or workload_result.get("overall", {})
-                except Exception:
-                    pass
+                            if workload_result and not workload_result.get("skipped"):
+                                tables_data = workload_result.get("tables", [])
+                                table_workload = next(
+                                    (t for t in tables_data if t.get("table_name") == table_name),
+                                    None,
+                                )
+                                workload_info = table_workload or workload_result.get("overall", {})
+                    except Exception:
+                        pass
+                    workload_info_by_table[table_name] = workload_info
+                workload_info = workload_info_by_table[table_name]
 
                 # Decide if we should create the index (with size-aware analysis + Predictive Indexing + Workload-Aware)
                 logger.info(
@@ -2203,7 +2875,9 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
                         )
 
                         if is_foreign_key_suggestions_enabled():
-                            fk_without_indexes = find_foreign_keys_without_indexes()
+                            # Schema-wide lookup; reuse it for the rest of the cycle
+                            if fk_without_indexes is None:
+                                fk_without_indexes = find_foreign_keys_without_indexes()
                             is_fk = any(
                                 fk.get("table") == table_name and fk.get("column") == field_name
                                 for fk in fk_without_indexes
@@ -2374,6 +3048,26 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
                         continue  # Skip actual index creation
 
                     # Apply mode: actually create the index
+                    finalize_args = {
+                        "table_name": table_name,
+                        "field_name": field_name,
+                        "index_name": index_name,
+                        "index_sql": index_sql,
+                        "index_type": index_type,
+                        "table_catalog": table_catalog,
+                        "sample_query": sample_query,
+                        "before_perf": before_perf,
+                        "build_cost": build_cost,
+                        "confidence": confidence,
+                        "field_selectivity": field_selectivity,
+                        "total_queries": total_queries,
+                        "query_cost_without_index": query_cost_without_index,
+                        "row_count": row_count,
+                        "reason": reason,
+                        "strategy": strategy,
+                        "write_stats": write_stats,
+                    }
+                    estimated_index_size_mb = 1.0
                     # Check storage budget before creating
                     try:
                         from src.storage_budget import check_storage_budget
@@ -2422,7 +3116,6 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
                             from src.adaptive_safeguards import (
                                 check_circuit_breaker,
                                 record_circuit_failure,
-                                record_circuit_success,
                             )
 
                             circuit_breaker_name = f"index_creation_{table_name}"
@@ -2473,6 +3166,27 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
                         except Exception:
                             pass
 
+                        if use_build_executor:
+                            # Built in parallel with other tables; finalized after the loop.
+                            # Reserve the table's index slot now so later candidates on the
+                            # same table see it in max_indexes_per_table
+                            if table_catalog is not None:
+                                table_catalog.record_index(index_name, index_sql)
+                            try:
+                                build_future = get_index_build_executor().submit(
+                                    table_name,
+                                    field_name,
+                                    index_name,
+                                    index_sql,
+                                    estimated_size_mb=estimated_index_size_mb,
+                                )
+                            except Exception:
+                                if table_catalog is not None:
+                                    table_catalog.forget_index(index_name)
+                                raise
+                            pending_builds.append((build_future, finalize_args))
+                            continue
+
                         # Use lock management with CPU throttling for index creation
                         # Wrap with retry logic if enabled
                         try:
@@ -2550,400 +3264,7 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
                             )
                             continue
 
-                        # Track successful creation
-                        try:
-                            from src.safeguard_monitoring import track_index_creation_attempt
-
-                            track_index_creation_attempt(
-                                success=True, throttled=False, blocked=False
-                            )
-                        except Exception:
-                            pass
-
-                        # Record circuit breaker success
-                        try:
-                            from src.adaptive_safeguards import record_circuit_success
-
-                            circuit_breaker_name = f"index_creation_{table_name}"
-                            record_circuit_success(circuit_breaker_name)
-                        except Exception:
-                            pass
-
-                        # Track index version (Phase 3)
-                        try:
-                            from src.index_lifecycle_advanced import track_index_version
-
-                            track_index_version(
-                                index_name=index_name,
-                                table_name=table_name,
-                                index_definition=index_sql,
-                                created_by="auto_indexer",
-                                metadata={
-                                    "index_type": index_type,
-                                    "build_cost": build_cost,
-                                    "confidence": confidence,
-                                },
-                            )
-                        except Exception as e:
-                            logger.debug(f"Could not track index version: {e}")
-
-                        # Validate index effectiveness using EXPLAIN before/after
-                        validation_result = None
-                        try:
-                            if sample_query:
-                                from src.composite_index_detection import (
-                                    validate_index_effectiveness,
-                                )
-
-                                query_str, params = sample_query
-                                validation_result = validate_index_effectiveness(
-                                    table_name=table_name,
-                                    field_name=field_name,
-                                    index_name=index_name,
-                                    sample_query=(query_str, params),
-                                )
-
-                                if validation_result.get("status") == "success":
-                                    improvement_pct = validation_result.get(
-                                        "improvement_percent", 0.0
-                                    )
-                                    effective = validation_result.get("effective", False)
-
-                                    # ✅ ENHANCEMENT: Use EXPLAIN-based comparison for rollback decision
-                                    explain_comparison = None
-                                    try:
-                                        from src.query_analyzer import compare_explain_before_after
-
-                                        # Get sample query for comparison
-                                        sample_query = get_sample_query_for_field(
-                                            table_name, field_name
-                                        )
-                                        if sample_query:
-                                            query_str, query_params = sample_query
-                                            explain_comparison = compare_explain_before_after(
-                                                query=query_str,
-                                                params=query_params,
-                                                index_name=index_name,
-                                            )
-
-                                            # Use EXPLAIN comparison if available and reliable
-                                            if explain_comparison.get("is_effective") is not None:
-                                                is_effective_explain = explain_comparison.get(
-                                                    "is_effective", False
-                                                )
-                                                improvement_pct_explain = explain_comparison.get(
-                                                    "improvement_pct", 0.0
-                                                )
-
-                                                # Prefer EXPLAIN-based decision over simple validation
-                                                # EXPLAIN provides more accurate cost-based analysis
-                                                effective = is_effective_explain
-                                                improvement_pct = improvement_pct_explain
-
-                                                cost_reduction_val = explain_comparison.get(
-                                                    "cost_reduction_pct", 0.0
-                                                )
-                                                cost_reduction = (
-                                                    float(cost_reduction_val)
-                                                    if isinstance(cost_reduction_val, int | float)
-                                                    else 0.0
-                                                )
-
-                                                logger.info(
-                                                    f"EXPLAIN-based validation for {index_name}: "
-                                                    f"improvement={improvement_pct_explain:.2f}%, "
-                                                    f"effective={is_effective_explain}, "
-                                                    f"cost_reduction={cost_reduction:.2f}%"
-                                                )
-                                            else:
-                                                logger.debug(
-                                                    f"EXPLAIN comparison returned inconclusive for {index_name}, "
-                                                    "falling back to performance validation"
-                                                )
-                                    except Exception as e:
-                                        logger.debug(f"EXPLAIN comparison failed: {e}")
-                                        # Fall back to validation_result
-
-                                    # Enhanced rollback decision based on EXPLAIN and validation results
-                                    should_rollback = False
-                                    rollback_reason = ""
-
-                                    # Ensure improvement_pct is a float for comparisons
-                                    improvement_pct_float = (
-                                        float(improvement_pct)
-                                        if isinstance(improvement_pct, int | float)
-                                        else 0.0
-                                    )
-
-                                    if not effective:
-                                        if (
-                                            improvement_pct_float < -10.0
-                                        ):  # Significant degradation (>10% worse)
-                                            should_rollback = True
-                                            rollback_reason = f"significant performance degradation ({improvement_pct_float:.2f}%)"
-                                        elif improvement_pct_float < 0 and explain_comparison:
-                                            # EXPLAIN shows negative impact
-                                            explain_cost_reduction_val = explain_comparison.get(
-                                                "cost_reduction_pct", 0.0
-                                            )
-                                            explain_cost_reduction = (
-                                                float(explain_cost_reduction_val)
-                                                if isinstance(
-                                                    explain_cost_reduction_val, int | float
-                                                )
-                                                else 0.0
-                                            )
-                                            if (
-                                                explain_cost_reduction < -5.0
-                                            ):  # EXPLAIN shows >5% cost increase
-                                                should_rollback = True
-                                                rollback_reason = f"EXPLAIN shows cost increase ({explain_cost_reduction:.2f}%)"
-                                        elif improvement_pct_float < 0:
-                                            # Minor degradation but no improvement
-                                            should_rollback = True
-                                            rollback_reason = f"no performance improvement ({improvement_pct:.2f}%)"
-
-                                    if should_rollback:
-                                        logger.warning(
-                                            f"Index {index_name} will be rolled back: {rollback_reason}"
-                                        )
-
-                                        # Auto-rollback if enabled
-                                        auto_rollback_enabled = (
-                                            _config_loader.get_bool(
-                                                "features.auto_rollback.enabled", False
-                                            )
-                                            if _config_loader
-                                            else False
-                                        )
-
-                                        if auto_rollback_enabled:
-                                            try:
-                                                logger.warning(
-                                                    f"Auto-rolling back index {index_name} due to negative improvement"
-                                                )
-                                                with get_connection() as rollback_conn:
-                                                    rollback_cursor = rollback_conn.cursor(
-                                                        cursor_factory=RealDictCursor
-                                                    )
-                                                    try:
-                                                        rollback_cursor.execute(
-                                                            f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'
-                                                        )
-                                                        rollback_conn.commit()
-                                                        logger.info(
-                                                            f"Successfully rolled back index {index_name}"
-                                                        )
-
-                                                        # Log rollback to audit
-                                                        from src.audit import log_audit_event
-
-                                                        log_audit_event(
-                                                            "ROLLBACK_INDEX",
-                                                            table_name=table_name,
-                                                            field_name=field_name,
-                                                            details={
-                                                                "index_name": index_name,
-                                                                "reason": "negative_improvement",
-                                                                "improvement_pct": improvement_pct,
-                                                            },
-                                                            severity="warning",
-                                                        )
-
-                                                        # Skip adding to created_indexes
-                                                        continue
-                                                    except Exception as rollback_error:
-                                                        logger.error(
-                                                            f"Failed to rollback index {index_name}: {rollback_error}"
-                                                        )
-                                                        rollback_conn.rollback()
-                                            except Exception as e:
-                                                logger.error(
-                                                    f"Auto-rollback failed for {index_name}: {e}"
-                                                )
-                                        # Note: If auto-rollback disabled, index is kept but warning is logged
-                                elif validation_result.get("status") == "theoretical":
-                                    # Index doesn't exist yet, theoretical analysis
-                                    recommended = validation_result.get("recommended", False)
-                                    if not recommended:
-                                        logger.debug(
-                                            f"Index {index_name} theoretical analysis suggests limited benefit"
-                                        )
-                        except Exception as e:
-                            logger.debug(f"Could not validate index effectiveness: {e}")
-
-                        # Measure performance after index creation
-                        after_perf = None
-                        improvement_pct = 0.0
-                        try:
-                            if sample_query and before_perf:
-                                query_str, params = sample_query
-                                # Wait a moment for index to be ready
-                                time.sleep(0.5)
-
-                                sample_runs_val = _COST_CONFIG.get("SAMPLE_QUERY_RUNS", 5)
-                                sample_runs = (
-                                    int(sample_runs_val)
-                                    if isinstance(sample_runs_val, int | float)
-                                    else 5
-                                )
-                                after_perf = measure_query_performance(
-                                    query_str, params, num_runs=sample_runs
-                                )
-                                # Note: after_plan analysis removed as it was unused
-
-                                # Calculate improvement
-                                if before_perf["median_ms"] > 0:
-                                    improvement_pct = (
-                                        (before_perf["median_ms"] - after_perf["median_ms"])
-                                        / before_perf["median_ms"]
-                                    ) * 100.0
-
-                                # If improvement is below threshold, consider removing index
-                                min_improvement_val = _COST_CONFIG.get("MIN_IMPROVEMENT_PCT", 20.0)
-                                min_improvement = (
-                                    min_improvement_val
-                                    if isinstance(min_improvement_val, int | float)
-                                    else 20.0
-                                )
-                                if improvement_pct < min_improvement:
-                                    logger.warning(
-                                        f"Index {index_name} shows only {improvement_pct:.1f}% improvement "
-                                        f"(below {min_improvement}% threshold)"
-                                    )
-                                    # Auto-rollback if improvement is negative and enabled
-                                    auto_rollback_enabled = (
-                                        _config_loader.get_bool(
-                                            "features.auto_rollback.enabled", False
-                                        )
-                                        if _config_loader
-                                        else False
-                                    )
-
-                                    if auto_rollback_enabled and improvement_pct < 0:
-                                        # Only auto-rollback if improvement is negative (not just below threshold)
-                                        try:
-                                            logger.warning(
-                                                f"Auto-rolling back index {index_name} due to negative improvement"
-                                            )
-                                            with get_connection() as rollback_conn:
-                                                rollback_cursor = rollback_conn.cursor(
-                                                    cursor_factory=RealDictCursor
-                                                )
-                                                try:
-                                                    rollback_cursor.execute(
-                                                        f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'
-                                                    )
-                                                    rollback_conn.commit()
-                                                    logger.info(
-                                                        f"Successfully rolled back index {index_name}"
-                                                    )
-
-                                                    # Log rollback to audit
-                                                    from src.audit import log_audit_event
-
-                                                    log_audit_event(
-                                                        "ROLLBACK_INDEX",
-                                                        table_name=table_name,
-                                                        field_name=field_name,
-                                                        details={
-                                                            "index_name": index_name,
-                                                            "reason": "below_threshold_negative",
-                                                            "improvement_pct": improvement_pct,
-                                                            "threshold": min_improvement,
-                                                        },
-                                                        severity="warning",
-                                                    )
-
-                                                    # Skip adding to created_indexes
-                                                    continue
-                                                except Exception as rollback_error:
-                                                    logger.error(
-                                                        f"Failed to rollback index {index_name}: {rollback_error}"
-                                                    )
-                                                    rollback_conn.rollback()
-                                        except Exception as e:
-                                            logger.error(
-                                                f"Auto-rollback failed for {index_name}: {e}"
-                                            )
-                                    # Note: If auto-rollback disabled or improvement >= 0, index is kept but warning is logged
-                        except Exception as e:
-                            logger.debug(f"Could not measure after performance: {e}")
-
-                        # Log the mutation to audit trail
-                        from src.audit import log_audit_event
-
-                        log_audit_event(
-                            "CREATE_INDEX",
-                            table_name=table_name,
-                            field_name=field_name,
-                            details={
-                                "index_name": index_name,
-                                "index_type": index_type,
-                                "build_cost_estimate": build_cost,
-                                "queries_analyzed": total_queries,
-                                "query_cost_without_index": query_cost_without_index,
-                                "row_count": row_count,
-                                "field_selectivity": field_selectivity,
-                                "confidence": confidence,
-                                "reason": reason,
-                                "strategy": strategy["primary"],
-                                "before_perf_ms": before_perf["median_ms"] if before_perf else None,
-                                "after_perf_ms": after_perf["median_ms"] if after_perf else None,
-                                "improvement_pct": improvement_pct if after_perf else None,
-                                "mode": "apply",  # Index was actually created
-                            },
-                            severity="info",
-                        )
-
-                        # Monitor write performance after creating
-                        monitor_write_performance(table_name)
-
-                        created_indexes.append(
-                            {
-                                "table": table_name,
-                                "field": field_name,
-                                "index_name": index_name,
-                                "index_type": index_type,
-                                "queries": total_queries,
-                                "build_cost": build_cost,
-                                "confidence": confidence,
-                                "field_selectivity": field_selectivity,
-                                "improvement_pct": improvement_pct if after_perf else None,
-                                "write_overhead_estimate": write_stats.get(
-                                    "estimated_write_overhead", 0
-                                ),
-                            }
-                        )
-                        write_overhead_val = write_stats.get("estimated_write_overhead", 0)
-                        write_overhead = (
-                            float(write_overhead_val)
-                            if isinstance(write_overhead_val, int | float)
-                            else 0.0
-                        )
-                        improvement_str = (
-                            f"improvement: {improvement_pct:.1f}%, " if after_perf else ""
-                        )
-                        print(
-                            f"Created index {index_name} on {table_name}.{field_name} "
-                            f"(type: {index_type}, queries: {total_queries}, "
-                            f"build_cost: {build_cost:.2f}, confidence: {confidence:.2f}, "
-                            f"{improvement_str}"
-                            f"write overhead: {write_overhead * 100:.1f}%)"
-                        )
-
-                        # Register newly created index with lifecycle management
-                        try:
-                            from src.index_lifecycle_manager import is_lifecycle_management_enabled
-
-                            if is_lifecycle_management_enabled():
-                                logger.debug(
-                                    f"Index {index_name} registered with lifecycle management"
-                                )
-                        except Exception as lifecycle_error:
-                            logger.debug(
-                                f"Could not register index {index_name} with lifecycle: {lifecycle_error}"
-                            )
+                        _finalize_created_index(created_indexes, **finalize_args)
                     except (IndexCreationError, Exception) as e:
                         logger.error(f"Failed to create index {index_name}: {e}")
                         monitoring = get_monitoring()
@@ -2977,6 +3298,16 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
         finally:
             cursor.close()
 
+    # Collected only once the cycle's connection is committed and back in the pool
+    if pending_builds:
+        _collect_parallel_builds(
+            pending_builds,
+            created_indexes,
+            skipped_indexes,
+            pending_indexes,
+            get_build_collect_timeout_seconds(),
+        )
+
     # Log EXPLAIN coverage statistics if tracking is enabled
     if _COST_CONFIG.get("EXPLAIN_USAGE_TRACKING_ENABLED", True):
         explain_stats = get_explain_usage_stats()
@@ -2990,7 +3321,7 @@ def analyze_and_create_indexes(time_window_hours=24, min_query_threshold=100):
             # Log warning if coverage is below minimum threshold
             log_explain_coverage_warning()
 
-    return {"created": created_indexes, "skipped": skipped_indexes}
+    return {"created": created_indexes, "skipped": skipped_indexes, "pending": pending_indexes}
 
 
 # Set up structured logging at startup (if enabled)
@@ -3009,3 +3340,4 @@ if __name__ == "__main__":
     print("\nIndex creation summary:")
     print(f"  Created: {len(results['created'])}")
     print(f"  Skipped: {len(results['skipped'])}")
+    print(f"  Pending: {len(results.get('pending', []))}")
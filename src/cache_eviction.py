@@ -0,0 +1,382 @@
+"""
+Eviction policies for ProductionCache.
+
+Policies only track keys; the cache owns the values and memory accounting. A
+policy is told about every lookup and insert and is asked for a victim when the
+cache is over its size or memory limit.
+
+- lru: least recently used
+- slru: segmented LRU; entries must be hit twice to reach the protected segment,
+  so a scan of one-off queries only churns the probation segment
+- w-tinylfu: small LRU admission window in front of an SLRU main cache; entries
+  leaving the window are only kept if a count-min frequency sketch says they are
+  requested more often than the entry they would displace
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Protocol
+
+from src.type_definitions import JSONDict
+
+DEFAULT_EVICTION_POLICY = "lru"
+
+_MASK_64 = (1 << 64) - 1
+# Odd 64-bit multipliers, one per sketch row (multiply-shift hashing)
+_SKETCH_SEEDS = (
+    0x9E3779B97F4A7C15,
+    0xC2B2AE3D27D4EB4F,
+    0x165667B19E3779F9,
+    0xD6E8FEB86659FD93,
+)
+# Counter values halved in one bytes.translate() call when the sketch ages
+_HALVE_TABLE = bytes(value >> 1 for value in range(256))
+
+
+class CountMinSketch:
+    """
+    Compact frequency estimator (TinyLFU).
+
+    depth x width one-byte counters saturating at max_count. Increments use the
+    conservative update rule, and all counters are halved every sample_size
+    increments so old popularity fades.
+    """
+
+    def __init__(self, capacity: int, depth: int = 4, max_count: int = 15):
+        self.depth = max(1, min(depth, len(_SKETCH_SEEDS)))
+        self._bits = max(4, (max(1, capacity) - 1).bit_length())
+        self.width = 1 << self._bits
+        self.max_count = max_count
+        self.sample_size = 10 * max(1, capacity)
+        self._table = bytearray(self.depth * self.width)
+        self._additions = 0
+
+    def _indexes(self, key: str) -> list[int]:
+        h = hash(key) & _MASK_64
+        shift = 64 - self._bits
+        return [
+            row * self.width + (((h * _SKETCH_SEEDS[row]) & _MASK_64) >> shift)
+            for row in range(self.depth)
+        ]
+
+    def estimate(self, key: str) -> int:
+        table = self._table
+        return min(table[index] for index in self._indexes(key))
+
+    def increment(self, key: str) -> None:
+        table = self._table
+        indexes = self._indexes(key)
+        current = min(table[index] for index in indexes)
+        if current < self.max_count:
+            for index in indexes:
+                if table[index] == current:
+                    table[index] = current + 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._table = bytearray(self._table.translate(_HALVE_TABLE))
+            self._additions //= 2
+
+    def clear(self) -> None:
+        self._table = bytearray(self.depth * self.width)
+        self._additions = 0
+
+
+class EvictionPolicy(Protocol):
+    """Key-ordering strategy used by ProductionCache"""
+
+    name: str
+
+    def on_access(self, key: str, hit: bool) -> None:
+        """Record a lookup (hit=True if the key is cached)"""
+        ...
+
+    def on_insert(self, key: str) -> None:
+        """Track a newly cached key"""
+        ...
+
+    def remove(self, key: str) -> None:
+        """Forget a key removed by the cache (invalidation, expiry, replacement)"""
+        ...
+
+    def evict(self) -> str | None:
+        """Choose a victim, forget it and return it (None if empty)"""
+        ...
+
+    def clear(self) -> None: ...
+
+    def describe(self) -> JSONDict:
+        """Segment sizes and hit counts"""
+        ...
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, key: object) -> bool: ...
+
+
+class LRUPolicy:
+    name = "lru"
+
+    def __init__(self, max_size: int):
+        self._order: OrderedDict[str, None] = OrderedDict()
+        self.hits = 0
+
+    def on_access(self, key: str, hit: bool) -> None:
+        if hit and key in self._order:
+            self._order.move_to_end(key)
+            self.hits += 1
+
+    def on_insert(self, key: str) -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def evict(self) -> str | None:
+        if not self._order:
+            return None
+        return self._order.popitem(last=False)[0]
+
+    def clear(self) -> None:
+        self._order.clear()
+        self.hits = 0
+
+    def describe(self) -> JSONDict:
+        return {"size": len(self._order), "hits": self.hits}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._order
+
+
+class SLRUPolicy:
+    """Probation + protected LRU segments"""
+
+    name = "slru"
+
+    def __init__(self, max_size: int, protected_ratio: float = 0.8):
+        self.protected_capacity = max(1, int(max_size * protected_ratio))
+        self._probation: OrderedDict[str, None] = OrderedDict()
+        self._protected: OrderedDict[str, None] = OrderedDict()
+        self.probation_hits = 0
+        self.protected_hits = 0
+
+    def on_access(self, key: str, hit: bool) -> None:
+        if not hit:
+            return
+        if key in self._protected:
+            self._protected.move_to_end(key)
+            self.protected_hits += 1
+        elif key in self._probation:
+            # Second hit: promote, demoting the protected segment's LRU if it overflows
+            del self._probation[key]
+            self._protected[key] = None
+            self.probation_hits += 1
+            while len(self._protected) > self.protected_capacity:
+                demoted = self._protected.popitem(last=False)[0]
+                self._probation[demoted] = None
+
+    def on_insert(self, key: str) -> None:
+        self._probation[key] = None
+        self._probation.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        if key in self._probation:
+            del self._probation[key]
+        else:
+            self._protected.pop(key, None)
+
+    def evict(self) -> str | None:
+        if self._probation:
+            return self._probation.popitem(last=False)[0]
+        if self._protected:
+            return self._protected.popitem(last=False)[0]
+        return None
+
+    def clear(self) -> None:
+        self._probation.clear()
+        self._protected.clear()
+        self.probation_hits = 0
+        self.protected_hits = 0
+
+    def describe(self) -> JSONDict:
+        return {
+            "probation_size": len(self._probation),
+            "protected_size": len(self._protected),
+            "probation_hits": self.probation_hits,
+            "protected_hits": self.protected_hits,
+        }
+
+    def __len__(self) -> int:
+        return len(self._probation) + len(self._protected)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._probation or key in self._protected
+
+
+class WTinyLFUPolicy:
+    """LRU admission window in front of an SLRU main cache, gated by a frequency sketch"""
+
+    name = "w-tinylfu"
+
+    def __init__(
+        self,
+        max_size: int,
+        window_ratio: float = 0.01,
+        sketch: CountMinSketch | None = None,
+    ):
+        self.window_capacity = max(1, int(max_size * window_ratio))
+        self._window: OrderedDict[str, None] = OrderedDict()
+        self._main = SLRUPolicy(max(1, max_size - self.window_capacity))
+        # Several policies (one per cache partition) may share one sketch
+        self.sketch = sketch if sketch is not None else CountMinSketch(max_size)
+        self.window_hits = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def on_access(self, key: str, hit: bool) -> None:
+        self.sketch.increment(key)
+        if not hit:
+            return
+        if key in self._window:
+            self._window.move_to_end(key)
+            self.window_hits += 1
+        else:
+            self._main.on_access(key, hit)
+
+    def on_insert(self, key: str) -> None:
+        self.sketch.increment(key)
+        self._window[key] = None
+        self._window.move_to_end(key)
+        # Window overflow moves to the main cache's probation segment, where it is a
+        # candidate for admission the next time something has to be evicted
+        while len(self._window) > self.window_capacity:
+            self._main.on_insert(self._window.popitem(last=False)[0])
+
+    def remove(self, key: str) -> None:
+        if key in self._window:
+            del self._window[key]
+        else:
+            self._main.remove(key)
+
+    def evict(self) -> str | None:
+        probation = self._main._probation
+        if len(probation) >= 2:
+            # Newest probation entry (the candidate from the window) against the oldest
+            candidate = next(reversed(probation))
+            victim = next(iter(probation))
+            if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+                self.admitted += 1
+                del probation[victim]
+                return victim
+            self.rejected += 1
+            del probation[candidate]
+            return candidate
+        if len(self._main):
+            return self._main.evict()
+        if self._window:
+            return self._window.popitem(last=False)[0]
+        return None
+
+    def clear(self) -> None:
+        self._window.clear()
+        self._main.clear()
+        self.sketch.clear()
+        self.window_hits = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def describe(self) -> JSONDict:
+        description = self._main.describe()
+        description.update(
+            {
+                "window_size": len(self._window),
+                "window_hits": self.window_hits,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+            }
+        )
+        return description
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._main)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._window or key in self._main
+
+
+EVICTION_POLICIES: dict[str, type[LRUPolicy] | type[SLRUPolicy] | type[WTinyLFUPolicy]] = {
+    LRUPolicy.name: LRUPolicy,
+    SLRUPolicy.name: SLRUPolicy,
+    WTinyLFUPolicy.name: WTinyLFUPolicy,
+}
+
+
+def create_eviction_policy(
+    name: str, max_size: int, frequency_sketch: CountMinSketch | None = None
+) -> EvictionPolicy:
+    """
+    Build an eviction policy by name.
+
+    Args:
+        name: "lru", "slru" or "w-tinylfu" (case-insensitive, "_" accepted for "-")
+        max_size: Cache capacity in entries (sizes the segments and the sketch)
+        frequency_sketch: Existing sketch for w-tinylfu to share instead of sizing
+            its own (ignored by the other policies)
+
+    Raises:
+        ValueError: Unknown policy name
+    """
+    normalized = name.strip().lower().replace("_", "-")
+    policy_class = EVICTION_POLICIES.get(normalized)
+    if policy_class is None:
+        raise ValueError(
+            f"Unknown cache eviction policy '{name}' (expected one of: "
+            f"{', '.join(EVICTION_POLICIES)})"
+        )
+    if policy_class is WTinyLFUPolicy:
+        return WTinyLFUPolicy(max_size, sketch=frequency_sketch)
+    return policy_class(max_size)
+
+
+class ShadowPolicy:
+    """
+    Replays the cache's key stream through another policy to measure the hit ratio
+    it would have had. Only the entry-count limit is simulated.
+    """
+
+    def __init__(self, name: str, max_size: int):
+        self.policy = create_eviction_policy(name, max_size)
+        self.max_size = max(1, max_size)
+        self.hits = 0
+        self.misses = 0
+
+    def on_lookup(self, key: str) -> None:
+        hit = key in self.policy
+        self.policy.on_access(key, hit)
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def on_store(self, key: str) -> None:
+        self.policy.remove(key)
+        self.policy.on_insert(key)
+        while len(self.policy) > self.max_size:
+            if self.policy.evict() is None:
+                break
+
+    def remove(self, key: str) -> None:
+        self.policy.remove(key)
+
+    def clear(self) -> None:
+        self.policy.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate_pct(self) -> float:
+        total = self.hits + self.misses
+        return round(self.hits / total * 100, 2) if total > 0 else 0.0
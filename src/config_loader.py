@@ -277,6 +277,50 @@ class ConfigLoader:
                 "emergency": {"enabled": False, "reason": "", "auto_recover_after_seconds": 0},
             },
             "features": {
+                "stats_collection": {
+                    "batch_size": 100,
+                    "flush_interval_seconds": 5,
+                    "max_buffer_size": 10000,
+                    "mode": "raw",  # "aggregate" writes per-bucket rollups instead of raw rows
+                    "aggregation_bucket_seconds": 60,
+                    "flush_method": "execute_values",  # "copy" | "execute_values" | "executemany"
+                    "background_flush": False,
+                    "buffer_stripes": 16,
+                    "validation_cache_size": 4096,
+                },
+                "query_stats_partitioning": {
+                    "enabled": True,
+                    "interval": "day",  # "day" | "hour"
+                    "premake": 3,
+                    "retention_days": 90,  # Partitions and rollup rows; 0 keeps everything
+                },
+                "stats_rollup": {
+                    "enabled": True,
+                    "lag_seconds": 300,
+                    "backfill_hours": 24,
+                    "max_hours_per_run": 24,
+                },
+                "query_analyzer": {
+                    "cache_max_size": 100,
+                    "cache_ttl": 86400,  # Backstop; plans are revalidated per table
+                    "batch_max_workers": 4,
+                    "cache_backend": "memory",  # "memory" | "sqlite" | "postgres"
+                    "cache_sqlite_path": ".indexpilot/explain_cache.sqlite3",
+                    "shared_cache_max_size": 10000,
+                    "table_version_refresh_seconds": 5,
+                },
+                "index_build_executor": {
+                    "enabled": False,
+                    "max_concurrent_builds": 2,
+                    "max_queue_wait_seconds": 3600,
+                    "collect_timeout_seconds": 60,
+                },
+                "per_tenant_config": {
+                    "enabled": True,
+                    "cache_max_memory_mb": 0,  # 0 = no per-tenant quota
+                    "cache_max_entries": 0,
+                    "cache_weight": 1.0,
+                },
                 "query_interceptor": {
                     "max_query_cost": 10000.0,
                     "max_seq_scan_cost": 1000.0,
@@ -286,6 +330,10 @@ class ConfigLoader:
                     "enable_plan_cache": True,
                     "plan_cache_ttl": 300,
                     "plan_cache_max_size": 1000,
+                    "enable_verdict_cache": True,
+                    "verdict_cache_ttl": 60,
+                    "verdict_cache_max_size": 10000,
+                    "async_max_workers": 4,
                     "query_preview_length": 200,
                     "safety_score_unsafe_threshold": 0.3,
                     "safety_score_warning_threshold": 0.7,
@@ -231,9 +231,9 @@ def get_connection(
 
     # Check if shutdown is in progress - don't try to get connections during shutdown
     try:
-        from src.graceful_shutdown import is_shutting_down
+        from src.graceful_shutdown import is_shutdown_drain_active, is_shutting_down
 
-        if is_shutting_down():
+        if is_shutting_down() and not is_shutdown_drain_active():
             raise ConnectionError("Database connection unavailable: system is shutting down")
     except ImportError:
         # graceful_shutdown not available, continue
@@ -0,0 +1,647 @@
+"""Pluggable EXPLAIN plan cache backends"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Protocol
+
+from src.config_loader import ConfigLoader
+from src.type_definitions import JSONDict
+
+logger = logging.getLogger(__name__)
+
+# Load config
+try:
+    _config_loader = ConfigLoader()
+except Exception as e:
+    logger.error(f"Failed to initialize ConfigLoader: {e}, using defaults")
+    _config_loader = ConfigLoader()
+
+CACHE_BACKEND_MEMORY = "memory"
+CACHE_BACKEND_SQLITE = "sqlite"
+CACHE_BACKEND_POSTGRES = "postgres"
+CACHE_BACKENDS = (CACHE_BACKEND_MEMORY, CACHE_BACKEND_SQLITE, CACHE_BACKEND_POSTGRES)
+
+DEFAULT_CACHE_MAX_SIZE = 100  # In-process LRU entries
+DEFAULT_CACHE_TTL = 86400  # Seconds; backstop only, entries are revalidated per table
+DEFAULT_SHARED_CACHE_MAX_SIZE = 10000  # Entries kept in the sqlite/postgres tier
+DEFAULT_SQLITE_PATH = ".indexpilot/explain_cache.sqlite3"
+DEFAULT_TABLE_VERSION_REFRESH_SECONDS = 5.0
+_PRUNE_EVERY_PUTS = 100  # Shared tiers trim expired/excess rows every N writes
+
+# Token for a table that no longer exists (or was never visible to pg_class)
+MISSING_TABLE_VERSION = "missing"
+
+
+class ExplainCache(Protocol):
+    """Minimal interface shared by all EXPLAIN cache backends"""
+
+    def get(self, key: str) -> JSONDict | None: ...
+
+    def put(self, key: str, analysis: JSONDict) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class MemoryExplainCache:
+    """Per-process LRU cache with TTL (the original _explain_cache behaviour)"""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_MAX_SIZE, ttl: float = DEFAULT_CACHE_TTL):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[JSONDict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> JSONDict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            analysis, cached_at = entry
+            if time.time() - cached_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return analysis
+
+    def put(self, key: str, analysis: JSONDict) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            elif len(self._entries) >= self.max_size:
+                self._entries.popitem(last=False)
+            self._entries[key] = (analysis, time.time())
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteExplainCache:
+    """
+    On-disk cache shared by every process on the host.
+
+    Uses WAL mode so concurrent readers don't block the writer. Entries are
+    pruned oldest-first once the table exceeds max_size.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_SQLITE_PATH,
+        max_size: int = DEFAULT_SHARED_CACHE_MAX_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL,
+    ):
+        self.path = Path(path)
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS explain_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    analysis TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> JSONDict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT analysis, created_at FROM explain_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl:
+            return None
+        return _decode(row[0])
+
+    def put(self, key: str, analysis: JSONDict) -> None:
+        encoded = _encode(analysis)
+        if encoded is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO explain_cache (cache_key, analysis, created_at) "
+                "VALUES (?, ?, ?)",
+                (key, encoded, time.time()),
+            )
+            self._puts += 1
+            if self._puts % _PRUNE_EVERY_PUTS == 0:
+                self._prune()
+            self._conn.commit()
+
+    def _prune(self) -> None:
+        self._conn.execute(
+            "DELETE FROM explain_cache WHERE created_at < ?", (time.time() - self.ttl,)
+        )
+        self._conn.execute(
+            """
+            DELETE FROM explain_cache WHERE cache_key NOT IN (
+                SELECT cache_key FROM explain_cache ORDER BY created_at DESC LIMIT ?
+            )
+            """,
+            (self.max_size,),
+        )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM explain_cache WHERE cache_key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM explain_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM explain_cache").fetchone()
+        return int(row[0]) if row else 0
+
+
+class PostgresExplainCache:
+    """
+    Cache stored in the explain_plan_cache metadata table, shared by every
+    process connected to the database. Failures are logged and treated as misses.
+    """
+
+    def __init__(
+        self, max_size: int = DEFAULT_SHARED_CACHE_MAX_SIZE, ttl: float = DEFAULT_CACHE_TTL
+    ):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._puts = 0
+        self._puts_lock = threading.Lock()
+
+    def get(self, key: str) -> JSONDict | None:
+        from src.db import get_cursor
+
+        try:
+            with get_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT analysis_json
+                    FROM explain_plan_cache
+                    WHERE cache_key = %s
+                      AND created_at > NOW() - make_interval(secs => %s)
+                    """,
+                    (key, float(self.ttl)),
+                )
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.debug(f"Shared EXPLAIN cache read failed: {e}")
+            return None
+        if not row:
+            return None
+        analysis = row["analysis_json"]
+        if isinstance(analysis, str):
+            return _decode(analysis)
+        return analysis if isinstance(analysis, dict) else None
+
+    def put(self, key: str, analysis: JSONDict) -> None:
+        from src.db import get_cursor
+
+        encoded = _encode(analysis)
+        if encoded is None:
+            return
+        with self._puts_lock:
+            self._puts += 1
+            prune = self._puts % _PRUNE_EVERY_PUTS == 0
+        try:
+            with get_cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO explain_plan_cache (cache_key, analysis_json, created_at)
+                    VALUES (%s, %s::jsonb, NOW())
+                    ON CONFLICT (cache_key) DO UPDATE
+                    SET analysis_json = EXCLUDED.analysis_json, created_at = EXCLUDED.created_at
+                    """,
+                    (key, encoded),
+                )
+                if prune:
+                    cursor.execute(
+                        """
+                        DELETE FROM explain_plan_cache
+                        WHERE created_at < NOW() - make_interval(secs => %s)
+                           OR cache_key NOT IN (
+                               SELECT cache_key FROM explain_plan_cache
+                               ORDER BY created_at DESC LIMIT %s
+                           )
+                        """,
+                        (float(self.ttl), self.max_size),
+                    )
+        except Exception as e:
+            logger.debug(f"Shared EXPLAIN cache write failed: {e}")
+
+    def delete(self, key: str) -> None:
+        from src.db import get_cursor
+
+        try:
+            with get_cursor() as cursor:
+                cursor.execute("DELETE FROM explain_plan_cache WHERE cache_key = %s", (key,))
+        except Exception as e:
+            logger.debug(f"Shared EXPLAIN cache delete failed: {e}")
+
+    def clear(self) -> None:
+        from src.db import get_cursor
+
+        try:
+            with get_cursor() as cursor:
+                cursor.execute("DELETE FROM explain_plan_cache")
+        except Exception as e:
+            logger.debug(f"Shared EXPLAIN cache clear failed: {e}")
+
+    def __len__(self) -> int:
+        from src.db import get_cursor
+
+        try:
+            with get_cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) AS entries FROM explain_plan_cache")
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.debug(f"Shared EXPLAIN cache count failed: {e}")
+            return 0
+        return int(row["entries"]) if row else 0
+
+
+class TieredExplainCache:
+    """In-process LRU in front of a shared tier; shared hits are promoted to the LRU"""
+
+    def __init__(self, local: MemoryExplainCache, shared: ExplainCache):
+        self.local = local
+        self.shared = shared
+
+    def get(self, key: str) -> JSONDict | None:
+        analysis = self.local.get(key)
+        if analysis is not None:
+            return analysis
+        analysis = self.shared.get(key)
+        if analysis is not None:
+            self.local.put(key, analysis)
+        return analysis
+
+    def put(self, key: str, analysis: JSONDict) -> None:
+        self.local.put(key, analysis)
+        self.shared.put(key, analysis)
+
+    def delete(self, key: str) -> None:
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def clear(self) -> None:
+        self.local.clear()
+        self.shared.clear()
+
+    def __len__(self) -> int:
+        return len(self.local)
+
+
+def _encode(analysis: JSONDict) -> str | None:
+    try:
+        return json.dumps(analysis, default=str)
+    except (TypeError, ValueError) as e:
+        logger.debug(f"EXPLAIN analysis is not JSON-serializable, not sharing it: {e}")
+        return None
+
+
+def _decode(payload: str) -> JSONDict | None:
+    try:
+        analysis = json.loads(payload)
+    except json.JSONDecodeError:
+        return None
+    return analysis if isinstance(analysis, dict) else None
+
+
+_explain_cache: ExplainCache | None = None
+_explain_cache_lock = threading.Lock()
+
+
+def get_explain_cache_backend_name() -> str:
+    """Configured backend: "memory", "sqlite" or "postgres" (unknown values -> memory)"""
+    backend = _config_loader.get_str(
+        "features.query_analyzer.cache_backend", CACHE_BACKEND_MEMORY
+    ).lower()
+    if backend not in CACHE_BACKENDS:
+        logger.warning(f"Unknown EXPLAIN cache backend '{backend}', using memory")
+        return CACHE_BACKEND_MEMORY
+    return backend
+
+
+def _build_explain_cache() -> ExplainCache:
+    max_size = _config_loader.get_int(
+        "features.query_analyzer.cache_max_size", DEFAULT_CACHE_MAX_SIZE
+    )
+    ttl = _config_loader.get_int("features.query_analyzer.cache_ttl", DEFAULT_CACHE_TTL)
+    shared_max_size = _config_loader.get_int(
+        "features.query_analyzer.shared_cache_max_size", DEFAULT_SHARED_CACHE_MAX_SIZE
+    )
+    local = MemoryExplainCache(max_size=max_size, ttl=ttl)
+
+    backend = get_explain_cache_backend_name()
+    if backend == CACHE_BACKEND_SQLITE:
+        path = _config_loader.get_str(
+            "features.query_analyzer.cache_sqlite_path", DEFAULT_SQLITE_PATH
+        )
+        try:
+            return TieredExplainCache(
+                local, SQLiteExplainCache(path, max_size=shared_max_size, ttl=ttl)
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not open EXPLAIN cache at {path}: {e}, using memory")
+            return local
+    if backend == CACHE_BACKEND_POSTGRES:
+        return TieredExplainCache(local, PostgresExplainCache(max_size=shared_max_size, ttl=ttl))
+    return local
+
+
+def get_explain_cache() -> ExplainCache:
+    """Get the process-wide EXPLAIN cache, building it from config on first use"""
+    global _explain_cache
+    if _explain_cache is None:
+        with _explain_cache_lock:
+            if _explain_cache is None:
+                _explain_cache = _build_explain_cache()
+    return _explain_cache
+
+
+def set_explain_cache(cache: ExplainCache | None) -> None:
+    """Replace the process-wide cache (None rebuilds it from config on next use)"""
+    global _explain_cache
+    with _explain_cache_lock:
+        _explain_cache = cache
+
+
+# Per-table plan dependencies. Each cached plan records a version token for every
+# relation it scans; a lookup re-reads those tables' tokens and discards the plan if
+# any changed. Tokens change on ANALYZE (manual or autovacuum), index create/drop,
+# column add/drop, table recreation, and when the live row count crosses a power of two.
+_TABLE_VERSION_QUERY = """
+    SELECT
+        c.relname,
+        c.oid::bigint AS relid,
+        COALESCE(s.analyze_count + s.autoanalyze_count, 0) AS analyze_count,
+        COALESCE(s.n_live_tup, 0) AS live_tuples,
+        (SELECT COALESCE(string_agg(i.indexrelid::text, ',' ORDER BY i.indexrelid), '')
+         FROM pg_index i WHERE i.indrelid = c.oid) AS index_oids,
+        (SELECT COUNT(*) FROM pg_attribute a
+         WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped) AS column_count
+    FROM pg_class c
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE c.relname = ANY(%s)
+      AND c.relkind IN ('r', 'p', 'm')
+"""
+
+_table_versions: dict[str, tuple[str, float]] = {}  # table -> (token, read at)
+_table_versions_lock = threading.Lock()
+
+# Signatures cached by this process, per table, for proactive eviction. Bounded to the
+# cache's capacity, oldest first; a forgotten signature is still caught by revalidation.
+_keys_by_table: dict[str, set[str]] = {}
+_tables_by_key: OrderedDict[str, tuple[str, ...]] = OrderedDict()
+_keys_by_table_lock = threading.Lock()
+
+_cache_stats = {
+    "hits": 0,
+    "misses": 0,
+    "revalidation_evictions": 0,
+    "invalidation_evictions": 0,
+    "version_queries": 0,
+}
+_cache_stats_lock = threading.Lock()
+
+
+def _bump_stat(name: str, amount: int = 1) -> None:
+    with _cache_stats_lock:
+        _cache_stats[name] += amount
+
+
+def get_explain_cache_stats() -> JSONDict:
+    """Hit/miss and invalidation counters for the EXPLAIN cache"""
+    with _cache_stats_lock:
+        return dict(_cache_stats)
+
+
+def plan_relations(plan_node: object) -> list[str]:
+    """Collect the "Relation Name" of every node in an EXPLAIN (FORMAT JSON) plan tree"""
+    relations: set[str] = set()
+    stack = [plan_node]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        relation = node.get("Relation Name")
+        if isinstance(relation, str) and relation:
+            relations.add(relation)
+        children = node.get("Plans")
+        if isinstance(children, list):
+            stack.extend(children)
+    return sorted(relations)
+
+
+def _read_table_versions(tables: list[str]) -> dict[str, str]:
+    from src.db import get_cursor
+
+    _bump_stat("version_queries")
+    fingerprints: dict[str, list[str]] = {table: [] for table in tables}
+    with get_cursor() as cursor:
+        cursor.execute(_TABLE_VERSION_QUERY, (tables,))
+        rows = cursor.fetchall()
+    for row in rows:
+        relname = str(row["relname"])
+        if relname not in fingerprints:
+            continue
+        # Row-count changes only matter to the planner in aggregate, so bucket them
+        size_bucket = int(row["live_tuples"] or 0).bit_length()
+        fingerprints[relname].append(
+            f"{row['relid']}:{row['analyze_count']}:{size_bucket}:"
+            f"{row['index_oids']}:{row['column_count']}"
+        )
+    return {
+        table: (
+            hashlib.md5("|".join(sorted(parts)).encode()).hexdigest()[:12]
+            if parts
+            else MISSING_TABLE_VERSION
+        )
+        for table, parts in fingerprints.items()
+    }
+
+
+def get_table_versions(tables: list[str]) -> dict[str, str] | None:
+    """
+    Get the current version token for each table.
+
+    Tokens read within table_version_refresh_seconds are reused; the rest are
+    fetched in a single catalog query.
+
+    Returns:
+        Mapping of table name to version token, or None if the catalog can't be read
+    """
+    if not tables:
+        return {}
+    refresh_seconds = _config_loader.get_float(
+        "features.query_analyzer.table_version_refresh_seconds",
+        DEFAULT_TABLE_VERSION_REFRESH_SECONDS,
+    )
+    now = time.monotonic()
+    versions: dict[str, str] = {}
+    stale: list[str] = []
+    with _table_versions_lock:
+        for table in tables:
+            entry = _table_versions.get(table)
+            if entry is not None and now - entry[1] < refresh_seconds:
+                versions[table] = entry[0]
+            else:
+                stale.append(table)
+    if not stale:
+        return versions
+
+    try:
+        fresh = _read_table_versions(stale)
+    except Exception as e:
+        logger.debug(f"Could not read table versions for {stale}: {e}")
+        return None
+    with _table_versions_lock:
+        for table, token in fresh.items():
+            _table_versions[table] = (token, now)
+    versions.update(fresh)
+    return versions
+
+
+def _cache_capacity(cache: ExplainCache) -> int:
+    """Entries the cache can hold: the shared tier's size when there is one"""
+    backing = getattr(cache, "shared", cache)
+    return int(getattr(backing, "max_size", DEFAULT_SHARED_CACHE_MAX_SIZE))
+
+
+def _forget_key_locked(signature: str) -> None:
+    for table in _tables_by_key.pop(signature, ()):
+        keys = _keys_by_table.get(table)
+        if keys is None:
+            continue
+        keys.discard(signature)
+        if not keys:
+            del _keys_by_table[table]
+
+
+def _index_key(signature: str, tables: list[str], capacity: int) -> None:
+    with _keys_by_table_lock:
+        _forget_key_locked(signature)
+        _tables_by_key[signature] = tuple(tables)
+        for table in tables:
+            _keys_by_table.setdefault(table, set()).add(signature)
+        while len(_tables_by_key) > capacity:
+            _forget_key_locked(next(iter(_tables_by_key)))
+
+
+def _unindex_key(signature: str) -> None:
+    with _keys_by_table_lock:
+        _forget_key_locked(signature)
+
+
+def lookup_plan(signature: str) -> JSONDict | None:
+    """
+    Return the cached analysis for a query signature if its tables are unchanged.
+
+    A plan whose recorded table versions no longer match the catalog is evicted.
+    """
+    cache = get_explain_cache()
+    entry = cache.get(signature)
+    if entry is None:
+        _bump_stat("misses")
+        return None
+    analysis = entry.get("analysis")
+    recorded = entry.get("table_versions")
+    if not isinstance(analysis, dict) or not isinstance(recorded, dict):
+        cache.delete(signature)
+        _unindex_key(signature)
+        _bump_stat("misses")
+        return None
+
+    current = get_table_versions(sorted(recorded))
+    if current is None:
+        # Can't revalidate; don't risk serving a plan for a changed schema
+        _bump_stat("misses")
+        return None
+    if current != recorded:
+        cache.delete(signature)
+        _unindex_key(signature)
+        _bump_stat("revalidation_evictions")
+        _bump_stat("misses")
+        return None
+
+    _bump_stat("hits")
+    return analysis
+
+
+def store_plan(signature: str, analysis: JSONDict, tables: list[str]) -> None:
+    """Cache an analysis together with the current versions of the tables it scans"""
+    versions = get_table_versions(sorted(set(tables)))
+    if versions is None:
+        return
+    cache = get_explain_cache()
+    cache.put(signature, {"analysis": analysis, "table_versions": versions})
+    _index_key(signature, list(versions), _cache_capacity(cache))
+
+
+def invalidate_tables(tables: list[str]) -> int:
+    """
+    Evict cached plans that scan any of the given tables.
+
+    Call after creating or dropping an index (or other DDL) so the next lookup
+    re-plans instead of waiting for revalidation. Plans cached by other processes
+    in a shared tier are caught by revalidation, since the tables' versions changed.
+
+    Returns:
+        Number of cache entries evicted by this process
+    """
+    signatures: set[str] = set()
+    with _keys_by_table_lock:
+        for table in tables:
+            signatures.update(_keys_by_table.get(table, ()))
+        for signature in signatures:
+            _forget_key_locked(signature)
+    with _table_versions_lock:
+        for table in tables:
+            _table_versions.pop(table, None)
+
+    cache = get_explain_cache()
+    for signature in signatures:
+        cache.delete(signature)
+    if signatures:
+        _bump_stat("invalidation_evictions", len(signatures))
+        logger.debug(f"Evicted {len(signatures)} cached EXPLAIN plans for tables {tables}")
+    return len(signatures)
+
+
+def reset_table_versions() -> None:
+    """Forget memoized table versions and the per-table key index"""
+    with _table_versions_lock:
+        _table_versions.clear()
+    with _keys_by_table_lock:
+        _keys_by_table.clear()
+        _tables_by_key.clear()
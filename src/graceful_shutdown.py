@@ -6,7 +6,8 @@ import signal
 import sys
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,7 @@ _shutdown_lock = threading.Lock()
 _shutdown_in_progress = False
 _simulation_active = False  # Track if simulation is running
 _simulation_lock = threading.Lock()
+_drain_state = threading.local()  # Threads allowed to use the database during shutdown
 
 
 def register_shutdown_handler(handler: Callable[[], None], priority: int = 0):
@@ -65,6 +67,27 @@ def is_shutting_down() -> bool:
     return _shutdown_event.is_set() or _shutdown_in_progress
 
 
+@contextmanager
+def shutdown_drain() -> Iterator[None]:
+    """
+    Let the calling thread keep opening database connections during shutdown.
+
+    For shutdown handlers that write out buffered state; get_connection() refuses
+    everyone else once shutdown has started.
+    """
+    previous = getattr(_drain_state, "active", False)
+    _drain_state.active = True
+    try:
+        yield
+    finally:
+        _drain_state.active = previous
+
+
+def is_shutdown_drain_active() -> bool:
+    """Check if the calling thread is inside shutdown_drain()"""
+    return getattr(_drain_state, "active", False)
+
+
 def set_simulation_active(active: bool):
     """Mark simulation as active/inactive to prevent premature shutdowns"""
     global _simulation_active
@@ -0,0 +1,542 @@
+"""Parallel CREATE INDEX CONCURRENTLY executor with per-table serialization"""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from src.config_loader import ConfigLoader
+from src.db import get_cursor
+from src.type_definitions import JSONDict
+
+logger = logging.getLogger(__name__)
+
+# Load config
+try:
+    _config_loader = ConfigLoader()
+except Exception as e:
+    logger.error(f"Failed to initialize ConfigLoader: {e}, using defaults")
+    _config_loader = ConfigLoader()
+
+DEFAULT_MAX_CONCURRENT_BUILDS = 2
+DEFAULT_MAX_QUEUE_WAIT_SECONDS = 3600
+# How long an auto-indexer cycle waits for its queued builds before reporting them
+# as pending and finalizing them in the background
+DEFAULT_COLLECT_TIMEOUT_SECONDS = 60
+# Upper bound on how long a deferred build sleeps before its gates are re-checked
+DEFAULT_GATE_RECHECK_SECONDS = 60.0
+# Completed builds kept for get_queue_state()
+_COMPLETED_HISTORY = 50
+
+BuildFunc = Callable[["IndexBuildJob"], JSONDict]
+
+
+def is_index_build_executor_enabled() -> bool:
+    """Check if the auto-indexer should build through the parallel executor"""
+    return _config_loader.get_bool("features.index_build_executor.enabled", False)
+
+
+def _get_max_concurrent_builds() -> int:
+    return max(
+        1,
+        _config_loader.get_int(
+            "features.index_build_executor.max_concurrent_builds", DEFAULT_MAX_CONCURRENT_BUILDS
+        ),
+    )
+
+
+def _get_max_queue_wait_seconds() -> float:
+    return float(
+        _config_loader.get_int(
+            "features.index_build_executor.max_queue_wait_seconds",
+            DEFAULT_MAX_QUEUE_WAIT_SECONDS,
+        )
+    )
+
+
+def get_build_collect_timeout_seconds() -> float:
+    """Seconds an auto-indexer cycle waits for its queued builds"""
+    return max(
+        0.0,
+        float(
+            _config_loader.get_int(
+                "features.index_build_executor.collect_timeout_seconds",
+                DEFAULT_COLLECT_TIMEOUT_SECONDS,
+            )
+        ),
+    )
+
+
+@dataclass
+class IndexBuildJob:
+    """One queued CREATE INDEX CONCURRENTLY build"""
+
+    table_name: str
+    field_name: str
+    index_name: str
+    index_sql: str
+    estimated_size_mb: float = 0.0
+    tenant_id: int | None = None
+    future: Future = field(default_factory=Future)
+    submitted_at: float = field(default_factory=time.time)
+    # Earliest time an admission gate allows this build to be retried
+    not_before: float = 0.0
+    started_at: float | None = None
+    deferrals: int = 0
+    last_deferral_reason: str | None = None
+
+    def describe(self) -> JSONDict:
+        return {
+            "table": self.table_name,
+            "field": self.field_name,
+            "index_name": self.index_name,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "not_before": self.not_before,
+            "deferrals": self.deferrals,
+            "last_deferral_reason": self.last_deferral_reason,
+        }
+
+
+def _default_build(job: IndexBuildJob) -> JSONDict:
+    """Build through the lock manager, with the same retry policy as the auto-indexer"""
+    from functools import partial
+
+    from src.lock_manager import create_index_with_lock_management
+
+    # The executor's CPU gate already admitted this build
+    create_index_func = partial(
+        create_index_with_lock_management,
+        job.table_name,
+        job.field_name,
+        job.index_sql,
+        timeout=300,
+        respect_cpu_throttle=False,
+    )
+    try:
+        from src.index_retry import retry_index_creation
+    except ImportError:
+        return {"success": create_index_func(), "retries": 0}
+    retry_result = retry_index_creation(create_index_func, job.table_name, job.field_name)
+    if not retry_result.get("success", False) and retry_result.get("error"):
+        from src.error_handler import IndexCreationError
+
+        raise IndexCreationError(str(retry_result["error"]))
+    return retry_result
+
+
+class IndexBuildExecutor:
+    """
+    Runs index builds on up to max_concurrent_builds tables at once.
+
+    Builds on the same table are serialized (CONCURRENTLY builds on one table wait
+    on each other and the lock manager holds a per-table lock anyway), builds on
+    different tables run in parallel. Before a build starts it must pass the CPU
+    throttle, maintenance window and storage budget gates; a build that is only
+    delayed by a gate goes back on the queue, one that can never be admitted is
+    rejected.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_builds: int = DEFAULT_MAX_CONCURRENT_BUILDS,
+        build_func: BuildFunc | None = None,
+        max_queue_wait_seconds: float = DEFAULT_MAX_QUEUE_WAIT_SECONDS,
+        gate_recheck_seconds: float = DEFAULT_GATE_RECHECK_SECONDS,
+    ):
+        self.max_concurrent_builds = max(1, max_concurrent_builds)
+        self.max_queue_wait_seconds = max_queue_wait_seconds
+        self.gate_recheck_seconds = gate_recheck_seconds
+        self._build_func = build_func or _default_build
+        self._condition = threading.Condition()
+        self._pending: deque[IndexBuildJob] = deque()
+        self._active: dict[str, IndexBuildJob] = {}
+        self._completed: deque[JSONDict] = deque(maxlen=_COMPLETED_HISTORY)
+        self._workers: list[threading.Thread] = []
+        self._shutdown = False
+        self._counters = {"submitted": 0, "succeeded": 0, "failed": 0, "rejected": 0}
+
+    def submit(
+        self,
+        table_name: str,
+        field_name: str,
+        index_name: str,
+        index_sql: str,
+        estimated_size_mb: float = 0.0,
+        tenant_id: int | None = None,
+    ) -> Future:
+        """
+        Queue an index build.
+
+        A build for the same index name, or for the same table and field, that is
+        still queued, deferred or running is not queued twice; its future is
+        returned instead.
+
+        Returns:
+            Future resolving to a dict with "success" and, when the build did not
+            succeed, "reason". "attempted" is set once the build itself has run, so
+            callers can tell build failures from gate rejections. Build errors are
+            raised from future.result().
+        """
+        job = IndexBuildJob(
+            table_name=table_name,
+            field_name=field_name,
+            index_name=index_name,
+            index_sql=index_sql,
+            estimated_size_mb=estimated_size_mb,
+            tenant_id=tenant_id,
+        )
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Index build executor is shut down")
+            existing = self._find_duplicate_locked(job)
+            if existing is not None:
+                logger.debug(
+                    f"Index build {index_name} on {table_name}.{field_name} already queued "
+                    f"as {existing.index_name}"
+                )
+                return existing.future
+            self._pending.append(job)
+            self._counters["submitted"] += 1
+            self._start_workers_locked()
+            self._condition.notify_all()
+        return job.future
+
+    def _find_duplicate_locked(self, job: IndexBuildJob) -> IndexBuildJob | None:
+        for queued in (*self._pending, *self._active.values()):
+            if queued.index_name == job.index_name or (
+                queued.table_name == job.table_name and queued.field_name == job.field_name
+            ):
+                return queued
+        return None
+
+    def _start_workers_locked(self) -> None:
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        while len(self._workers) < self.max_concurrent_builds:
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"indexpilot-index-build-{len(self._workers)}",
+                daemon=True,
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_job_locked(self, now: float) -> tuple[IndexBuildJob | None, float | None]:
+        """First runnable job (FIFO) plus, if none, how long until one may become runnable"""
+        next_wakeup: float | None = None
+        for job in self._pending:
+            if job.table_name in self._active:
+                continue
+            if job.not_before > now:
+                delay = job.not_before - now
+                next_wakeup = delay if next_wakeup is None else min(next_wakeup, delay)
+                continue
+            return job, None
+        return None, next_wakeup
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._shutdown:
+                        return
+                    job, wait_seconds = self._next_job_locked(time.time())
+                    if job is not None:
+                        break
+                    self._condition.wait(timeout=wait_seconds)
+                self._pending.remove(job)
+                # Reserve the table while the gates run so no other worker picks it up
+                self._active[job.table_name] = job
+            self._run_job(job)
+
+    def _run_job(self, job: IndexBuildJob) -> None:
+        # A deferred job's future is already running
+        if not job.future.running() and not job.future.set_running_or_notify_cancel():
+            self._release(job)
+            return
+
+        try:
+            admitted, delay, reason = self._check_admission(job)
+        except Exception as e:
+            logger.debug(f"Admission gates failed for {job.index_name}, admitting: {e}")
+            admitted, delay, reason = True, 0.0, None
+
+        if not admitted:
+            if delay is not None and (
+                time.time() + delay - job.submitted_at <= self.max_queue_wait_seconds
+            ):
+                self._defer(job, delay, reason)
+                return
+            self._finish(job, {"success": False, "index_name": job.index_name, "reason": reason})
+            return
+
+        job.started_at = time.time()
+        logger.info(f"Starting index build {job.index_name} on {job.table_name}")
+        try:
+            result = dict(self._build_func(job))
+        except Exception as e:
+            self._finish(job, error=e)
+            return
+        result.setdefault("index_name", job.index_name)
+        result["attempted"] = True
+        result["duration_seconds"] = time.time() - job.started_at
+        if not result.get("success", False):
+            # The CPU gate already ran; a failed build timed out or lost the lock
+            result.setdefault("reason", "build_not_completed")
+        self._finish(job, result)
+
+    def _check_admission(self, job: IndexBuildJob) -> tuple[bool, float | None, str | None]:
+        """
+        Run the admission gates.
+
+        Returns:
+            (admitted, retry_after_seconds, reason). retry_after_seconds is None when
+            the build can never be admitted.
+        """
+        from src.cpu_throttle import should_throttle_index_creation
+        from src.maintenance_window import (
+            is_in_maintenance_window,
+            should_wait_for_maintenance_window,
+        )
+        from src.storage_budget import check_storage_budget
+
+        if not is_in_maintenance_window():
+            should_wait, wait_seconds = should_wait_for_maintenance_window(
+                "index_creation",
+                max_wait_hours=self.max_queue_wait_seconds / 3600.0,
+                tenant_id=job.tenant_id,
+            )
+            if should_wait:
+                return (
+                    False,
+                    min(wait_seconds, self.gate_recheck_seconds),
+                    f"outside_maintenance_window (wait {wait_seconds / 3600:.1f}h)",
+                )
+
+        # Builds already admitted have not reached the catalog yet; count them against
+        # the budget too
+        with self._condition:
+            in_flight_mb = sum(
+                active.estimated_size_mb
+                for active in self._active.values()
+                if active is not job and active.started_at is not None
+            )
+        budget_check = check_storage_budget(
+            tenant_id=job.tenant_id,
+            estimated_index_size_mb=job.estimated_size_mb + in_flight_mb,
+        )
+        if not budget_check.get("allowed", True):
+            reason = str(budget_check.get("reason", "storage_budget_exceeded"))
+            if in_flight_mb > 0:
+                # May fit once the in-flight builds are accounted for by the catalog
+                return False, self.gate_recheck_seconds, reason
+            return False, None, reason
+
+        should_throttle, throttle_reason, wait_seconds = should_throttle_index_creation()
+        if should_throttle:
+            return (
+                False,
+                min(max(float(wait_seconds), 1.0), self.gate_recheck_seconds),
+                f"cpu_throttled: {throttle_reason}",
+            )
+
+        return True, 0.0, None
+
+    def _defer(self, job: IndexBuildJob, delay: float, reason: str | None) -> None:
+        logger.info(f"Deferring index build {job.index_name} for {delay:.1f}s: {reason}")
+        with self._condition:
+            self._active.pop(job.table_name, None)
+            job.not_before = time.time() + delay
+            job.deferrals += 1
+            job.last_deferral_reason = reason
+            # Future is already running; re-queue it as-is
+            self._pending.append(job)
+            self._condition.notify_all()
+
+    def _release(self, job: IndexBuildJob) -> None:
+        with self._condition:
+            self._active.pop(job.table_name, None)
+            self._condition.notify_all()
+
+    def _finish(
+        self,
+        job: IndexBuildJob,
+        result: JSONDict | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        record = job.describe()
+        record["finished_at"] = time.time()
+        with self._condition:
+            self._active.pop(job.table_name, None)
+            if error is not None:
+                self._counters["failed"] += 1
+                record["success"] = False
+                record["reason"] = f"creation_failed: {error}"
+            elif result is not None and result.get("success", False):
+                self._counters["succeeded"] += 1
+                record["success"] = True
+            else:
+                self._counters["failed" if job.started_at is not None else "rejected"] += 1
+                record["success"] = False
+                record["reason"] = result.get("reason") if result else None
+            self._completed.append(record)
+            self._condition.notify_all()
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result or {"success": False})
+
+    def get_queue_state(self) -> JSONDict:
+        """Queued, running and recently finished builds"""
+        with self._condition:
+            return {
+                "max_concurrent_builds": self.max_concurrent_builds,
+                "queued": [job.describe() for job in self._pending],
+                "active": [job.describe() for job in self._active.values()],
+                "completed": list(self._completed),
+                "counters": dict(self._counters),
+                "shutdown": self._shutdown,
+            }
+
+    def get_build_progress(self) -> list[JSONDict]:
+        """
+        Progress of running builds from pg_stat_progress_create_index.
+
+        There is at most one build per table, so rows are matched by table. Builds
+        without a progress row (gates still running, PostgreSQL < 12) report None.
+        """
+        with self._condition:
+            running = {
+                table: job for table, job in self._active.items() if job.started_at is not None
+            }
+        if not running:
+            return []
+
+        progress_by_table: dict[str, JSONDict] = {}
+        try:
+            with get_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT
+                        relid::regclass::text AS table_name,
+                        pid,
+                        phase,
+                        blocks_total,
+                        blocks_done,
+                        tuples_total,
+                        tuples_done,
+                        lockers_total,
+                        lockers_done
+                    FROM pg_stat_progress_create_index
+                    WHERE relid::regclass::text = ANY(%s)
+                """,
+                    (list(running),),
+                )
+                for row in cursor.fetchall():
+                    progress_by_table[row["table_name"]] = dict(row)
+        except Exception as e:
+            logger.debug(f"Could not read pg_stat_progress_create_index: {e}")
+
+        builds: list[JSONDict] = []
+        for table, job in running.items():
+            build = job.describe()
+            progress = progress_by_table.get(table)
+            if progress is not None:
+                blocks_total = progress.get("blocks_total") or 0
+                tuples_total = progress.get("tuples_total") or 0
+                # Block counts cover the table scan, tuple counts the sort/load phases
+                if tuples_total > 0:
+                    percent = (progress.get("tuples_done") or 0) / tuples_total * 100.0
+                elif blocks_total > 0:
+                    percent = (progress.get("blocks_done") or 0) / blocks_total * 100.0
+                else:
+                    percent = 0.0
+                build["progress"] = {
+                    "pid": progress.get("pid"),
+                    "phase": progress.get("phase", "unknown"),
+                    "blocks_total": blocks_total,
+                    "blocks_done": progress.get("blocks_done") or 0,
+                    "tuples_total": tuples_total,
+                    "tuples_done": progress.get("tuples_done") or 0,
+                    "progress_percent": round(percent, 2),
+                }
+            else:
+                build["progress"] = None
+            builds.append(build)
+        return builds
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """
+        Stop the workers and cancel builds that have not started. Running builds are
+        allowed to finish.
+
+        Args:
+            timeout: Total seconds to wait for running builds (None = wait indefinitely)
+        """
+        with self._condition:
+            self._shutdown = True
+            pending = list(self._pending)
+            self._pending.clear()
+            workers = list(self._workers)
+            self._condition.notify_all()
+        for job in pending:
+            if not job.future.cancel():
+                # Deferred jobs are already running; resolve them as not built
+                job.future.set_result(
+                    {"success": False, "index_name": job.index_name, "reason": "shutdown"}
+                )
+        deadline = None if timeout is None else time.time() + timeout
+        for worker in workers:
+            worker.join(timeout=None if deadline is None else max(0.0, deadline - time.time()))
+
+
+_executor: IndexBuildExecutor | None = None
+_executor_lock = threading.Lock()
+_shutdown_handler_registered = False
+
+
+def get_index_build_executor() -> IndexBuildExecutor:
+    """Shared executor, sized from features.index_build_executor"""
+    global _executor, _shutdown_handler_registered
+    with _executor_lock:
+        if _executor is None:
+            _executor = IndexBuildExecutor(
+                max_concurrent_builds=_get_max_concurrent_builds(),
+                max_queue_wait_seconds=_get_max_queue_wait_seconds(),
+            )
+        if not _shutdown_handler_registered:
+            try:
+                from src.graceful_shutdown import register_shutdown_handler
+
+                # Before the connection pool closes (priority 10)
+                register_shutdown_handler(shutdown_index_build_executor, priority=20)
+                _shutdown_handler_registered = True
+            except Exception as e:
+                logger.debug(f"Could not register index build executor shutdown: {e}")
+        return _executor
+
+
+def shutdown_index_build_executor() -> None:
+    """Cancel queued builds and wait up to collect_timeout_seconds for running ones"""
+    global _executor
+    with _executor_lock:
+        executor = _executor
+        _executor = None
+    if executor is not None:
+        executor.shutdown(timeout=get_build_collect_timeout_seconds())
+
+
+def get_index_build_status() -> JSONDict:
+    """Queue state and live progress of the shared executor"""
+    with _executor_lock:
+        executor = _executor
+    if executor is None:
+        return {"enabled": is_index_build_executor_enabled(), "running": False}
+    status = executor.get_queue_state()
+    status["enabled"] = is_index_build_executor_enabled()
+    status["running"] = True
+    status["progress"] = executor.get_build_progress()
+    return status
@@ -0,0 +1,253 @@
+"""Set-based catalog prefetch for auto-indexer candidate evaluation"""
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from psycopg2 import sql
+
+from src.db import get_cursor
+from src.type_definitions import JSONDict
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TableCatalog:
+    """Catalog facts for one candidate table, read once per analysis cycle"""
+
+    table_name: str
+    row_count: int = 0
+    table_size_bytes: int = 0
+    index_size_bytes: int = 0
+    has_tenant_field: bool = False
+    # (index name, index definition) for every index on the table
+    indexes: list[tuple[str, str]] = field(default_factory=list)
+    # Candidate fields not covered by an existing index when the catalog was read
+    candidate_fields: set[str] = field(default_factory=set)
+    # Exact COUNT(DISTINCT field), filled in lazily by fetch_distinct_count()
+    distinct_counts: dict[str, int] = field(default_factory=dict)
+    # pg_stats.n_distinct (negative = fraction of rows, as PostgreSQL reports it)
+    stats_n_distinct: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def index_count(self) -> int:
+        return len(self.indexes)
+
+    def size_info(self) -> JSONDict:
+        """Same shape as stats.get_table_size_info()"""
+        index_overhead_percent = 0.0
+        if self.table_size_bytes > 0:
+            index_overhead_percent = float((self.index_size_bytes / self.table_size_bytes) * 100.0)
+        return {
+            "row_count": self.row_count,
+            "table_size_bytes": self.table_size_bytes,
+            "index_size_bytes": self.index_size_bytes,
+            "total_size_bytes": self.table_size_bytes + self.index_size_bytes,
+            "index_overhead_percent": index_overhead_percent,
+        }
+
+    def has_index_for_field(self, field_name: str, index_names: tuple[str, ...]) -> bool:
+        """True if one of index_names exists or any index definition mentions the field"""
+        return any(
+            name in index_names or field_name in definition for name, definition in self.indexes
+        )
+
+    def record_index(self, index_name: str, index_definition: str) -> None:
+        """Reflect an index created (or queued for creation) during the current cycle"""
+        if all(entry[0] != index_name for entry in self.indexes):
+            self.indexes.append((index_name, index_definition))
+
+    def forget_index(self, index_name: str) -> None:
+        """Reflect an index dropped during the current cycle"""
+        self.indexes = [entry for entry in self.indexes if entry[0] != index_name]
+
+    def actual_selectivity(self, field_name: str) -> float | None:
+        distinct = self.distinct_counts.get(field_name)
+        if distinct is None:
+            return None
+        if self.row_count <= 0:
+            return 0.0
+        return float(distinct / self.row_count)
+
+    def estimated_selectivity(self, field_name: str) -> float | None:
+        """Planner-statistics selectivity from pg_stats, or None if never analyzed"""
+        n_distinct = self.stats_n_distinct.get(field_name)
+        if n_distinct is None or self.row_count <= 0:
+            return None
+        if n_distinct < 0:
+            return min(1.0, -n_distinct)
+        return min(1.0, n_distinct / self.row_count)
+
+
+def _fetch_indexes(cursor, catalogs: dict[str, TableCatalog]) -> None:
+    cursor.execute(
+        """
+        SELECT tablename, indexname, indexdef
+        FROM pg_indexes
+        WHERE schemaname = 'public'
+          AND tablename = ANY(%s)
+        ORDER BY tablename, indexname
+    """,
+        (list(catalogs),),
+    )
+    for row in cursor.fetchall():
+        catalogs[row["tablename"]].indexes.append((row["indexname"], row["indexdef"]))
+
+
+def _fetch_sizes(cursor, catalogs: dict[str, TableCatalog]) -> None:
+    cursor.execute(
+        """
+        SELECT
+            c.relname,
+            pg_relation_size(c.oid) AS table_size_bytes,
+            COALESCE(
+                (SELECT SUM(pg_relation_size(i.indexrelid))
+                 FROM pg_index i WHERE i.indrelid = c.oid),
+                0
+            ) AS index_size_bytes
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public'
+          AND c.relkind IN ('r', 'p')
+          AND c.relname = ANY(%s)
+    """,
+        (list(catalogs),),
+    )
+    for row in cursor.fetchall():
+        catalog = catalogs[row["relname"]]
+        catalog.table_size_bytes = int(row["table_size_bytes"] or 0)
+        catalog.index_size_bytes = int(row["index_size_bytes"] or 0)
+
+
+def _fetch_pg_stats(cursor, catalogs: dict[str, TableCatalog]) -> None:
+    cursor.execute(
+        """
+        SELECT tablename, attname, n_distinct
+        FROM pg_stats
+        WHERE schemaname = 'public'
+          AND tablename = ANY(%s)
+    """,
+        (list(catalogs),),
+    )
+    for row in cursor.fetchall():
+        if row["n_distinct"] is not None:
+            catalogs[row["tablename"]].stats_n_distinct[row["attname"]] = float(row["n_distinct"])
+
+
+def _fetch_tenant_tables(cursor, catalogs: dict[str, TableCatalog]) -> None:
+    # Same sources, in the same order, as auto_indexer._has_tenant_field()
+    tables = list(catalogs)
+    cursor.execute("SAVEPOINT indexpilot_tenant_prefetch")
+    try:
+        cursor.execute(
+            """
+            SELECT DISTINCT table_name
+            FROM genome_catalog
+            WHERE table_name = ANY(%s)
+              AND (field_name = 'tenant_id' OR field_name LIKE 'tenant_%%')
+        """,
+            (tables,),
+        )
+    except Exception as e:
+        logger.debug(f"genome_catalog unavailable for tenant prefetch: {e}")
+        cursor.execute("ROLLBACK TO SAVEPOINT indexpilot_tenant_prefetch")
+        cursor.execute(
+            """
+            SELECT DISTINCT table_name
+            FROM information_schema.columns
+            WHERE table_name = ANY(%s)
+              AND (column_name = 'tenant_id' OR column_name LIKE 'tenant_%%')
+        """,
+            (tables,),
+        )
+    for row in cursor.fetchall():
+        catalogs[row["table_name"]].has_tenant_field = True
+    cursor.execute("RELEASE SAVEPOINT indexpilot_tenant_prefetch")
+
+
+def _fetch_row_count(cursor, catalog: TableCatalog) -> None:
+    cursor.execute(
+        sql.SQL("SELECT COUNT(*) AS total_rows FROM {}").format(sql.Identifier(catalog.table_name))
+    )
+    row = cursor.fetchone()
+    if row:
+        catalog.row_count = int(row["total_rows"] or 0)
+
+
+def fetch_distinct_count(catalog: TableCatalog, field_name: str) -> int | None:
+    """
+    Exact COUNT(DISTINCT field_name), computed on first use and kept on the catalog.
+
+    Only candidates that reach the selectivity check pay for this scan; earlier
+    skips work from pg_stats and the prefetched indexes alone.
+
+    Returns:
+        Distinct count, or None if it could not be read
+    """
+    if field_name in catalog.distinct_counts:
+        return catalog.distinct_counts[field_name]
+    try:
+        with get_cursor() as cursor:
+            cursor.execute(
+                sql.SQL("SELECT COUNT(DISTINCT {}) AS distinct_count FROM {}").format(
+                    sql.Identifier(field_name), sql.Identifier(catalog.table_name)
+                )
+            )
+            row = cursor.fetchone()
+    except Exception as e:
+        logger.debug(f"Could not count distinct {catalog.table_name}.{field_name}: {e}")
+        return None
+    distinct = int(row["distinct_count"] or 0) if row else 0
+    catalog.distinct_counts[field_name] = distinct
+    return distinct
+
+
+def prefetch_candidate_catalog(
+    fields_by_table: dict[str, set[str]],
+    candidate_index_names: Callable[[str, str, bool], tuple[str, ...]] | None = None,
+) -> dict[str, TableCatalog]:
+    """
+    Read the catalog data needed to score index candidates, for all tables at once.
+
+    Indexes, sizes, pg_stats and tenant columns are fetched with one set-based query
+    each. Fields that already have an index are dropped from candidate_fields, and
+    rows are counted only for tables with a candidate left. Distinct counts are not
+    prefetched (see fetch_distinct_count()). Names must already be validated
+    (validate_table_name / validate_field_name).
+
+    Args:
+        fields_by_table: Candidate fields keyed by table name
+        candidate_index_names: (table, field, has_tenant) -> index names that would
+            cover the field; without it every field stays a candidate
+
+    Returns:
+        TableCatalog per table, or an empty dict if the prefetch failed (callers fall
+        back to the per-candidate lookups)
+    """
+    if not fields_by_table:
+        return {}
+    catalogs = {table: TableCatalog(table_name=table) for table in fields_by_table}
+    try:
+        with get_cursor() as cursor:
+            _fetch_indexes(cursor, catalogs)
+            _fetch_sizes(cursor, catalogs)
+            _fetch_pg_stats(cursor, catalogs)
+            _fetch_tenant_tables(cursor, catalogs)
+            for table, fields in fields_by_table.items():
+                catalog = catalogs[table]
+                catalog.candidate_fields = {
+                    field_name
+                    for field_name in fields
+                    if candidate_index_names is None
+                    or not catalog.has_index_for_field(
+                        field_name,
+                        candidate_index_names(table, field_name, catalog.has_tenant_field),
+                    )
+                }
+                if catalog.candidate_fields:
+                    _fetch_row_count(cursor, catalog)
+    except Exception as e:
+        logger.warning(f"Candidate catalog prefetch failed, using per-candidate lookups: {e}")
+        return {}
+    return catalogs
@@ -0,0 +1,237 @@
+"""
+Query interception metrics.
+
+Counters live in per-thread shards so the interception hot path never takes a
+lock: each thread only writes its own shard, and snapshot() sums the shards on
+read. Interception overhead is recorded in an HDR-style log-linear histogram.
+"""
+
+import threading
+
+from src.type_definitions import JSONDict
+
+# Each power of two is split into 2**SUB_BUCKET_BITS linear sub-buckets, so a
+# recorded value is reported to within 1/32 (~3%) of its true value
+SUB_BUCKET_BITS = 5
+_SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+# Values above ~68.7s are clamped into the last bucket
+MAX_TRACKABLE_NS = (1 << 36) - 1
+_BUCKET_COUNT = (MAX_TRACKABLE_NS.bit_length() - SUB_BUCKET_BITS + 1) << SUB_BUCKET_BITS
+
+_SUMMARY_PERCENTILES = (("p50_us", 0.50), ("p90_us", 0.90), ("p99_us", 0.99), ("p999_us", 0.999))
+
+
+def _bucket_index(value_ns: int) -> int:
+    bits = value_ns.bit_length()
+    if bits <= SUB_BUCKET_BITS + 1:
+        return value_ns
+    shift = bits - SUB_BUCKET_BITS - 1
+    return (shift << SUB_BUCKET_BITS) + (value_ns >> shift)
+
+
+def _bucket_lower_bound(index: int) -> int:
+    if index < 2 * _SUB_BUCKET_COUNT:
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    return (index - (shift << SUB_BUCKET_BITS)) << shift
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram (HdrHistogram layout).
+
+    Values below 64ns are counted exactly; above that each power-of-two range has
+    32 equal-width buckets. Recording is a bit_length and a list increment.
+    """
+
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, value_ns: int) -> None:
+        if value_ns < 0:
+            value_ns = 0
+        elif value_ns > MAX_TRACKABLE_NS:
+            value_ns = MAX_TRACKABLE_NS
+        self.counts[_bucket_index(value_ns)] += 1
+        self.count += 1
+        self.total_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's counts into this one"""
+        # list() copies in one step, so a concurrent record() cannot tear the read
+        for index, bucket_count in enumerate(list(other.counts)):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Value at a percentile, as the highest value equivalent to its bucket.
+
+        Args:
+            percentile: Percentile as a fraction (0.99 for p99)
+
+        Returns:
+            Latency in nanoseconds, capped at the observed maximum (0 if empty)
+        """
+        total = sum(self.counts)
+        if total <= 0:
+            return 0
+        rank = max(1, int(percentile * total + 0.5))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(_bucket_lower_bound(index + 1) - 1, self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> JSONDict:
+        """Count, mean, max and p50/p90/p99/p99.9 in microseconds"""
+        result: JSONDict = {
+            "count": self.count,
+            "mean_us": round(self.total_ns / self.count / 1000, 3) if self.count else 0.0,
+            "max_us": round(self.max_ns / 1000, 3),
+        }
+        for key, percentile in _SUMMARY_PERCENTILES:
+            result[key] = round(self.percentile(percentile) / 1000, 3)
+        return result
+
+
+class _ThreadShard:
+    __slots__ = (
+        "thread",
+        "interceptions",
+        "blocked",
+        "blocked_by_reason",
+        "verdict_cache_hits",
+        "verdict_cache_misses",
+        "analyzed",
+        "analysis_time_ns",
+        "overhead",
+    )
+
+    def __init__(self, thread: threading.Thread | None):
+        self.thread = thread
+        self.interceptions = 0
+        self.blocked = 0
+        self.blocked_by_reason: dict[str, int] = {}
+        self.verdict_cache_hits = 0
+        self.verdict_cache_misses = 0
+        self.analyzed = 0
+        self.analysis_time_ns = 0
+        self.overhead = LatencyHistogram()
+
+    def merge(self, other: "_ThreadShard") -> None:
+        self.interceptions += other.interceptions
+        self.blocked += other.blocked
+        for reason, count in dict(other.blocked_by_reason).items():
+            self.blocked_by_reason[reason] = self.blocked_by_reason.get(reason, 0) + count
+        self.verdict_cache_hits += other.verdict_cache_hits
+        self.verdict_cache_misses += other.verdict_cache_misses
+        self.analyzed += other.analyzed
+        self.analysis_time_ns += other.analysis_time_ns
+        self.overhead.merge(other.overhead)
+
+
+class InterceptionMetrics:
+    """
+    Interception counters sharded per thread and aggregated on read.
+
+    record_*() only touch the calling thread's shard. snapshot() sums all shards
+    and folds the shards of exited threads into a retired total, so short-lived
+    threads do not accumulate.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: list[_ThreadShard] = []
+        self._retired = _ThreadShard(None)
+        # Guards shard registration and folding, never the record path
+        self._lock = threading.Lock()
+
+    def _shard(self) -> _ThreadShard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _ThreadShard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def record_interception(self, overhead_ns: int) -> None:
+        """Count an interception and how long deciding its verdict took"""
+        shard = self._shard()
+        shard.interceptions += 1
+        shard.overhead.record(overhead_ns)
+
+    def record_blocked(self, reason: str | None) -> None:
+        shard = self._shard()
+        shard.blocked += 1
+        if reason is not None:
+            shard.blocked_by_reason[reason] = shard.blocked_by_reason.get(reason, 0) + 1
+
+    def record_verdict_cache_lookup(self, hit: bool) -> None:
+        shard = self._shard()
+        if hit:
+            shard.verdict_cache_hits += 1
+        else:
+            shard.verdict_cache_misses += 1
+
+    def record_analysis(self, elapsed_ns: int) -> None:
+        """Count a full (uncached) query analysis"""
+        shard = self._shard()
+        shard.analyzed += 1
+        shard.analysis_time_ns += elapsed_ns
+
+    def _aggregate(self) -> _ThreadShard:
+        total = _ThreadShard(None)
+        with self._lock:
+            live: list[_ThreadShard] = []
+            for shard in self._shards:
+                if shard.thread is not None and not shard.thread.is_alive():
+                    # No further writes can happen; fold it away
+                    self._retired.merge(shard)
+                else:
+                    live.append(shard)
+            self._shards = live
+            total.merge(self._retired)
+            for shard in live:
+                total.merge(shard)
+        return total
+
+    def snapshot(self) -> JSONDict:
+        """
+        Totals across all threads.
+
+        Returns:
+            dict with interception, block, verdict cache and analysis counters and
+            an "interception_overhead" latency summary
+        """
+        total = self._aggregate()
+        return {
+            "total_interceptions": total.interceptions,
+            "total_blocked": total.blocked,
+            "blocked_by_reason": dict(total.blocked_by_reason),
+            "verdict_cache_hits": total.verdict_cache_hits,
+            "verdict_cache_misses": total.verdict_cache_misses,
+            "total_analyzed": total.analyzed,
+            "total_analysis_time_ms": total.analysis_time_ns / 1_000_000,
+            "interception_overhead": total.overhead.summary(),
+            "threads": len(self._shards),
+        }
+
+    def reset(self) -> None:
+        """Zero every counter"""
+        with self._lock:
+            self._local = threading.local()
+            self._shards = []
+            self._retired = _ThreadShard(None)
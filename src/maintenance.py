@@ -620,6 +620,24 @@ def run_maintenance_tasks(force: bool = False) -> JSONDict:
             monitoring.alert("warning", f"Found {len(stale_ops)} stale operations")
         cleanup_dict["stale_operations"] = len(stale_ops)
 
+        # 5b. Create upcoming query_stats partitions and drop expired ones
+        try:
+            from src.query_stats_partitions import run_query_stats_partition_maintenance
+
+            cleanup_dict["query_stats_partitions"] = run_query_stats_partition_maintenance()
+        except Exception as e:
+            logger.warning(f"query_stats partition maintenance failed: {e}")
+            cleanup_dict["query_stats_partitions"] = f"error: {e}"
+
+        # 5c. Roll complete hours of raw query_stats into query_stats_hourly
+        try:
+            from src.stats_rollup import roll_up_query_stats
+
+            cleanup_dict["query_stats_rollup"] = roll_up_query_stats()
+        except Exception as e:
+            logger.warning(f"query_stats rollup failed: {e}")
+            cleanup_dict["query_stats_rollup"] = f"error: {e}"
+
         # 6. Clean up unused indexes (if enabled)
         try:
             from src.index_cleanup import find_unused_indexes
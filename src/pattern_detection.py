@@ -36,6 +36,81 @@ def _get_spike_threshold() -> float:
     return _config_loader.get_float("features.pattern_detection.spike_threshold", 3.0)
 
 
+def _period_thresholds(hourly: bool) -> tuple[int, int]:
+    """(minimum periods with data, minimum queries per period) for a detection mode"""
+    if hourly:
+        # For simulations, require at least 2 hours of data and lower threshold
+        return 2, 10
+    return _get_min_days_sustained(), _get_min_queries_per_day()
+
+
+def _classify_period_counts(query_counts: list[int], hourly: bool) -> dict[str, JSONValue]:
+    """
+    Classify one field's per-period query counts as sustained, spike or neither.
+
+    Args:
+        query_counts: Query count of every period (hour or day) that saw queries
+        hourly: Hourly simulation-mode analysis instead of daily
+
+    Returns:
+        dict with pattern analysis (see detect_sustained_pattern)
+    """
+    min_periods_required, min_queries_per_period = _period_thresholds(hourly)
+    if len(query_counts) < min_periods_required:
+        return {
+            "is_sustained": False,
+            "reason": f"Insufficient data: {len(query_counts)} {'hours' if hourly else 'days'}",
+            "days_analyzed": len(query_counts),
+            "avg_queries_per_day": 0,
+            "min_queries_per_day": 0,
+            "max_queries_per_day": 0,
+        }
+    if not query_counts:
+        return {
+            "is_sustained": False,
+            "reason": "no_data",
+            "days_analyzed": 0,
+            "days_above_threshold": 0,
+            "avg_queries_per_day": 0,
+            "min_queries_per_day": 0,
+            "max_queries_per_day": 0,
+            "is_spike": False,
+            "spike_ratio": 0,
+        }
+    avg_queries = sum(query_counts) / len(query_counts)
+    min_queries = min(query_counts)
+    max_queries = max(query_counts)
+
+    # Check for spike (one period much higher than average)
+    is_spike = max_queries > avg_queries * _get_spike_threshold() if avg_queries > 0 else False
+
+    # Check if pattern is sustained
+    periods_above_threshold = sum(1 for count in query_counts if count >= min_queries_per_period)
+    is_sustained = (
+        periods_above_threshold >= min_periods_required
+        and avg_queries >= min_queries_per_period
+        and not is_spike
+    )
+
+    return {
+        "is_sustained": is_sustained,
+        "reason": "sustained_pattern"
+        if is_sustained
+        else (
+            "spike_detected"
+            if is_spike
+            else f"only_{periods_above_threshold}_{'periods' if hourly else 'days'}_above_threshold"
+        ),
+        "days_analyzed": len(query_counts),
+        "days_above_threshold": periods_above_threshold,
+        "avg_queries_per_day": avg_queries,
+        "min_queries_per_day": min_queries,
+        "max_queries_per_day": max_queries,
+        "is_spike": is_spike,
+        "spike_ratio": max_queries / avg_queries if avg_queries > 0 else 0,
+    }
+
+
 def detect_sustained_pattern(
     table_name: str, field_name: str, days: int = 7, time_window_hours: int | None = None
 ) -> dict[str, JSONValue]:
@@ -51,194 +126,220 @@ def detect_sustained_pattern(
     Returns:
         dict with pattern analysis
     """
-    from src.db import get_cursor
+    from src.stats import get_field_period_counts
     from src.validation import validate_field_name, validate_table_name
 
     table_name = validate_table_name(table_name)
     field_name = validate_field_name(field_name, table_name)
 
-    with get_cursor() as cursor:
-        # For short time windows (simulation mode), use hourly analysis instead of daily
-        if time_window_hours and time_window_hours <= 24:
-            # Use hourly grouping for simulations
-            cursor.execute(
-                """
-                SELECT
-                    DATE_TRUNC('hour', created_at) as query_period,
-                    COUNT(*) as query_count
-                FROM query_stats
-                WHERE table_name = %s
-                  AND field_name = %s
-                  AND created_at >= NOW() - INTERVAL '1 hour' * %s
-                GROUP BY DATE_TRUNC('hour', created_at)
-                ORDER BY query_period DESC
-            """,
-                (table_name, field_name, time_window_hours),
-            )
-
-            period_counts = cursor.fetchall()
-
-            # For simulations, require at least 2 hours of data and lower threshold
-            min_periods_required = 2
-            min_queries_per_period = 10  # Lower threshold for simulations
-
-            if not period_counts or len(period_counts) < min_periods_required:
-                return {
-                    "is_sustained": False,
-                    "reason": f"Insufficient data: {len(period_counts) if period_counts else 0} hours",
-                    "days_analyzed": len(period_counts) if period_counts else 0,
-                    "avg_queries_per_day": 0,
-                    "min_queries_per_day": 0,
-                    "max_queries_per_day": 0,
-                }
-
-            # Calculate statistics for hourly data
-            # Use safe access to prevent tuple index errors
-            from src.db import safe_get_row_value
-
-            query_counts: list[int] = []
-            for row in period_counts:
-                count_val = safe_get_row_value(row, "query_count", 0) or safe_get_row_value(
-                    row, 1, 0
-                )
-                count = int(count_val) if isinstance(count_val, int | float) else 0
-                query_counts.append(count)
-            if not query_counts:
-                return {
-                    "is_sustained": False,
-                    "reason": "no_data",
-                    "days_analyzed": 0,
-                    "days_above_threshold": 0,
-                    "avg_queries_per_day": 0,
-                    "min_queries_per_day": 0,
-                    "max_queries_per_day": 0,
-                    "is_spike": False,
-                    "spike_ratio": 0,
-                }
-            avg_queries = sum(query_counts) / len(query_counts)
-            min_queries = min(query_counts)
-            max_queries = max(query_counts)
-
-            # For simulations, be more lenient - just check if pattern exists
-            periods_above_threshold = sum(
-                1 for count in query_counts if count >= min_queries_per_period
-            )
-            is_sustained = (
-                periods_above_threshold >= min_periods_required
-                and avg_queries >= min_queries_per_period
-            )
-
-            # Check for spike (one period much higher than average)
-            is_spike = (
-                max_queries > avg_queries * _get_spike_threshold() if avg_queries > 0 else False
-            )
+    # For short time windows (simulation mode), use hourly analysis instead of daily.
+    # Counts come from the same source as detect_sustained_patterns(): the stats
+    # rollups (query_stats_rollup in aggregate mode, where query_stats stays empty)
+    hourly = bool(time_window_hours and time_window_hours <= 24)
+    rows = get_field_period_counts(
+        [(table_name, field_name)],
+        time_window_hours if hourly else days * 24,
+        "hour" if hourly else "day",
+    )
+
+    counts_by_period: dict[object, int] = {}
+    for row in rows:
+        if row["query_count"]:
+            period = row["query_period"]
+            counts_by_period[period] = counts_by_period.get(period, 0) + int(row["query_count"])
+    query_counts = list(counts_by_period.values())
+    return _classify_period_counts(query_counts, hourly)
+
+
+# Relative change in query volume across the analyzed periods (least-squares
+# slope times the observed span, over the mean) that counts as a trend
+_TREND_RATIO_THRESHOLD = 0.5
+
+
+def _temporal_profile(pattern: dict[str, JSONValue], trend_ratio: float) -> str:
+    if "is_spike" not in pattern:
+        return "insufficient_data"
+    if pattern["is_spike"]:
+        return "spike"
+    if trend_ratio >= _TREND_RATIO_THRESHOLD:
+        return "growing"
+    if trend_ratio <= -_TREND_RATIO_THRESHOLD:
+        return "declining"
+    return "steady"
+
+
+def _period_position(period, hourly: bool) -> int:
+    """Integer period number (hours or days), for trend fitting"""
+    return period.toordinal() * 24 + period.hour if hourly else period.toordinal()
+
+
+def _trend_ratio(series: dict[int, int]) -> float:
+    """Pure-Python trend ratio for one field's {period position: count} series"""
+    n = len(series)
+    if n < 2:
+        return 0.0
+    sum_x = sum(series)
+    sum_y = sum(series.values())
+    sum_xx = sum(x * x for x in series)
+    sum_xy = sum(x * y for x, y in series.items())
+    denominator = n * sum_xx - sum_x * sum_x
+    if denominator <= 0 or sum_y <= 0:
+        return 0.0
+    slope = (n * sum_xy - sum_x * sum_y) / denominator
+    return slope * (max(series) - min(series)) / (sum_y / n)
+
+
+def _classify_series_python(
+    series_by_field: list[dict[int, int]], hourly: bool
+) -> list[dict[str, JSONValue]]:
+    results = []
+    for series in series_by_field:
+        pattern = _classify_period_counts([series[x] for x in sorted(series)], hourly)
+        trend_ratio = _trend_ratio(series) if "is_spike" in pattern else 0.0
+        pattern["trend_ratio"] = trend_ratio
+        pattern["temporal_profile"] = _temporal_profile(pattern, trend_ratio)
+        results.append(pattern)
+    return results
+
+
+def _classify_series_numpy(
+    series_by_field: list[dict[int, int]], hourly: bool
+) -> list[dict[str, JSONValue]]:
+    """
+    Vectorized _classify_period_counts() plus trend fitting for many fields.
 
-            return {
-                "is_sustained": is_sustained and not is_spike,
+    Fields are rows and periods columns of one count matrix; periods without
+    queries hold 0 and are masked out, matching the per-field analysis which only
+    sees periods that had queries.
+    """
+    import numpy as np
+
+    positions = sorted({x for series in series_by_field for x in series})
+    column = {x: i for i, x in enumerate(positions)}
+    counts = np.zeros((len(series_by_field), max(len(positions), 1)), dtype=np.int64)
+    for row, series in enumerate(series_by_field):
+        for x, count in series.items():
+            counts[row, column[x]] = count
+
+    min_periods_required, min_queries_per_period = _period_thresholds(hourly)
+    present = counts > 0
+    periods = present.sum(axis=1)
+    totals = counts.sum(axis=1)
+    avg = np.divide(totals, periods, out=np.zeros(len(totals)), where=periods > 0)
+    max_counts = counts.max(axis=1)
+    min_counts = np.where(present, counts, np.iinfo(np.int64).max).min(axis=1)
+    above = (present & (counts >= min_queries_per_period)).sum(axis=1)
+    is_spike = (avg > 0) & (max_counts > avg * _get_spike_threshold())
+    is_sustained = (above >= min_periods_required) & (avg >= min_queries_per_period) & ~is_spike
+    spike_ratio = np.divide(max_counts, avg, out=np.zeros(len(avg)), where=avg > 0)
+
+    # Least-squares slope over the periods each field has data for
+    x = np.asarray(positions if positions else [0], dtype=np.float64)
+    x = x - x[0]  # keep the sums small; the slope is shift invariant
+    mask = present.astype(np.float64)
+    sum_x = mask @ x
+    sum_xx = mask @ (x * x)
+    sum_xy = counts.astype(np.float64) @ x
+    denominator = periods * sum_xx - sum_x * sum_x
+    slope = np.divide(
+        periods * sum_xy - sum_x * totals,
+        denominator,
+        out=np.zeros(len(totals)),
+        where=denominator > 0,
+    )
+    span = np.where(present, x, -np.inf).max(axis=1) - np.where(present, x, np.inf).min(axis=1)
+    trend_ratio = np.divide(
+        slope * np.where(periods > 1, span, 0.0), avg, out=np.zeros(len(avg)), where=avg > 0
+    )
+
+    results: list[dict[str, JSONValue]] = []
+    for row in range(len(series_by_field)):
+        analyzed = int(periods[row])
+        if analyzed < min_periods_required or analyzed == 0:
+            # Insufficient / no-data results are identical to the per-field path
+            pattern = _classify_period_counts([0] * analyzed, hourly)
+            pattern["trend_ratio"] = 0.0
+        else:
+            sustained = bool(is_sustained[row])
+            spike = bool(is_spike[row])
+            unit = "periods" if hourly else "days"
+            pattern = {
+                "is_sustained": sustained,
                 "reason": "sustained_pattern"
-                if (is_sustained and not is_spike)
+                if sustained
                 else (
-                    "spike_detected"
-                    if is_spike
-                    else f"only_{periods_above_threshold}_periods_above_threshold"
+                    "spike_detected" if spike else f"only_{int(above[row])}_{unit}_above_threshold"
                 ),
-                "days_analyzed": len(period_counts),
-                "days_above_threshold": periods_above_threshold,
-                "avg_queries_per_day": avg_queries,
-                "min_queries_per_day": min_queries,
-                "max_queries_per_day": max_queries,
-                "is_spike": is_spike,
-                "spike_ratio": max_queries / avg_queries if avg_queries > 0 else 0,
+                "days_analyzed": analyzed,
+                "days_above_threshold": int(above[row]),
+                "avg_queries_per_day": float(avg[row]),
+                "min_queries_per_day": int(min_counts[row]),
+                "max_queries_per_day": int(max_counts[row]),
+                "is_spike": spike,
+                "spike_ratio": float(spike_ratio[row]),
+                "trend_ratio": float(trend_ratio[row]),
             }
+        pattern["temporal_profile"] = _temporal_profile(pattern, float(pattern["trend_ratio"]))
+        results.append(pattern)
+    return results
 
-        # Original daily analysis for production
-        # Get daily query counts
-        cursor.execute(
-            """
-            SELECT
-                DATE(created_at) as query_date,
-                COUNT(*) as query_count
-            FROM query_stats
-            WHERE table_name = %s
-              AND field_name = %s
-              AND created_at >= NOW() - INTERVAL '1 day' * %s
-            GROUP BY DATE(created_at)
-            ORDER BY query_date DESC
-        """,
-            (table_name, field_name, days),
-        )
 
-        daily_counts = cursor.fetchall()
+def detect_sustained_patterns(
+    fields_by_table: dict[str, set[str]], time_window_hours: int | None = None
+) -> dict[tuple[str, str], dict[str, JSONValue]]:
+    """
+    detect_sustained_pattern() for every candidate field from one grouped query.
 
-        if not daily_counts or len(daily_counts) < _get_min_days_sustained():
-            return {
-                "is_sustained": False,
-                "reason": f"Insufficient data: {len(daily_counts) if daily_counts else 0} days",
-                "days_analyzed": len(daily_counts) if daily_counts else 0,
-                "avg_queries_per_day": 0,
-                "min_queries_per_day": 0,
-                "max_queries_per_day": 0,
-            }
+    Per-period counts for all fields are read in one statement (from the stats
+    rollups where available) and classified together, vectorized with NumPy when
+    it is installed. Each result also carries a trend_ratio and a temporal_profile
+    ("spike", "growing", "declining", "steady" or "insufficient_data"). Meant to
+    be computed once per auto-indexer cycle. Names must already be validated.
 
-        # Calculate statistics
-        # Use safe access to prevent tuple index errors
-        from src.db import safe_get_row_value
+    Args:
+        fields_by_table: Candidate fields keyed by table name
+        time_window_hours: If provided and <= 24, hourly simulation-mode analysis;
+            otherwise daily analysis over the spike detection window
 
-        daily_query_counts: list[int] = []
-        for row in daily_counts:
-            count_val = safe_get_row_value(row, "query_count", 0) or safe_get_row_value(row, 1, 0)
-            count = int(count_val) if isinstance(count_val, int | float) else 0
-            daily_query_counts.append(count)
-        if not daily_query_counts:
-            return {
-                "is_sustained": False,
-                "reason": "no_data",
-                "days_analyzed": 0,
-                "days_above_threshold": 0,
-                "avg_queries_per_day": 0,
-                "min_queries_per_day": 0,
-                "max_queries_per_day": 0,
-                "is_spike": False,
-                "spike_ratio": 0,
-            }
-        avg_queries = sum(daily_query_counts) / len(daily_query_counts)
-        min_queries = min(daily_query_counts)
-        max_queries = max(daily_query_counts)
+    Returns:
+        Pattern analysis per (table_name, field_name), or an empty dict if the
+        query failed (callers fall back to detect_sustained_pattern)
+    """
+    fields = sorted((table, field) for table, names in fields_by_table.items() for field in names)
+    if not fields:
+        return {}
+
+    hourly = bool(time_window_hours and time_window_hours <= 24)
+    window_hours = time_window_hours if hourly else _get_spike_detection_window() * 24
+    try:
+        from src.stats import get_field_period_counts
 
-        # Check for spike (one day much higher than average)
-        is_spike = max_queries > avg_queries * _get_spike_threshold()
+        rows = get_field_period_counts(fields, window_hours, "hour" if hourly else "day")
+    except Exception as e:
+        logger.warning(f"Batch pattern detection failed, using per-field queries: {e}")
+        return {}
 
-        # Check if pattern is sustained
-        days_above_threshold = sum(
-            1 for count in daily_query_counts if count >= _get_min_queries_per_day()
-        )
-        is_sustained = (
-            days_above_threshold >= _get_min_days_sustained()
-            and not is_spike
-            and avg_queries >= _get_min_queries_per_day()
-        )
+    series: dict[tuple[str, str], dict[int, int]] = {key: {} for key in fields}
+    for row in rows:
+        key = (row["table_name"], row["field_name"])
+        if key in series and row["query_count"]:
+            position = _period_position(row["query_period"], hourly)
+            series[key][position] = series[key].get(position, 0) + int(row["query_count"])
 
-        return {
-            "is_sustained": is_sustained,
-            "reason": "sustained_pattern"
-            if is_sustained
-            else (
-                "spike_detected"
-                if is_spike
-                else f"only_{days_above_threshold}_days_above_threshold"
-            ),
-            "days_analyzed": len(daily_counts),
-            "days_above_threshold": days_above_threshold,
-            "avg_queries_per_day": avg_queries,
-            "min_queries_per_day": min_queries,
-            "max_queries_per_day": max_queries,
-            "is_spike": is_spike,
-            "spike_ratio": max_queries / avg_queries if avg_queries > 0 else 0,
-        }
+    series_by_field = [series[key] for key in fields]
+    try:
+        patterns = _classify_series_numpy(series_by_field, hourly)
+    except ImportError:
+        patterns = _classify_series_python(series_by_field, hourly)
+    return dict(zip(fields, patterns, strict=True))
 
 
 def should_create_index_based_on_pattern(
-    table_name: str, field_name: str, total_queries: int, time_window_hours: int | None = None
+    table_name: str,
+    field_name: str,
+    total_queries: int,
+    time_window_hours: int | None = None,
+    pattern: dict[str, JSONValue] | None = None,
 ) -> tuple[bool, str]:
     """
     Determine if index should be created based on sustained pattern.
@@ -248,6 +349,8 @@ def should_create_index_based_on_pattern(
         field_name: Field name
         total_queries: Total queries in time window
         time_window_hours: Time window in hours (for simulation mode)
+        pattern: Analysis from detect_sustained_patterns() for the same window, if
+            already computed this cycle
 
     Returns:
         (should_create, reason)
@@ -255,9 +358,10 @@ def should_create_index_based_on_pattern(
     # Check for sustained pattern
     if time_window_hours and time_window_hours <= 24:
         # Simulation mode: use hourly analysis
-        pattern = detect_sustained_pattern(
-            table_name, field_name, days=1, time_window_hours=time_window_hours
-        )
+        if pattern is None:
+            pattern = detect_sustained_pattern(
+                table_name, field_name, days=1, time_window_hours=time_window_hours
+            )
         # Lower threshold for simulations
         min_queries_for_simulation = 20
         if total_queries < min_queries_for_simulation:
@@ -265,9 +369,10 @@ def should_create_index_based_on_pattern(
             return False, reason
     else:
         # Production mode: use daily analysis
-        pattern = detect_sustained_pattern(
-            table_name, field_name, days=_get_spike_detection_window()
-        )
+        if pattern is None:
+            pattern = detect_sustained_pattern(
+                table_name, field_name, days=_get_spike_detection_window()
+            )
         # Pattern is sustained, check query volume
         if total_queries < _get_min_queries_per_day() * _get_min_days_sustained():
             reason = f"Insufficient query volume: {total_queries} queries"
@@ -157,6 +157,10 @@ def set_tenant_config(
                 )
 
                 conn.commit()
+                if config_key.startswith("cache_"):
+                    from src.production_cache import invalidate_tenant_cache_quota
+
+                    invalidate_tenant_cache_quota(tenant_id)
                 return True
 
             except Exception as e:
@@ -244,3 +248,38 @@ def get_tenant_maintenance_window(tenant_id: int) -> dict[str, Any] | None:
         return tenant_config["maintenance_window"]
 
     return None
+
+
+def get_tenant_cache_quota(tenant_id: int | str | None) -> dict[str, Any]:
+    """
+    Get query result cache quota for a tenant.
+
+    Args:
+        tenant_id: Tenant ID (None = entries cached without a tenant)
+
+    Returns:
+        dict with max_memory_mb and max_entries (None = no quota) and weight
+        (relative share of the cache under fair-share eviction)
+    """
+    max_memory_mb = _config_loader.get_float("features.per_tenant_config.cache_max_memory_mb", 0.0)
+    max_entries = _config_loader.get_int("features.per_tenant_config.cache_max_entries", 0)
+    default_config: dict[str, Any] = {
+        "max_memory_mb": max_memory_mb if max_memory_mb > 0 else None,
+        "max_entries": max_entries if max_entries > 0 else None,
+        "weight": _config_loader.get_float("features.per_tenant_config.cache_weight", 1.0),
+    }
+    try:
+        tenant_config = get_tenant_config(int(tenant_id)) if tenant_id is not None else {}
+    except ValueError:
+        # Non-numeric tenant IDs have no tenant_config rows
+        tenant_config = {}
+
+    # Override with tenant-specific config
+    if "cache_max_memory_mb" in tenant_config:
+        default_config["max_memory_mb"] = tenant_config["cache_max_memory_mb"] or None
+    if "cache_max_entries" in tenant_config:
+        default_config["max_entries"] = tenant_config["cache_max_entries"] or None
+    if "cache_weight" in tenant_config:
+        default_config["weight"] = tenant_config["cache_weight"]
+
+    return default_config
@@ -7,10 +7,12 @@ robust native query plan caching (e.g., SQLite, older MySQL versions).
 For PostgreSQL, MySQL 8.0+, and SQL Server, use native database caching instead.
 
 Features:
-- LRU eviction policy
+- Pluggable eviction policy (LRU, SLRU, W-TinyLFU; see src/cache_eviction.py)
 - Memory limits
 - Thread-safe operations
-- Automatic table-based invalidation
+- Automatic table-based invalidation (indexed by table)
+- Incremental memory accounting
+- Single-flight misses with optional stale-while-revalidate (get_or_compute)
 - Configurable TTL
 - Cache statistics and monitoring
 - Production-ready error handling
@@ -25,8 +27,16 @@ import re
 import threading
 import time
 from collections import OrderedDict
-from collections.abc import Iterable
-
+from collections.abc import Callable, Iterable
+from typing import cast
+
+from src.cache_eviction import (
+    DEFAULT_EVICTION_POLICY,
+    CountMinSketch,
+    EvictionPolicy,
+    ShadowPolicy,
+    create_eviction_policy,
+)
 from src.database.type_detector import (
     DATABASE_POSTGRESQL,
     get_database_type,
@@ -36,14 +46,181 @@ from src.type_definitions import JSONDict, JSONValue, QueryParams
 
 logger = logging.getLogger(__name__)
 
+# Per-entry bookkeeping overhead (expiry, tables, etc.) added to the key and value size
+_ENTRY_OVERHEAD_BYTES = 100
+
+TenantId = int | str | None
+# Returns max_memory_mb / max_entries (None = no quota) and weight for a tenant
+TenantQuotaResolver = Callable[[TenantId], JSONDict]
+
+# Label for entries cached without a tenant
+_SHARED_PARTITION = "shared"
+
+# How long a resolved tenant quota is reused before the resolver is asked again
+DEFAULT_TENANT_QUOTA_TTL_SECONDS = 300.0
+
+
+class _TenantPartition:
+    """Eviction policy, accounting and quota for one tenant's entries"""
+
+    def __init__(
+        self,
+        tenant_id: TenantId,
+        policy: EvictionPolicy,
+        max_entries: int | None = None,
+        max_memory_mb: float | None = None,
+        weight: float = 1.0,
+    ):
+        self.tenant_id = tenant_id
+        self.policy = policy
+        self.max_entries = max_entries
+        self.max_memory_mb = max_memory_mb
+        self.weight = weight if weight > 0 else 1.0
+        # Set by set_tenant_quota(); pinned partitions are kept while empty
+        self.pinned = False
+        self.entries = 0
+        self.bytes = 0
+        self.evictions = 0
+
+    @property
+    def max_memory_bytes(self) -> float | None:
+        return self.max_memory_mb * 1024 * 1024 if self.max_memory_mb else None
+
+    def over_quota(self, incoming_bytes: int = 0, incoming_entries: int = 0) -> bool:
+        if self.max_entries and self.entries + incoming_entries > self.max_entries:
+            return True
+        max_bytes = self.max_memory_bytes
+        return max_bytes is not None and self.bytes + incoming_bytes > max_bytes
+
+    def describe(self) -> JSONDict:
+        return {
+            "size": self.entries,
+            "max_entries": self.max_entries,
+            "memory_mb": round(self.bytes / (1024 * 1024), 2),
+            "max_memory_mb": self.max_memory_mb,
+            "weight": self.weight,
+            "evictions": self.evictions,
+            "policy_segments": self.policy.describe(),
+        }
+
+
+class _TenantRecord:
+    """
+    Per-tenant state that outlives the tenant's partition: the memoized quota and
+    lookup counts (a partition is dropped whenever it empties)
+    """
+
+    def __init__(self):
+        self.quota: JSONDict | None = None
+        self.quota_resolved_at: float | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def describe(self) -> JSONDict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_pct": round(self.hits / total * 100, 2) if total > 0 else 0.0,
+        }
+
+
+# Literals are replaced so every query of one shape shares a table-tag entry
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_TABLE_TAGS_MAX_SHAPES = 4096
+
+# Query shape -> tables it touches (LRU-bounded, shared by all cache instances)
+_table_tags_by_shape: OrderedDict[str, frozenset[str]] = OrderedDict()
+_table_tags_lock = threading.Lock()
+
+# Fallback for SQL the parser rejects
+_TABLE_PATTERNS = [
+    re.compile(r'\bFROM\s+["\']?(\w+)["\']?', re.IGNORECASE),  # FROM table
+    re.compile(r'\bJOIN\s+["\']?(\w+)["\']?', re.IGNORECASE),  # JOIN table
+    re.compile(r'\bINTO\s+["\']?(\w+)["\']?', re.IGNORECASE),  # INSERT INTO
+    re.compile(r'\bUPDATE\s+["\']?(\w+)["\']?', re.IGNORECASE),  # UPDATE
+    re.compile(r'\bTABLE\s+["\']?(\w+)["\']?', re.IGNORECASE),  # CREATE TABLE, DROP TABLE
+]
+_TABLE_PATTERN_KEYWORDS = {"select", "where", "group", "order", "having", "limit", "offset"}
+
+
+def _parse_table_tags(query_shape: str) -> frozenset[str]:
+    """Tables in a query shape via the SQL AST, falling back to regexes"""
+    from src.sql_parser import SQLPatternError, extract_referenced_tables
+
+    try:
+        return extract_referenced_tables(query_shape)
+    except SQLPatternError:
+        pass
+
+    query_normalized = re.sub(r"--.*?\n", " ", query_shape, flags=re.MULTILINE)
+    query_normalized = re.sub(r"/\*.*?\*/", " ", query_normalized, flags=re.DOTALL)
+    tables: set[str] = set()
+    for pattern in _TABLE_PATTERNS:
+        tables.update(
+            match.lower()
+            for match in pattern.findall(query_normalized)
+            if match.lower() not in _TABLE_PATTERN_KEYWORDS
+        )
+    return frozenset(tables)
+
+
+def normalize_table_tag(table_name: str) -> str:
+    """Bare, lowercased table name, as used for cache invalidation tags"""
+    return table_name.rsplit(".", 1)[-1].strip('"').lower()
+
+
+def query_table_tags(query: str) -> frozenset[str]:
+    """
+    Tables a query reads or writes, used to tag cache entries for invalidation.
+
+    Parsed with the SQL AST (schema-qualified names, quoted identifiers and CTEs are
+    handled) once per query shape: literals are stripped first, so queries that
+    differ only in their values share one parse.
+
+    Args:
+        query: SQL query string
+
+    Returns:
+        frozenset of bare, lowercased table names
+    """
+    query_shape = " ".join(_NUMBER_LITERAL_RE.sub("?", _STRING_LITERAL_RE.sub("?", query)).split())
+    with _table_tags_lock:
+        tags = _table_tags_by_shape.get(query_shape)
+        if tags is not None:
+            _table_tags_by_shape.move_to_end(query_shape)
+            return tags
+
+    tags = _parse_table_tags(query_shape)
+    with _table_tags_lock:
+        _table_tags_by_shape[query_shape] = tags
+        while len(_table_tags_by_shape) > _TABLE_TAGS_MAX_SHAPES:
+            _table_tags_by_shape.popitem(last=False)
+    return tags
+
+
+class _InFlight:
+    """One computation of a missing/stale key that concurrent callers wait on"""
+
+    def __init__(self, generation: tuple[int, dict[str, int]]):
+        # Invalidation state when the computation started; the result is only cached
+        # if no table it reads was invalidated in the meantime
+        self.generation = generation
+        self.done = threading.Event()
+        self.value: JSONValue = None
+        self.error: BaseException | None = None
+
 
 class ProductionCache:
     """
     Production-grade in-memory cache for query results.
 
     Features:
-    - LRU (Least Recently Used) eviction
+    - Pluggable eviction (LRU, SLRU, W-TinyLFU)
     - Memory limit protection
+    - Per-tenant partitions with quotas and fair-share eviction
+    - Request coalescing: concurrent misses for one key share a single computation
     - Thread-safe operations
     - Table-based invalidation
     - Configurable TTL
@@ -55,6 +232,11 @@ class ProductionCache:
         default_ttl: int = 300,
         max_size: int = 10000,
         max_memory_mb: int | None = 100,
+        eviction_policy: str = DEFAULT_EVICTION_POLICY,
+        shadow_policies: Iterable[str] | None = None,
+        tenant_quota_resolver: TenantQuotaResolver | None = None,
+        stale_while_revalidate_seconds: float = 0,
+        tenant_quota_ttl_seconds: float = DEFAULT_TENANT_QUOTA_TTL_SECONDS,
     ):
         """
         Initialize production cache.
@@ -63,19 +245,65 @@ class ProductionCache:
             default_ttl: Default time-to-live in seconds (default: 5 minutes)
             max_size: Maximum number of cache entries (default: 10,000)
             max_memory_mb: Maximum memory usage in MB (None = no limit)
+            eviction_policy: "lru", "slru" or "w-tinylfu"
+            shadow_policies: Other policies to replay the key stream through, so
+                get_stats() can compare their hit ratios with the active policy's
+            tenant_quota_resolver: Looks up a tenant's quota when its partition is
+                created, i.e. when it stores an entry while it has none cached
+                (None = tenants only share the global limits)
+            stale_while_revalidate_seconds: How long after expiry get_or_compute()
+                may still serve an entry while it is refreshed in the background
+                (0 = never serve stale results)
+            tenant_quota_ttl_seconds: How long a resolved quota is reused; see also
+                invalidate_tenant_quota()
         """
-        # Use OrderedDict for LRU eviction
-        self.cache: OrderedDict[str, tuple[JSONValue, float, set[str]]] = OrderedDict()
+        # key -> (value, expiry, tables, size_bytes, tenant); each tenant partition's
+        # policy owns the eviction order of its keys
+        self.cache: dict[str, tuple[JSONValue, float, set[str], int, TenantId]] = {}
         self.default_ttl = default_ttl
         self.max_size = max_size
         self.max_memory_mb = max_memory_mb
         self.lock = threading.Lock()
+        self.eviction_policy = create_eviction_policy(eviction_policy, 1).name
+        self._tenant_quota_resolver = tenant_quota_resolver
+        self.tenant_quota_ttl_seconds = tenant_quota_ttl_seconds
+        # Most recently used last; bounded to max_size tenants
+        self._tenants: OrderedDict[TenantId, _TenantRecord] = OrderedDict()
+        # One frequency sketch for every partition (w-tinylfu only), sized to the
+        # whole cache, so memory does not grow with the number of tenants
+        self._frequency_sketch = (
+            CountMinSketch(max_size) if self.eviction_policy == "w-tinylfu" else None
+        )
+        # Tenant partitions exist only while they hold entries (or were given an
+        # explicit quota), so there are never more of them than cached entries
+        self._partitions: dict[TenantId, _TenantPartition] = {None: self._new_partition(None)}
+        self._shadows = [
+            ShadowPolicy(name, max_size)
+            for name in (shadow_policies or ())
+            if create_eviction_policy(name, 1).name != self.eviction_policy
+        ]
+
+        # Maintained on every insert/remove so memory checks and invalidation don't
+        # have to walk the whole cache
+        self._total_bytes = 0
+        self._keys_by_table: dict[str, set[str]] = {}
+
+        # Single-flight state: key -> computation in progress. Invalidation bumps the
+        # table's generation (clear() bumps the epoch) so results computed from
+        # data that has since changed are returned but not cached.
+        self.stale_while_revalidate_seconds = max(0.0, stale_while_revalidate_seconds)
+        self._in_flight: dict[str, _InFlight] = {}
+        self._epoch = 0
+        self._table_generations: dict[str, int] = {}
 
         # Statistics
         self.hits = 0
         self.misses = 0
         self.evictions = 0
         self.invalidations = 0
+        self.coalesced = 0
+        self.stale_hits = 0
+        self.background_refreshes = 0
 
     def _estimate_entry_size(self, value: JSONValue) -> int:
         """Estimate memory size of cache entry in bytes"""
@@ -99,34 +327,193 @@ class ProductionCache:
 
     def _get_total_memory_mb(self) -> float:
         """Get total memory usage in MB"""
-        total_bytes = 0
-        for key, (value, _expiry, _tables) in self.cache.items():
-            total_bytes += len(key.encode("utf-8"))  # Key size
-            total_bytes += self._estimate_entry_size(value)  # Value size
-            total_bytes += 100  # Overhead (expiry, tables, etc.)
-        return total_bytes / (1024 * 1024)
-
-    def _evict_if_needed(self):
-        """Evict entries if size or memory limits exceeded"""
+        return self._total_bytes / (1024 * 1024)
+
+    def _new_partition(
+        self, tenant_id: TenantId, quota: JSONDict | None = None
+    ) -> _TenantPartition:
+        quota = quota or {}
+        max_entries_val = quota.get("max_entries")
+        max_memory_val = quota.get("max_memory_mb")
+        weight_val = quota.get("weight", 1.0)
+        max_entries = int(max_entries_val) if isinstance(max_entries_val, int | float) else None
+        return _TenantPartition(
+            tenant_id,
+            create_eviction_policy(
+                self.eviction_policy, max_entries or self.max_size, self._frequency_sketch
+            ),
+            max_entries=max_entries or None,
+            max_memory_mb=float(max_memory_val)
+            if isinstance(max_memory_val, int | float)
+            else None,
+            weight=float(weight_val) if isinstance(weight_val, int | float) else 1.0,
+        )
+
+    def _get_partition(self, tenant_id: TenantId) -> _TenantPartition:
+        """
+        Partition for tenant_id, resolving its quota (outside the lock) if it has none.
+
+        A new partition is not registered here; _attach_partition_locked() does that
+        when an entry is stored, so lookups alone never create one.
+        """
+        partition = self._partitions.get(tenant_id)
+        if partition is not None:
+            return partition
+        return self._new_partition(tenant_id, self._resolve_quota(tenant_id))
+
+    def _resolve_quota(self, tenant_id: TenantId) -> JSONDict | None:
+        """Tenant's quota from the resolver, memoized for tenant_quota_ttl_seconds"""
+        if self._tenant_quota_resolver is None:
+            return None
+        now = time.monotonic()
+        with self.lock:
+            record = self._tenants.get(tenant_id)
+            if (
+                record is not None
+                and record.quota_resolved_at is not None
+                and now - record.quota_resolved_at < self.tenant_quota_ttl_seconds
+            ):
+                return record.quota
+
+        quota: JSONDict | None = None
+        try:
+            quota = self._tenant_quota_resolver(tenant_id)
+        except Exception as e:
+            # Memoized too, so a failing resolver is not retried on every store
+            logger.debug(f"Could not resolve cache quota for tenant {tenant_id}: {e}")
+        with self.lock:
+            record = self._tenant_record_locked(tenant_id)
+            record.quota = quota
+            record.quota_resolved_at = now
+        return quota
+
+    def invalidate_tenant_quota(self, tenant_id: TenantId):
+        """
+        Forget a tenant's memoized quota so the resolver is asked again.
+
+        Call after the tenant's cache quota config changes. A partition the tenant
+        already has keeps its limits until it empties (or set_tenant_quota()).
+        """
+        with self.lock:
+            record = self._tenants.get(tenant_id)
+            if record is not None:
+                record.quota = None
+                record.quota_resolved_at = None
+
+    def _tenant_record_locked(self, tenant_id: TenantId) -> _TenantRecord:
+        """Get or create tenant_id's record, marking it recently used. Caller must hold self.lock."""
+        record = self._tenants.get(tenant_id)
+        if record is None:
+            record = self._tenants[tenant_id] = _TenantRecord()
+            while len(self._tenants) > self.max_size:
+                self._tenants.popitem(last=False)
+        else:
+            self._tenants.move_to_end(tenant_id)
+        return record
+
+    def _attach_partition_locked(self, partition: _TenantPartition) -> _TenantPartition:
+        """Register partition unless its tenant already has one. Caller must hold self.lock."""
+        return self._partitions.setdefault(partition.tenant_id, partition)
+
+    def set_tenant_quota(
+        self,
+        tenant_id: TenantId,
+        max_memory_mb: float | None = None,
+        max_entries: int | None = None,
+        weight: float = 1.0,
+    ):
+        """
+        Set (or replace) a tenant's quota, evicting down to it immediately.
+
+        Args:
+            tenant_id: Tenant ID
+            max_memory_mb: Memory quota in MB (None = bounded only by the global limit)
+            max_entries: Entry quota (None = bounded only by the global limit)
+            weight: Relative share of the global limits under fair-share eviction
+        """
+        partition = self._get_partition(tenant_id)
+        with self.lock:
+            partition = self._attach_partition_locked(partition)
+            partition.pinned = True
+            partition.max_memory_mb = max_memory_mb
+            partition.max_entries = max_entries
+            partition.weight = weight if weight > 0 else 1.0
+            while partition.entries and partition.over_quota():
+                self._evict_from(partition)
+
+    def _remove_entry(self, key: str) -> bool:
+        """Remove an entry from the cache and its policies. Caller must hold self.lock."""
+        entry = self.cache.get(key)
+        if entry is None:
+            return False
+        self._partitions[entry[4]].policy.remove(key)
+        for shadow in self._shadows:
+            shadow.remove(key)
+        return self._discard_entry(key)
+
+    def _discard_entry(self, key: str) -> bool:
+        """Remove an entry and its accounting. Caller must hold self.lock."""
+        entry = self.cache.pop(key, None)
+        if entry is None:
+            return False
+        _value, _expiry, tables, size_bytes, tenant_id = entry
+        self._total_bytes -= size_bytes
+        partition = self._partitions[tenant_id]
+        partition.entries -= 1
+        partition.bytes -= size_bytes
+        if not partition.entries and tenant_id is not None and not partition.pinned:
+            del self._partitions[tenant_id]
+        for table in tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_table[table]
+        return True
+
+    def _evict_from(self, partition: _TenantPartition) -> None:
+        """Evict the partition policy's victim. Caller must hold self.lock."""
+        victim = partition.policy.evict()
+        if victim is None or victim not in self.cache:
+            # Policy out of step with the cache; fall back to the tenant's oldest entry
+            victim = next(
+                key for key, entry in self.cache.items() if entry[4] == partition.tenant_id
+            )
+            partition.policy.remove(victim)
+        self._discard_entry(victim)
+        partition.evictions += 1
+        self.evictions += 1
+
+    def _fair_share_victim(self, by_memory: bool) -> _TenantPartition:
+        """
+        Partition to evict from when a global limit is hit: the one using the most
+        of the cache relative to its weight, i.e. the furthest over its fair share.
+        """
+        candidates = [partition for partition in self._partitions.values() if partition.entries]
+        if by_memory:
+            return max(candidates, key=lambda partition: partition.bytes / partition.weight)
+        return max(candidates, key=lambda partition: partition.entries / partition.weight)
+
+    def _evict_if_needed(self, partition: _TenantPartition, incoming_bytes: int = 0):
+        """Evict entries if the tenant's quota or the global size/memory limits are exceeded"""
         evicted = False
 
+        # Tenant quota: only the tenant's own entries are evicted
+        while partition.entries and partition.over_quota(incoming_bytes, 1):
+            self._evict_from(partition)
+            evicted = True
+
         # Check size limit
-        while len(self.cache) >= self.max_size:
-            # Remove least recently used (first item in OrderedDict)
-            if self.cache:
-                self.cache.popitem(last=False)
-                self.evictions += 1
-                evicted = True
+        while self.cache and len(self.cache) >= self.max_size:
+            self._evict_from(self._fair_share_victim(by_memory=False))
+            evicted = True
 
-        # Check memory limit
+        # Check memory limit (leaving room for the entry about to be added)
         if self.max_memory_mb:
-            while self._get_total_memory_mb() > self.max_memory_mb:
-                if self.cache:
-                    self.cache.popitem(last=False)
-                    self.evictions += 1
-                    evicted = True
-                else:
-                    break
+            max_bytes = self.max_memory_mb * 1024 * 1024
+            while self.cache and self._total_bytes + incoming_bytes > max_bytes:
+                self._evict_from(self._fair_share_victim(by_memory=True))
+                evicted = True
 
         if evicted:
             logger.debug(
@@ -137,58 +524,36 @@ class ProductionCache:
         """
         Extract table names from SQL query.
 
-        Enhanced parser that handles:
-        - FROM/JOIN clauses
-        - INSERT/UPDATE/DELETE operations
-        - Subqueries (basic)
-        - Table aliases
-
         Args:
             query: SQL query string
 
         Returns:
-            set: Set of table names referenced in the query
+            set: Set of table names referenced in the query (see query_table_tags)
         """
-        tables: set[str] = set()
-
-        # Normalize query (remove comments, extra whitespace)
-        query_normalized = re.sub(r"--.*?\n", " ", query, flags=re.MULTILINE)
-        query_normalized = re.sub(r"/\*.*?\*/", " ", query_normalized, flags=re.DOTALL)
-        query_normalized = " ".join(query_normalized.split())
-
-        # Patterns to match table names
-        patterns = [
-            r'\bFROM\s+["\']?(\w+)["\']?',  # FROM table
-            r'\bJOIN\s+["\']?(\w+)["\']?',  # JOIN table
-            r'\bINTO\s+["\']?(\w+)["\']?',  # INSERT INTO
-            r'\bUPDATE\s+["\']?(\w+)["\']?',  # UPDATE
-            r'\bTABLE\s+["\']?(\w+)["\']?',  # CREATE TABLE, DROP TABLE
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, query_normalized, re.IGNORECASE)
-            # Filter out SQL keywords that might be matched
-            sql_keywords = {"select", "where", "group", "order", "having", "limit", "offset"}
-            tables.update(m for m in matches if m.lower() not in sql_keywords)
+        return set(query_table_tags(query))
 
-        return tables
-
-    def _make_key(self, query: str, params: QueryParams | None = None) -> str:
-        """Create cache key from query and params"""
+    def _make_key(
+        self, query: str, params: QueryParams | None = None, tenant_id: TenantId = None
+    ) -> str:
+        """Create cache key from query and params (namespaced by tenant)"""
         if params is None:
             params = ()
         # Normalize query (remove extra whitespace)
         query_normalized = " ".join(query.split())
         key_data = f"{query_normalized}:{json.dumps(params, sort_keys=True, default=str)}"
-        return hashlib.sha256(key_data.encode()).hexdigest()
+        digest = hashlib.sha256(key_data.encode()).hexdigest()
+        return digest if tenant_id is None else f"{tenant_id}:{digest}"
 
-    def get(self, query: str, params: QueryParams | None = None) -> JSONValue | None:
+    def get(
+        self, query: str, params: QueryParams | None = None, tenant_id: TenantId = None
+    ) -> JSONValue | None:
         """
         Get cached result if available and not expired.
 
         Args:
             query: SQL query
             params: Query parameters
+            tenant_id: Tenant whose partition to read (None = shared partition)
 
         Returns:
             Cached result or None if not found/expired
@@ -196,24 +561,161 @@ class ProductionCache:
         if params is None:
             params = ()
 
-        key = self._make_key(query, params)
-        current_time = time.time()
+        key = self._make_key(query, params, tenant_id)
 
         with self.lock:
-            if key in self.cache:
-                value, expiry, _tables = self.cache[key]
-                if current_time < expiry:
-                    # Move to end (most recently used)
-                    self.cache.move_to_end(key)
-                    self.hits += 1
-                    return value
-                else:
-                    # Expired, remove it
-                    del self.cache[key]
-                    logger.debug(f"Cache entry expired for query: {query[:50]}...")
-
-            self.misses += 1
-            return None
+            partition = self._partitions.get(tenant_id)
+            if partition is None:
+                # A tenant without a partition has no entries: a plain miss
+                for shadow in self._shadows:
+                    shadow.on_lookup(key)
+                self._partitions[None].policy.on_access(key, False)
+                self._tenant_record_locked(tenant_id).misses += 1
+                self.misses += 1
+                return None
+            value, fresh = self._lookup_locked(key, partition, time.time())
+            return value if fresh else None
+
+    def _lookup_locked(
+        self, key: str, partition: _TenantPartition, current_time: float
+    ) -> tuple[JSONValue | None, bool]:
+        """
+        Look up key, recording a hit or miss. Caller must hold self.lock.
+
+        Returns:
+            (value, True) for a live entry; (value, False) for an expired entry still
+            inside the stale-while-revalidate window; (None, False) otherwise
+        """
+        for shadow in self._shadows:
+            shadow.on_lookup(key)
+        entry = self.cache.get(key)
+        stale_value: JSONValue | None = None
+        if entry is not None:
+            value, expiry, _tables, _size_bytes, _tenant_id = entry
+            if current_time < expiry:
+                partition.policy.on_access(key, True)
+                self._tenant_record_locked(partition.tenant_id).hits += 1
+                self.hits += 1
+                return value, True
+            if current_time < expiry + self.stale_while_revalidate_seconds:
+                # Kept (but counted as a miss) so get_or_compute() can serve it
+                stale_value = value
+            else:
+                # Expired, remove it
+                self._remove_entry(key)
+                logger.debug("Cache entry expired")
+
+        partition.policy.on_access(key, False)
+        self._tenant_record_locked(partition.tenant_id).misses += 1
+        self.misses += 1
+        return stale_value, False
+
+    def get_or_compute(
+        self,
+        query: str,
+        params: QueryParams | None,
+        compute: Callable[[], JSONValue],
+        ttl: int | None = None,
+        tables: Iterable[str] | None = None,
+        tenant_id: TenantId = None,
+    ) -> JSONValue:
+        """
+        Get a cached result, computing it at most once across concurrent callers.
+
+        On a miss the first caller runs compute() and caches the result; concurrent
+        callers for the same key wait for it (and see its exception if it fails)
+        instead of all hitting the database. Within the stale-while-revalidate
+        window an expired result is returned immediately and refreshed by one
+        background thread.
+
+        Args:
+            query: SQL query
+            params: Query parameters
+            compute: Produces the result on a miss (e.g. runs the query)
+            ttl: Time-to-live in seconds (uses default if None)
+            tables: Optional set of table names (auto-extracted if None)
+            tenant_id: Tenant whose partition to read and write
+
+        Returns:
+            Cached, stale or freshly computed result
+        """
+        if params is None:
+            params = ()
+        if tables is None:
+            tables_set = self._extract_tables_from_query(query)
+        else:
+            tables_set = {normalize_table_tag(table) for table in tables}
+
+        key = self._make_key(query, params, tenant_id)
+        partition = self._get_partition(tenant_id)
+
+        with self.lock:
+            value, fresh = self._lookup_locked(key, partition, time.time())
+            if fresh:
+                return value
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = _InFlight(self._generation_locked(tables_set))
+                self._in_flight[key] = flight
+            if value is not None:
+                self.stale_hits += 1
+                if leader:
+                    self.background_refreshes += 1
+            elif not leader:
+                self.coalesced += 1
+
+        args = (key, flight, query, params, compute, ttl, tables_set, tenant_id)
+        if value is not None:
+            # Stale hit: serve it, and refresh in the background unless already underway
+            if leader:
+                threading.Thread(
+                    target=self._run_flight,
+                    args=args,
+                    kwargs={"background": True},
+                    name="production-cache-refresh",
+                    daemon=True,
+                ).start()
+            return value
+
+        if leader:
+            self._run_flight(*args)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _run_flight(
+        self,
+        key: str,
+        flight: _InFlight,
+        query: str,
+        params: QueryParams,
+        compute: Callable[[], JSONValue],
+        ttl: int | None,
+        tables: set[str],
+        tenant_id: TenantId,
+        background: bool = False,
+    ):
+        """Run compute() for a single-flight key, cache the result and wake waiters"""
+        try:
+            flight.value = compute()
+            self._store(query, params, flight.value, ttl, tables, tenant_id, flight.generation)
+        except BaseException as e:
+            flight.error = e
+            if background:
+                # Nobody is waiting; the stale entry stays until the window closes
+                logger.warning(f"Background cache refresh failed: {e}")
+        finally:
+            with self.lock:
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+            flight.done.set()
+
+    def _generation_locked(self, tables: set[str]) -> tuple[int, dict[str, int]]:
+        """Invalidation state for tables. Caller must hold self.lock."""
+        return self._epoch, {table: self._table_generations.get(table, 0) for table in tables}
 
     def set(
         self,
@@ -222,6 +724,7 @@ class ProductionCache:
         value: JSONValue,
         ttl: int | None = None,
         tables: Iterable[str] | None = None,
+        tenant_id: TenantId = None,
     ):
         """
         Cache a query result.
@@ -232,30 +735,60 @@ class ProductionCache:
             value: Result to cache
             ttl: Time-to-live in seconds (uses default if None)
             tables: Optional set of table names (auto-extracted if None)
+            tenant_id: Tenant whose partition (and quota) the entry counts against
         """
-        if ttl is None:
-            ttl = self.default_ttl
-
         # Extract table names from query if not provided
         if tables is None:
             tables_set = self._extract_tables_from_query(query)
         else:
-            # Ensure tables is a set
-            tables_set = set(tables) if not isinstance(tables, set) else tables
+            tables_set = {normalize_table_tag(table) for table in tables}
+
+        self._store(query, params, value, ttl, tables_set, tenant_id)
+
+    def _store(
+        self,
+        query: str,
+        params: QueryParams | None,
+        value: JSONValue,
+        ttl: int | None,
+        tables_set: set[str],
+        tenant_id: TenantId,
+        generation: tuple[int, dict[str, int]] | None = None,
+    ):
+        """Insert an entry; skipped if generation is given and a table was invalidated since"""
+        if ttl is None:
+            ttl = self.default_ttl
 
-        key = self._make_key(query, params)
+        key = self._make_key(query, params, tenant_id)
+        partition = self._get_partition(tenant_id)
         expiry = time.time() + ttl
+        # Sized once, outside the lock
+        size_bytes = len(key) + self._estimate_entry_size(value) + _ENTRY_OVERHEAD_BYTES
 
         with self.lock:
-            # Remove existing entry if present (for LRU update)
-            if key in self.cache:
-                del self.cache[key]
-
-            # Evict if needed before adding
-            self._evict_if_needed()
+            if generation is not None and generation != self._generation_locked(tables_set):
+                logger.debug("Not caching result computed before its tables were invalidated")
+                return
 
-            # Add new entry (at end = most recently used)
-            self.cache[key] = (value, expiry, tables_set)
+            # Remove existing entry if present (for LRU update)
+            self._remove_entry(key)
+
+            # Evict if needed before adding. Either step can empty (and drop) the
+            # tenant's partition, so it is attached only afterwards
+            partition = self._partitions.get(tenant_id, partition)
+            self._evict_if_needed(partition, size_bytes)
+            partition = self._attach_partition_locked(partition)
+
+            # Add new entry
+            self.cache[key] = (value, expiry, tables_set, size_bytes, tenant_id)
+            partition.policy.on_insert(key)
+            for shadow in self._shadows:
+                shadow.on_store(key)
+            partition.entries += 1
+            partition.bytes += size_bytes
+            self._total_bytes += size_bytes
+            for table in tables_set:
+                self._keys_by_table.setdefault(table, set()).add(key)
 
     def invalidate_table(self, table_name: str):
         """
@@ -267,34 +800,64 @@ class ProductionCache:
         if not table_name:
             return
 
-        keys_to_remove = []
-
         with self.lock:
-            for key, (_value, _expiry, tables) in self.cache.items():
-                if table_name in tables:
-                    keys_to_remove.append(key)
-
-            for key in keys_to_remove:
-                if key in self.cache:
-                    del self.cache[key]
-                    self.invalidations += 1
-
-        if keys_to_remove:
-            logger.debug(f"Invalidated {len(keys_to_remove)} cache entries for table: {table_name}")
+            removed = self._invalidate_table_locked(table_name)
+
+        if removed:
+            logger.debug(f"Invalidated {removed} cache entries for table: {table_name}")
+
+    def _invalidate_table_locked(self, table_name: str) -> int:
+        """Remove the entries that reference table_name. Caller must hold self.lock."""
+        table_name = normalize_table_tag(table_name)
+        if self._in_flight:
+            self._table_generations[table_name] = self._table_generations.get(table_name, 0) + 1
+        # Copy: _remove_entry() shrinks the index set while we iterate
+        keys_to_remove = list(self._keys_by_table.get(table_name, ()))
+        for key in keys_to_remove:
+            if self._remove_entry(key):
+                self.invalidations += 1
+        return len(keys_to_remove)
 
     def invalidate_tables(self, table_names: Iterable[str]):
         """Invalidate cache entries for multiple tables"""
-        for table_name in table_names:
-            self.invalidate_table(table_name)
+        removed = 0
+        with self.lock:
+            for table_name in table_names:
+                if table_name:
+                    removed += self._invalidate_table_locked(table_name)
+
+        if removed:
+            logger.debug(f"Invalidated {removed} cache entries for tables")
 
     def clear(self):
         """Clear all cached entries"""
         with self.lock:
             self.cache.clear()
+            self._epoch += 1
+            self._partitions = {
+                tenant_id: partition
+                for tenant_id, partition in self._partitions.items()
+                if tenant_id is None or partition.pinned
+            }
+            for partition in self._partitions.values():
+                partition.policy.clear()
+                partition.entries = 0
+                partition.bytes = 0
+                partition.evictions = 0
+            for record in self._tenants.values():
+                record.hits = 0
+                record.misses = 0
+            for shadow in self._shadows:
+                shadow.clear()
+            self._total_bytes = 0
+            self._keys_by_table.clear()
             self.hits = 0
             self.misses = 0
             self.evictions = 0
             self.invalidations = 0
+            self.coalesced = 0
+            self.stale_hits = 0
+            self.background_refreshes = 0
 
     def get_stats(self) -> JSONDict:
         """Get cache statistics"""
@@ -302,6 +865,24 @@ class ProductionCache:
             total = self.hits + self.misses
             hit_rate = (self.hits / total * 100) if total > 0 else 0.0
             memory_mb = self._get_total_memory_mb()
+            # Lookup counts live on the tenant records, which outlive partitions
+            tenants: JSONDict = {}
+            for tenant_id in {*self._partitions, *self._tenants}:
+                partition = self._partitions.get(tenant_id)
+                record = self._tenants.get(tenant_id) or _TenantRecord()
+                if not (record.hits or record.misses) and (
+                    partition is None or (tenant_id is None and not partition.entries)
+                ):
+                    continue
+                tenants[_SHARED_PARTITION if tenant_id is None else str(tenant_id)] = {
+                    **record.describe(),
+                    **(partition.describe() if partition is not None else {"size": 0}),
+                }
+            policy_segments: dict[str, int] = {}
+            for partition in self._partitions.values():
+                for name, count in partition.policy.describe().items():
+                    if isinstance(count, int):
+                        policy_segments[name] = policy_segments.get(name, 0) + count
 
             return {
                 "hits": self.hits,
@@ -311,24 +892,38 @@ class ProductionCache:
                 "max_size": self.max_size,
                 "evictions": self.evictions,
                 "invalidations": self.invalidations,
+                "coalesced": self.coalesced,
+                "stale_hits": self.stale_hits,
+                "background_refreshes": self.background_refreshes,
+                "in_flight": len(self._in_flight),
+                "stale_while_revalidate_seconds": self.stale_while_revalidate_seconds,
                 "memory_mb": round(memory_mb, 2),
                 "max_memory_mb": self.max_memory_mb,
+                "eviction_policy": self.eviction_policy,
+                "policy_segments": cast(JSONDict, policy_segments),
+                # Shadow policies simulate one unpartitioned cache with the max_size
+                # limit only (no memory limit or tenant quotas)
+                "policy_hit_ratios": {
+                    self.eviction_policy: round(hit_rate, 2),
+                    **{shadow.policy.name: shadow.hit_rate_pct() for shadow in self._shadows},
+                },
+                "tenants": tenants,
             }
 
     def cleanup_expired(self):
-        """Remove expired entries (call periodically)"""
-        current_time = time.time()
+        """Remove expired entries past the stale-while-revalidate window (call periodically)"""
+        current_time = time.time() - self.stale_while_revalidate_seconds
         expired_count = 0
 
         with self.lock:
             keys_to_remove = [
                 key
-                for key, (_value, expiry, _tables) in self.cache.items()
+                for key, (_value, expiry, _tables, _size_bytes, _tenant_id) in self.cache.items()
                 if current_time >= expiry
             ]
 
             for key in keys_to_remove:
-                del self.cache[key]
+                self._remove_entry(key)
                 expired_count += 1
 
         if expired_count > 0:
@@ -397,16 +992,60 @@ def get_production_cache() -> ProductionCache | None:
             else None
         )
 
-        _global_cache = ProductionCache(
-            default_ttl=default_ttl, max_size=max_size, max_memory_mb=max_memory_mb
-        )
+        stale_while_revalidate = float(os.getenv("CACHE_STALE_WHILE_REVALIDATE_SECONDS", "0"))
+        eviction_policy = os.getenv("CACHE_EVICTION_POLICY", DEFAULT_EVICTION_POLICY)
+        shadow_policies = [
+            name.strip()
+            for name in os.getenv("CACHE_SHADOW_POLICIES", "").split(",")
+            if name.strip()
+        ]
+
+        from src.per_tenant_config import get_tenant_cache_quota
+
+        try:
+            _global_cache = ProductionCache(
+                default_ttl=default_ttl,
+                max_size=max_size,
+                max_memory_mb=max_memory_mb,
+                eviction_policy=eviction_policy,
+                shadow_policies=shadow_policies,
+                tenant_quota_resolver=get_tenant_cache_quota,
+                stale_while_revalidate_seconds=stale_while_revalidate,
+            )
+        except ValueError as e:
+            logger.warning(f"Invalid cache eviction settings: {e}, using {DEFAULT_EVICTION_POLICY}")
+            eviction_policy = DEFAULT_EVICTION_POLICY
+            _global_cache = ProductionCache(
+                default_ttl=default_ttl,
+                max_size=max_size,
+                max_memory_mb=max_memory_mb,
+                tenant_quota_resolver=get_tenant_cache_quota,
+                stale_while_revalidate_seconds=stale_while_revalidate,
+            )
         logger.info(
-            f"Production cache initialized (TTL: {default_ttl}s, Max size: {max_size}, Max memory: {max_memory_mb}MB)"
+            f"Production cache initialized (TTL: {default_ttl}s, Max size: {max_size}, "
+            f"Max memory: {max_memory_mb}MB, Eviction: {eviction_policy}, "
+            f"Stale-while-revalidate: {stale_while_revalidate}s)"
         )
 
     return _global_cache
 
 
+def get_production_cache_stats() -> JSONDict:
+    """Get application cache statistics, including per-tenant hit rates and memory"""
+    cache = get_production_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.get_stats()}
+
+
+def invalidate_tenant_cache_quota(tenant_id: TenantId):
+    """Re-resolve a tenant's cache quota after its config changed"""
+    cache = _global_cache
+    if cache:
+        cache.invalidate_tenant_quota(tenant_id)
+
+
 def invalidate_cache_for_table(table_name: str):
     """Invalidate cache for a table after data mutations"""
     cache = get_production_cache()
@@ -11,13 +11,22 @@ import json
 import logging
 import threading
 import time
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import cast
 
-from psycopg2.extras import RealDictRow
+from psycopg2.extras import RealDictCursor, RealDictRow
 
 from src.config_loader import ConfigLoader
-from src.db import get_cursor
+from src.db import get_connection, get_cursor
+from src.explain_cache import (
+    get_explain_cache,
+    invalidate_tables,
+    lookup_plan,
+    plan_relations,
+    reset_table_versions,
+    set_explain_cache,
+    store_plan,
+)
 from src.type_definitions import JSONDict, JSONValue, QueryParams
 
 logger = logging.getLogger(__name__)
@@ -30,14 +39,9 @@ except Exception as e:
     _config_loader = ConfigLoader()
 
 # Constants for query analyzer
-DEFAULT_CACHE_MAX_SIZE = 100  # Maximum cached plans
-DEFAULT_CACHE_TTL = 3600  # Cache TTL in seconds (1 hour)
 DEFAULT_HIGH_COST_THRESHOLD = 100  # Cost threshold for index recommendations
 DEFAULT_RETRY_BASE_DELAY = 0.1  # Base delay for exponential backoff (seconds)
-
-# EXPLAIN result cache (LRU cache)
-_explain_cache: OrderedDict[str, tuple[JSONDict, float]] = OrderedDict()
-_cache_lock = threading.Lock()
+DEFAULT_BATCH_MAX_WORKERS = 4  # Pooled connections used by batch EXPLAIN
 
 # EXPLAIN success rate tracking
 _explain_stats = {
@@ -51,16 +55,6 @@ _explain_stats = {
 _stats_lock = threading.Lock()
 
 
-def _get_cache_max_size() -> int:
-    """Get cache max size from config or default"""
-    return _config_loader.get_int("features.query_analyzer.cache_max_size", DEFAULT_CACHE_MAX_SIZE)
-
-
-def _get_cache_ttl() -> int:
-    """Get cache TTL from config or default"""
-    return _config_loader.get_int("features.query_analyzer.cache_ttl", DEFAULT_CACHE_TTL)
-
-
 def _get_high_cost_threshold() -> float:
     """Get high cost threshold from config or default"""
     return _config_loader.get_float(
@@ -128,6 +122,161 @@ def reset_explain_stats() -> None:
         )
 
 
+def _extract_plan_node(result: object) -> dict[str, JSONValue] | None:
+    """
+    Extract the top plan node from an EXPLAIN (FORMAT JSON) result row.
+
+    Handles both RealDictCursor rows and tuple rows, and plan data returned either
+    as a JSON string or already decoded by psycopg2.
+
+    Returns:
+        The "Plan" node dict, or None if the row holds no usable plan
+    """
+    if not result:
+        return None
+
+    if isinstance(result, dict):
+        values = list(result.values())
+    elif isinstance(result, tuple | list):
+        values = list(result)
+    else:
+        return None
+
+    plan_data: str | list[dict[str, JSONValue]] | None = None
+    for col_value in values:
+        if col_value is None:
+            continue
+        if isinstance(col_value, str):
+            plan_data = col_value
+            break
+        if isinstance(col_value, list) and all(isinstance(item, dict) for item in col_value):
+            plan_data = cast(list[dict[str, JSONValue]], col_value)
+            break
+
+    if isinstance(plan_data, str):
+        try:
+            parsed = json.loads(plan_data)
+        except json.JSONDecodeError as e:
+            logger.debug(f"EXPLAIN JSON decode failed: {e}")
+            return None
+        if not isinstance(parsed, list):
+            return None
+        plan = parsed
+    elif isinstance(plan_data, list):
+        plan = plan_data
+    else:
+        return None
+
+    first_plan = plan[0] if plan else None
+    if not isinstance(first_plan, dict):
+        return None
+    plan_node = first_plan.get("Plan")
+    if not isinstance(plan_node, dict):
+        return None
+    return plan_node
+
+
+def _build_fast_plan_analysis(
+    plan_node: dict[str, JSONValue],
+    query: str,
+    materialized_views: list[JSONDict] | None = None,
+) -> JSONDict:
+    """
+    Build the analyze_query_plan_fast() result for a plan node.
+
+    Args:
+        plan_node: Top "Plan" node from EXPLAIN (FORMAT JSON)
+        query: SQL query the plan belongs to
+        materialized_views: Pre-fetched find_materialized_views() result (batch callers
+            look it up once instead of once per plan)
+    """
+    total_cost_val = plan_node.get("Total Cost", 0)
+    total_cost = float(total_cost_val) if isinstance(total_cost_val, int | float) else 0.0
+    node_type_val = plan_node.get("Node Type", "Unknown")
+    node_type = str(node_type_val) if node_type_val is not None else "Unknown"
+
+    analysis: JSONDict = {
+        "total_cost": total_cost,
+        "actual_time_ms": 0,  # Not available without ANALYZE
+        "node_type": node_type,
+        "planning_time_ms": 0,  # Not available without ANALYZE
+        "has_seq_scan": _has_sequential_scan(plan_node),
+        "has_index_scan": _has_index_scan(plan_node),
+        "needs_index": False,
+        "recommendations": [],
+        "from_cache": False,
+        "retry_attempt": 0,
+    }
+
+    # Determine if index would help
+    high_cost_threshold = _get_high_cost_threshold()
+    analysis_total_cost_val = analysis.get("total_cost", 0.0)
+    analysis_total_cost_float = (
+        float(analysis_total_cost_val) if isinstance(analysis_total_cost_val, int | float) else 0.0
+    )
+    analysis_has_seq_scan = analysis.get("has_seq_scan", False)
+    if (
+        isinstance(analysis_has_seq_scan, bool)
+        and analysis_has_seq_scan
+        and analysis_total_cost_float > high_cost_threshold
+    ):
+        analysis["needs_index"] = True
+        recommendations = analysis.get("recommendations", [])
+        if isinstance(recommendations, list):
+            recommendations.append(
+                f"Sequential scan detected (cost: {analysis_total_cost_float:.2f}). "
+                "Consider creating an index on filtered columns."
+            )
+
+    # Check for nested loops (can be slow)
+    node_type_check = plan_node.get("Node Type")
+    if isinstance(node_type_check, str) and node_type_check == "Nested Loop":
+        recommendations = analysis.get("recommendations", [])
+        if isinstance(recommendations, list):
+            recommendations.append("Nested loop join detected. Consider indexes on join columns.")
+
+    # QPG Enhancement: Add QPG analysis for better bottleneck identification
+    # Enhanced with diverse plan generation
+    try:
+        from src.algorithms.qpg import enhance_plan_analysis
+
+        analysis = enhance_plan_analysis(analysis, plan_node, query=query)
+    except Exception as e:
+        logger.debug(f"QPG enhancement failed: {e}")
+        # Continue with base analysis if QPG fails
+
+    # ✅ INTEGRATION: Check if query involves materialized views
+    try:
+        from src.materialized_view_support import find_materialized_views
+
+        query_lower = query.lower() if query else ""
+        # Check if query references any materialized views
+        mvs = (
+            materialized_views
+            if materialized_views is not None
+            else find_materialized_views(schema_name="public")
+        )
+        for mv in mvs:
+            mv_name = mv.get("name", "")
+            if mv_name and mv_name.lower() in query_lower:
+                analysis["involves_materialized_view"] = True
+                analysis["materialized_view"] = mv.get("full_name", mv_name)
+                # Add recommendation to check MV indexes
+                if "recommendations" not in analysis:
+                    analysis["recommendations"] = []
+                recommendations = analysis["recommendations"]
+                if isinstance(recommendations, list):
+                    recommendations.append(
+                        f"Query involves materialized view {mv_name}. Consider indexes on MV for better refresh performance."
+                    )
+                break
+    except Exception as e:
+        logger.debug(f"Materialized view check failed: {e}")
+        # Silently fail - MV support is optional
+
+    return analysis
+
+
 def analyze_query_plan_fast(query, params=None, use_cache=True, max_retries=3):
     """
     Analyze query execution plan using EXPLAIN (without ANALYZE).
@@ -144,23 +293,9 @@ def analyze_query_plan_fast(query, params=None, use_cache=True, max_retries=3):
     Returns:
         dict with plan analysis including cost, node type, and recommendations
     """
-    # Handle None params properly - convert to empty tuple
-    if params is None:
-        params = ()
-    elif not isinstance(params, list | tuple):
-        # Handle single parameter case
-        params = (params,)
-
-    # Validate and sanitize parameters to prevent NULL-related issues
+    # Handle None params and sanitize NULL values that would break EXPLAIN
     try:
-        sanitized_params = []
-        for param in params:
-            if param is None:
-                # Replace None with a placeholder that won't cause EXPLAIN issues
-                sanitized_params.append("")  # Empty string for NULL values
-            else:
-                sanitized_params.append(param)
-        params = tuple(sanitized_params)
+        params = _sanitize_explain_params(params)
     except Exception as e:
         logger.warning(f"Parameter sanitization failed: {e}, using empty params")
         params = ()
@@ -168,21 +303,12 @@ def analyze_query_plan_fast(query, params=None, use_cache=True, max_retries=3):
     # Check cache first
     if use_cache:
         cache_key = _get_query_signature(query, params)
-        with _cache_lock:
-            if cache_key in _explain_cache:
-                cached_result, cached_time = _explain_cache[cache_key]
-                # Check if cache is still valid
-                cache_ttl = _get_cache_ttl()
-                if time.time() - cached_time < cache_ttl:
-                    # Move to end (LRU)
-                    _explain_cache.move_to_end(cache_key)
-                    logger.debug(f"Using cached EXPLAIN plan for query signature: {cache_key[:8]}")
-                    with _stats_lock:
-                        _explain_stats["cached_hits"] += 1
-                    return cached_result
-                else:
-                    # Expired, remove
-                    del _explain_cache[cache_key]
+        cached_result = _get_cached_fast_plan(cache_key)
+        if cached_result is not None:
+            logger.debug(f"Using cached EXPLAIN plan for query signature: {cache_key[:8]}")
+            with _stats_lock:
+                _explain_stats["cached_hits"] += 1
+            return cached_result
 
     # Track attempt
     with _stats_lock:
@@ -199,247 +325,24 @@ def analyze_query_plan_fast(query, params=None, use_cache=True, max_retries=3):
                 cursor.execute(explain_query, params)
                 result: RealDictRow | None = cursor.fetchone()
 
-                if not result:
-                    if attempt < max_retries - 1:
-                        wait_time = retry_base_delay * (2**attempt)
-                        logger.debug(
-                            f"EXPLAIN (fast) attempt {attempt + 1}/{max_retries} returned no result, "
-                            f"retrying in {wait_time:.2f}s"
-                        )
-                        time.sleep(wait_time)
-                        continue
-                    return None
-
-                # RealDictCursor returns a dict, extract EXPLAIN output from first column value
-                # Handle both dict (RealDictCursor) and tuple results safely
-                plan_data: str | list[dict[str, JSONValue]] | None = None
-                # RealDictRow is dict[str, object], but we need to handle it as a dict
-                if isinstance(result, dict):
-                    for col_value in result.values():
-                        if col_value is not None:
-                            if isinstance(col_value, str):
-                                plan_data = col_value
-                                break
-                            elif isinstance(col_value, list) and all(
-                                isinstance(item, dict) for item in col_value
-                            ):
-                                plan_data = cast(list[dict[str, JSONValue]], col_value)
-                                break
-
-                # Check if we still need to extract from result (fallback for non-dict results)
-                if plan_data is None:
-                    # Handle tuple/list result - use safe helper
-
-                    from src.db import safe_get_row_value
-
-                    # Type narrowing: result could be various types at runtime
-                    # Use object to allow runtime type checking
-                    result_any: object = result
-                    if isinstance(result_any, tuple | list):
-                        for i in range(len(result_any)):
-                            col_value = safe_get_row_value(result_any, i, None)
-                            if col_value is not None:
-                                if isinstance(col_value, str):
-                                    plan_data = col_value
-                                    break
-                                elif isinstance(col_value, list) and all(
-                                    isinstance(item, dict) for item in col_value
-                                ):
-                                    plan_data = cast(list[dict[str, JSONValue]], col_value)
-                                    break
-
-                if plan_data is None:
-                    if attempt < max_retries - 1:
-                        wait_time = retry_base_delay * (2**attempt)
-                        logger.debug(
-                            f"EXPLAIN (fast) attempt {attempt + 1}/{max_retries} returned no plan data, "
-                            f"retrying in {wait_time:.2f}s"
-                        )
-                        time.sleep(wait_time)
-                        continue
-                    return None
-
-                # Handle different plan_data types with explicit type checking
-                if isinstance(plan_data, str):
-                    try:
-                        parsed = json.loads(plan_data)
-                        if isinstance(parsed, list):
-                            plan = parsed
-                        else:
-                            # Invalid JSON structure
-                            if attempt < max_retries - 1:
-                                wait_time = retry_base_delay * (2**attempt)
-                                logger.debug(
-                                    f"EXPLAIN (fast) attempt {attempt + 1}/{max_retries} returned invalid JSON structure, "
-                                    f"retrying in {wait_time:.2f}s"
-                                )
-                                time.sleep(wait_time)
-                                continue
-                            return None
-                    except json.JSONDecodeError as e:
-                        if attempt < max_retries - 1:
-                            wait_time = retry_base_delay * (2**attempt)
-                            logger.debug(
-                                f"EXPLAIN (fast) attempt {attempt + 1}/{max_retries} JSON decode failed: {e}, "
-                                f"retrying in {wait_time:.2f}s"
-                            )
-                            time.sleep(wait_time)
-                            continue
-                        logger.warning(
-                            f"EXPLAIN JSON decode failed after {max_retries} attempts: {e}"
-                        )
-                        return None
-                elif isinstance(plan_data, list):
-                    plan = plan_data
-                else:
-                    # Handle unexpected data types for runtime safety
-                    # Type narrowing: plan_data should be str | list | None at this point
-                    # but we keep this branch for defensive programming
-                    # Mypy considers this unreachable, but it's kept for runtime safety
-                    logger.warning(  # type: ignore[unreachable]
-                        f"EXPLAIN (fast) returned unexpected data type: {type(plan_data)}"
-                    )
-                    if attempt < max_retries - 1:
-                        wait_time = retry_base_delay * (2**attempt)
-                        logger.debug(
-                            f"EXPLAIN (fast) attempt {attempt + 1}/{max_retries} returned unexpected data type, "
-                            f"retrying in {wait_time:.2f}s"
-                        )
-                        time.sleep(wait_time)
-                        continue
-                    return None
-
-                # Extract plan information
-                if not plan or len(plan) == 0:
-                    if attempt < max_retries - 1:
-                        wait_time = retry_base_delay * (2**attempt)
-                        logger.debug(
-                            f"EXPLAIN (fast) attempt {attempt + 1}/{max_retries} returned invalid plan structure, "
-                            f"retrying in {wait_time:.2f}s"
-                        )
-                        time.sleep(wait_time)
-                        continue
-                    return None
-                # Safe access to plan[0] - we've checked len(plan) > 0 above
-                first_plan = plan[0] if isinstance(plan, list) and len(plan) > 0 else {}
-                if not isinstance(first_plan, dict) or "Plan" not in first_plan:
+                plan_node = _extract_plan_node(result)
+                if plan_node is None:
                     if attempt < max_retries - 1:
                         wait_time = retry_base_delay * (2**attempt)
                         logger.debug(
-                            f"EXPLAIN (fast) attempt {attempt + 1}/{max_retries} returned invalid plan structure, "
+                            f"EXPLAIN (fast) attempt {attempt + 1}/{max_retries} returned no usable plan, "
                             f"retrying in {wait_time:.2f}s"
                         )
                         time.sleep(wait_time)
                         continue
                     return None
-                plan_node_value = first_plan.get("Plan")
-                if not isinstance(plan_node_value, dict):
-                    if attempt < max_retries - 1:
-                        wait_time = retry_base_delay * (2**attempt)
-                        logger.debug(
-                            f"EXPLAIN (fast) attempt {attempt + 1}/{max_retries} returned invalid plan node, "
-                            f"retrying in {wait_time:.2f}s"
-                        )
-                        time.sleep(wait_time)
-                        continue
-                    return None
-                plan_node: dict[str, JSONValue] = plan_node_value
 
-                total_cost_val = plan_node.get("Total Cost", 0)
-                total_cost = (
-                    float(total_cost_val) if isinstance(total_cost_val, int | float) else 0.0
-                )
-                node_type_val = plan_node.get("Node Type", "Unknown")
-                node_type = str(node_type_val) if node_type_val is not None else "Unknown"
-
-                analysis: JSONDict = {
-                    "total_cost": total_cost,
-                    "actual_time_ms": 0,  # Not available without ANALYZE
-                    "node_type": node_type,
-                    "planning_time_ms": 0,  # Not available without ANALYZE
-                    "has_seq_scan": _has_sequential_scan(plan_node),
-                    "has_index_scan": _has_index_scan(plan_node),
-                    "needs_index": False,
-                    "recommendations": [],
-                    "from_cache": False,
-                    "retry_attempt": attempt,  # Track which retry succeeded
-                }
-
-                # Determine if index would help
-                high_cost_threshold = _get_high_cost_threshold()
-                analysis_total_cost_val = analysis.get("total_cost", 0.0)
-                analysis_total_cost_float = (
-                    float(analysis_total_cost_val)
-                    if isinstance(analysis_total_cost_val, int | float)
-                    else 0.0
-                )
-                analysis_has_seq_scan = analysis.get("has_seq_scan", False)
-                if (
-                    isinstance(analysis_has_seq_scan, bool)
-                    and analysis_has_seq_scan
-                    and analysis_total_cost_float > high_cost_threshold
-                ):
-                    analysis["needs_index"] = True
-                    recommendations = analysis.get("recommendations", [])
-                    if isinstance(recommendations, list):
-                        recommendations.append(
-                            f"Sequential scan detected (cost: {analysis_total_cost_float:.2f}). "
-                            "Consider creating an index on filtered columns."
-                        )
-
-                # Check for nested loops (can be slow)
-                node_type_check = plan_node.get("Node Type")
-                if isinstance(node_type_check, str) and node_type_check == "Nested Loop":
-                    recommendations = analysis.get("recommendations", [])
-                    if isinstance(recommendations, list):
-                        recommendations.append(
-                            "Nested loop join detected. Consider indexes on join columns."
-                        )
-
-                # QPG Enhancement: Add QPG analysis for better bottleneck identification
-                # Enhanced with diverse plan generation
-                try:
-                    from src.algorithms.qpg import enhance_plan_analysis
-
-                    analysis = enhance_plan_analysis(analysis, plan_node, query=query)
-                except Exception as e:
-                    logger.debug(f"QPG enhancement failed: {e}")
-                    # Continue with base analysis if QPG fails
-
-                # ✅ INTEGRATION: Check if query involves materialized views
-                try:
-                    from src.materialized_view_support import find_materialized_views
-
-                    query_lower = query.lower() if query else ""
-                    # Check if query references any materialized views
-                    mvs = find_materialized_views(schema_name="public")
-                    for mv in mvs:
-                        mv_name = mv.get("name", "")
-                        if mv_name and mv_name.lower() in query_lower:
-                            analysis["involves_materialized_view"] = True
-                            analysis["materialized_view"] = mv.get("full_name", mv_name)
-                            # Add recommendation to check MV indexes
-                            if "recommendations" not in analysis:
-                                analysis["recommendations"] = []
-                            recommendations = analysis["recommendations"]
-                            if isinstance(recommendations, list):
-                                recommendations.append(
-                                    f"Query involves materialized view {mv_name}. Consider indexes on MV for better refresh performance."
-                                )
-                            break
-                except Exception as e:
-                    logger.debug(f"Materialized view check failed: {e}")
-                    # Silently fail - MV support is optional
+                analysis = _build_fast_plan_analysis(plan_node, query)
+                analysis["retry_attempt"] = attempt  # Track which retry succeeded
 
                 # Cache the result
                 if use_cache:
-                    cache_key = _get_query_signature(query, params)
-                    cache_max_size = _get_cache_max_size()
-                    with _cache_lock:
-                        # Remove oldest if cache is full
-                        if len(_explain_cache) >= cache_max_size:
-                            _explain_cache.popitem(last=False)
-                        _explain_cache[cache_key] = (analysis, time.time())
+                    _cache_fast_plan(_get_query_signature(query, params), analysis, plan_node)
 
                 # Track success
                 with _stats_lock:
@@ -470,6 +373,214 @@ def analyze_query_plan_fast(query, params=None, use_cache=True, max_retries=3):
                 return None
 
 
+def _sanitize_explain_params(params: object) -> tuple:
+    """Normalize EXPLAIN params the same way analyze_query_plan_fast() does"""
+    if params is None:
+        return ()
+    if not isinstance(params, list | tuple):
+        params = (params,)
+    # Replace None with a placeholder that won't cause EXPLAIN issues
+    return tuple("" if param is None else param for param in params)
+
+
+def _get_cached_fast_plan(cache_key: str) -> JSONDict | None:
+    """Return a cached EXPLAIN analysis whose tables are unchanged, or None"""
+    return lookup_plan(cache_key)
+
+
+def _cache_fast_plan(cache_key: str, analysis: JSONDict, plan_node: dict[str, JSONValue]) -> None:
+    """Store an EXPLAIN analysis tagged with the versions of the tables in its plan"""
+    store_plan(cache_key, analysis, plan_relations(plan_node))
+
+
+def invalidate_explain_cache_for_tables(tables: list[str]) -> int:
+    """
+    Evict cached EXPLAIN plans that scan any of the given tables.
+
+    Call after creating or dropping indexes so plans are rebuilt immediately.
+
+    Returns:
+        Number of cached plans evicted
+    """
+    return invalidate_tables(tables)
+
+
+def clear_explain_cache() -> None:
+    """Drop every cached EXPLAIN analysis (all tiers of the configured backend)"""
+    get_explain_cache().clear()
+    reset_table_versions()
+
+
+def reset_explain_cache() -> None:
+    """Rebuild the EXPLAIN cache from config on next use (e.g. after a backend change)"""
+    set_explain_cache(None)
+
+
+def _get_batch_max_workers() -> int:
+    """Get the number of pooled connections used by batch EXPLAIN"""
+    return max(
+        1,
+        _config_loader.get_int(
+            "features.query_analyzer.batch_max_workers", DEFAULT_BATCH_MAX_WORKERS
+        ),
+    )
+
+
+def _explain_batch_chunk(
+    chunk: list[tuple[str, str, tuple]],
+    materialized_views: list[JSONDict] | None,
+) -> dict[str, tuple[JSONDict, list[str]] | None]:
+    """
+    Run the EXPLAINs for one chunk on a single pooled connection.
+
+    All EXPLAINs share one transaction; each runs under a savepoint so a failing
+    query doesn't abort the rest of the chunk.
+
+    Returns:
+        Mapping of cache key to (analysis, relations scanned by the plan), or None
+    """
+    results: dict[str, tuple[JSONDict, list[str]] | None] = {}
+    with get_connection() as conn:
+        use_savepoints = not conn.autocommit
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            for cache_key, query, params in chunk:
+                if use_savepoints:
+                    cursor.execute("SAVEPOINT indexpilot_batch_explain")
+                try:
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+                    plan_node = _extract_plan_node(cursor.fetchone())
+                    if use_savepoints:
+                        cursor.execute("RELEASE SAVEPOINT indexpilot_batch_explain")
+                except Exception as e:
+                    if use_savepoints:
+                        cursor.execute("ROLLBACK TO SAVEPOINT indexpilot_batch_explain")
+                    logger.debug(f"Batch EXPLAIN failed for query: {query[:100]}...: {e}")
+                    results[cache_key] = None
+                    continue
+                results[cache_key] = (
+                    (
+                        _build_fast_plan_analysis(plan_node, query, materialized_views),
+                        plan_relations(plan_node),
+                    )
+                    if plan_node is not None
+                    else None
+                )
+        finally:
+            cursor.close()
+    return results
+
+
+def analyze_query_plans_fast_batch(
+    queries: list[str],
+    params_list: list[QueryParams | None] | None = None,
+    use_cache: bool = True,
+    max_workers: int | None = None,
+) -> list[JSONDict | None]:
+    """
+    Analyze many query plans with EXPLAIN (without ANALYZE) in one batch.
+
+    Identical (query, params) signatures are explained once. Cache misses are
+    spread across up to max_workers pooled connections that run in parallel,
+    each issuing its share of EXPLAINs inside a single transaction. Unlike
+    analyze_query_plan_fast(), failed EXPLAINs are not retried; their slot is None.
+
+    Args:
+        queries: SQL query strings
+        params_list: Per-query parameters (same length as queries, or None)
+        use_cache: Whether to read and populate the EXPLAIN cache
+        max_workers: Maximum parallel connections (default from config)
+
+    Returns:
+        One analysis dict (or None) per input query, in input order
+    """
+    if params_list is None:
+        params_list = [None] * len(queries)
+    if len(params_list) != len(queries):
+        raise ValueError("params_list must have the same length as queries")
+
+    keys: list[str] = []
+    resolved: dict[str, JSONDict | None] = {}
+    pending: dict[str, tuple[str, str, tuple]] = {}
+    cached_hits = 0
+    for query, raw_params in zip(queries, params_list, strict=True):
+        params = _sanitize_explain_params(raw_params)
+        cache_key = _get_query_signature(query, params)
+        keys.append(cache_key)
+        if cache_key in resolved or cache_key in pending:
+            continue
+        if use_cache:
+            cached = _get_cached_fast_plan(cache_key)
+            if cached is not None:
+                resolved[cache_key] = cached
+                cached_hits += 1
+                continue
+        pending[cache_key] = (cache_key, query, params)
+
+    if cached_hits:
+        with _stats_lock:
+            _explain_stats["cached_hits"] += cached_hits
+
+    if pending:
+        work = list(pending.values())
+        workers = min(max_workers or _get_batch_max_workers(), len(work))
+        # Round-robin so each connection gets a similar number of EXPLAINs
+        chunks = [work[i::workers] for i in range(workers)]
+
+        # Materialized views are looked up once for the whole batch
+        materialized_views: list[JSONDict] | None = None
+        try:
+            from src.materialized_view_support import find_materialized_views
+
+            materialized_views = find_materialized_views(schema_name="public")
+        except Exception as e:
+            logger.debug(f"Materialized view lookup failed: {e}")
+            materialized_views = []
+
+        with _stats_lock:
+            _explain_stats["total_attempts"] += len(work)
+            _explain_stats["fast_explain_used"] += len(work)
+
+        explained: dict[str, tuple[JSONDict, list[str]] | None] = {}
+        if workers == 1:
+            try:
+                explained.update(_explain_batch_chunk(chunks[0], materialized_views))
+            except Exception as e:
+                logger.warning(f"Batch EXPLAIN chunk failed: {e}")
+                explained.update({cache_key: None for cache_key, _, _ in chunks[0]})
+        else:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="indexpilot-explain"
+            ) as executor:
+                futures = [
+                    executor.submit(_explain_batch_chunk, chunk, materialized_views)
+                    for chunk in chunks
+                ]
+                for future, chunk in zip(futures, chunks, strict=True):
+                    try:
+                        explained.update(future.result())
+                    except Exception as e:
+                        # Connection-level failure: every query in the chunk fails
+                        logger.warning(f"Batch EXPLAIN chunk failed: {e}")
+                        explained.update({cache_key: None for cache_key, _, _ in chunk})
+
+        successful = 0
+        for cache_key, explained_plan in explained.items():
+            if explained_plan is None:
+                resolved[cache_key] = None
+                continue
+            analysis, relations = explained_plan
+            resolved[cache_key] = analysis
+            successful += 1
+            if use_cache:
+                store_plan(cache_key, analysis, relations)
+        with _stats_lock:
+            _explain_stats["successful"] += successful
+            _explain_stats["failed"] += len(work) - successful
+
+    return [resolved.get(cache_key) for cache_key in keys]
+
+
 def analyze_query_plan(query, params=None, use_cache=True, max_retries=3):
     """
     Analyze query execution plan using EXPLAIN ANALYZE.
@@ -497,24 +608,13 @@ def analyze_query_plan(query, params=None, use_cache=True, max_retries=3):
     # Check cache first
     if use_cache:
         cache_key = _get_query_signature(query, params)
-        cache_ttl = _get_cache_ttl()
-        with _cache_lock:
-            if cache_key in _explain_cache:
-                cached_result, cached_time = _explain_cache[cache_key]
-                # Check if cache is still valid
-                if time.time() - cached_time < cache_ttl:
-                    # Move to end (LRU)
-                    _explain_cache.move_to_end(cache_key)
-                    logger.debug(
-                        f"Using cached EXPLAIN ANALYZE plan for query signature: {cache_key[:8]}"
-                    )
-                    with _stats_lock:
-                        _explain_stats["cached_hits"] += 1
-                        _explain_stats["successful"] += 1
-                    return cached_result
-                else:
-                    # Expired, remove
-                    del _explain_cache[cache_key]
+        cached_result = _get_cached_fast_plan(cache_key)
+        if cached_result is not None:
+            logger.debug(f"Using cached EXPLAIN ANALYZE plan for query signature: {cache_key[:8]}")
+            with _stats_lock:
+                _explain_stats["cached_hits"] += 1
+                _explain_stats["successful"] += 1
+            return cached_result
 
     # Retry logic for transient failures
     for attempt in range(max_retries):
@@ -673,13 +773,9 @@ def analyze_query_plan(query, params=None, use_cache=True, max_retries=3):
 
                         # Cache the result
                         if use_cache:
-                            cache_key = _get_query_signature(query, params)
-                            cache_max_size = _get_cache_max_size()
-                            with _cache_lock:
-                                # Remove oldest if cache is full
-                                if len(_explain_cache) >= cache_max_size:
-                                    _explain_cache.popitem(last=False)
-                                _explain_cache[cache_key] = (analysis, time.time())
+                            _cache_fast_plan(
+                                _get_query_signature(query, params), analysis, plan_node
+                            )
 
                         # Track success
                         with _stats_lock:
@@ -23,7 +23,11 @@ from src.database.type_detector import (
     get_recommended_cache_strategy,
 )
 from src.db import get_connection
-from src.production_cache import get_production_cache, invalidate_cache_for_tables
+from src.production_cache import (
+    get_production_cache,
+    invalidate_cache_for_tables,
+    query_table_tags,
+)
 from src.query_interceptor import intercept_query
 from src.type_definitions import JSONValue, QueryParams, QueryResults
 
@@ -51,7 +55,8 @@ def _extract_tables_from_mutation(query: str) -> set[str]:
     """
     Extract table names from mutation queries.
 
-    Uses the same logic as the centralized cache system's table extraction.
+    Uses the centralized cache system's table extraction, so the names match the
+    tags cache entries were stored under.
 
     Args:
         query: SQL query string
@@ -59,31 +64,7 @@ def _extract_tables_from_mutation(query: str) -> set[str]:
     Returns:
         set: Set of table names affected by the mutation
     """
-    import re
-
-    tables: set[str] = set()
-
-    # Normalize query (remove comments, extra whitespace) - same as cache system
-    query_normalized = re.sub(r"--.*?\n", " ", query, flags=re.MULTILINE)
-    query_normalized = re.sub(r"/\*.*?\*/", " ", query_normalized, flags=re.DOTALL)
-    query_normalized = " ".join(query_normalized.split())
-
-    # Patterns to match table names (same patterns as cache system)
-    patterns = [
-        r'\bFROM\s+["\']?(\w+)["\']?',  # FROM table
-        r'\bJOIN\s+["\']?(\w+)["\']?',  # JOIN table
-        r'\bINTO\s+["\']?(\w+)["\']?',  # INSERT INTO
-        r'\bUPDATE\s+["\']?(\w+)["\']?',  # UPDATE
-        r'\bTABLE\s+["\']?(\w+)["\']?',  # CREATE TABLE, DROP TABLE, ALTER TABLE
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, query_normalized, re.IGNORECASE)
-        # Filter out SQL keywords that might be matched (same as cache system)
-        sql_keywords = {"select", "where", "group", "order", "having", "limit", "offset"}
-        tables.update(m for m in matches if m.lower() not in sql_keywords)
-
-    return tables
+    return set(query_table_tags(query))
 
 
 def execute_query(
@@ -116,35 +97,9 @@ def execute_query(
     Raises:
         QueryBlockedError: If query is blocked by interceptor
     """
-    from psycopg2.extras import RealDictCursor
-
     if params is None:
         params = ()
 
-    # Check for canary deployment and A/B testing (Phase 3)
-    import time
-
-    start_time = time.time()
-    canary_deployment = None
-    ab_experiment = None
-
-    try:
-        from src.adaptive_safeguards import get_all_canary_deployments, get_canary_deployment
-
-        # Check for active canary deployments
-        all_canaries = get_all_canary_deployments()
-        for dep_id, dep_info in all_canaries.items():
-            if dep_info.get("status") == "active":
-                canary_deployment = get_canary_deployment(dep_id)
-                if canary_deployment and canary_deployment.should_use_canary():
-                    break
-
-        # Check for active A/B experiments
-        # Note: Full A/B experiment integration would require table_name extraction from query
-        # Current implementation supports canary deployments; A/B experiments can be added when needed
-    except Exception as e:
-        logger.debug(f"Could not check canary/AB deployments: {e}")
-
     # Intercept query before execution (proactive blocking)
     # This checks rate limits and analyzes query plan to block harmful queries
     intercept_query(query, params, tenant_id, skip_interception=skip_interception)
@@ -168,16 +123,46 @@ def execute_query(
     # Try application cache first (if enabled)
     if use_cache:
         cache = get_production_cache()
-        if cache:
-            cached_result = cache.get(query, params)
-            if cached_result is not None:
-                logger.debug(f"Cache HIT for query: {query[:50]}...")
-                # Cache stores QueryResults, cast to satisfy type checker
-                return cast(QueryResults, cached_result)
+        if cache and not _is_mutation_query(query):
+            # Single-flight: on a miss, concurrent callers of the same query wait for
+            # one execution instead of all hitting the database
+            def execute_for_cache() -> JSONValue:
+                result_list = _execute_uncached(query, params, use_cache=True)
+                logger.debug(f"Caching query result: {query[:50]}...")
+                # Convert to JSONValue-compatible format
+                return [
+                    {str(k): v for k, v in row.items()} if isinstance(row, dict) else row
+                    for row in result_list
+                ]
+
+            # Cache stores QueryResults, cast to satisfy type checker
+            return cast(
+                QueryResults,
+                cache.get_or_compute(
+                    query, params, execute_for_cache, ttl=cache_ttl, tenant_id=tenant_id
+                ),
+            )
+
+    return _execute_uncached(query, params, use_cache=bool(use_cache))
+
+
+def _execute_uncached(query: str, params: QueryParams, use_cache: bool) -> QueryResults:
+    """
+    Execute a query against the database (no result caching).
 
-    # Check for canary deployment and A/B testing (Phase 3)
+    Args:
+        query: SQL query string
+        params: Query parameters (tuple)
+        use_cache: Whether the application cache is in use (mutations invalidate it)
+
+    Returns:
+        list: Query results as list of dicts ([] for mutations)
+    """
     import time
 
+    from psycopg2.extras import RealDictCursor
+
+    # Check for canary deployment and A/B testing (Phase 3)
     start_time = time.time()
     canary_deployment = None
     ab_experiment = None
@@ -298,18 +283,6 @@ def execute_query(
                     except Exception as e:
                         logger.debug(f"Could not record AB result: {e}")
 
-                # Cache result if application cache is enabled
-                if use_cache:
-                    cache = get_production_cache()
-                    if cache:
-                        # Convert to JSONValue-compatible format
-                        cache_value: JSONValue = [
-                            {str(k): v for k, v in row.items()} if isinstance(row, dict) else row
-                            for row in result_list
-                        ]
-                        cache.set(query, params, cache_value, ttl=cache_ttl)
-                        logger.debug(f"Cached query result: {query[:50]}...")
-
                 return result_list
         except Exception as e:
             # Record failure for canary/AB testing
@@ -7,25 +7,33 @@ from running and impacting database performance.
 
 Optimizations:
 - Plan analysis caching to reduce EXPLAIN overhead
+- Verdict caching per query shape (only the rate limit is checked per call)
 - Query signature normalization for better cache hits
 - Early exit for simple/known-safe queries
 - Whitelist/blacklist support for query patterns
+- Async API (intercept_query_async) that keeps blocking work off the event loop
 - Per-table threshold configuration
 - Metrics collection for monitoring
 """
 
+import asyncio
+import functools
 import hashlib
 import json
 import logging
 import os
 import re
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import cast
 
 from src.audit import log_audit_event
 from src.config_loader import ConfigLoader
 from src.error_handler import QueryBlockedError
+from src.interception_metrics import InterceptionMetrics
 from src.query_analyzer import analyze_query_plan_fast
+from src.query_normalizer import analyze_query_text
 from src.rate_limiter import check_query_rate_limit
 from src.type_definitions import JSONDict, JSONValue, QueryParams
 
@@ -118,6 +126,18 @@ def _load_config() -> JSONDict:
         "plan_cache_max_size": safe_int(
             plan_cache_max_size, "features.query_interceptor.plan_cache_max_size", 1000
         ),
+        "enable_verdict_cache": _config_loader.get_bool(
+            "features.query_interceptor.enable_verdict_cache", True
+        ),
+        "verdict_cache_ttl": _config_loader.get_float(
+            "features.query_interceptor.verdict_cache_ttl", 60.0
+        ),
+        "verdict_cache_max_size": _config_loader.get_int(
+            "features.query_interceptor.verdict_cache_max_size", 10000
+        ),
+        "async_max_workers": _config_loader.get_int(
+            "features.query_interceptor.async_max_workers", 4
+        ),
         "query_preview_length": _config_loader.get_int(
             "features.query_interceptor.query_preview_length", 200
         ),
@@ -224,7 +244,125 @@ def _get_str_from_dict(d: dict[str, JSONValue], key: str, default: str) -> str:
 # Query whitelist/blacklist (query pattern -> action)
 _query_whitelist: set[str] = set()  # Patterns that always pass
 _query_blacklist: set[str] = set()  # Patterns that always block
-_query_list_lock = threading.Lock()
+_query_list_lock = threading.Lock()  # Serializes list updates; reads use the matchers
+
+# Characters that make a pattern a regex rather than a plain substring
+_REGEX_METACHARACTERS = frozenset("\\.^$*+?{}[]()|")
+_BACKREFERENCE_RE = re.compile(r"\\\d|\(\?P=")
+
+
+def _literal_trie_regex(literals: set[str]) -> str:
+    """
+    Regex matching any of literals, factored into a character trie so the
+    regex engine branches per character instead of trying each literal in turn.
+    A literal that extends another is dropped: the shorter one already matches.
+    """
+    trie: dict[str, dict] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict[str, dict]) -> str:
+        parts = []
+        # Walk single-child chains iteratively (keeps recursion to branch points)
+        while "" not in node and len(node) == 1:
+            ((char, node),) = node.items()
+            parts.append(re.escape(char))
+        if "" not in node:
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items())]
+            parts.append(f"(?:{'|'.join(branches)})")
+        return "".join(parts)
+
+    return build(trie)
+
+
+class _QueryListMatcher:
+    """
+    Immutable compiled form of one pattern list.
+
+    A query matches a pattern if it contains it as a substring or matches it as a
+    regex. Plain substrings are combined into one trie regex; regex patterns into
+    one alternation (or checked one by one if they cannot be combined, e.g.
+    because of backreferences). A list change drops the matcher and the next check
+    compiles a new one, so bulk updates compile once and matching takes no lock.
+    """
+
+    def __init__(self, patterns: set[str]):
+        literals: set[str] = set()
+        regexes: list[str] = []
+        self._regexes: list[re.Pattern[str]] = []
+        # An empty pattern is a substring of every query
+        self._matches_all = "" in patterns
+        for pattern in patterns:
+            if not pattern:
+                continue
+            literals.add(pattern)
+            if any(char in _REGEX_METACHARACTERS for char in pattern):
+                try:
+                    compiled = re.compile(pattern, re.IGNORECASE)
+                except re.error:
+                    logger.warning(f"Invalid regex in query list, matching as substring: {pattern}")
+                    continue
+                if compiled.groups and _BACKREFERENCE_RE.search(pattern):
+                    # Group numbers shift inside a combined alternation
+                    self._regexes.append(compiled)
+                else:
+                    regexes.append(pattern)
+
+        self.pattern_count = len(patterns)
+        self._literal_re = re.compile(_literal_trie_regex(literals)) if literals else None
+        if regexes:
+            try:
+                combined = "|".join(f"(?:{pattern})" for pattern in sorted(regexes))
+                self._regexes.append(re.compile(combined, re.IGNORECASE))
+            except re.error:
+                # e.g. the same group name in two patterns
+                self._regexes.extend(re.compile(pattern, re.IGNORECASE) for pattern in regexes)
+
+    def matches(self, query_lower: str) -> bool:
+        if self._matches_all:
+            return True
+        if self._literal_re is not None and self._literal_re.search(query_lower):
+            return True
+        return any(regex.search(query_lower) for regex in self._regexes)
+
+
+# Compiled lists; None = list changed since last compiled
+_query_blacklist_matcher: _QueryListMatcher | None = _QueryListMatcher(set())
+_query_whitelist_matcher: _QueryListMatcher | None = _QueryListMatcher(set())
+
+
+def _get_query_list_matchers() -> tuple[_QueryListMatcher, _QueryListMatcher]:
+    """(blacklist, whitelist) matchers, compiling any list changed since last use"""
+    global _query_blacklist_matcher, _query_whitelist_matcher
+    blacklist = _query_blacklist_matcher
+    whitelist = _query_whitelist_matcher
+    if blacklist is None or whitelist is None:
+        with _query_list_lock:
+            if _query_blacklist_matcher is None:
+                _query_blacklist_matcher = _QueryListMatcher(_query_blacklist)
+            if _query_whitelist_matcher is None:
+                _query_whitelist_matcher = _QueryListMatcher(_query_whitelist)
+            blacklist = _query_blacklist_matcher
+            whitelist = _query_whitelist_matcher
+    return blacklist, whitelist
+
+
+# Verdict cache: query signature (without params) -> (expires_at, should_block, reason,
+# details, decided_by_lists). Read without the lock; writes and invalidation take it.
+_verdict_cache: dict[str, tuple[float, bool, str | None, JSONDict, bool]] = {}
+_verdict_cache_lock = threading.Lock()
+_verdict_cache_generation = 0
+# Verdicts that may be transient and must be re-evaluated on the next call
+_UNCACHEABLE_REASONS = frozenset({"plan_analysis_failed"})
+
+# Thread pool for the async API (created on first use)
+_async_executor: ThreadPoolExecutor | None = None
+_async_executor_lock = threading.Lock()
+_async_shutdown_registered = False
+_async_shutdown_started = False
 
 # Pattern learning (learned from history)
 _pattern_learning_enabled = True
@@ -235,17 +373,8 @@ _pattern_learning_interval = 3600  # Learn patterns every hour
 _per_table_thresholds: dict[str, dict[str, JSONValue]] = {}
 _per_table_lock = threading.Lock()
 
-# Interception metrics
-_interception_metrics: JSONDict = {
-    "total_interceptions": 0,
-    "total_blocked": 0,
-    "total_analyzed": 0,
-    "total_cache_hits": 0,
-    "total_cache_misses": 0,
-    "total_analysis_time_ms": 0.0,
-    "blocked_by_reason": {},
-}
-_metrics_lock = threading.Lock()
+# Interception metrics (per-thread counters, aggregated on read)
+_metrics = InterceptionMetrics()
 
 
 def configure_interceptor(
@@ -276,6 +405,7 @@ def configure_interceptor(
     if enable_rate_limiting is not None:
         _config["enable_rate_limiting"] = enable_rate_limiting
 
+    invalidate_verdict_cache()
     logger.info(f"Query interceptor configured: {_config}")
 
 
@@ -283,10 +413,9 @@ def _normalize_query_signature(query: str, params: QueryParams | None = None) ->
     """
     Create a normalized query signature for caching.
 
-    Normalizes:
+    Normalizes (see src/query_normalizer.py):
     - Whitespace (multiple spaces -> single space)
-    - Parameter placeholders (%s -> ?)
-    - Case-insensitive keywords
+    - Parameter placeholders (%s, %(name)s, $1 -> ?)
     - Removes comments
 
     Args:
@@ -296,18 +425,8 @@ def _normalize_query_signature(query: str, params: QueryParams | None = None) ->
     Returns:
         Normalized query signature string
     """
-    # Normalize whitespace
-    normalized = re.sub(r"\s+", " ", query.strip())
-
-    # Normalize parameter placeholders
-    normalized = re.sub(r"%s|\$\d+", "?", normalized)
-
-    # Remove comments
-    normalized = re.sub(r"--.*?$", "", normalized, flags=re.MULTILINE)
-    normalized = re.sub(r"/\*.*?\*/", "", normalized, flags=re.DOTALL)
-
-    # Normalize case for SQL keywords (optional - can be disabled if case matters)
-    # normalized = re.sub(r'\b(SELECT|FROM|WHERE|JOIN|INNER|OUTER|LEFT|RIGHT|ON|AND|OR|ORDER|BY|GROUP|HAVING|LIMIT|OFFSET)\b', lambda m: m.group(1).upper(), normalized, flags=re.IGNORECASE)
+    # Memoized per raw query text
+    normalized = analyze_query_text(query).signature
 
     # Add params hash if provided (for queries with different params but same structure)
     if params:
@@ -349,70 +468,73 @@ def get_interceptor_metrics() -> JSONDict:
         float(cache_hit_rate_val) if isinstance(cache_hit_rate_val, int | float | str) else 0.0
     )
 
-    with _metrics_lock:
-        total_analyzed_val = _interception_metrics.get("total_analyzed", 0)
-        total_analyzed: int = total_analyzed_val if isinstance(total_analyzed_val, int) else 0
-        total_analysis_time_val = _interception_metrics.get("total_analysis_time_ms", 0.0)
-        total_analysis_time: float = (
-            total_analysis_time_val if isinstance(total_analysis_time_val, int | float) else 0.0
-        )
-        avg_analysis_time: float = (
-            total_analysis_time / float(total_analyzed) if total_analyzed > 0 else 0.0
-        )
+    metrics = _metrics.snapshot()
+    total_analyzed = cast(int, metrics["total_analyzed"])
+    total_analysis_time = cast(float, metrics["total_analysis_time_ms"])
+    total_interceptions = cast(int, metrics["total_interceptions"])
+    total_blocked = cast(int, metrics["total_blocked"])
+    verdict_hits = cast(int, metrics["verdict_cache_hits"])
+    verdict_misses = cast(int, metrics["verdict_cache_misses"])
+    verdict_lookups = verdict_hits + verdict_misses
 
-        total_interceptions_val = _interception_metrics.get("total_interceptions", 0)
-        total_interceptions: int = (
-            total_interceptions_val if isinstance(total_interceptions_val, int) else 0
-        )
-        total_blocked_val = _interception_metrics.get("total_blocked", 0)
-        total_blocked: int = total_blocked_val if isinstance(total_blocked_val, int) else 0
-        block_rate: float = (
-            float(total_blocked) / float(total_interceptions) if total_interceptions > 0 else 0.0
-        )
+    return {
+        "total_interceptions": total_interceptions,
+        "total_blocked": total_blocked,
+        "total_analyzed": total_analyzed,
+        "block_rate": total_blocked / total_interceptions if total_interceptions > 0 else 0.0,
+        "cache_hits": explain_cache_hits,
+        "cache_misses": explain_total_attempts - explain_cache_hits,
+        "cache_hit_rate": explain_cache_hit_rate,
+        "avg_analysis_time_ms": total_analysis_time / total_analyzed if total_analyzed > 0 else 0.0,
+        "blocked_by_reason": metrics["blocked_by_reason"],
+        "plan_cache_size": explain_total_attempts,  # Use EXPLAIN stats instead
+        "verdict_cache_hits": verdict_hits,
+        "verdict_cache_misses": verdict_misses,
+        "verdict_cache_hit_rate": verdict_hits / verdict_lookups if verdict_lookups else 0.0,
+        "verdict_cache_size": len(_verdict_cache),
+        "interception_overhead": metrics["interception_overhead"],
+    }
 
-        blocked_by_reason_val = _interception_metrics.get("blocked_by_reason", {})
-        blocked_by_reason: dict[str, int] = {}
-        if isinstance(blocked_by_reason_val, dict):
-            for k, v in blocked_by_reason_val.items():
-                if isinstance(k, str) and isinstance(v, int):
-                    blocked_by_reason[k] = v
 
-        return {
-            "total_interceptions": total_interceptions,
-            "total_blocked": total_blocked,
-            "total_analyzed": total_analyzed,
-            "block_rate": block_rate,
-            "cache_hits": explain_cache_hits,
-            "cache_misses": explain_total_attempts - explain_cache_hits,
-            "cache_hit_rate": explain_cache_hit_rate,
-            "avg_analysis_time_ms": avg_analysis_time,
-            "blocked_by_reason": dict(blocked_by_reason),
-            "plan_cache_size": explain_total_attempts,  # Use EXPLAIN stats instead
-        }
+def reset_interceptor_metrics():
+    """Zero the interception counters and overhead histogram."""
+    _metrics.reset()
 
 
 def add_query_to_whitelist(pattern: str):
     """Add a query pattern to whitelist (always allow)."""
+    global _query_whitelist_matcher
     with _query_list_lock:
         _query_whitelist.add(pattern.lower())
+        _query_whitelist_matcher = None
+    invalidate_verdict_cache()
 
 
 def add_query_to_blacklist(pattern: str):
     """Add a query pattern to blacklist (always block)."""
+    global _query_blacklist_matcher
     with _query_list_lock:
         _query_blacklist.add(pattern.lower())
+        _query_blacklist_matcher = None
+    invalidate_verdict_cache()
 
 
 def remove_query_from_whitelist(pattern: str):
     """Remove a query pattern from whitelist."""
+    global _query_whitelist_matcher
     with _query_list_lock:
         _query_whitelist.discard(pattern.lower())
+        _query_whitelist_matcher = None
+    invalidate_verdict_cache()
 
 
 def remove_query_from_blacklist(pattern: str):
     """Remove a query pattern from blacklist."""
+    global _query_blacklist_matcher
     with _query_list_lock:
         _query_blacklist.discard(pattern.lower())
+        _query_blacklist_matcher = None
+    invalidate_verdict_cache()
 
 
 def set_per_table_thresholds(table_name: str, thresholds: dict[str, JSONValue]):
@@ -425,6 +547,7 @@ def set_per_table_thresholds(table_name: str, thresholds: dict[str, JSONValue]):
     """
     with _per_table_lock:
         _per_table_thresholds[table_name] = thresholds.copy()
+    invalidate_verdict_cache()
 
 
 def get_per_table_thresholds(table_name: str) -> dict[str, float] | None:
@@ -464,11 +587,8 @@ def _extract_field_from_query(query: str, table_name: str) -> str | None:
 
 def _extract_table_name(query: str) -> str | None:
     """Extract primary table name from query (simple heuristic)."""
-    # Simple extraction - looks for FROM table_name
-    match = re.search(r'\bFROM\s+["\']?(\w+)["\']?', query, re.IGNORECASE)
-    if match:
-        return match.group(1)
-    return None
+    # Simple extraction - first FROM table_name
+    return analyze_query_text(query).from_table
 
 
 def _check_query_lists(query: str) -> tuple[bool, str] | None:
@@ -480,17 +600,19 @@ def _check_query_lists(query: str) -> tuple[bool, str] | None:
         (True, 'BLACKLISTED') if blacklisted
         None if not in any list
     """
+    # Lock-free unless a list changed since the last check
+    blacklist, whitelist = _get_query_list_matchers()
+    if not blacklist.pattern_count and not whitelist.pattern_count:
+        return None
+
     query_lower = query.lower()
-    with _query_list_lock:
-        # Check blacklist first (more restrictive)
-        for pattern in _query_blacklist:
-            if pattern in query_lower or re.search(pattern, query_lower, re.IGNORECASE):
-                return True, "BLACKLISTED"
+    # Check blacklist first (more restrictive)
+    if blacklist.matches(query_lower):
+        return True, "BLACKLISTED"
 
-        # Check whitelist
-        for pattern in _query_whitelist:
-            if pattern in query_lower or re.search(pattern, query_lower, re.IGNORECASE):
-                return False, "WHITELISTED"
+    # Check whitelist
+    if whitelist.matches(query_lower):
+        return False, "WHITELISTED"
 
     return None
 
@@ -552,6 +674,58 @@ def _has_nested_loop(plan_node: dict[str, JSONValue]) -> bool:
     return False
 
 
+def invalidate_verdict_cache():
+    """
+    Drop all cached should_block_query() verdicts.
+
+    Called when thresholds, the whitelist/blacklist or learned patterns change.
+    """
+    global _verdict_cache_generation
+    with _verdict_cache_lock:
+        _verdict_cache_generation += 1
+        _verdict_cache.clear()
+
+
+def _cache_verdict(
+    signature: str,
+    generation: int,
+    verdict: tuple[bool, str | None, JSONDict],
+    decided_by_lists: bool,
+):
+    """Store a verdict unless invalidated since its evaluation started"""
+    should_block, reason, details = verdict
+    if reason in _UNCACHEABLE_REASONS:
+        return
+    expires_at = time.monotonic() + _get_config_float("verdict_cache_ttl", 60.0)
+    max_size = _get_config_int("verdict_cache_max_size", 10000)
+    with _verdict_cache_lock:
+        if generation != _verdict_cache_generation:
+            return
+        if signature not in _verdict_cache:
+            # Oldest-first eviction; entries expire by TTL anyway
+            while _verdict_cache and len(_verdict_cache) >= max_size:
+                del _verdict_cache[next(iter(_verdict_cache))]
+        _verdict_cache[signature] = (expires_at, should_block, reason, details, decided_by_lists)
+
+
+def _check_rate_limit(tenant_id: str | None) -> tuple[bool, str | None, JSONDict] | None:
+    """Blocking verdict if the tenant is over its query rate limit, else None"""
+    if not _config["enable_rate_limiting"]:
+        return None
+    allowed, retry_after = check_query_rate_limit(tenant_id)
+    if allowed:
+        return None
+    return (
+        True,
+        "RATE_LIMIT_EXCEEDED",
+        {
+            "retry_after_seconds": retry_after,
+            "tenant_id": tenant_id,
+            "message": f"Query rate limit exceeded. Retry after {retry_after:.1f} seconds.",
+        },
+    )
+
+
 def should_block_query(
     query: str,
     params: QueryParams | None = None,
@@ -573,31 +747,58 @@ def should_block_query(
         - reason: Human-readable reason for blocking (None if not blocked)
         - details: Dictionary with blocking details
     """
+    # Verdicts depend only on the query shape, so repeat shapes reuse the cached one
+    # and only the per-tenant rate limit is evaluated per call
+    signature: str | None = None
+    generation = 0
+    if plan_analysis is None and _get_config_bool("enable_verdict_cache", True):
+        signature = _normalize_query_signature(query)
+        cached = _verdict_cache.get(signature)
+        if cached is not None and cached[0] > time.monotonic():
+            _metrics.record_verdict_cache_lookup(hit=True)
+            _expires_at, should_block, reason, details, decided_by_lists = cached
+            if not decided_by_lists:
+                rate_limit_verdict = _check_rate_limit(tenant_id)
+                if rate_limit_verdict is not None:
+                    return rate_limit_verdict
+            return should_block, reason, dict(details)
+        _metrics.record_verdict_cache_lookup(hit=False)
+        generation = _verdict_cache_generation
+
     # Check whitelist/blacklist first (fastest check)
     list_check = _check_query_lists(query)
     if list_check is not None:
         should_block, reason = list_check
-        return (
+        verdict: tuple[bool, str | None, JSONDict] = (
             should_block,
             reason,
             {"message": f"Query {reason.lower()}", "query_preview": query[:200]},
         )
+        if signature is not None:
+            _cache_verdict(signature, generation, verdict, decided_by_lists=True)
+        return verdict[0], verdict[1], dict(verdict[2])
 
     # Check rate limiting (if enabled)
-    if _config["enable_rate_limiting"]:
-        allowed, retry_after = check_query_rate_limit(tenant_id)
-        if not allowed:
-            return (
-                True,
-                "RATE_LIMIT_EXCEEDED",
-                {
-                    "retry_after_seconds": retry_after,
-                    "tenant_id": tenant_id,
-                    "message": f"Query rate limit exceeded. Retry after {retry_after:.1f} seconds.",
-                },
-            )
+    rate_limit_verdict = _check_rate_limit(tenant_id)
+    if rate_limit_verdict is not None:
+        return rate_limit_verdict
+
+    analysis_start = time.perf_counter_ns()
+    verdict = _evaluate_query_shape(query, params, plan_analysis)
+    _metrics.record_analysis(time.perf_counter_ns() - analysis_start)
+    if signature is not None:
+        _cache_verdict(signature, generation, verdict, decided_by_lists=False)
+    return verdict[0], verdict[1], dict(verdict[2])
 
-    # If blocking is disabled, only check rate limiting
+
+def _evaluate_query_shape(
+    query: str, params: QueryParams | None, plan_analysis: JSONDict | None
+) -> tuple[bool, str | None, JSONDict]:
+    """
+    Blocking verdict from everything except the lists and the rate limit:
+    learned patterns, ML prediction, complexity heuristics and the query plan.
+    """
+    # If blocking is disabled, only the lists and rate limiting apply
     if not _get_config_bool("enable_blocking", True):
         return False, None, {}
 
@@ -685,18 +886,14 @@ def should_block_query(
 
     # Early exit for simple queries (SELECT with LIMIT, simple WHERE)
     # These are typically safe and don't need analysis
-    query_upper = query.strip().upper()
+    features = analyze_query_text(query)
     # Simple SELECT with LIMIT - likely safe
-    if (
-        query_upper.startswith("SELECT")
-        and re.search(r"\bLIMIT\s+\d+\b", query_upper)
-        and not re.search(r"\bJOIN\b", query_upper)
-    ):
+    if features.is_select and features.has_limit_number and not features.has_join:
         # Very simple query - skip analysis
         return False, None, {"skipped_analysis": True, "reason": "simple_query"}
 
     # Analyze query complexity first (fast heuristic check)
-    complexity = _analyze_query_complexity(query)
+    complexity = features.complexity()
 
     # Block cartesian products immediately (very dangerous)
     if complexity["has_cartesian_risk"]:
@@ -847,53 +1044,168 @@ def intercept_query(
     if skip_interception:
         return
 
-    # Update metrics
-    with _metrics_lock:
-        current_interceptions = _interception_metrics.get("total_interceptions", 0)
-        if isinstance(current_interceptions, int):
-            _interception_metrics["total_interceptions"] = current_interceptions + 1
-        else:
-            _interception_metrics["total_interceptions"] = 1
-
     # Check if query should be blocked
+    start = time.perf_counter_ns()
     should_block, reason, details = should_block_query(query, params, tenant_id)
+    _metrics.record_interception(time.perf_counter_ns() - start)
 
     if should_block:
-        # Update metrics
-        with _metrics_lock:
-            current_blocked = _interception_metrics.get("total_blocked", 0)
-            if isinstance(current_blocked, int):
-                _interception_metrics["total_blocked"] = current_blocked + 1
-            else:
-                _interception_metrics["total_blocked"] = 1
-            blocked_by_reason_dict = _interception_metrics.get("blocked_by_reason", {})
-            if isinstance(blocked_by_reason_dict, dict) and reason is not None:
-                current_count = blocked_by_reason_dict.get(reason, 0)
-                if isinstance(current_count, int):
-                    blocked_by_reason_dict[reason] = current_count + 1
-                else:
-                    blocked_by_reason_dict[reason] = 1
-                _interception_metrics["blocked_by_reason"] = blocked_by_reason_dict
-
-        # Log to audit trail
-        preview_length = _get_config_int("query_preview_length", 200)
-        audit_details: dict[str, JSONValue] = {
-            "reason": reason if reason is not None else "unknown",
-            "query_preview": query[:preview_length],  # Configurable preview length
-        }
-        # Merge details into audit_details
-        for k, v in details.items():
-            audit_details[k] = v
-        log_audit_event(
-            "QUERY_BLOCKED",
-            tenant_id=int(tenant_id) if tenant_id and tenant_id.isdigit() else None,
-            details=audit_details,
-            severity="warning",
-        )
+        _block_query(query, tenant_id, reason, details)
+
+
+def _block_query(query: str, tenant_id: str | None, reason: str | None, details: JSONDict):
+    """
+    Record a blocked query in the metrics and audit trail, then block it.
 
-        # Raise exception to block query
-        message_str = _get_str_from_dict(details, "message", f"Query blocked: {reason}")
-        raise QueryBlockedError(message=message_str, reason=reason, details=details)
+    Raises:
+        QueryBlockedError: Always
+    """
+    # Update metrics
+    _metrics.record_blocked(reason)
+
+    # Log to audit trail
+    preview_length = _get_config_int("query_preview_length", 200)
+    audit_details: dict[str, JSONValue] = {
+        "reason": reason if reason is not None else "unknown",
+        "query_preview": query[:preview_length],  # Configurable preview length
+    }
+    # Merge details into audit_details
+    for k, v in details.items():
+        audit_details[k] = v
+    log_audit_event(
+        "QUERY_BLOCKED",
+        tenant_id=int(tenant_id) if tenant_id and tenant_id.isdigit() else None,
+        details=audit_details,
+        severity="warning",
+    )
+
+    # Raise exception to block query
+    message_str = _get_str_from_dict(details, "message", f"Query blocked: {reason}")
+    raise QueryBlockedError(message=message_str, reason=reason, details=details)
+
+
+def _get_async_executor() -> ThreadPoolExecutor:
+    """Bounded pool the async API runs blocking interception work on"""
+    global _async_executor, _async_shutdown_registered
+    with _async_executor_lock:
+        if _async_shutdown_started:
+            raise RuntimeError("Async query interception is shut down")
+        if _async_executor is None:
+            max_workers = max(1, _get_config_int("async_max_workers", 4))
+            _async_executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="query-interceptor"
+            )
+        if not _async_shutdown_registered:
+            try:
+                from src.graceful_shutdown import register_shutdown_handler
+
+                # Before the connection pool closes (priority 10)
+                register_shutdown_handler(shutdown_async_interception, priority=20)
+                _async_shutdown_registered = True
+            except Exception as e:
+                logger.debug(f"Could not register async interception shutdown: {e}")
+        return _async_executor
+
+
+def shutdown_async_interception(timeout: float = 10.0):
+    """
+    Stop the async interception pool and refuse new work.
+
+    Queued checks are cancelled; in-progress ones get up to timeout seconds to finish.
+    """
+    global _async_executor, _async_shutdown_started
+    with _async_executor_lock:
+        _async_shutdown_started = True
+        executor = _async_executor
+        _async_executor = None
+    if executor is None:
+        return
+    executor.shutdown(wait=False, cancel_futures=True)
+    waiter = threading.Thread(
+        target=executor.shutdown, name="query-interceptor-shutdown", daemon=True
+    )
+    waiter.start()
+    waiter.join(timeout=timeout)
+    if waiter.is_alive():
+        logger.warning(f"Async interception checks still running after {timeout}s")
+
+
+async def should_block_query_async(
+    query: str,
+    params: QueryParams | None = None,
+    tenant_id: str | None = None,
+    plan_analysis: JSONDict | None = None,
+) -> tuple[bool, str | None, JSONDict]:
+    """
+    Async should_block_query() for asyncio applications.
+
+    Cached verdicts decided by the whitelist/blacklist, or cached with rate
+    limiting off, are returned without leaving the event loop. Everything else
+    (rate limiting with its audit writes, pattern lookups, EXPLAIN) runs
+    should_block_query() on a bounded thread pool (features.query_interceptor.
+    async_max_workers), so verdicts and metrics are identical to the sync API.
+
+    Args:
+        query: SQL query string
+        params: Query parameters
+        tenant_id: Tenant ID for rate limiting
+        plan_analysis: Pre-computed plan analysis (if available)
+
+    Returns:
+        Tuple of (should_block, reason, details), as should_block_query()
+    """
+    if plan_analysis is None and _get_config_bool("enable_verdict_cache", True):
+        cached = _verdict_cache.get(_normalize_query_signature(query))
+        if (
+            cached is not None
+            and cached[0] > time.monotonic()
+            and (cached[4] or not _config["enable_rate_limiting"])
+        ):
+            # Served from the entry read here: an invalidation racing this call
+            # must not fall through to a full evaluation on the event loop
+            _metrics.record_verdict_cache_lookup(hit=True)
+            _expires_at, should_block, reason, details, _decided_by_lists = cached
+            return should_block, reason, dict(details)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_async_executor(),
+        functools.partial(should_block_query, query, params, tenant_id, plan_analysis),
+    )
+
+
+async def intercept_query_async(
+    query: str,
+    params: QueryParams | None = None,
+    tenant_id: str | None = None,
+    skip_interception: bool = False,
+) -> None:
+    """
+    Async intercept_query(): blocking work runs off the event loop.
+
+    Args:
+        query: SQL query string
+        params: Query parameters
+        tenant_id: Tenant ID for rate limiting and audit logging
+        skip_interception: If True, skip interception (for internal queries)
+
+    Raises:
+        QueryBlockedError: If query should be blocked
+    """
+    if skip_interception:
+        return
+
+    start = time.perf_counter_ns()
+    should_block, reason, details = await should_block_query_async(query, params, tenant_id)
+    _metrics.record_interception(time.perf_counter_ns() - start)
+
+    if should_block:
+        # The audit trail write is a DB insert
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            _get_async_executor(),
+            functools.partial(_block_query, query, tenant_id, reason, details),
+        )
 
 
 def _analyze_query_complexity(query: str) -> dict[str, int | bool]:
@@ -903,43 +1215,7 @@ def _analyze_query_complexity(query: str) -> dict[str, int | bool]:
     Returns:
         dict with complexity metrics
     """
-    query_upper = query.upper()
-
-    # Count JOINs (including LEFT JOIN, RIGHT JOIN, INNER JOIN, etc.)
-    join_count = len(re.findall(r"\b(?:LEFT|RIGHT|INNER|FULL|CROSS)\s+JOIN\b", query_upper))
-
-    # Count subqueries (SELECT within SELECT)
-    subquery_count = len(re.findall(r"\(\s*SELECT\s+", query_upper))
-
-    # Check for cartesian product (JOIN without ON clause)
-    # This is a heuristic - actual detection requires parsing
-    has_cartesian_risk = False
-    if join_count > 0:
-        # Check if JOINs have ON clauses
-        join_on_pairs = re.findall(r"JOIN\s+\w+\s+ON", query_upper)
-        if len(join_on_pairs) < join_count:
-            has_cartesian_risk = True
-
-    # Check for missing WHERE clause in SELECT (dangerous for large tables)
-    has_missing_where = False
-    if (
-        query_upper.startswith("SELECT")
-        and "WHERE" not in query_upper
-        and not re.search(r"\bLIMIT\s+\d+\b", query_upper)
-    ):
-        has_missing_where = True
-
-    # Count UNION operations
-    union_count = len(re.findall(r"\bUNION\s+(?:ALL\s+)?SELECT\b", query_upper))
-
-    return {
-        "join_count": join_count,
-        "subquery_count": subquery_count,
-        "union_count": union_count,
-        "has_cartesian_risk": has_cartesian_risk,
-        "has_missing_where": has_missing_where,
-        "complexity_score": join_count * 2 + subquery_count * 3 + union_count * 2,
-    }
+    return analyze_query_text(query).complexity()
 
 
 def get_query_safety_score(
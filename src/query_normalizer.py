@@ -0,0 +1,229 @@
+"""
+Single-pass SQL text normalizer.
+
+The interceptor, the ML interceptor and workload analysis all need cheap
+text-level facts about a query: a signature for the verdict cache, a literal-free
+template for clustering, and join/subquery/union counts for the complexity
+heuristics. analyze_query_text() derives all of them from one scan of one
+compiled tokenizer and memoizes the result per raw query text, so a repeated
+query costs a dict lookup.
+
+This is deliberately not a parser (see src/sql_parser.py for sqlglot); it only
+has to know where comments, literals and placeholders start and end.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+
+from src.type_definitions import JSONDict
+
+# Bound on memoized query texts; the oldest entry is dropped first
+MAX_CACHED_QUERIES = 10000
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+)
+    |(?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+    |(?P<string>'(?:[^']|'')*'?)
+    |(?P<quoted>"(?:[^"]|"")*"?)
+    |(?P<param>%s|%\(\w+\)s|\$\d+|\?)
+    |(?P<word>\w+)
+    |(?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_JOIN_QUALIFIERS = frozenset({"LEFT", "RIGHT", "INNER", "FULL", "CROSS"})
+
+
+@dataclass(frozen=True)
+class QueryFeatures:
+    """Text-level facts about one query"""
+
+    # Comments dropped, whitespace collapsed, placeholders as "?"; case and literals kept
+    signature: str
+    # Upper-cased signature with numeric, string and quoted-identifier literals as "?"
+    template: str
+    join_count: int
+    join_on_count: int
+    subquery_count: int
+    union_count: int
+    is_select: bool
+    has_where: bool
+    has_join: bool
+    has_limit_number: bool
+    from_table: str | None
+
+    @property
+    def has_cartesian_risk(self) -> bool:
+        # Heuristic: fewer "JOIN <table> ON" clauses than qualified JOINs
+        return self.join_count > 0 and self.join_on_count < self.join_count
+
+    @property
+    def has_missing_where(self) -> bool:
+        return self.is_select and not self.has_where and not self.has_limit_number
+
+    @property
+    def complexity_score(self) -> int:
+        return self.join_count * 2 + self.subquery_count * 3 + self.union_count * 2
+
+    def complexity(self) -> dict[str, int | bool]:
+        """Complexity metrics in the shape returned by _analyze_query_complexity()"""
+        return {
+            "join_count": self.join_count,
+            "subquery_count": self.subquery_count,
+            "union_count": self.union_count,
+            "has_cartesian_risk": self.has_cartesian_risk,
+            "has_missing_where": self.has_missing_where,
+            "complexity_score": self.complexity_score,
+        }
+
+
+_features_cache: dict[str, QueryFeatures] = {}
+_features_cache_lock = threading.Lock()
+_cache_hits = 0
+_cache_misses = 0
+
+
+def _scan(query: str) -> QueryFeatures:
+    signature_parts: list[str] = []
+    template_parts: list[str] = []
+    pending_space = False
+
+    join_count = 0
+    join_on_count = 0
+    subquery_count = 0
+    union_count = 0
+    first_word: str | None = None
+    has_where = False
+    has_join = False
+    has_limit_number = False
+    from_table: str | None = None
+
+    # The two previous significant tokens, upper-cased (punctuation as-is)
+    prev = ""
+    prev2 = ""
+
+    for match in _TOKEN_RE.finditer(query):
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "ws" or kind == "comment":
+            pending_space = True
+            continue
+        if pending_space and signature_parts:
+            signature_parts.append(" ")
+            template_parts.append(" ")
+        pending_space = False
+
+        if kind == "word":
+            upper = text.upper()
+            signature_parts.append(text)
+            if text.isdigit():
+                template_parts.append("?")
+                if prev == "LIMIT":
+                    has_limit_number = True
+            else:
+                template_parts.append(upper)
+                if upper == "JOIN":
+                    has_join = True
+                    if prev in _JOIN_QUALIFIERS:
+                        join_count += 1
+                elif upper == "SELECT":
+                    if prev == "(":
+                        subquery_count += 1
+                    elif prev == "UNION" or (prev == "ALL" and prev2 == "UNION"):
+                        union_count += 1
+                elif upper == "ON":
+                    if prev2 == "JOIN" and prev.isidentifier():
+                        join_on_count += 1
+                elif upper == "WHERE":
+                    has_where = True
+            if first_word is None:
+                first_word = upper
+            if prev == "FROM" and from_table is None:
+                from_table = text
+        elif kind == "param":
+            signature_parts.append("?")
+            template_parts.append("?")
+            upper = "?"
+        else:
+            signature_parts.append(text)
+            if kind == "other":
+                template_parts.append(text)
+                upper = text
+            else:
+                template_parts.append("?")
+                upper = "?"
+                if kind == "quoted" and prev == "FROM" and from_table is None:
+                    inner = text.strip('"')
+                    if inner.isidentifier():
+                        from_table = inner
+        if first_word is None:
+            first_word = ""
+        prev2 = prev
+        prev = upper
+
+    return QueryFeatures(
+        signature="".join(signature_parts),
+        template="".join(template_parts),
+        join_count=join_count,
+        join_on_count=join_on_count,
+        subquery_count=subquery_count,
+        union_count=union_count,
+        is_select=first_word == "SELECT",
+        has_where=has_where,
+        has_join=has_join,
+        has_limit_number=has_limit_number,
+        from_table=from_table,
+    )
+
+
+def analyze_query_text(query: str) -> QueryFeatures:
+    """
+    Signature, template and complexity features of a query, memoized per raw text.
+
+    Args:
+        query: Raw SQL query string
+
+    Returns:
+        QueryFeatures for the query
+    """
+    global _cache_hits, _cache_misses
+
+    # Lock-free read; entries are immutable
+    features = _features_cache.get(query)
+    if features is not None:
+        _cache_hits += 1
+        return features
+
+    features = _scan(query)
+    with _features_cache_lock:
+        _cache_misses += 1
+        if query not in _features_cache:
+            while len(_features_cache) >= MAX_CACHED_QUERIES:
+                del _features_cache[next(iter(_features_cache))]
+            _features_cache[query] = features
+    return features
+
+
+def clear_query_features_cache() -> None:
+    """Drop all memoized query features"""
+    global _cache_hits, _cache_misses
+
+    with _features_cache_lock:
+        _features_cache.clear()
+        _cache_hits = 0
+        _cache_misses = 0
+
+
+def get_query_normalizer_stats() -> JSONDict:
+    """Memoization hit/miss counters"""
+    total = _cache_hits + _cache_misses
+    return {
+        "size": len(_features_cache),
+        "max_size": MAX_CACHED_QUERIES,
+        "hits": _cache_hits,
+        "misses": _cache_misses,
+        "hit_rate": round(_cache_hits / total * 100, 2) if total > 0 else 0.0,
+    }
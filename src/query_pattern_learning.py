@@ -17,7 +17,7 @@ from src.algorithms.xgboost_classifier import (
     score_recommendation,
     train_model,
 )
-from src.db import get_cursor
+from src.stats import get_field_latency_sketches
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +35,47 @@ _fast_query_patterns: dict[str, dict[str, Any]] = {}
 _fast_patterns_lock = threading.Lock()
 
 
+def _invalidate_interception_verdicts():
+    """Interceptor verdicts cached per query shape depend on the learned patterns"""
+    from src.query_interceptor import invalidate_verdict_cache
+
+    invalidate_verdict_cache()
+
+
+def _latency_pattern_rows(
+    time_window_hours: int,
+    min_occurrences: int,
+    lower_ms: float | None = None,
+    upper_ms: float | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Per-(table, field, query_type) stats for durations within [lower_ms, upper_ms].
+
+    Read from the merged latency sketches, so counts, averages and p95 of the
+    selected range are within the sketch's ~1% relative error (durations right at
+    a threshold may fall on either side of it).
+    """
+    rows = []
+    for (table_name, field_name, query_type), latency in get_field_latency_sketches(
+        time_window_hours
+    ).items():
+        selected = latency.sketch.between(lower_ms, upper_ms)
+        if selected.count < min_occurrences:
+            continue
+        rows.append(
+            {
+                "table_name": table_name,
+                "field_name": field_name,
+                "query_type": query_type,
+                "occurrence_count": selected.count,
+                "avg_duration_ms": selected.mean(),
+                "p95_duration_ms": selected.quantile(0.95),
+                "max_duration_ms": min(selected.quantile(1.0), latency.max_duration_ms),
+            }
+        )
+    return rows
+
+
 def learn_from_slow_queries(
     time_window_hours: int = 24,
     slow_threshold_ms: float = 1000.0,
@@ -53,88 +94,70 @@ def learn_from_slow_queries(
     Returns:
         dict with learned patterns and statistics
     """
-    with get_cursor() as cursor:
-        # Get slow queries from query_stats
-        cursor.execute(
-            """
-            SELECT
-                table_name,
-                field_name,
-                query_type,
-                COUNT(*) as occurrence_count,
-                AVG(duration_ms) as avg_duration_ms,
-                PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY duration_ms) as p95_duration_ms,
-                MAX(duration_ms) as max_duration_ms
-            FROM query_stats
-            WHERE created_at >= NOW() - INTERVAL '1 hour' * %s
-              AND duration_ms >= %s
-            GROUP BY table_name, field_name, query_type
-            HAVING COUNT(*) >= %s
-            ORDER BY avg_duration_ms DESC
-        """,
-            (time_window_hours, slow_threshold_ms, min_occurrences),
-        )
+    slow_queries = _latency_pattern_rows(
+        time_window_hours, min_occurrences, lower_ms=slow_threshold_ms
+    )
+    slow_queries.sort(key=lambda row: row["avg_duration_ms"], reverse=True)
+
+    learned_patterns: dict[str, Any] = {
+        "timestamp": datetime.now().isoformat(),
+        "time_window_hours": time_window_hours,
+        "slow_threshold_ms": slow_threshold_ms,
+        "patterns": [],
+        "summary": {
+            "total_patterns": 0,
+            "total_slow_queries": 0,
+            "avg_duration_ms": 0.0,
+        },
+    }
+
+    total_duration = 0.0
+    total_count = 0
 
-        slow_queries = cursor.fetchall()
-
-        learned_patterns: dict[str, Any] = {
-            "timestamp": datetime.now().isoformat(),
-            "time_window_hours": time_window_hours,
-            "slow_threshold_ms": slow_threshold_ms,
-            "patterns": [],
-            "summary": {
-                "total_patterns": 0,
-                "total_slow_queries": 0,
-                "avg_duration_ms": 0.0,
-            },
-        }
-
-        total_duration = 0.0
-        total_count = 0
-
-        with _slow_patterns_lock:
-            for query in slow_queries:
-                table_name = query["table_name"]
-                field_name = query.get("field_name", "")
-                query_type = query.get("query_type", "SELECT")
-                avg_duration = query.get("avg_duration_ms", 0) or 0
-                occurrence_count = query.get("occurrence_count", 0) or 0
-
-                # Create pattern signature
-                pattern_key = f"{table_name}:{field_name}:{query_type}"
-
-                pattern = {
-                    "table_name": table_name,
-                    "field_name": field_name,
-                    "query_type": query_type,
-                    "pattern_key": pattern_key,
-                    "avg_duration_ms": round(avg_duration, 2),
-                    "p95_duration_ms": round(query.get("p95_duration_ms", 0) or 0, 2),
-                    "max_duration_ms": round(query.get("max_duration_ms", 0) or 0, 2),
-                    "occurrence_count": occurrence_count,
-                    "risk_level": _calculate_risk_level(avg_duration, occurrence_count),
-                }
+    with _slow_patterns_lock:
+        for query in slow_queries:
+            table_name = query["table_name"]
+            field_name = query.get("field_name", "")
+            query_type = query.get("query_type", "SELECT")
+            avg_duration = query.get("avg_duration_ms", 0) or 0
+            occurrence_count = query.get("occurrence_count", 0) or 0
+
+            # Create pattern signature
+            pattern_key = f"{table_name}:{field_name}:{query_type}"
+
+            pattern = {
+                "table_name": table_name,
+                "field_name": field_name,
+                "query_type": query_type,
+                "pattern_key": pattern_key,
+                "avg_duration_ms": round(avg_duration, 2),
+                "p95_duration_ms": round(query.get("p95_duration_ms", 0) or 0, 2),
+                "max_duration_ms": round(query.get("max_duration_ms", 0) or 0, 2),
+                "occurrence_count": occurrence_count,
+                "risk_level": _calculate_risk_level(avg_duration, occurrence_count),
+            }
 
-                patterns_list = learned_patterns["patterns"]
-                if isinstance(patterns_list, list):
-                    patterns_list.append(pattern)
-                _slow_query_patterns[pattern_key] = pattern
+            patterns_list = learned_patterns["patterns"]
+            if isinstance(patterns_list, list):
+                patterns_list.append(pattern)
+            _slow_query_patterns[pattern_key] = pattern
 
-                total_duration += avg_duration * occurrence_count
-                total_count += occurrence_count
+            total_duration += avg_duration * occurrence_count
+            total_count += occurrence_count
 
-        if total_count > 0:
-            learned_patterns["summary"]["avg_duration_ms"] = round(total_duration / total_count, 2)
-        patterns_list = learned_patterns["patterns"]
-        pattern_count = len(patterns_list) if isinstance(patterns_list, list) else 0
-        summary = learned_patterns["summary"]
-        if isinstance(summary, dict):
-            summary["total_patterns"] = pattern_count
-            summary["total_slow_queries"] = total_count
+    _invalidate_interception_verdicts()
+    if total_count > 0:
+        learned_patterns["summary"]["avg_duration_ms"] = round(total_duration / total_count, 2)
+    patterns_list = learned_patterns["patterns"]
+    pattern_count = len(patterns_list) if isinstance(patterns_list, list) else 0
+    summary = learned_patterns["summary"]
+    if isinstance(summary, dict):
+        summary["total_patterns"] = pattern_count
+        summary["total_slow_queries"] = total_count
 
-        logger.info(f"Learned {pattern_count} slow query patterns from {total_count} slow queries")
+    logger.info(f"Learned {pattern_count} slow query patterns from {total_count} slow queries")
 
-        return learned_patterns
+    return learned_patterns
 
 
 def learn_from_fast_queries(
@@ -155,83 +178,64 @@ def learn_from_fast_queries(
     Returns:
         dict with learned fast patterns
     """
-    with get_cursor() as cursor:
-        # Get fast queries from query_stats
-        cursor.execute(
-            """
-            SELECT
-                table_name,
-                field_name,
-                query_type,
-                COUNT(*) as occurrence_count,
-                AVG(duration_ms) as avg_duration_ms,
-                PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY duration_ms) as p95_duration_ms
-            FROM query_stats
-            WHERE created_at >= NOW() - INTERVAL '1 hour' * %s
-              AND duration_ms <= %s
-            GROUP BY table_name, field_name, query_type
-            HAVING COUNT(*) >= %s
-            ORDER BY occurrence_count DESC
-        """,
-            (time_window_hours, fast_threshold_ms, min_occurrences),
-        )
+    fast_queries = _latency_pattern_rows(
+        time_window_hours, min_occurrences, upper_ms=fast_threshold_ms
+    )
+    fast_queries.sort(key=lambda row: row["occurrence_count"], reverse=True)
+
+    learned_patterns = {
+        "timestamp": datetime.now().isoformat(),
+        "time_window_hours": time_window_hours,
+        "fast_threshold_ms": fast_threshold_ms,
+        "patterns": [],
+        "summary": {
+            "total_patterns": 0,
+            "total_fast_queries": 0,
+        },
+    }
+
+    total_count = 0
 
-        fast_queries = cursor.fetchall()
-
-        learned_patterns = {
-            "timestamp": datetime.now().isoformat(),
-            "time_window_hours": time_window_hours,
-            "fast_threshold_ms": fast_threshold_ms,
-            "patterns": [],
-            "summary": {
-                "total_patterns": 0,
-                "total_fast_queries": 0,
-            },
-        }
-
-        total_count = 0
-
-        with _fast_patterns_lock:
-            for query in fast_queries:
-                table_name = query["table_name"]
-                field_name = query.get("field_name", "")
-                query_type = query.get("query_type", "SELECT")
-                avg_duration = query.get("avg_duration_ms", 0) or 0
-                occurrence_count = query.get("occurrence_count", 0) or 0
-
-                # Create pattern signature
-                pattern_key = f"{table_name}:{field_name}:{query_type}"
-
-                pattern = {
-                    "table_name": table_name,
-                    "field_name": field_name,
-                    "query_type": query_type,
-                    "pattern_key": pattern_key,
-                    "avg_duration_ms": round(avg_duration, 2),
-                    "p95_duration_ms": round(query.get("p95_duration_ms", 0) or 0, 2),
-                    "occurrence_count": occurrence_count,
-                    "confidence": min(
-                        1.0, occurrence_count / 100.0
-                    ),  # Higher count = more confidence
-                }
+    with _fast_patterns_lock:
+        for query in fast_queries:
+            table_name = query["table_name"]
+            field_name = query.get("field_name", "")
+            query_type = query.get("query_type", "SELECT")
+            avg_duration = query.get("avg_duration_ms", 0) or 0
+            occurrence_count = query.get("occurrence_count", 0) or 0
+
+            # Create pattern signature
+            pattern_key = f"{table_name}:{field_name}:{query_type}"
+
+            pattern = {
+                "table_name": table_name,
+                "field_name": field_name,
+                "query_type": query_type,
+                "pattern_key": pattern_key,
+                "avg_duration_ms": round(avg_duration, 2),
+                "p95_duration_ms": round(query.get("p95_duration_ms", 0) or 0, 2),
+                "occurrence_count": occurrence_count,
+                "confidence": min(1.0, occurrence_count / 100.0),  # Higher count = more confidence
+            }
 
-                patterns_list = learned_patterns["patterns"]
-                if isinstance(patterns_list, list):
-                    patterns_list.append(pattern)
-                _fast_query_patterns[pattern_key] = pattern
+            patterns_list = learned_patterns["patterns"]
+            if isinstance(patterns_list, list):
+                patterns_list.append(pattern)
+            _fast_query_patterns[pattern_key] = pattern
 
-                total_count += occurrence_count
+            total_count += occurrence_count
 
-        patterns_list = learned_patterns["patterns"]
-        pattern_count = len(patterns_list) if isinstance(patterns_list, list) else 0
-        summary = learned_patterns["summary"]
-        if isinstance(summary, dict):
-            summary["total_patterns"] = pattern_count
-            summary["total_fast_queries"] = total_count
+    _invalidate_interception_verdicts()
+    patterns_list = learned_patterns["patterns"]
+    pattern_count = len(patterns_list) if isinstance(patterns_list, list) else 0
+    summary = learned_patterns["summary"]
+    if isinstance(summary, dict):
+        summary["total_patterns"] = pattern_count
+        summary["total_fast_queries"] = total_count
 
-        logger.info(f"Learned {pattern_count} fast query patterns from {total_count} fast queries")
+    logger.info(f"Learned {pattern_count} fast query patterns from {total_count} fast queries")
 
-        return learned_patterns
+    return learned_patterns
 
 
 def _calculate_risk_level(avg_duration_ms: float, occurrence_count: int) -> str:
@@ -0,0 +1,284 @@
+"""
+Time-range partitioning for query_stats.
+
+When features.query_stats_partitioning.enabled is on, init_schema() creates
+query_stats as a table range-partitioned on created_at, with a DEFAULT
+partition for rows outside every range. This module keeps daily (or hourly)
+partitions created ahead of time and enforces retention by dropping whole
+partitions instead of DELETEing rows; the rollup tables built from query_stats
+are pruned to the same retention. The BRIN and btree indexes on the parent
+(see create_indexes()) cascade to every partition.
+
+Windowed reads (created_at >= NOW() - INTERVAL ...) are pruned to the
+partitions that overlap the window at executor startup.
+"""
+
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Any
+
+from src.config_loader import ConfigLoader
+from src.db import get_cursor
+from src.type_definitions import JSONDict
+
+logger = logging.getLogger(__name__)
+
+# Load config
+try:
+    _config_loader = ConfigLoader()
+except Exception as e:
+    logger.error(f"Failed to initialize ConfigLoader: {e}, using defaults")
+    _config_loader = ConfigLoader()
+
+PARENT_TABLE = "query_stats"
+DEFAULT_PARTITION = "query_stats_default"
+# Pre-aggregated copies of query_stats, keyed by bucket_start; same retention
+ROLLUP_TABLES = ("query_stats_rollup", "query_stats_hourly")
+
+PARTITION_INTERVALS = {
+    "day": (timedelta(days=1), "%Y%m%d"),
+    "hour": (timedelta(hours=1), "%Y%m%d%H"),
+}
+
+_PARTITION_NAME_RE = re.compile(rf"^{PARENT_TABLE}_p(\d{{8}}|\d{{10}})$")
+
+# Partition DDL needs a brief lock on query_stats; give up rather than queue
+# behind a long read and stall every stats insert behind us
+_DDL_LOCK_TIMEOUT = "5s"
+
+
+def is_query_stats_partitioning_enabled() -> bool:
+    """Check if query_stats is created as a partitioned table"""
+    return _config_loader.get_bool("features.query_stats_partitioning.enabled", True)
+
+
+def get_partitioning_config() -> dict[str, Any]:
+    """Get query_stats partitioning configuration"""
+    interval = _config_loader.get_str("features.query_stats_partitioning.interval", "day")
+    if interval not in PARTITION_INTERVALS:
+        logger.warning(f"Unknown query_stats partition interval '{interval}', using 'day'")
+        interval = "day"
+    return {
+        "enabled": is_query_stats_partitioning_enabled(),
+        "interval": interval,
+        "premake": max(1, _config_loader.get_int("features.query_stats_partitioning.premake", 3)),
+        "retention_days": max(
+            0, _config_loader.get_int("features.query_stats_partitioning.retention_days", 90)
+        ),
+    }
+
+
+def partition_start(timestamp: datetime, interval: str) -> datetime:
+    """Start of the partition range containing timestamp"""
+    if interval == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def partition_name(start: datetime, interval: str) -> str:
+    """Partition table name for the range starting at start"""
+    return f"{PARENT_TABLE}_p{start.strftime(PARTITION_INTERVALS[interval][1])}"
+
+
+def parse_partition_name(name: str) -> tuple[datetime, str] | None:
+    """
+    Range start and interval encoded in a partition name.
+
+    Returns:
+        (start, interval), or None for names this module did not create
+    """
+    match = _PARTITION_NAME_RE.match(name)
+    if not match:
+        return None
+    digits = match.group(1)
+    interval = "hour" if len(digits) == 10 else "day"
+    return datetime.strptime(digits, PARTITION_INTERVALS[interval][1]), interval
+
+
+def is_query_stats_partitioned(cursor) -> bool:
+    """True if query_stats exists and is a partitioned table"""
+    cursor.execute(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)",
+        (PARENT_TABLE,),
+    )
+    row = cursor.fetchone()
+    return bool(row) and row["relkind"] == "p"
+
+
+def _list_partitions(cursor) -> list[str]:
+    cursor.execute(
+        """
+        SELECT child.relname AS partition_name
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(%s)
+        """,
+        (PARENT_TABLE,),
+    )
+    return [row["partition_name"] for row in cursor.fetchall()]
+
+
+def _database_now(cursor) -> datetime:
+    # created_at defaults to CURRENT_TIMESTAMP in a TIMESTAMP column, i.e. the
+    # server's local time, so ranges are computed from the server clock too
+    cursor.execute("SELECT LOCALTIMESTAMP AS now")
+    return cursor.fetchone()["now"]
+
+
+def ensure_query_stats_partitions(cursor, now: datetime | None = None) -> list[str]:
+    """
+    Create missing partitions from premake intervals back to premake intervals ahead.
+
+    Each partition is created under its own savepoint; one that cannot be created
+    (typically because the DEFAULT partition already holds rows in its range) is
+    logged and skipped. Does not commit.
+
+    Args:
+        cursor: Database cursor
+        now: Reference time (default: the database's LOCALTIMESTAMP)
+
+    Returns:
+        Names of the partitions created
+    """
+    if not is_query_stats_partitioned(cursor):
+        return []
+
+    config = get_partitioning_config()
+    interval = config["interval"]
+    step = PARTITION_INTERVALS[interval][0]
+    current = partition_start(now or _database_now(cursor), interval)
+    existing = set(_list_partitions(cursor))
+
+    created: list[str] = []
+    for offset in range(-config["premake"], config["premake"] + 1):
+        start = current + step * offset
+        name = partition_name(start, interval)
+        if name in existing:
+            continue
+        cursor.execute("SAVEPOINT query_stats_partition")
+        try:
+            cursor.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {name}
+                PARTITION OF {PARENT_TABLE}
+                FOR VALUES FROM (%s) TO (%s)
+                """,
+                (start, start + step),
+            )
+            cursor.execute("RELEASE SAVEPOINT query_stats_partition")
+            created.append(name)
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT query_stats_partition")
+            logger.warning(f"Could not create query_stats partition {name}: {e}")
+
+    if created:
+        logger.info(f"Created query_stats partitions: {', '.join(created)}")
+    return created
+
+
+def drop_expired_query_stats_partitions(
+    cursor, now: datetime | None = None
+) -> tuple[list[str], int]:
+    """
+    Drop partitions whose whole range is older than retention_days.
+
+    Rows that landed in the DEFAULT partition are deleted individually once they
+    expire; that partition only holds rows outside the pre-created ranges.
+    Does not commit.
+
+    Args:
+        cursor: Database cursor
+        now: Reference time (default: the database's LOCALTIMESTAMP)
+
+    Returns:
+        (names of dropped partitions, expired rows deleted from the DEFAULT partition)
+    """
+    config = get_partitioning_config()
+    if config["retention_days"] <= 0 or not is_query_stats_partitioned(cursor):
+        return [], 0
+
+    cutoff = (now or _database_now(cursor)) - timedelta(days=config["retention_days"])
+    dropped: list[str] = []
+    default_rows_deleted = 0
+    for name in sorted(_list_partitions(cursor)):
+        if name == DEFAULT_PARTITION:
+            cursor.execute(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < %s", (cutoff,))
+            default_rows_deleted = cursor.rowcount or 0
+            continue
+        parsed = parse_partition_name(name)
+        if parsed is None:
+            continue
+        start, interval = parsed
+        if start + PARTITION_INTERVALS[interval][0] <= cutoff:
+            cursor.execute("SAVEPOINT query_stats_partition")
+            try:
+                cursor.execute(f"DROP TABLE IF EXISTS {name}")
+                cursor.execute("RELEASE SAVEPOINT query_stats_partition")
+                dropped.append(name)
+            except Exception as e:
+                # Usually lock_timeout; the next maintenance run retries
+                cursor.execute("ROLLBACK TO SAVEPOINT query_stats_partition")
+                logger.warning(f"Could not drop query_stats partition {name}: {e}")
+
+    if dropped:
+        logger.info(f"Dropped expired query_stats partitions: {', '.join(dropped)}")
+    return dropped, default_rows_deleted
+
+
+def delete_expired_query_stats_rollups(cursor, now: datetime | None = None) -> JSONDict:
+    """
+    Delete rollup rows whose bucket started before the retention cutoff.
+
+    The rollup tables hold one row per key and bucket, so they are pruned with a
+    plain DELETE. Does not commit.
+
+    Args:
+        cursor: Database cursor
+        now: Reference time (default: the database's LOCALTIMESTAMP)
+
+    Returns:
+        Rows deleted per rollup table (empty when retention_days is 0)
+    """
+    config = get_partitioning_config()
+    if config["retention_days"] <= 0:
+        return {}
+
+    cutoff = (now or _database_now(cursor)) - timedelta(days=config["retention_days"])
+    deleted: JSONDict = {}
+    for table in ROLLUP_TABLES:
+        cursor.execute(f"DELETE FROM {table} WHERE bucket_start < %s", (cutoff,))
+        deleted[table] = cursor.rowcount or 0
+    return deleted
+
+
+def run_query_stats_partition_maintenance() -> JSONDict:
+    """
+    Create upcoming query_stats partitions, drop expired ones and prune the rollups.
+
+    Run from maintenance; safe to call repeatedly.
+
+    Returns:
+        dict with created/dropped partition names and rollup rows deleted, or
+        status "not_partitioned" (rollups are still pruned)
+    """
+    if not is_query_stats_partitioning_enabled():
+        return {"status": "disabled"}
+
+    with get_cursor() as cursor:
+        now = _database_now(cursor)
+        rollup_rows_deleted = delete_expired_query_stats_rollups(cursor, now)
+        if not is_query_stats_partitioned(cursor):
+            # Tables created before partitioning was enabled keep working unpartitioned
+            return {"status": "not_partitioned", "rollup_rows_deleted": rollup_rows_deleted}
+        cursor.execute(f"SET LOCAL lock_timeout = '{_DDL_LOCK_TIMEOUT}'")
+        created = ensure_query_stats_partitions(cursor, now)
+        dropped, default_rows_deleted = drop_expired_query_stats_partitions(cursor, now)
+
+    return {
+        "status": "completed",
+        "created": list(created),
+        "dropped": list(dropped),
+        "default_rows_deleted": default_rows_deleted,
+        "rollup_rows_deleted": rollup_rows_deleted,
+    }
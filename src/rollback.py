@@ -1,5 +1,6 @@
 """Rollback mechanism for quick disable"""
 
+import copy
 import logging
 
 from src.monitoring import get_monitoring
@@ -423,13 +424,28 @@ def get_system_status():
         }
 
 
-def require_enabled(func):
-    """Decorator to require system to be enabled"""
+def require_enabled(func=None, *, disabled_return=None):
+    """
+    Decorator to require system to be enabled.
+
+    Usable bare (@require_enabled) or with arguments.
+
+    Args:
+        disabled_return: Result returned (with "reason" added) when the system is
+            disabled, so callers get the function's usual result shape
+    """
+
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            if not is_system_enabled():
+                logger.warning(f"Operation {func.__name__} skipped: system is disabled")
+                if disabled_return is not None:
+                    return {**copy.deepcopy(disabled_return), "reason": "system_disabled"}
+                return {"skipped": True, "reason": "system_disabled"}
+            return func(*args, **kwargs)
 
-    def wrapper(*args, **kwargs):
-        if not is_system_enabled():
-            logger.warning(f"Operation {func.__name__} skipped: system is disabled")
-            return {"skipped": True, "reason": "system_disabled"}
-        return func(*args, **kwargs)
+        return wrapper
 
-    return wrapper
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -47,6 +47,10 @@ def discover_schema_from_database(
         "expression_profile",
         "mutation_log",
         "query_stats",
+        "query_stats_rollup",
+        "query_stats_hourly",
+        "query_stats_rollup_watermark",
+        "explain_plan_cache",
         "index_versions",
         "ab_experiments",
         "ab_experiment_results",
@@ -67,6 +71,15 @@ def discover_schema_from_database(
                     FROM information_schema.tables
                     WHERE table_schema = %s
                       AND table_type = 'BASE TABLE'
+                      -- Partitions are covered by their parent table
+                      AND NOT EXISTS (
+                          SELECT 1
+                          FROM pg_class
+                          JOIN pg_namespace ON pg_namespace.oid = pg_class.relnamespace
+                          WHERE pg_namespace.nspname = table_schema
+                            AND pg_class.relname = table_name
+                            AND pg_class.relispartition
+                      )
                     ORDER BY table_name
                 """
             cursor.execute(tables_query, (schema_name,))
@@ -147,6 +147,12 @@ def detect_and_sync_schema_changes(
                 f"Detected removed schema elements: {len(removed_tables)} tables, {len(removed_columns)} columns"
             )
 
+        # Identifiers may have been added or dropped: drop memoized validation results
+        if new_tables or new_columns or removed_tables or removed_columns:
+            from src.validation import clear_validation_cache
+
+            clear_validation_cache()
+
         # 7. Update genome_catalog if requested
         if auto_update:
             if new_tables or new_columns:
@@ -11,6 +11,11 @@ from psycopg2.extras import RealDictCursor
 
 from src.database import get_database_adapter
 from src.db import get_connection
+from src.query_stats_partitions import (
+    ensure_query_stats_partitions,
+    is_query_stats_partitioned,
+    is_query_stats_partitioning_enabled,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -140,15 +145,130 @@ def create_metadata_tables(cursor):
     )
 
     # Query stats - tracks query performance
+    # Range-partitioned on created_at (partitions managed by src/query_stats_partitions.py)
+    # unless features.query_stats_partitioning.enabled is off. An existing unpartitioned
+    # table is left as it is.
+    if is_query_stats_partitioning_enabled():
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS query_stats (
+                id SERIAL,
+                tenant_id INTEGER REFERENCES tenants(id) ON DELETE SET NULL,
+                table_name TEXT NOT NULL,
+                field_name TEXT,
+                query_type TEXT NOT NULL,
+                duration_ms NUMERIC NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        """
+        )
+        if is_query_stats_partitioned(cursor):
+            # Catches rows outside every pre-created range so inserts never fail
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS query_stats_default PARTITION OF query_stats DEFAULT"
+            )
+    else:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS query_stats (
+                id SERIAL PRIMARY KEY,
+                tenant_id INTEGER REFERENCES tenants(id) ON DELETE SET NULL,
+                table_name TEXT NOT NULL,
+                field_name TEXT,
+                query_type TEXT NOT NULL,
+                duration_ms NUMERIC NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
+    # Query stats rollup - pre-aggregated query stats (stats_collection.mode = "aggregate")
+    # duration_histogram holds per-bucket counts for DURATION_HISTOGRAM_BOUNDS_MS;
+    # latency_sketch holds DDSketch bin counts (src/sketches.py) for percentiles
     cursor.execute(
         """
-        CREATE TABLE IF NOT EXISTS query_stats (
-            id SERIAL PRIMARY KEY,
-            tenant_id INTEGER REFERENCES tenants(id) ON DELETE SET NULL,
+        CREATE TABLE IF NOT EXISTS query_stats_rollup (
+            id BIGSERIAL PRIMARY KEY,
+            bucket_start TIMESTAMP NOT NULL,
+            tenant_id INTEGER,
             table_name TEXT NOT NULL,
             field_name TEXT,
             query_type TEXT NOT NULL,
-            duration_ms NUMERIC NOT NULL,
+            query_count BIGINT NOT NULL DEFAULT 0,
+            total_duration_ms DOUBLE PRECISION NOT NULL DEFAULT 0,
+            min_duration_ms DOUBLE PRECISION,
+            max_duration_ms DOUBLE PRECISION,
+            duration_histogram INTEGER[] NOT NULL,
+            latency_sketch JSONB NOT NULL DEFAULT '{}'
+        )
+    """
+    )
+    # Upsert target for rollup flushes (NULL tenant/field collapse to one key)
+    cursor.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_query_stats_rollup_key
+        ON query_stats_rollup (
+            bucket_start, (COALESCE(tenant_id, 0)), table_name,
+            (COALESCE(field_name, '')), query_type
+        )
+    """
+    )
+
+    # Hourly rollups of raw query_stats, written by src/stats_rollup.py past a watermark
+    # tenant_hll is a HyperLogLog sketch of the hour's distinct tenant IDs and
+    # latency_sketch the hour's DDSketch of durations
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS query_stats_hourly (
+            bucket_start TIMESTAMP NOT NULL,
+            table_name TEXT NOT NULL,
+            field_name TEXT,
+            query_type TEXT NOT NULL,
+            query_count BIGINT NOT NULL,
+            total_duration_ms DOUBLE PRECISION NOT NULL,
+            min_duration_ms DOUBLE PRECISION,
+            max_duration_ms DOUBLE PRECISION,
+            duration_histogram INTEGER[] NOT NULL,
+            tenant_hll BYTEA NOT NULL,
+            latency_sketch JSONB NOT NULL DEFAULT '{}'
+        )
+    """
+    )
+    # Rollup tables created before latency sketches were added
+    for rollup_table in ("query_stats_rollup", "query_stats_hourly"):
+        cursor.execute(
+            f"""
+            ALTER TABLE {rollup_table}
+            ADD COLUMN IF NOT EXISTS latency_sketch JSONB NOT NULL DEFAULT '{{}}'
+        """
+        )
+    cursor.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_query_stats_hourly_key
+        ON query_stats_hourly (
+            bucket_start, table_name, (COALESCE(field_name, '')), query_type
+        )
+    """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS query_stats_rollup_watermark (
+            job_name TEXT PRIMARY KEY,
+            covered_from TIMESTAMP NOT NULL,
+            rolled_up_to TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    )
+
+    # EXPLAIN plan cache - shared tier for features.query_analyzer.cache_backend = "postgres"
+    # cache_key embeds the schema/statistics epoch, so stale plans are never read
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS explain_plan_cache (
+            cache_key TEXT PRIMARY KEY,
+            analysis_json JSONB NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """
@@ -277,6 +397,16 @@ def create_indexes(cursor, max_retries: int = 3, retry_delay: float = 0.5):
         CREATE INDEX IF NOT EXISTS idx_algorithm_usage_table_field
         ON algorithm_usage(table_name, field_name, algorithm_name, created_at DESC)
         """,
+        # query_stats is append-only in created_at order, so a BRIN index stays tiny
+        # and lets time-window scans skip old blocks (cascades to every partition)
+        """
+        CREATE INDEX IF NOT EXISTS idx_query_stats_created_at_brin
+        ON query_stats USING BRIN (created_at)
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_query_stats_table_field_created
+        ON query_stats(table_name, field_name, created_at)
+        """,
     ]
 
     for stmt in index_statements:
@@ -332,6 +462,7 @@ def init_schema():
                     create_business_tables(cursor)
                     create_metadata_tables(cursor)
                     create_indexes(cursor)
+                    ensure_query_stats_partitions(cursor)
                     conn.commit()
                     _schema_initialized = True
                     logger.info("Schema initialized successfully")
@@ -0,0 +1,201 @@
+"""
+Mergeable summaries for rolled-up query stats.
+
+Sketches are built in whichever process rolls the stats up, serialized into
+rollup rows and merged again at read time, so their hashing and encoding must
+not depend on the process (no salted hash()).
+"""
+
+import hashlib
+import json
+import math
+
+DEFAULT_HLL_PRECISION = 10
+
+# Persisted latency sketches all use this accuracy so they stay mergeable
+DEFAULT_DDSKETCH_ACCURACY = 0.01
+# Values at or below this (ms) are counted in the zero bucket
+DDSKETCH_MIN_INDEXABLE = 1e-3
+_ZERO_BUCKET_KEY = "z"
+
+
+def _hash64(value: object) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "big", signed=False
+    )
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-value counter.
+
+    2**precision one-byte registers (1 KiB at the default precision of 10, ~3%
+    standard error). Small cardinalities use linear counting and are close to
+    exact. Two sketches with the same precision merge by register-wise max.
+    """
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION, registers: bytes | None = None):
+        if not 4 <= precision <= 16:
+            raise ValueError(f"HyperLogLog precision must be 4-16, got {precision}")
+        self.precision = precision
+        size = 1 << precision
+        if registers is not None and len(registers) != size:
+            raise ValueError(f"Expected {size} HyperLogLog registers, got {len(registers)}")
+        self.registers = bytearray(registers) if registers is not None else bytearray(size)
+
+    def add(self, value: object) -> None:
+        hashed = _hash64(value)
+        index_bits = self.precision
+        rest_bits = 64 - index_bits
+        index = hashed >> rest_bits
+        rest = hashed & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Fold another sketch into this one"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precisions")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        """Estimated number of distinct values added"""
+        size = len(self.registers)
+        zeros = self.registers.count(0)
+        if zeros == size:
+            return 0
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / sum(2.0**-register for register in self.registers)
+        if raw <= 2.5 * size and zeros:
+            return round(size * math.log(size / zeros))
+        return round(raw)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> "HyperLogLog":
+        data = bytes(data)
+        return cls((len(data) - 1).bit_length(), data)
+
+
+class DDSketch:
+    """
+    DDSketch quantile sketch (Masson et al., VLDB 2019).
+
+    Values are counted in logarithmic bins of ratio gamma = (1 + a) / (1 - a), so
+    every quantile is returned within relative error a of a value at that rank.
+    Bins are sparse; for millisecond latencies between 1µs and an hour an a of 1%
+    needs at most ~1100 of them. Sketches with the same accuracy merge by adding
+    bin counts, which is also how the JSON form is merged in SQL.
+    """
+
+    __slots__ = ("relative_accuracy", "gamma", "log_gamma", "bins", "zero_count", "count")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_DDSKETCH_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"DDSketch accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def bin_index(self, value: float) -> int | None:
+        """Bin holding value, or None for the zero bucket"""
+        if value <= DDSKETCH_MIN_INDEXABLE:
+            return None
+        return math.ceil(math.log(value) / self.log_gamma)
+
+    def bin_value(self, index: int | None) -> float:
+        """Representative value of a bin (within relative_accuracy of all its members)"""
+        if index is None:
+            return 0.0
+        return 2 * self.gamma**index / (self.gamma + 1)
+
+    def add(self, value: float) -> None:
+        self.add_bin(self.bin_index(value), 1)
+
+    def add_bin(self, index: int | None, count: int) -> None:
+        """Add count values to a bin (None is the zero bucket)"""
+        if count <= 0:
+            return
+        if index is None:
+            self.zero_count += count
+        else:
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other: "DDSketch") -> None:
+        """Fold another sketch into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge DDSketches with different accuracies")
+        self.zero_count += other.zero_count
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += other.count
+
+    def _sorted_bins(self) -> list[tuple[int | None, int]]:
+        ordered: list[tuple[int | None, int]] = [(None, self.zero_count)] if self.zero_count else []
+        ordered.extend(sorted(self.bins.items()))
+        return ordered
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile.
+
+        Args:
+            q: Quantile as a fraction (0.95 for p95)
+
+        Returns:
+            Estimated value (0.0 for an empty sketch)
+        """
+        if self.count <= 0:
+            return 0.0
+        rank = min(max(q, 0.0), 1.0) * (self.count - 1)
+        cumulative = 0
+        ordered = self._sorted_bins()
+        for index, count in ordered:
+            cumulative += count
+            if cumulative > rank:
+                return self.bin_value(index)
+        return self.bin_value(ordered[-1][0])
+
+    def mean(self) -> float:
+        """Mean of the bin representatives (within relative_accuracy of the true mean)"""
+        if self.count <= 0:
+            return 0.0
+        return sum(self.bin_value(index) * count for index, count in self.bins.items()) / self.count
+
+    def between(self, lower: float | None = None, upper: float | None = None) -> "DDSketch":
+        """Sub-sketch of the bins whose representative value lies in [lower, upper]"""
+        subset = DDSketch(self.relative_accuracy)
+        for index, count in self._sorted_bins():
+            value = self.bin_value(index)
+            if (lower is None or value >= lower) and (upper is None or value <= upper):
+                subset.add_bin(index, count)
+        return subset
+
+    def to_dict(self) -> dict[str, int]:
+        """Bin counts keyed by bin index ("z" for the zero bucket), as stored in JSONB"""
+        data = {str(index): count for index, count in self.bins.items()}
+        if self.zero_count:
+            data[_ZERO_BUCKET_KEY] = self.zero_count
+        return data
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: dict[str, int] | str | None,
+        relative_accuracy: float = DEFAULT_DDSKETCH_ACCURACY,
+    ) -> "DDSketch":
+        sketch = cls(relative_accuracy)
+        if isinstance(data, str):
+            data = json.loads(data)
+        for key, count in (data or {}).items():
+            sketch.add_bin(None if key == _ZERO_BUCKET_KEY else int(key), int(count))
+        return sketch
@@ -3,23 +3,39 @@
 The public contract in this module is deliberately small.  SQLGlot nodes do
 not escape into the rest of IndexPilot, which keeps a future move to
 libpg_query possible without changing report or auto-indexer shapes.
+
+Workload snapshots and the auto-indexer see the same normalized query texts
+over and over, so read-only parses, fingerprints and extracted patterns are
+memoized in a bounded cache keyed by a hash of the raw text and the parser
+version.
 """
 
 from __future__ import annotations
 
+import copy
 import hashlib
 import re
+import threading
 from collections.abc import Iterable, Iterator
 from typing import Any
 
 import sqlglot
 from sqlglot import exp
-from sqlglot.errors import ParseError
+from sqlglot.errors import ParseError, SqlglotError
+
+from src.type_definitions import JSONDict
 
 PARSER_BACKEND = "sqlglot_postgres_ast"
 TENANT_KEY = "tenant_id"
 _SUPPORTED_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
 
+# Bound on memoized query parses; the oldest entry is dropped first
+MAX_CACHED_PARSES = 4096
+# Patterns kept per parse, one per distinct catalog slice / default schema
+_MAX_PATTERNS_PER_PARSE = 4
+# Part of every cache key, so an upgraded parser never serves stale results
+_PARSER_VERSION = f"{PARSER_BACKEND}/{sqlglot.__version__}"
+
 
 class SQLPatternError(ValueError):
     """Raised when SQL cannot safely be treated as one read-only query."""
@@ -246,6 +262,130 @@ def parse_read_only_query(query: str) -> exp.Query:
     return statement
 
 
+def extract_referenced_tables(sql: str) -> frozenset[str]:
+    """Return the lowercased names of the tables any statement in ``sql`` touches.
+
+    Covers reads and writes (INSERT/UPDATE/DELETE targets, joins, subqueries).
+    Schema qualifiers and quoting are dropped and CTE names are skipped, so the
+    result can be used as invalidation tags keyed by bare table name.
+    """
+    try:
+        statements = sqlglot.parse(sql, read="postgres")
+    except SqlglotError as exc:
+        raise SQLPatternError("invalid_postgresql_sql") from exc
+
+    tables: set[str] = set()
+    for statement in statements:
+        if statement is None:
+            continue
+        cte_names = {cte.alias_or_name.lower() for cte in statement.find_all(exp.CTE)}
+        for table_node in statement.find_all(exp.Table):
+            table = table_node.name.lower()
+            # Table functions (generate_series(...)) have no name
+            if table and (table_node.db or table not in cte_names):
+                tables.add(table)
+    return frozenset(tables)
+
+
+class _ParsedQuery:
+    """One memoized read-only parse and what has been derived from it.
+
+    The statement is shared between callers and must only be read; every
+    transformation goes through a copy.
+    """
+
+    __slots__ = ("statement", "error", "table_refs", "fingerprint", "patterns")
+
+    def __init__(self, statement: exp.Query | None, error: str | None = None):
+        self.statement = statement
+        self.error = error
+        self.table_refs: tuple[tuple[str | None, str], ...] = ()
+        if statement is not None:
+            refs: list[tuple[str | None, str]] = []
+            for table_node in statement.find_all(exp.Table):
+                ref = (table_node.db.lower() or None, table_node.name.lower())
+                if ref not in refs:
+                    refs.append(ref)
+            self.table_refs = tuple(refs)
+        self.fingerprint: str | None = None
+        self.patterns: dict[tuple[Any, ...], dict[str, Any] | None] = {}
+
+
+_parse_cache: dict[tuple[bytes, str], _ParsedQuery] = {}
+_parse_cache_lock = threading.Lock()
+_parse_cache_hits = 0
+_parse_cache_misses = 0
+
+
+def _parse_cache_key(query: str) -> tuple[bytes, str]:
+    digest = hashlib.blake2b(query.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    return digest, _PARSER_VERSION
+
+
+def _cached_read_only_parse(query: str) -> _ParsedQuery:
+    """Return the memoized :func:`parse_read_only_query` outcome for ``query``."""
+    global _parse_cache_hits, _parse_cache_misses
+
+    key = _parse_cache_key(query)
+    # Lock-free read; derived fields on an entry are only ever assigned whole
+    parsed = _parse_cache.get(key)
+    if parsed is not None:
+        _parse_cache_hits += 1
+        return parsed
+
+    try:
+        parsed = _ParsedQuery(parse_read_only_query(query))
+    except SQLPatternError as exc:
+        parsed = _ParsedQuery(None, str(exc))
+    with _parse_cache_lock:
+        _parse_cache_misses += 1
+        if key not in _parse_cache:
+            while len(_parse_cache) >= MAX_CACHED_PARSES:
+                del _parse_cache[next(iter(_parse_cache))]
+            _parse_cache[key] = parsed
+    return parsed
+
+
+def _cached_fingerprint(parsed: _ParsedQuery, statement: exp.Query) -> str:
+    if parsed.fingerprint is None:
+        parsed.fingerprint = canonical_query_fingerprint(statement)
+    return parsed.fingerprint
+
+
+def clear_sql_parse_cache() -> None:
+    """Drop all memoized parses, fingerprints and patterns"""
+    global _parse_cache_hits, _parse_cache_misses
+
+    with _parse_cache_lock:
+        _parse_cache.clear()
+        _parse_cache_hits = 0
+        _parse_cache_misses = 0
+
+
+def get_sql_parse_cache_stats() -> JSONDict:
+    """Parse cache hit/miss counters"""
+    total = _parse_cache_hits + _parse_cache_misses
+    return {
+        "size": len(_parse_cache),
+        "max_size": MAX_CACHED_PARSES,
+        "parser_version": _PARSER_VERSION,
+        "hits": _parse_cache_hits,
+        "misses": _parse_cache_misses,
+        "hit_rate": round(_parse_cache_hits / total * 100, 2) if total > 0 else 0.0,
+    }
+
+
+def read_only_query_fingerprint(query: str) -> str:
+    """Return the value-free fingerprint of one read-only query, memoized per text.
+
+    Raises :class:`SQLPatternError` exactly like :func:`parse_read_only_query`.
+    """
+    parsed = _cached_read_only_parse(query)
+    if parsed.statement is None:
+        raise SQLPatternError(parsed.error)
+    return _cached_fingerprint(parsed, parsed.statement)
+
+
 def canonical_query_fingerprint(statement: exp.Query) -> str:
     """Return a value-free fingerprint so equivalent query shapes group."""
 
@@ -420,9 +560,9 @@ def extract_proposed_index_query_context(
     ):
         return None
 
-    try:
-        statement = parse_read_only_query(query)
-    except SQLPatternError:
+    parsed = _cached_read_only_parse(query)
+    statement = parsed.statement
+    if statement is None:
         return None
 
     physical_tables = _physical_tables(statement, table_columns, default_schema)
@@ -460,7 +600,7 @@ def extract_proposed_index_query_context(
             ],
             "leading_column": leading_column,
             "leading_column_usage": leading_column_usage,
-            "query_fingerprint": canonical_query_fingerprint(statement),
+            "query_fingerprint": _cached_fingerprint(parsed, statement),
             "parser_backend": PARSER_BACKEND,
             **context,
         }
@@ -504,12 +644,44 @@ def extract_postgres_query_pattern(
     table_columns: dict[tuple[str, str], set[str]],
     default_schema: str = "public",
 ) -> dict[str, Any] | None:
-    """Extract the strongest safe index pattern from one PostgreSQL query."""
-    try:
-        statement = parse_read_only_query(query)
-    except SQLPatternError:
+    """Extract the strongest safe index pattern from one PostgreSQL query.
+
+    Results are memoized per query text together with the slice of
+    ``table_columns`` the query can touch, so a changed catalog is re-evaluated.
+    Callers get their own copy of the pattern.
+    """
+    parsed = _cached_read_only_parse(query)
+    statement = parsed.statement
+    if statement is None:
         return None
 
+    schema = default_schema.lower()
+    catalog_slice = tuple(
+        (key, frozenset(table_columns[key]))
+        for key in dict.fromkeys(
+            (ref_schema or schema, table) for ref_schema, table in parsed.table_refs
+        )
+        if key in table_columns
+    )
+    pattern_key = (default_schema, catalog_slice)
+    if pattern_key in parsed.patterns:
+        return copy.deepcopy(parsed.patterns[pattern_key])
+
+    pattern = _extract_pattern(parsed, statement, table_columns, default_schema)
+    patterns = dict(parsed.patterns)
+    while len(patterns) >= _MAX_PATTERNS_PER_PARSE:
+        del patterns[next(iter(patterns))]
+    patterns[pattern_key] = pattern
+    parsed.patterns = patterns
+    return copy.deepcopy(pattern)
+
+
+def _extract_pattern(
+    parsed: _ParsedQuery,
+    statement: exp.Query,
+    table_columns: dict[tuple[str, str], set[str]],
+    default_schema: str,
+) -> dict[str, Any] | None:
     physical_tables = _physical_tables(statement, table_columns, default_schema)
     patterns = [
         pattern
@@ -527,6 +699,6 @@ def extract_postgres_query_pattern(
             len(item["range_columns"]),
         ),
     )
-    pattern["query_fingerprint"] = canonical_query_fingerprint(statement)
+    pattern["query_fingerprint"] = _cached_fingerprint(parsed, statement)
     pattern["parser_backend"] = PARSER_BACKEND
     return pattern
@@ -1,23 +1,266 @@
 """Query stats collection and analysis"""
 
+import csv
+import io
 import logging
 import threading
 import time
 
-from psycopg2.extras import RealDictCursor
+from psycopg2.errors import FeatureNotSupported, InsufficientPrivilege
+from psycopg2.extras import Json, RealDictCursor, execute_values
 
+from src.config_loader import ConfigLoader
 from src.db import get_connection, get_cursor
+from src.graceful_shutdown import register_shutdown_handler, shutdown_drain
+from src.sketches import DDSketch
+from src.stats_aggregation import (
+    DEFAULT_BUCKET_SECONDS,
+    HISTOGRAM_BUCKET_COUNT,
+    LatencyStats,
+    QueryStatsAggregator,
+    histogram_percentile,
+    merge_histograms,
+)
+from src.stats_buffer import DEFAULT_STRIPES, StripedStatsBuffer
+from src.stats_flusher import StatsFlusher
+from src.stats_rollup import (
+    get_field_usage_stats_from_rollups,
+    get_latency_stats_from_rollups,
+    get_period_counts_from_rollups,
+    is_stats_rollup_enabled,
+)
+from src.type_definitions import JSONDict
 
 logger = logging.getLogger(__name__)
 
+# Load config
+try:
+    _config_loader = ConfigLoader()
+except Exception as e:
+    logger.error(f"Failed to initialize ConfigLoader: {e}, using defaults")
+    _config_loader = ConfigLoader()
+
+STATS_MODE_RAW = "raw"
+STATS_MODE_AGGREGATE = "aggregate"
+
+# Raw-row flush backends (features.stats_collection.flush_method)
+FLUSH_METHOD_EXECUTEMANY = "executemany"  # One round trip per row
+FLUSH_METHOD_EXECUTE_VALUES = "execute_values"  # Multi-row VALUES pages
+FLUSH_METHOD_COPY = "copy"  # COPY ... FROM STDIN streamed from an in-memory CSV buffer
+FLUSH_METHODS = (FLUSH_METHOD_EXECUTEMANY, FLUSH_METHOD_EXECUTE_VALUES, FLUSH_METHOD_COPY)
+DEFAULT_FLUSH_METHOD = FLUSH_METHOD_EXECUTE_VALUES
+_EXECUTE_VALUES_PAGE_SIZE = 1000
+
+_QUERY_STATS_COLUMNS = "(tenant_id, table_name, field_name, query_type, duration_ms)"
+
+# Set once COPY fails (e.g. restricted role or RLS on query_stats); later flushes
+# go straight to execute_values instead of failing over on every flush
+_copy_unavailable = False
+
 # Thread-safe batch stats for performance
 
-_stats_buffer: list[tuple[str, str, str | None, str, float]] = []
-_stats_lock = threading.Lock()
 _last_flush_time = time.time()
+_interval_flush_lock = threading.Lock()
 _flush_interval = 5.0  # Flush every 5 seconds even if buffer not full
 _max_buffer_size = 10000  # Maximum buffer size to prevent memory issues
 
+# Lock-striped so concurrent log_query_stat callers don't serialize on one lock
+_stats_buffer = StripedStatsBuffer(
+    stripes=_config_loader.get_int("features.stats_collection.buffer_stripes", DEFAULT_STRIPES),
+    max_size=_max_buffer_size,
+)
+
+# Pre-aggregation (features.stats_collection.mode = "aggregate")
+_aggregator = QueryStatsAggregator(
+    _config_loader.get_int(
+        "features.stats_collection.aggregation_bucket_seconds", DEFAULT_BUCKET_SECONDS
+    )
+)
+
+# Memoized (table_name, field_name) validation results for log_query_stat. Reads are
+# lock-free dict lookups; the cache is reset when full or when src.validation's
+# generation changes (schema change detection / schema evolution cleared it).
+_validated_identifiers: dict[tuple[str, str | None], tuple[str, str | None]] = {}
+_validated_identifiers_generation = -1
+_validated_identifiers_max_size = _config_loader.get_int(
+    "features.stats_collection.validation_cache_size", 4096
+)
+
+# Background flusher (features.stats_collection.background_flush), created lazily
+_stats_flusher: StatsFlusher | None = None
+_stats_flusher_lock = threading.Lock()
+_flusher_shutdown_registered = False
+
+
+def get_stats_collection_mode() -> str:
+    """Get the stats collection mode ("raw" or "aggregate") from config"""
+    mode = _config_loader.get_str("features.stats_collection.mode", STATS_MODE_RAW).lower()
+    if mode not in (STATS_MODE_RAW, STATS_MODE_AGGREGATE):
+        logger.warning(f"Unknown stats collection mode '{mode}', using '{STATS_MODE_RAW}'")
+        return STATS_MODE_RAW
+    return mode
+
+
+def is_stats_aggregation_enabled() -> bool:
+    """Check if query stats are pre-aggregated into query_stats_rollup"""
+    return get_stats_collection_mode() == STATS_MODE_AGGREGATE
+
+
+def _validate_stat_identifiers(table_name, field_name) -> tuple[str, str | None]:
+    """
+    Validate a (table, field) pair, memoizing successful results.
+
+    Raises:
+        ValueError: If the table or field name is invalid (failures are not cached)
+    """
+    global _validated_identifiers, _validated_identifiers_generation
+
+    from src.validation import get_validation_generation, validate_field_name, validate_table_name
+
+    generation = get_validation_generation()
+    if generation != _validated_identifiers_generation:
+        _validated_identifiers = {}
+        _validated_identifiers_generation = generation
+
+    key = (table_name, field_name)
+    cached = _validated_identifiers.get(key)
+    if cached is not None:
+        return cached
+
+    validated_table = validate_table_name(table_name)
+    validated_field = validate_field_name(field_name, validated_table) if field_name else field_name
+
+    if len(_validated_identifiers) >= _validated_identifiers_max_size:
+        _validated_identifiers = {}
+    _validated_identifiers[key] = (validated_table, validated_field)
+    return validated_table, validated_field
+
+
+def clear_stats_validation_cache() -> None:
+    """Drop memoized log_query_stat validation results"""
+    global _validated_identifiers
+    _validated_identifiers = {}
+
+
+def is_background_flush_enabled() -> bool:
+    """Check if stats are flushed on a background thread instead of the caller's"""
+    return _config_loader.get_bool("features.stats_collection.background_flush", False)
+
+
+def _get_stats_flusher() -> StatsFlusher:
+    """Get the background flusher, starting it on first use"""
+    global _stats_flusher, _flusher_shutdown_registered
+
+    flusher = _stats_flusher
+    if flusher is not None and flusher.is_running():
+        return flusher
+
+    with _stats_flusher_lock:
+        if _stats_flusher is None:
+            _stats_flusher = StatsFlusher(
+                flush_callback=flush_query_stats_buffer,
+                batch_size=_config_loader.get_int("features.stats_collection.batch_size", 100),
+                flush_interval=_config_loader.get_float(
+                    "features.stats_collection.flush_interval_seconds", _flush_interval
+                ),
+                max_queue_size=_config_loader.get_int(
+                    "features.stats_collection.max_buffer_size", _max_buffer_size
+                ),
+            )
+        # Drain before the connection pool is closed (pool handler uses priority 10)
+        if not _flusher_shutdown_registered:
+            register_shutdown_handler(stop_stats_flusher, priority=20)
+            _flusher_shutdown_registered = True
+        _stats_flusher.start()
+        return _stats_flusher
+
+
+def stop_stats_flusher(timeout: float = 10.0) -> None:
+    """Stop the background flusher and write out everything still buffered"""
+    global _stats_flusher
+
+    with _stats_flusher_lock:
+        flusher = _stats_flusher
+        _stats_flusher = None
+    # Runs from a shutdown handler, after get_connection() has started refusing callers
+    with shutdown_drain():
+        if flusher is not None:
+            flusher.stop(timeout=timeout)
+        flush_query_stats()
+
+
+def get_stats_flusher_metrics() -> JSONDict:
+    """Get background flusher backpressure metrics (queue depth, drops, flush latency)"""
+    flusher = _stats_flusher
+    if flusher is None:
+        return {"enabled": is_background_flush_enabled(), "running": False}
+    return {"enabled": is_background_flush_enabled(), **flusher.get_metrics()}
+
+
+def get_stats_flush_method() -> str:
+    """Get the raw-row flush backend from config"""
+    method = _config_loader.get_str(
+        "features.stats_collection.flush_method", DEFAULT_FLUSH_METHOD
+    ).lower()
+    if method not in FLUSH_METHODS:
+        logger.warning(f"Unknown stats flush method '{method}', using '{DEFAULT_FLUSH_METHOD}'")
+        return DEFAULT_FLUSH_METHOD
+    return method
+
+
+def _stats_rows_to_csv(buffer) -> io.StringIO:
+    """Serialize stats rows for COPY (FORMAT csv); empty values load as NULL"""
+    csv_buffer = io.StringIO()
+    writer = csv.writer(csv_buffer, lineterminator="\n")
+    for tenant_id, table_name, field_name, query_type, duration_ms in buffer:
+        writer.writerow(
+            (
+                tenant_id if tenant_id not in (None, "") else "",
+                table_name,
+                field_name if field_name is not None else "",
+                query_type,
+                duration_ms,
+            )
+        )
+    csv_buffer.seek(0)
+    return csv_buffer
+
+
+def insert_query_stats_rows(cursor, buffer, method: str | None = None) -> str:
+    """
+    Insert raw stats rows into query_stats using the given flush backend.
+
+    Does not commit. COPY failures are not retried here; callers that want the
+    execute_values fallback should use flush_query_stats_buffer().
+
+    Args:
+        cursor: Database cursor
+        buffer: (tenant_id, table_name, field_name, query_type, duration_ms) rows
+        method: Flush backend (defaults to the configured one)
+
+    Returns:
+        The flush method that was used
+    """
+    method = method or get_stats_flush_method()
+    if method == FLUSH_METHOD_COPY:
+        cursor.copy_expert(
+            f"COPY query_stats {_QUERY_STATS_COLUMNS} FROM STDIN WITH (FORMAT csv)",
+            _stats_rows_to_csv(buffer),
+        )
+    elif method == FLUSH_METHOD_EXECUTE_VALUES:
+        execute_values(
+            cursor,
+            f"INSERT INTO query_stats {_QUERY_STATS_COLUMNS} VALUES %s",
+            buffer,
+            page_size=_EXECUTE_VALUES_PAGE_SIZE,
+        )
+    else:
+        cursor.executemany(
+            f"INSERT INTO query_stats {_QUERY_STATS_COLUMNS} VALUES (%s, %s, %s, %s, %s)",
+            buffer,
+        )
+    return method
+
 
 def log_query_stat(
     tenant_id,
@@ -39,20 +282,19 @@ def log_query_stat(
         # Rollback module not available, continue normally
         pass
 
-    global _stats_buffer, _last_flush_time
+    global _last_flush_time
 
     # Validate inputs (best-effort, don't crash on invalid data)
     # Skip validation for simulator/internal use (performance optimization)
     if not skip_validation:
         try:
-            from src.validation import validate_field_name, validate_table_name, validate_tenant_id
+            from src.validation import validate_tenant_id
 
             validated_tenant_id = validate_tenant_id(tenant_id)
             # Convert to string for buffer storage
             tenant_id = str(validated_tenant_id) if validated_tenant_id is not None else ""
-            table_name = validate_table_name(table_name)
-            if field_name:
-                field_name = validate_field_name(field_name, table_name)
+            # Table/field checks hit genome_catalog, so they are memoized per pair
+            table_name, field_name = _validate_stat_identifiers(table_name, field_name)
         except (ValueError, ImportError) as e:
             logger.warning(f"Invalid stat data, skipping: {e}")
             return
@@ -60,30 +302,26 @@ def log_query_stat(
         # Convert tenant_id to string even when skipping validation
         tenant_id = str(tenant_id) if tenant_id is not None else ""
 
-    buffer_copy = None
-    with _stats_lock:
-        # Prevent buffer overflow (memory protection)
-        if len(_stats_buffer) >= _max_buffer_size:
-            logger.warning(f"Stats buffer at maximum size ({_max_buffer_size}), forcing flush")
-            current_time = time.time()
-            _last_flush_time = current_time
-            buffer_copy = _stats_buffer[:]
-            _stats_buffer = []
-        else:
-            _stats_buffer.append((tenant_id, table_name, field_name, query_type, duration_ms))
-
-            # Flush when buffer is full or time interval passed
-            current_time = time.time()
-            should_flush = (
-                len(_stats_buffer) >= batch_size
-                or (current_time - _last_flush_time) >= _flush_interval
-            )
+    row = (tenant_id, table_name, field_name, query_type, duration_ms)
+
+    # Background mode: hand the row to the flusher thread, never touch the DB here
+    if is_background_flush_enabled():
+        _get_stats_flusher().submit(row)
+        return
 
-            if should_flush:
-                _last_flush_time = current_time
-                # Make a copy to flush outside lock
-                buffer_copy = _stats_buffer[:]
-                _stats_buffer = []
+    buffer_copy = _stats_buffer.append(row, batch_size)
+
+    # Interval flush: one thread claims it, the others keep appending
+    if (
+        buffer_copy is None
+        and (time.time() - _last_flush_time) >= _flush_interval
+        and _interval_flush_lock.acquire(blocking=False)
+    ):
+        try:
+            _last_flush_time = time.time()
+            buffer_copy = _stats_buffer.drain()
+        finally:
+            _interval_flush_lock.release()
 
     if buffer_copy:
         flush_query_stats_buffer(buffer_copy)
@@ -91,49 +329,235 @@ def log_query_stat(
 
 def flush_query_stats():
     """Flush buffered query stats to database (thread-safe)"""
-    global _stats_buffer
+    buffer_copy = _stats_buffer.drain()
+    if buffer_copy:
+        flush_query_stats_buffer(buffer_copy)
 
-    with _stats_lock:
-        if not _stats_buffer:
-            return
-        # Make a copy to flush outside lock
-        buffer_copy = _stats_buffer[:]
-        _stats_buffer = []
+    flusher = _stats_flusher
+    if flusher is not None:
+        flusher.flush()
 
-    flush_query_stats_buffer(buffer_copy)
+    # Explicit flushes also write out any partially filled rollup buckets
+    if is_stats_aggregation_enabled():
+        flush_query_stats_rollup()
 
 
 def flush_query_stats_buffer(buffer):
-    """Flush a specific buffer to database"""
+    """
+    Flush a specific buffer to database.
+
+    In aggregate mode the rows are folded into the in-memory rollup counters, and
+    the rollup is written once per flush interval instead of one row per query.
+    """
     if not buffer:
         return
 
+    if is_stats_aggregation_enabled():
+        _aggregator.add_rows(buffer)
+        if _aggregator.seconds_since_drain() >= _flush_interval:
+            flush_query_stats_rollup()
+        return
+
+    global _copy_unavailable
+
+    method = get_stats_flush_method()
+    if method == FLUSH_METHOD_COPY and _copy_unavailable:
+        method = FLUSH_METHOD_EXECUTE_VALUES
+
     with get_connection() as conn:
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
-            cursor.executemany(
-                """
-                INSERT INTO query_stats
-                (tenant_id, table_name, field_name, query_type, duration_ms)
-                VALUES (%s, %s, %s, %s, %s)
-            """,
-                buffer,
-            )
+            try:
+                insert_query_stats_rows(cursor, buffer, method)
+            except (InsufficientPrivilege, FeatureNotSupported) as e:
+                if method != FLUSH_METHOD_COPY:
+                    raise
+                # Restricted roles (or RLS on query_stats) may not allow COPY
+                conn.rollback()
+                _copy_unavailable = True
+                logger.warning(f"COPY flush of query stats not allowed ({e}), using execute_values")
+                insert_query_stats_rows(cursor, buffer, FLUSH_METHOD_EXECUTE_VALUES)
+            except Exception as e:
+                if method != FLUSH_METHOD_COPY:
+                    raise
+                # Transient failures (deadlock, serialization) do not disable COPY
+                conn.rollback()
+                logger.warning(f"COPY flush of query stats failed ({e}), retrying once")
+                insert_query_stats_rows(cursor, buffer, FLUSH_METHOD_COPY)
             conn.commit()
         except Exception as e:
             conn.rollback()
             # Log error but don't crash - stats are best-effort
-            import logging
-
-            logger = logging.getLogger(__name__)
             logger.error(f"Failed to flush query stats: {e}")
             raise
         finally:
             cursor.close()
 
 
+def flush_query_stats_rollup():
+    """
+    Write the accumulated rollup counters to query_stats_rollup.
+
+    One row is upserted per (bucket, tenant, table, field, query_type); rows for a
+    bucket that was already written are merged into the existing counters. Latency
+    sketches merge in SQL by adding their per-bin counts.
+    """
+    drained = _aggregator.drain()
+    if not drained:
+        return
+
+    rows = [
+        (
+            bucket_start,
+            tenant_id,
+            table_name,
+            field_name,
+            query_type,
+            counters.query_count,
+            counters.total_duration_ms,
+            counters.min_duration_ms,
+            counters.max_duration_ms,
+            counters.histogram,
+            Json(counters.latency.to_dict()),
+        )
+        for (bucket_start, tenant_id, table_name, field_name, query_type), counters in drained
+    ]
+
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO query_stats_rollup
+                    (bucket_start, tenant_id, table_name, field_name, query_type,
+                     query_count, total_duration_ms, min_duration_ms, max_duration_ms,
+                     duration_histogram, latency_sketch)
+                    VALUES %s
+                    ON CONFLICT (bucket_start, (COALESCE(tenant_id, 0)), table_name,
+                                 (COALESCE(field_name, '')), query_type)
+                    DO UPDATE SET
+                        query_count = query_stats_rollup.query_count + EXCLUDED.query_count,
+                        total_duration_ms =
+                            query_stats_rollup.total_duration_ms + EXCLUDED.total_duration_ms,
+                        min_duration_ms =
+                            LEAST(query_stats_rollup.min_duration_ms, EXCLUDED.min_duration_ms),
+                        max_duration_ms =
+                            GREATEST(query_stats_rollup.max_duration_ms, EXCLUDED.max_duration_ms),
+                        duration_histogram = ARRAY(
+                            SELECT a + b
+                            FROM unnest(
+                                query_stats_rollup.duration_histogram,
+                                EXCLUDED.duration_histogram
+                            ) AS h(a, b)
+                        ),
+                        latency_sketch = (
+                            SELECT COALESCE(jsonb_object_agg(bin, total), '{}'::jsonb)
+                            FROM (
+                                SELECT bin, SUM(n::bigint) AS total
+                                FROM (
+                                    SELECT * FROM jsonb_each_text(query_stats_rollup.latency_sketch)
+                                    UNION ALL
+                                    SELECT * FROM jsonb_each_text(EXCLUDED.latency_sketch)
+                                ) AS bins(bin, n)
+                                GROUP BY bin
+                            ) AS merged
+                        )
+                """,
+                    rows,
+                    template="(to_timestamp(%s)::timestamp, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                )
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Failed to flush query stats rollup: {e}")
+                raise
+            finally:
+                cursor.close()
+    except Exception:
+        # Keep the window for the next flush instead of dropping it
+        _aggregator.restore(drained)
+        raise
+
+
+def _get_query_stats_from_rollup(time_window_hours, table_name=None, field_name=None):
+    """get_query_stats() equivalent that reads pre-aggregated rollup rows"""
+    with get_cursor() as cursor:
+        query = """
+            SELECT
+                tenant_id,
+                table_name,
+                field_name,
+                query_type,
+                query_count,
+                total_duration_ms,
+                max_duration_ms,
+                duration_histogram,
+                latency_sketch
+            FROM query_stats_rollup
+            WHERE bucket_start >= NOW() - INTERVAL '1 hour' * %s
+        """
+        params = [time_window_hours]
+        if table_name:
+            query += " AND table_name = %s"
+            params.append(table_name)
+        if field_name:
+            query += " AND field_name = %s"
+            params.append(field_name)
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+    return _summarize_rollup_rows(rows, ("tenant_id", "table_name", "field_name", "query_type"))
+
+
+def _summarize_rollup_rows(rows, key_columns: tuple[str, ...]) -> list[dict]:
+    """
+    Merge query_stats_rollup rows per key into count/avg/p50/p95/p99 rows.
+
+    Percentiles come from the merged latency sketches. Rows written before
+    sketches existed leave a key's sketch short of its query count; such keys fall
+    back to the coarser duration histogram.
+    """
+    merged: dict[tuple, tuple[LatencyStats, list[int]]] = {}
+    for row in rows:
+        key = tuple(row[column] for column in key_columns)
+        entry = merged.get(key)
+        if entry is None:
+            entry = (LatencyStats(), [0] * HISTOGRAM_BUCKET_COUNT)
+            merged[key] = entry
+        latency, histogram = entry
+        latency.add(
+            row["query_count"],
+            row["total_duration_ms"],
+            row["max_duration_ms"],
+            DDSketch.from_dict(row.get("latency_sketch")),
+        )
+        merge_histograms(histogram, row["duration_histogram"])
+
+    results = []
+    for key, (latency, histogram) in merged.items():
+        summary = latency.summary()
+        if latency.sketch.count < latency.query_count:
+            for percentile in (50, 95, 99):
+                summary[f"p{percentile}_duration_ms"] = histogram_percentile(
+                    histogram, percentile / 100, latency.max_duration_ms
+                )
+        results.append({**dict(zip(key_columns, key, strict=True)), **summary})
+    results.sort(key=lambda r: r["query_count"], reverse=True)
+    return results
+
+
 def get_query_stats(time_window_hours=24, table_name=None, field_name=None):
-    """Get aggregated query stats over a time window"""
+    """
+    Get aggregated query stats over a time window.
+
+    Reads query_stats_rollup instead of raw rows when aggregation is enabled;
+    p50/p95/p99 are then estimated from the rolled-up latency sketches.
+    """
+    if is_stats_aggregation_enabled():
+        return _get_query_stats_from_rollup(time_window_hours, table_name, field_name)
+
     with get_cursor() as cursor:
         # Build query with proper parameterized interval
         query = """
@@ -177,11 +601,40 @@ def get_field_usage_stats(time_window_hours=24, limit: int | None = None):
     """
     Get field usage statistics aggregated across all tenants.
 
+    Reads query_stats_rollup instead of raw rows when aggregation is enabled.
+    Otherwise hours already rolled into query_stats_hourly come from there and
+    only the rest of the window is aggregated from raw rows (tenant_count is then
+    a HyperLogLog estimate).
+
     Args:
         time_window_hours: Time window to analyze queries
         limit: Optional limit on number of results (for performance optimization)
     """
-    with get_cursor() as cursor:
+    if not is_stats_aggregation_enabled() and is_stats_rollup_enabled():
+        try:
+            with get_cursor() as cursor:
+                rolled_up = get_field_usage_stats_from_rollups(cursor, time_window_hours, limit)
+            if rolled_up is not None:
+                return rolled_up
+        except Exception as e:
+            logger.debug(f"Hourly rollups unavailable, aggregating raw query stats: {e}")
+
+    if is_stats_aggregation_enabled():
+        query = """
+            SELECT
+                table_name,
+                field_name,
+                SUM(query_count) as total_queries,
+                COUNT(DISTINCT tenant_id) as tenant_count,
+                SUM(total_duration_ms) / NULLIF(SUM(query_count), 0) as avg_duration_ms,
+                SUM(total_duration_ms) as total_duration_ms
+            FROM query_stats_rollup
+            WHERE bucket_start >= NOW() - INTERVAL '1 hour' * %s
+              AND field_name IS NOT NULL
+            GROUP BY table_name, field_name
+            ORDER BY total_queries DESC
+        """
+    else:
         query = """
             SELECT
                 table_name,
@@ -196,17 +649,206 @@ def get_field_usage_stats(time_window_hours=24, limit: int | None = None):
             GROUP BY table_name, field_name
             ORDER BY total_queries DESC
         """
-        params = [time_window_hours]
+    params = [time_window_hours]
+
+    # OPTIMIZATION: Add LIMIT for small workloads
+    if limit:
+        query += " LIMIT %s"
+        params.append(limit)
+
+    with get_cursor() as cursor:
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
 
-        # OPTIMIZATION: Add LIMIT for small workloads
-        if limit:
-            query += " LIMIT %s"
-            params.append(limit)
+def _get_rollup_latency_rows(time_window_hours, table_name=None, field_name=None):
+    """
+    query_stats_rollup rows (all tenants) carrying latency data for a window.
 
+    bucket_start is truncated to the hour so rows can be grouped per hour.
+    """
+    query = """
+        SELECT
+            date_trunc('hour', bucket_start) AS bucket_start,
+            table_name,
+            field_name,
+            query_type,
+            query_count,
+            total_duration_ms,
+            max_duration_ms,
+            duration_histogram,
+            latency_sketch
+        FROM query_stats_rollup
+        WHERE bucket_start >= NOW() - INTERVAL '1 hour' * %s
+    """
+    params = [time_window_hours]
+    if table_name:
+        query += " AND table_name = %s"
+        params.append(table_name)
+    if field_name:
+        query += " AND field_name = %s"
+        params.append(field_name)
+    with get_cursor() as cursor:
         cursor.execute(query, params)
         return cursor.fetchall()
 
 
+def get_field_latency_sketches(
+    time_window_hours=24, table_name: str | None = None, field_name: str | None = None
+) -> dict[tuple[str, str | None, str], LatencyStats]:
+    """
+    Get merged latency sketches per (table_name, field_name, query_type).
+
+    Sketches come from the rollup tables: query_stats_rollup in aggregate mode,
+    otherwise query_stats_hourly plus the not yet rolled-up part of the window,
+    read from query_stats grouped per sketch bin. Either way the cost grows with
+    the number of rollup rows and sketch bins rather than with query volume.
+
+    Args:
+        time_window_hours: Time window to analyze queries
+        table_name: Optional table filter
+        field_name: Optional field filter
+
+    Returns:
+        dict mapping (table_name, field_name, query_type) to LatencyStats
+    """
+    if not is_stats_aggregation_enabled():
+        with get_cursor() as cursor:
+            return get_latency_stats_from_rollups(cursor, time_window_hours, table_name, field_name)
+
+    merged: dict[tuple[str, str | None, str], LatencyStats] = {}
+    for row in _get_rollup_latency_rows(time_window_hours, table_name, field_name):
+        key = (row["table_name"], row["field_name"], row["query_type"])
+        entry = merged.get(key)
+        if entry is None:
+            entry = LatencyStats()
+            merged[key] = entry
+        entry.add(
+            row["query_count"],
+            row["total_duration_ms"],
+            row["max_duration_ms"],
+            DDSketch.from_dict(row["latency_sketch"]),
+        )
+    return merged
+
+
+def get_field_latency_stats(
+    time_window_hours=24,
+    table_name: str | None = None,
+    field_name: str | None = None,
+    by_query_type: bool = True,
+) -> list[dict]:
+    """
+    Get per-field latency percentiles across all tenants.
+
+    p50/p95/p99 are read from merged DDSketches (~1% relative error, see
+    get_field_latency_sketches()); count, average and max are exact.
+
+    Args:
+        time_window_hours: Time window to analyze queries
+        table_name: Optional table filter
+        field_name: Optional field filter
+        by_query_type: Keep query types apart (False merges them per field)
+
+    Returns:
+        Rows with table_name, field_name, [query_type,] query_count and
+        avg/p50/p95/p99/max duration in ms, busiest first
+    """
+    key_columns = ("table_name", "field_name", "query_type")
+    if not by_query_type:
+        key_columns = ("table_name", "field_name")
+
+    return _get_latency_summaries(time_window_hours, key_columns, table_name, field_name)
+
+
+def get_hourly_latency_stats(time_window_hours=24) -> list[dict]:
+    """
+    Get query count and latency percentiles per hour, across all queries.
+
+    Args:
+        time_window_hours: Time window to analyze queries
+
+    Returns:
+        Rows with bucket_start, query_count and avg/p50/p95/p99/max duration in
+        ms, newest hour first
+    """
+    results = _get_latency_summaries(time_window_hours, ("bucket_start",))
+    results.sort(key=lambda r: r["bucket_start"], reverse=True)
+    return results
+
+
+def _get_latency_summaries(
+    time_window_hours,
+    key_columns: tuple[str, ...],
+    table_name: str | None = None,
+    field_name: str | None = None,
+) -> list[dict]:
+    if is_stats_aggregation_enabled():
+        rows = _get_rollup_latency_rows(time_window_hours, table_name, field_name)
+        return _summarize_rollup_rows(rows, key_columns)
+
+    with get_cursor() as cursor:
+        merged = get_latency_stats_from_rollups(
+            cursor, time_window_hours, table_name, field_name, key_columns
+        )
+    results = [
+        {**dict(zip(key_columns, key, strict=True)), **latency.summary()}
+        for key, latency in merged.items()
+    ]
+    results.sort(key=lambda r: r["query_count"], reverse=True)
+    return results
+
+
+def get_field_period_counts(
+    fields: list[tuple[str, str]], time_window_hours=24, period: str = "hour"
+) -> list[dict]:
+    """
+    Get query counts per hour or day for many (table, field) pairs at once.
+
+    One grouped query covers every pair: over query_stats_rollup in aggregate
+    mode, otherwise over query_stats_hourly plus the not yet rolled-up raw rows.
+
+    Args:
+        fields: (table_name, field_name) pairs
+        time_window_hours: Time window to analyze queries
+        period: "hour" or "day"
+
+    Returns:
+        Rows with table_name, field_name, query_period and query_count, only for
+        periods that saw queries
+    """
+    if not is_stats_aggregation_enabled():
+        with get_cursor() as cursor:
+            return get_period_counts_from_rollups(cursor, fields, time_window_hours, period)
+
+    if period not in ("hour", "day"):
+        raise ValueError(f"Unsupported period: {period}")
+    if not fields:
+        return []
+    with get_cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                table_name,
+                field_name,
+                date_trunc(%s, bucket_start) AS query_period,
+                SUM(query_count) AS query_count
+            FROM query_stats_rollup
+            JOIN unnest(%s::text[], %s::text[]) AS candidates(table_name, field_name)
+                USING (table_name, field_name)
+            WHERE bucket_start >= NOW() - INTERVAL '1 hour' * %s
+            GROUP BY 1, 2, 3
+        """,
+            (
+                period,
+                [table_name for table_name, _field_name in fields],
+                [field_name for _table_name, field_name in fields],
+                time_window_hours,
+            ),
+        )
+        return cursor.fetchall()
+
+
 def get_table_row_count(table_name: str) -> int:
     """Get the current row count for a table (used for cost estimation)"""
     # Validate table name to prevent SQL injection
@@ -0,0 +1,259 @@
+"""In-memory pre-aggregation of query stats into time-bucketed rollup rows"""
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+
+from src.sketches import DDSketch
+
+# Upper bounds (ms) of the duration histogram buckets. The final bucket is an
+# overflow bucket for anything slower than the last bound.
+DURATION_HISTOGRAM_BOUNDS_MS: tuple[float, ...] = (
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+    10.0,
+    20.0,
+    50.0,
+    100.0,
+    200.0,
+    500.0,
+    1000.0,
+    2000.0,
+    5000.0,
+    10000.0,
+    20000.0,
+    60000.0,
+)
+HISTOGRAM_BUCKET_COUNT = len(DURATION_HISTOGRAM_BOUNDS_MS) + 1
+
+DEFAULT_BUCKET_SECONDS = 60
+
+# (bucket_start, tenant_id, table_name, field_name, query_type)
+RollupKey = tuple[float, int | None, str, str | None, str]
+
+
+def histogram_bucket_index(duration_ms: float) -> int:
+    """Return the histogram bucket a duration falls into"""
+    return bisect.bisect_left(DURATION_HISTOGRAM_BOUNDS_MS, duration_ms)
+
+
+def histogram_percentile(histogram: list[int], percentile: float, max_ms: float = 0.0) -> float:
+    """
+    Estimate a percentile from a duration histogram.
+
+    Interpolates linearly inside the bucket that contains the requested rank. The
+    overflow bucket is capped by the observed maximum when one is known.
+
+    Args:
+        histogram: Per-bucket counts (HISTOGRAM_BUCKET_COUNT entries)
+        percentile: Percentile as a fraction (0.95 for p95)
+        max_ms: Largest observed duration, used to bound the overflow bucket
+
+    Returns:
+        Estimated duration in milliseconds (0.0 for an empty histogram)
+    """
+    total = sum(histogram)
+    if total <= 0:
+        return 0.0
+
+    rank = percentile * total
+    cumulative = 0
+    for index, count in enumerate(histogram):
+        if count <= 0:
+            continue
+        if cumulative + count >= rank:
+            lower = DURATION_HISTOGRAM_BOUNDS_MS[index - 1] if index > 0 else 0.0
+            if index < len(DURATION_HISTOGRAM_BOUNDS_MS):
+                upper = DURATION_HISTOGRAM_BOUNDS_MS[index]
+            else:
+                upper = max(max_ms, lower)
+            if max_ms > 0:
+                upper = min(upper, max(max_ms, lower))
+            fraction = (rank - cumulative) / count
+            return lower + (upper - lower) * fraction
+        cumulative += count
+    return max_ms
+
+
+def merge_histograms(target: list[int], source: list[int] | None) -> list[int]:
+    """Add source bucket counts into target (in place) and return target"""
+    if not source:
+        return target
+    for index, count in enumerate(source[:HISTOGRAM_BUCKET_COUNT]):
+        target[index] += int(count or 0)
+    return target
+
+
+@dataclass
+class RollupCounters:
+    """Running counters for one rollup key"""
+
+    query_count: int = 0
+    total_duration_ms: float = 0.0
+    min_duration_ms: float = float("inf")
+    max_duration_ms: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * HISTOGRAM_BUCKET_COUNT)
+    latency: DDSketch = field(default_factory=DDSketch, compare=False)
+
+    def add(self, duration_ms: float) -> None:
+        self.query_count += 1
+        self.total_duration_ms += duration_ms
+        if duration_ms < self.min_duration_ms:
+            self.min_duration_ms = duration_ms
+        if duration_ms > self.max_duration_ms:
+            self.max_duration_ms = duration_ms
+        self.histogram[histogram_bucket_index(duration_ms)] += 1
+        self.latency.add(duration_ms)
+
+    def merge(self, other: "RollupCounters") -> None:
+        """Fold another key's counters into these"""
+        self.query_count += other.query_count
+        self.total_duration_ms += other.total_duration_ms
+        self.min_duration_ms = min(self.min_duration_ms, other.min_duration_ms)
+        self.max_duration_ms = max(self.max_duration_ms, other.max_duration_ms)
+        merge_histograms(self.histogram, other.histogram)
+        self.latency.merge(other.latency)
+
+
+@dataclass
+class LatencyStats:
+    """
+    Mergeable latency summary for one key across rollup rows.
+
+    Count, sum and max are exact; percentiles come from the merged DDSketch and
+    are capped at the observed maximum.
+    """
+
+    query_count: int = 0
+    total_duration_ms: float = 0.0
+    max_duration_ms: float = 0.0
+    sketch: DDSketch = field(default_factory=DDSketch, compare=False)
+
+    def add(
+        self,
+        query_count: int,
+        total_duration_ms: float,
+        max_duration_ms: float,
+        sketch: DDSketch | None = None,
+    ) -> None:
+        self.query_count += int(query_count or 0)
+        self.total_duration_ms += float(total_duration_ms or 0.0)
+        self.max_duration_ms = max(self.max_duration_ms, float(max_duration_ms or 0.0))
+        if sketch is not None:
+            self.sketch.merge(sketch)
+
+    def percentile(self, percentile: float) -> float:
+        value = self.sketch.quantile(percentile)
+        return min(value, self.max_duration_ms) if self.max_duration_ms > 0 else value
+
+    def summary(self) -> dict[str, float | int]:
+        """query_count, avg/p50/p95/p99/max duration (ms)"""
+        count = self.query_count
+        return {
+            "query_count": count,
+            "avg_duration_ms": self.total_duration_ms / count if count else 0.0,
+            "p50_duration_ms": self.percentile(0.5),
+            "p95_duration_ms": self.percentile(0.95),
+            "p99_duration_ms": self.percentile(0.99),
+            "max_duration_ms": self.max_duration_ms,
+        }
+
+
+def _normalize_tenant_id(tenant_id: object) -> int | None:
+    """Stats buffer rows carry tenant_id as a string ("" when absent)"""
+    if tenant_id is None or tenant_id == "":
+        return None
+    try:
+        return int(str(tenant_id))
+    except ValueError:
+        return None
+
+
+class QueryStatsAggregator:
+    """
+    Rolls raw query stat rows up into per-bucket counters.
+
+    Rows are keyed by (bucket_start, tenant_id, table_name, field_name, query_type),
+    so memory is bounded by the number of distinct keys rather than by query volume.
+    The aggregator is thread-safe; drain() hands back the accumulated rows and resets.
+    """
+
+    def __init__(self, bucket_seconds: int = DEFAULT_BUCKET_SECONDS):
+        self.bucket_seconds = max(1, int(bucket_seconds))
+        self._counters: dict[RollupKey, RollupCounters] = {}
+        self._lock = threading.Lock()
+        self._last_drain_time = time.time()
+        self._rows_folded = 0
+
+    def _bucket_start(self, timestamp: float) -> float:
+        return timestamp - (timestamp % self.bucket_seconds)
+
+    def add_rows(
+        self,
+        rows: list[tuple[str, str, str | None, str, float]],
+        timestamp: float | None = None,
+    ) -> None:
+        """
+        Fold raw stats buffer rows into the rollup counters.
+
+        Args:
+            rows: (tenant_id, table_name, field_name, query_type, duration_ms) tuples
+            timestamp: Time to bucket the rows under (defaults to now)
+        """
+        if not rows:
+            return
+        bucket_start = self._bucket_start(time.time() if timestamp is None else timestamp)
+        with self._lock:
+            for tenant_id, table_name, field_name, query_type, duration_ms in rows:
+                key: RollupKey = (
+                    bucket_start,
+                    _normalize_tenant_id(tenant_id),
+                    table_name,
+                    field_name or None,
+                    query_type,
+                )
+                counters = self._counters.get(key)
+                if counters is None:
+                    counters = RollupCounters()
+                    self._counters[key] = counters
+                counters.add(float(duration_ms))
+            self._rows_folded += len(rows)
+
+    def pending_keys(self) -> int:
+        """Number of distinct rollup keys waiting to be written"""
+        with self._lock:
+            return len(self._counters)
+
+    def seconds_since_drain(self) -> float:
+        return time.time() - self._last_drain_time
+
+    def drain(self) -> list[tuple[RollupKey, RollupCounters]]:
+        """Return all accumulated counters and reset the aggregator"""
+        with self._lock:
+            counters = self._counters
+            self._counters = {}
+            self._last_drain_time = time.time()
+        return list(counters.items())
+
+    def restore(self, drained: list[tuple[RollupKey, RollupCounters]]) -> None:
+        """Merge counters returned by drain() back in, e.g. after a failed write"""
+        with self._lock:
+            for key, counters in drained:
+                existing = self._counters.get(key)
+                if existing is None:
+                    self._counters[key] = counters
+                else:
+                    existing.merge(counters)
+
+    def get_stats(self) -> dict[str, int | float]:
+        with self._lock:
+            return {
+                "bucket_seconds": self.bucket_seconds,
+                "pending_keys": len(self._counters),
+                "rows_folded": self._rows_folded,
+            }
@@ -0,0 +1,73 @@
+"""Lock-striped in-memory buffer for query stats"""
+
+import itertools
+import threading
+
+StatsRow = tuple[str, str, str | None, str, float]
+
+DEFAULT_STRIPES = 16
+
+
+class _Stripe:
+    __slots__ = ("lock", "rows")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows: list[StatsRow] = []
+
+
+class StripedStatsBuffer:
+    """
+    Stats buffer split into independently locked stripes.
+
+    Each thread is pinned to one stripe the first time it appends, so with N
+    stripes up to N threads can append concurrently without contending on a
+    single global lock. Batching is per stripe; drain() collects every stripe
+    for interval and explicit flushes.
+    """
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES, max_size: int = 10000):
+        self.stripe_count = max(1, stripes)
+        self.stripe_capacity = max(1, max_size // self.stripe_count)
+        self._stripes = [_Stripe() for _ in range(self.stripe_count)]
+        self._next_stripe = itertools.count()
+        self._local = threading.local()
+
+    def _current_stripe(self) -> _Stripe:
+        index = getattr(self._local, "stripe_index", None)
+        if index is None:
+            # itertools.count is atomic under the GIL, so threads spread round-robin
+            index = next(self._next_stripe) % self.stripe_count
+            self._local.stripe_index = index
+        return self._stripes[index]
+
+    def append(self, row: StatsRow, batch_size: int) -> list[StatsRow] | None:
+        """
+        Append a row to the calling thread's stripe.
+
+        Returns:
+            The stripe's rows (and empties the stripe) once it reaches batch_size or
+            its share of max_size, otherwise None
+        """
+        stripe = self._current_stripe()
+        with stripe.lock:
+            stripe.rows.append(row)
+            if len(stripe.rows) >= batch_size or len(stripe.rows) >= self.stripe_capacity:
+                rows = stripe.rows
+                stripe.rows = []
+                return rows
+        return None
+
+    def drain(self) -> list[StatsRow]:
+        """Remove and return the rows from every stripe"""
+        drained: list[StatsRow] = []
+        for stripe in self._stripes:
+            with stripe.lock:
+                if stripe.rows:
+                    drained.extend(stripe.rows)
+                    stripe.rows = []
+        return drained
+
+    def __len__(self) -> int:
+        # Unlocked read of each list length; approximate under concurrent appends
+        return sum(len(stripe.rows) for stripe in self._stripes)
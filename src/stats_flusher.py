@@ -0,0 +1,162 @@
+"""Background flusher for buffered query stats"""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+from src.type_definitions import JSONDict
+
+logger = logging.getLogger(__name__)
+
+StatsRow = tuple[str, str, str | None, str, float]
+
+
+class StatsFlusher:
+    """
+    Drains query stat rows to the database on a dedicated thread.
+
+    Producers call submit(), which is a bounded deque append (no lock, no DB I/O).
+    The flusher thread wakes when the queue reaches batch_size or every
+    flush_interval seconds, and hands the drained rows to flush_callback.
+    When the queue is full new rows are dropped and counted, so a slow or
+    unavailable database never blocks the application threads.
+    """
+
+    def __init__(
+        self,
+        flush_callback: Callable[[list[StatsRow]], None],
+        batch_size: int = 100,
+        flush_interval: float = 5.0,
+        max_queue_size: int = 10000,
+    ):
+        self.flush_callback = flush_callback
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.01, flush_interval)
+        self.max_queue_size = max(self.batch_size, max_queue_size)
+
+        self._queue: deque[StatsRow] = deque()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._flush_lock = threading.Lock()  # Serializes drains (thread vs explicit flush)
+
+        # Backpressure metrics
+        self._submitted = 0
+        self._dropped = 0
+        self._flushed_rows = 0
+        self._flush_count = 0
+        self._flush_failures = 0
+        self._last_flush_latency_ms = 0.0
+        self._max_flush_latency_ms = 0.0
+        self._total_flush_latency_ms = 0.0
+
+    def start(self) -> None:
+        """Start the flusher thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="IndexPilotStatsFlusher"
+        )
+        self._thread.start()
+        logger.debug("Stats flusher thread started")
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, row: StatsRow) -> bool:
+        """
+        Queue a stats row for flushing.
+
+        Returns:
+            False if the row was dropped because the queue is full
+        """
+        self._submitted += 1
+        if len(self._queue) >= self.max_queue_size:
+            self._dropped += 1
+            self._wakeup.set()
+            return False
+        self._queue.append(row)
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> int:
+        """
+        Drain the queue and flush it on the calling thread.
+
+        Returns:
+            Number of rows handed to the flush callback
+        """
+        with self._flush_lock:
+            rows: list[StatsRow] = []
+            # Bound the drain to what is queued now so producers can't starve it
+            for _ in range(len(self._queue)):
+                try:
+                    rows.append(self._queue.popleft())
+                except IndexError:
+                    break
+            if not rows:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                self.flush_callback(rows)
+            except Exception as e:
+                self._flush_failures += 1
+                logger.error(f"Background stats flush failed ({len(rows)} rows dropped): {e}")
+                return 0
+            finally:
+                latency_ms = (time.perf_counter() - start) * 1000.0
+                self._last_flush_latency_ms = latency_ms
+                self._max_flush_latency_ms = max(self._max_flush_latency_ms, latency_ms)
+                self._total_flush_latency_ms += latency_ms
+                self._flush_count += 1
+
+            self._flushed_rows += len(rows)
+            return len(rows)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                # stop() drains on its own thread
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                # Never let the flusher thread die on an unexpected error
+                logger.error(f"Stats flusher loop error: {e}", exc_info=True)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher thread and drain whatever is still queued"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning("Stats flusher thread did not stop within timeout")
+            self._thread = None
+        self.flush()
+
+    def get_metrics(self) -> JSONDict:
+        """Queue depth, drops and flush latency for backpressure monitoring"""
+        flush_count = self._flush_count
+        return {
+            "running": self.is_running(),
+            "queue_depth": len(self._queue),
+            "max_queue_size": self.max_queue_size,
+            "submitted": self._submitted,
+            "dropped": self._dropped,
+            "flushed_rows": self._flushed_rows,
+            "flush_count": flush_count,
+            "flush_failures": self._flush_failures,
+            "last_flush_latency_ms": self._last_flush_latency_ms,
+            "max_flush_latency_ms": self._max_flush_latency_ms,
+            "avg_flush_latency_ms": (
+                self._total_flush_latency_ms / flush_count if flush_count else 0.0
+            ),
+        }
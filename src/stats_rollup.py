@@ -0,0 +1,627 @@
+"""
+Hourly rollups of raw query_stats, maintained incrementally.
+
+roll_up_query_stats() folds every complete hour of raw query_stats rows past a
+persisted watermark into query_stats_hourly, one row per (hour, table, field,
+query_type). Each row carries counts, duration sums/min/max, the duration
+histogram, a HyperLogLog of tenant IDs and a DDSketch of durations. The insert
+and the watermark advance commit together, so every raw row is rolled up
+exactly once.
+
+Window reads (see get_field_usage_stats and get_field_latency_stats) take whole
+hours below the watermark from the rollup table and only the uncovered head and
+tail of the window from raw rows.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from psycopg2.extras import Json, RealDictCursor, execute_values
+
+from src.config_loader import ConfigLoader
+from src.db import get_connection
+from src.sketches import DDSKETCH_MIN_INDEXABLE, DDSketch, HyperLogLog
+from src.stats_aggregation import DURATION_HISTOGRAM_BOUNDS_MS, LatencyStats, RollupCounters
+from src.type_definitions import JSONDict
+
+logger = logging.getLogger(__name__)
+
+# Load config
+try:
+    _config_loader = ConfigLoader()
+except Exception as e:
+    logger.error(f"Failed to initialize ConfigLoader: {e}, using defaults")
+    _config_loader = ConfigLoader()
+
+ROLLUP_JOB_NAME = "query_stats_hourly"
+
+# (bucket_start, table_name, field_name, query_type)
+HourlyKey = tuple[datetime, str, str | None, str]
+
+# DDSketch bin of a raw duration, computed server-side so raw rows reach Python
+# already grouped per bin (NULL is the zero bucket); same formula as
+# DDSketch.bin_index. Parameters: (DDSKETCH_MIN_INDEXABLE, log_gamma)
+_SKETCH_BIN_SQL = """
+    CASE WHEN duration_ms::float8 > %s
+         THEN CEIL(LN(duration_ms::float8) / %s)::int
+    END
+"""
+
+
+def _sketch_bin_params() -> tuple[float, float]:
+    return DDSKETCH_MIN_INDEXABLE, DDSketch().log_gamma
+
+
+def is_stats_rollup_enabled() -> bool:
+    """Check if raw query_stats are rolled up into query_stats_hourly"""
+    return _config_loader.get_bool("features.stats_rollup.enabled", True)
+
+
+def get_stats_rollup_config() -> dict[str, Any]:
+    """Get hourly rollup configuration"""
+    return {
+        "enabled": is_stats_rollup_enabled(),
+        "lag_seconds": max(0, _config_loader.get_int("features.stats_rollup.lag_seconds", 300)),
+        "backfill_hours": max(
+            0, _config_loader.get_int("features.stats_rollup.backfill_hours", 24)
+        ),
+        "max_hours_per_run": max(
+            1, _config_loader.get_int("features.stats_rollup.max_hours_per_run", 24)
+        ),
+    }
+
+
+def hour_floor(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def hour_ceil(timestamp: datetime) -> datetime:
+    floor = hour_floor(timestamp)
+    return floor if floor == timestamp else floor + timedelta(hours=1)
+
+
+def fold_hourly_rows(
+    rows: list[dict[str, Any]],
+) -> dict[HourlyKey, tuple[RollupCounters, HyperLogLog]]:
+    """
+    Fold pre-grouped raw rows into per-hour counters and tenant sketches.
+
+    Args:
+        rows: Rows grouped by (bucket_start, table_name, field_name, query_type,
+            tenant_id, histogram_bucket) with query_count, total_duration_ms,
+            min_duration_ms and max_duration_ms
+
+    Returns:
+        dict mapping (bucket_start, table_name, field_name, query_type) to
+        (counters, tenant HyperLogLog)
+    """
+    folded: dict[HourlyKey, tuple[RollupCounters, HyperLogLog]] = {}
+    for row in rows:
+        key: HourlyKey = (
+            row["bucket_start"],
+            row["table_name"],
+            row["field_name"],
+            row["query_type"],
+        )
+        entry = folded.get(key)
+        if entry is None:
+            entry = (RollupCounters(), HyperLogLog())
+            folded[key] = entry
+        counters, tenants = entry
+        count = int(row["query_count"] or 0)
+        counters.query_count += count
+        counters.total_duration_ms += float(row["total_duration_ms"] or 0.0)
+        counters.min_duration_ms = min(counters.min_duration_ms, float(row["min_duration_ms"]))
+        counters.max_duration_ms = max(counters.max_duration_ms, float(row["max_duration_ms"]))
+        counters.histogram[int(row["histogram_bucket"])] += count
+        if row["tenant_id"] is not None:
+            tenants.add(row["tenant_id"])
+    return folded
+
+
+def fold_latency_rows(
+    rows: list[dict[str, Any]],
+    folded: dict[HourlyKey, tuple[RollupCounters, HyperLogLog]],
+) -> None:
+    """
+    Add per-bin duration counts to the latency sketches of folded hourly rows.
+
+    Args:
+        rows: Rows grouped by (bucket_start, table_name, field_name, query_type,
+            sketch_bin) with query_count
+        folded: Output of fold_hourly_rows() for the same hours (updated in place)
+    """
+    for row in rows:
+        key: HourlyKey = (
+            row["bucket_start"],
+            row["table_name"],
+            row["field_name"],
+            row["query_type"],
+        )
+        entry = folded.get(key)
+        if entry is not None:
+            entry[0].latency.add_bin(row["sketch_bin"], int(row["query_count"] or 0))
+
+
+def roll_up_query_stats(now: datetime | None = None) -> JSONDict:
+    """
+    Roll complete hours of raw query_stats past the watermark into query_stats_hourly.
+
+    Hours end at least lag_seconds before now, so rows still sitting in stats
+    buffers are not skipped. The first run starts backfill_hours back. At most
+    max_hours_per_run hours are rolled per call; later calls catch up.
+
+    Args:
+        now: Reference time (default: the database's LOCALTIMESTAMP)
+
+    Returns:
+        dict with the rolled hour range and row counts, or the reason nothing ran
+    """
+    config = get_stats_rollup_config()
+    if not config["enabled"]:
+        return {"status": "disabled"}
+
+    from src.stats import is_stats_aggregation_enabled
+
+    if is_stats_aggregation_enabled():
+        # Aggregate mode writes query_stats_rollup instead of raw rows
+        return {"status": "skipped", "reason": "aggregate_mode"}
+
+    with get_connection() as conn:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            # One roller at a time across processes; released at commit/rollback
+            cursor.execute(
+                "SELECT pg_try_advisory_xact_lock(hashtext(%s)) AS acquired", (ROLLUP_JOB_NAME,)
+            )
+            if not cursor.fetchone()["acquired"]:
+                conn.rollback()
+                return {"status": "skipped", "reason": "locked"}
+
+            if now is None:
+                cursor.execute("SELECT LOCALTIMESTAMP AS now")
+                now = cursor.fetchone()["now"]
+            cursor.execute(
+                """
+                SELECT covered_from, rolled_up_to
+                FROM query_stats_rollup_watermark
+                WHERE job_name = %s
+                """,
+                (ROLLUP_JOB_NAME,),
+            )
+            watermark = cursor.fetchone()
+            target = hour_floor(now - timedelta(seconds=config["lag_seconds"]))
+            if watermark is None:
+                covered_from = start = target - timedelta(hours=config["backfill_hours"])
+            else:
+                covered_from, start = watermark["covered_from"], watermark["rolled_up_to"]
+            end = min(target, start + timedelta(hours=config["max_hours_per_run"]))
+            if end <= start:
+                conn.rollback()
+                return {"status": "up_to_date", "rolled_up_to": start.isoformat()}
+
+            cursor.execute(
+                """
+                SELECT
+                    date_trunc('hour', created_at) AS bucket_start,
+                    table_name,
+                    field_name,
+                    query_type,
+                    tenant_id,
+                    width_bucket(duration_ms::float8, %s::float8[]) AS histogram_bucket,
+                    COUNT(*) AS query_count,
+                    SUM(duration_ms) AS total_duration_ms,
+                    MIN(duration_ms) AS min_duration_ms,
+                    MAX(duration_ms) AS max_duration_ms
+                FROM query_stats
+                WHERE created_at >= %s AND created_at < %s
+                GROUP BY 1, 2, 3, 4, 5, 6
+                """,
+                (list(DURATION_HISTOGRAM_BOUNDS_MS), start, end),
+            )
+            folded = fold_hourly_rows(cursor.fetchall())
+            cursor.execute(
+                f"""
+                SELECT
+                    date_trunc('hour', created_at) AS bucket_start,
+                    table_name,
+                    field_name,
+                    query_type,
+                    {_SKETCH_BIN_SQL} AS sketch_bin,
+                    COUNT(*) AS query_count
+                FROM query_stats
+                WHERE created_at >= %s AND created_at < %s
+                GROUP BY 1, 2, 3, 4, 5
+                """,
+                (*_sketch_bin_params(), start, end),
+            )
+            fold_latency_rows(cursor.fetchall(), folded)
+
+            if folded:
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO query_stats_hourly
+                    (bucket_start, table_name, field_name, query_type, query_count,
+                     total_duration_ms, min_duration_ms, max_duration_ms,
+                     duration_histogram, tenant_hll, latency_sketch)
+                    VALUES %s
+                    """,
+                    [
+                        (
+                            bucket_start,
+                            table_name,
+                            field_name,
+                            query_type,
+                            counters.query_count,
+                            counters.total_duration_ms,
+                            counters.min_duration_ms,
+                            counters.max_duration_ms,
+                            counters.histogram,
+                            tenants.to_bytes(),
+                            Json(counters.latency.to_dict()),
+                        )
+                        for (
+                            bucket_start,
+                            table_name,
+                            field_name,
+                            query_type,
+                        ), (counters, tenants) in folded.items()
+                    ],
+                )
+            cursor.execute(
+                """
+                INSERT INTO query_stats_rollup_watermark (job_name, covered_from, rolled_up_to)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (job_name) DO UPDATE SET
+                    rolled_up_to = EXCLUDED.rolled_up_to,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                (ROLLUP_JOB_NAME, covered_from, end),
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Failed to roll up query stats: {e}")
+            raise
+        finally:
+            cursor.close()
+
+    raw_rows = sum(counters.query_count for counters, _tenants in folded.values())
+    logger.info(
+        f"Rolled up {raw_rows} query stats ({len(folded)} rollup rows) "
+        f"for {start.isoformat()} - {end.isoformat()}"
+    )
+    return {
+        "status": "completed",
+        "rolled_from": start.isoformat(),
+        "rolled_up_to": end.isoformat(),
+        "raw_rows": raw_rows,
+        "rollup_rows": len(folded),
+    }
+
+
+def merge_field_usage(
+    rollup_rows: list[dict[str, Any]], raw_rows: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    Combine hourly rollup rows with raw-row aggregates into get_field_usage_stats rows.
+
+    Args:
+        rollup_rows: query_stats_hourly rows (table_name, field_name, query_count,
+            total_duration_ms, tenant_hll)
+        raw_rows: Raw aggregates per (table_name, field_name) with total_queries,
+            total_duration_ms and tenant_ids (distinct, non-NULL)
+
+    Returns:
+        Rows with table_name, field_name, total_queries, tenant_count,
+        avg_duration_ms and total_duration_ms, busiest first
+    """
+    merged: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def entry_for(table_name: str, field_name: str) -> dict[str, Any]:
+        entry = merged.get((table_name, field_name))
+        if entry is None:
+            entry = {"total_queries": 0, "total_duration_ms": 0.0, "hll": None, "tenants": set()}
+            merged[(table_name, field_name)] = entry
+        return entry
+
+    for row in rollup_rows:
+        entry = entry_for(row["table_name"], row["field_name"])
+        entry["total_queries"] += int(row["query_count"] or 0)
+        entry["total_duration_ms"] += float(row["total_duration_ms"] or 0.0)
+        sketch = HyperLogLog.from_bytes(row["tenant_hll"])
+        if entry["hll"] is None:
+            entry["hll"] = sketch
+        else:
+            entry["hll"].merge(sketch)
+
+    for row in raw_rows:
+        entry = entry_for(row["table_name"], row["field_name"])
+        entry["total_queries"] += int(row["total_queries"] or 0)
+        entry["total_duration_ms"] += float(row["total_duration_ms"] or 0.0)
+        entry["tenants"].update(row["tenant_ids"] or ())
+
+    results = []
+    for (table_name, field_name), entry in merged.items():
+        if entry["hll"] is None:
+            # Only raw rows: the distinct count is exact
+            tenant_count = len(entry["tenants"])
+        else:
+            for tenant_id in entry["tenants"]:
+                entry["hll"].add(tenant_id)
+            tenant_count = entry["hll"].estimate()
+        total_queries = entry["total_queries"]
+        results.append(
+            {
+                "table_name": table_name,
+                "field_name": field_name,
+                "total_queries": total_queries,
+                "tenant_count": tenant_count,
+                "avg_duration_ms": (
+                    entry["total_duration_ms"] / total_queries if total_queries else None
+                ),
+                "total_duration_ms": entry["total_duration_ms"],
+            }
+        )
+    results.sort(key=lambda row: row["total_queries"], reverse=True)
+    return results
+
+
+def _window_coverage(cursor, time_window_hours: float) -> tuple[datetime, datetime, datetime]:
+    """
+    Split a window ending now into its rolled-up hours and the rest.
+
+    Returns:
+        (window_start, rolled_from, rolled_to); rolled_from >= rolled_to when no
+        rolled-up hour falls inside the window
+    """
+    cursor.execute(
+        """
+        SELECT LOCALTIMESTAMP AS now, watermark.covered_from, watermark.rolled_up_to
+        FROM (SELECT 1) AS one
+        LEFT JOIN query_stats_rollup_watermark AS watermark ON watermark.job_name = %s
+        """,
+        (ROLLUP_JOB_NAME,),
+    )
+    state = cursor.fetchone()
+    window_start = state["now"] - timedelta(hours=float(time_window_hours))
+    if state["rolled_up_to"] is None:
+        return window_start, window_start, window_start
+    return (
+        window_start,
+        max(hour_ceil(window_start), state["covered_from"]),
+        state["rolled_up_to"],
+    )
+
+
+def get_field_usage_stats_from_rollups(
+    cursor, time_window_hours: float, limit: int | None = None
+) -> list[dict[str, Any]] | None:
+    """
+    get_field_usage_stats() answered from hourly rollups plus the raw remainder.
+
+    Whole hours inside the window that the rollup job has covered come from
+    query_stats_hourly; the partial first hour, any hours before the rollups
+    begin and the tail past the watermark come from raw query_stats rows.
+
+    Args:
+        cursor: Dict cursor
+        time_window_hours: Time window to analyze queries
+        limit: Optional limit on number of results
+
+    Returns:
+        Field usage rows, or None when no rolled-up hour falls inside the window
+    """
+    window_start, rolled_from, rolled_to = _window_coverage(cursor, time_window_hours)
+    if rolled_from >= rolled_to:
+        return None
+
+    cursor.execute(
+        """
+        SELECT table_name, field_name, query_count, total_duration_ms, tenant_hll
+        FROM query_stats_hourly
+        WHERE bucket_start >= %s AND bucket_start < %s
+          AND field_name IS NOT NULL
+        """,
+        (rolled_from, rolled_to),
+    )
+    rollup_rows = cursor.fetchall()
+
+    cursor.execute(
+        """
+        SELECT
+            table_name,
+            field_name,
+            COUNT(*) AS total_queries,
+            SUM(duration_ms) AS total_duration_ms,
+            ARRAY_AGG(DISTINCT tenant_id) FILTER (WHERE tenant_id IS NOT NULL) AS tenant_ids
+        FROM query_stats
+        WHERE created_at >= %s
+          AND (created_at < %s OR created_at >= %s)
+          AND field_name IS NOT NULL
+        GROUP BY table_name, field_name
+        """,
+        (window_start, rolled_from, rolled_to),
+    )
+    raw_rows = cursor.fetchall()
+
+    results = merge_field_usage(rollup_rows, raw_rows)
+    return results[:limit] if limit else results
+
+
+# Grouping columns accepted by get_latency_stats_from_rollups() and how raw
+# query_stats rows produce them
+LATENCY_KEY_COLUMNS = {
+    "bucket_start": "date_trunc('hour', created_at)",
+    "table_name": "table_name",
+    "field_name": "field_name",
+    "query_type": "query_type",
+}
+
+
+def get_latency_stats_from_rollups(
+    cursor,
+    time_window_hours: float,
+    table_name: str | None = None,
+    field_name: str | None = None,
+    key_columns: tuple[str, ...] = ("table_name", "field_name", "query_type"),
+) -> dict[tuple, LatencyStats]:
+    """
+    Latency summaries over a window ending now, grouped by key_columns.
+
+    Rolled-up hours contribute their stored DDSketches; the rest of the window is
+    read from raw rows grouped per sketch bin, so the work is proportional to the
+    number of hours and bins rather than to the number of queries.
+
+    Args:
+        cursor: Dict cursor
+        time_window_hours: Time window to analyze queries
+        table_name: Optional table filter
+        field_name: Optional field filter
+        key_columns: Grouping columns, from LATENCY_KEY_COLUMNS
+
+    Returns:
+        dict mapping key_columns values to LatencyStats
+    """
+    unknown = set(key_columns) - set(LATENCY_KEY_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unsupported latency key columns: {sorted(unknown)}")
+
+    window_start, rolled_from, rolled_to = _window_coverage(cursor, time_window_hours)
+    filters = ""
+    filter_params: list[str] = []
+    if table_name:
+        filters += " AND table_name = %s"
+        filter_params.append(table_name)
+    if field_name:
+        filters += " AND field_name = %s"
+        filter_params.append(field_name)
+
+    merged: dict[tuple, LatencyStats] = {}
+
+    def stats_for(row: dict[str, Any]) -> LatencyStats:
+        key = tuple(row[column] for column in key_columns)
+        entry = merged.get(key)
+        if entry is None:
+            entry = LatencyStats()
+            merged[key] = entry
+        return entry
+
+    if rolled_from < rolled_to:
+        cursor.execute(
+            f"""
+            SELECT {", ".join(key_columns)}, query_count,
+                   total_duration_ms, max_duration_ms, latency_sketch
+            FROM query_stats_hourly
+            WHERE bucket_start >= %s AND bucket_start < %s{filters}
+            """,
+            (rolled_from, rolled_to, *filter_params),
+        )
+        for row in cursor.fetchall():
+            stats_for(row).add(
+                row["query_count"],
+                row["total_duration_ms"],
+                row["max_duration_ms"],
+                DDSketch.from_dict(row["latency_sketch"]),
+            )
+        raw_range = "created_at >= %s AND (created_at < %s OR created_at >= %s)"
+        raw_params: tuple = (window_start, rolled_from, rolled_to)
+    else:
+        raw_range = "created_at >= %s"
+        raw_params = (window_start,)
+
+    raw_keys = "".join(f"{LATENCY_KEY_COLUMNS[column]} AS {column}, " for column in key_columns)
+    cursor.execute(
+        f"""
+        SELECT
+            {raw_keys}{_SKETCH_BIN_SQL} AS sketch_bin,
+            COUNT(*) AS query_count,
+            SUM(duration_ms) AS total_duration_ms,
+            MAX(duration_ms) AS max_duration_ms
+        FROM query_stats
+        WHERE {raw_range}{filters}
+        GROUP BY {", ".join(str(position) for position in range(1, len(key_columns) + 2))}
+        """,
+        (*_sketch_bin_params(), *raw_params, *filter_params),
+    )
+    for row in cursor.fetchall():
+        sketch = DDSketch()
+        sketch.add_bin(row["sketch_bin"], int(row["query_count"] or 0))
+        stats_for(row).add(
+            row["query_count"], row["total_duration_ms"], row["max_duration_ms"], sketch
+        )
+
+    return merged
+
+
+def get_period_counts_from_rollups(
+    cursor,
+    fields: list[tuple[str, str]],
+    time_window_hours: float,
+    period: str = "hour",
+) -> list[dict[str, Any]]:
+    """
+    Query counts per hour or day for many (table, field) pairs in one statement.
+
+    Rolled-up hours are summed from query_stats_hourly and only the rest of the
+    window is counted from raw rows.
+
+    Args:
+        cursor: Dict cursor
+        fields: (table_name, field_name) pairs to count
+        time_window_hours: Time window to analyze queries
+        period: "hour" or "day"
+
+    Returns:
+        Rows with table_name, field_name, query_period and query_count, only for
+        periods that saw queries
+    """
+    if period not in ("hour", "day"):
+        raise ValueError(f"Unsupported period: {period}")
+    if not fields:
+        return []
+
+    window_start, rolled_from, rolled_to = _window_coverage(cursor, time_window_hours)
+    if rolled_from >= rolled_to:
+        # Nothing rolled up inside the window: an empty rollup range, all raw rows
+        rolled_from = rolled_to = window_start
+    tables = [table_name for table_name, _field_name in fields]
+    field_names = [field_name for _table_name, field_name in fields]
+    cursor.execute(
+        """
+        SELECT table_name, field_name, query_period, SUM(query_count) AS query_count
+        FROM (
+            SELECT table_name, field_name,
+                   date_trunc(%s, bucket_start) AS query_period, query_count
+            FROM query_stats_hourly
+            JOIN unnest(%s::text[], %s::text[]) AS candidates(table_name, field_name)
+                USING (table_name, field_name)
+            WHERE bucket_start >= %s AND bucket_start < %s
+            UNION ALL
+            SELECT table_name, field_name,
+                   date_trunc(%s, created_at) AS query_period, COUNT(*) AS query_count
+            FROM query_stats
+            JOIN unnest(%s::text[], %s::text[]) AS candidates(table_name, field_name)
+                USING (table_name, field_name)
+            WHERE created_at >= %s AND (created_at < %s OR created_at >= %s)
+            GROUP BY 1, 2, 3
+        ) AS counts
+        GROUP BY 1, 2, 3
+        """,
+        (
+            period,
+            tables,
+            field_names,
+            rolled_from,
+            rolled_to,
+            period,
+            tables,
+            field_names,
+            window_start,
+            rolled_from,
+            rolled_to,
+        ),
+    )
+    return cursor.fetchall()
@@ -12,6 +12,10 @@ METADATA_TABLES = {"genome_catalog", "expression_profile", "mutation_log", "quer
 _allowed_tables_cache: set[str] | None = None
 _allowed_fields_cache: set[str] | None = None
 
+# Bumped whenever cached validation data is cleared, so callers that memoize
+# validation results (e.g. src.stats) can tell their entries are stale
+_validation_generation = 0
+
 
 def is_valid_identifier(name: str) -> bool:
     """
@@ -135,9 +139,15 @@ def _get_allowed_fields() -> set[str]:
 
 def clear_validation_cache():
     """Clear cached validation data (useful after schema changes)"""
-    global _allowed_tables_cache, _allowed_fields_cache
+    global _allowed_tables_cache, _allowed_fields_cache, _validation_generation
     _allowed_tables_cache = None
     _allowed_fields_cache = None
+    _validation_generation += 1
+
+
+def get_validation_generation() -> int:
+    """Get the validation cache generation (changes on every clear_validation_cache())"""
+    return _validation_generation
 
 
 def validate_table_name(table_name: str, use_cache: bool = True) -> str:
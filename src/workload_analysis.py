@@ -7,12 +7,12 @@ Based on VLDB 2021: "Workload Characterization for Index Tuning"
 """
 
 import logging
-import re
 from collections import Counter, defaultdict
 from typing import Any
 
 from src.config_loader import ConfigLoader
 from src.db import get_cursor
+from src.query_normalizer import analyze_query_text
 
 logger = logging.getLogger(__name__)
 
@@ -328,20 +328,9 @@ def extract_query_template(query: str) -> str:
     if not query:
         return ""
 
-    # Convert to uppercase for normalization
-    template = query.upper()
-
-    # Replace numeric literals with placeholders
-    template = re.sub(r"\b\d+\b", "?", template)
-
-    # Replace string literals with placeholders
-    template = re.sub(r"'[^']*'", "?", template)
-    template = re.sub(r'"[^"]*"', "?", template)
-
-    # Normalize whitespace
-    template = re.sub(r"\s+", " ", template.strip())
-
-    return template
+    # Upper-cased, literals and placeholders as "?", whitespace collapsed
+    # (single tokenizer pass, memoized per query text)
+    return analyze_query_text(query).template
 
 
 def extract_query_signature(query_record: dict[str, Any]) -> str:
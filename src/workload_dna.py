@@ -22,12 +22,12 @@ from src.sql_parser import (
     PARSER_BACKEND,
     ProposedIndexError,
     SQLPatternError,
-    canonical_query_fingerprint,
     extract_postgres_query_pattern,
     extract_proposed_index_query_context,
     parse_migration_indexes,
     parse_proposed_index,
     parse_read_only_query,
+    read_only_query_fingerprint,
 )
 
 _IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
@@ -485,10 +485,10 @@ def _query_fingerprint_map(snapshot: dict[str, Any]) -> dict[str, str]:
     for workload_row in snapshot.get("workload", []):
         query = str(workload_row.get("query", ""))
         try:
-            statement = parse_read_only_query(query)
+            fingerprint = read_only_query_fingerprint(query)
         except SQLPatternError:
             continue
-        queries.setdefault(canonical_query_fingerprint(statement), query)
+        queries.setdefault(fingerprint, query)
     return queries
 
 
@@ -80,17 +80,22 @@ def _optional_float(value: Any) -> float | None:
     return None
 
 
-def can_create_index_for_table(table_name: str) -> BoolStrTuple:
+def can_create_index_for_table(table_name: str, current_count: int | None = None) -> BoolStrTuple:
     """
     Check if we can create another index for a table.
 
+    Args:
+        table_name: Table name
+        current_count: Index count if the caller already has it (skips the catalog query)
+
     Returns:
         (can_create, reason_if_not)
     """
     if not is_write_performance_enabled():
         return True, None  # If disabled, allow index creation
 
-    current_count = get_index_count_for_table(table_name)
+    if current_count is None:
+        current_count = get_index_count_for_table(table_name)
     max_indexes = _get_max_indexes_per_table()
     warn_threshold = _get_warn_indexes_per_table()
 
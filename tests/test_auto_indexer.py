@@ -1,8 +1,11 @@
 """Tests for auto-indexer decision logic"""
 
+from unittest.mock import patch
+
 import pytest
 
 from src.auto_indexer import (
+    analyze_and_create_indexes,
     estimate_build_cost,
     estimate_query_cost_without_index,
     should_create_index,
@@ -90,3 +93,10 @@ def test_cost_benefit_threshold():
         estimated_build_cost=10.0, queries_over_horizon=101, extra_cost_per_query_without_index=0.5
     )
     assert should_create is True
+
+
+@patch("src.rollback.is_system_enabled", return_value=False)
+def test_disabled_system_returns_the_usual_result_shape(_mock_enabled):
+    """Callers index into created/skipped/pending even when the system is disabled"""
+    result = analyze_and_create_indexes()
+    assert result == {"created": [], "skipped": [], "pending": [], "reason": "system_disabled"}
@@ -0,0 +1,165 @@
+"""Tests for the pluggable EXPLAIN plan cache backends"""
+
+from unittest.mock import patch
+
+from src import explain_cache
+from src.explain_cache import MemoryExplainCache, SQLiteExplainCache, TieredExplainCache
+
+ANALYSIS = {"total_cost": 12.5, "node_type": "Index Scan", "recommendations": []}
+
+
+def test_memory_cache_evicts_least_recently_used():
+    """The in-process tier keeps the original LRU semantics"""
+    cache = MemoryExplainCache(max_size=2, ttl=60)
+    cache.put("a", ANALYSIS)
+    cache.put("b", ANALYSIS)
+    assert cache.get("a") == ANALYSIS  # touch "a" so "b" is evicted next
+    cache.put("c", ANALYSIS)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ANALYSIS
+    assert len(cache) == 2
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryExplainCache(max_size=10, ttl=0)
+    cache.put("a", ANALYSIS)
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    """A second process (here: a second connection) sees plans written by the first"""
+    path = tmp_path / "explain_cache.sqlite3"
+    writer = SQLiteExplainCache(path, max_size=10, ttl=60)
+    reader = SQLiteExplainCache(path, max_size=10, ttl=60)
+    try:
+        writer.put("sig:epoch", ANALYSIS)
+        assert reader.get("sig:epoch") == ANALYSIS
+        assert reader.get("sig:other-epoch") is None
+        reader.clear()
+        assert writer.get("sig:epoch") is None
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_tiered_cache_promotes_shared_hits(tmp_path):
+    shared = SQLiteExplainCache(tmp_path / "cache.sqlite3", max_size=10, ttl=60)
+    try:
+        shared.put("sig:epoch", ANALYSIS)
+        tiered = TieredExplainCache(MemoryExplainCache(max_size=10, ttl=60), shared)
+
+        assert tiered.get("sig:epoch") == ANALYSIS
+        assert tiered.local.get("sig:epoch") == ANALYSIS
+    finally:
+        shared.close()
+
+
+def test_plan_relations_walks_nested_plans():
+    plan = {
+        "Node Type": "Hash Join",
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "contacts"},
+            {"Node Type": "Hash", "Plans": [{"Node Type": "Index Scan", "Relation Name": "orgs"}]},
+        ],
+    }
+    assert explain_cache.plan_relations(plan) == ["contacts", "orgs"]
+
+
+def _use_memory_cache():
+    explain_cache.set_explain_cache(MemoryExplainCache(max_size=10, ttl=60))
+    explain_cache.reset_table_versions()
+
+
+def test_changed_table_version_evicts_plan_on_lookup():
+    """ANALYZE or an index change on a scanned table invalidates the cached plan"""
+    _use_memory_cache()
+    versions = {"contacts": "v1"}
+    try:
+        with patch.object(
+            explain_cache,
+            "_read_table_versions",
+            side_effect=lambda tables: {t: versions[t] for t in tables},
+        ):
+            explain_cache.store_plan("sig", ANALYSIS, ["contacts"])
+            with patch.object(explain_cache._config_loader, "get_float", return_value=0.0):
+                assert explain_cache.lookup_plan("sig") == ANALYSIS
+                versions["contacts"] = "v2"
+                assert explain_cache.lookup_plan("sig") is None
+            assert len(explain_cache.get_explain_cache()) == 0
+    finally:
+        explain_cache.set_explain_cache(None)
+        explain_cache.reset_table_versions()
+
+
+def test_unchanged_tables_keep_plan_without_time_cutoff():
+    """Within the refresh window lookups reuse the memoized versions (no catalog query)"""
+    _use_memory_cache()
+    try:
+        with patch.object(
+            explain_cache, "_read_table_versions", return_value={"contacts": "v1"}
+        ) as mock_read:
+            explain_cache.store_plan("sig", ANALYSIS, ["contacts"])
+            for _ in range(3):
+                assert explain_cache.lookup_plan("sig") == ANALYSIS
+        assert mock_read.call_count == 1
+    finally:
+        explain_cache.set_explain_cache(None)
+        explain_cache.reset_table_versions()
+
+
+def test_invalidate_tables_evicts_only_affected_plans():
+    _use_memory_cache()
+    try:
+        with patch.object(
+            explain_cache,
+            "_read_table_versions",
+            side_effect=lambda tables: dict.fromkeys(tables, "v1"),
+        ):
+            explain_cache.store_plan("contacts-sig", ANALYSIS, ["contacts"])
+            explain_cache.store_plan("orgs-sig", ANALYSIS, ["orgs"])
+
+            assert explain_cache.invalidate_tables(["contacts"]) == 1
+            assert explain_cache.lookup_plan("contacts-sig") is None
+            assert explain_cache.lookup_plan("orgs-sig") == ANALYSIS
+    finally:
+        explain_cache.set_explain_cache(None)
+        explain_cache.reset_table_versions()
+
+
+def test_unreadable_catalog_is_a_miss():
+    _use_memory_cache()
+    try:
+        explain_cache.get_explain_cache().put(
+            "sig", {"analysis": ANALYSIS, "table_versions": {"contacts": "v1"}}
+        )
+        with patch.object(
+            explain_cache, "_read_table_versions", side_effect=RuntimeError("db down")
+        ):
+            assert explain_cache.lookup_plan("sig") is None
+    finally:
+        explain_cache.set_explain_cache(None)
+        explain_cache.reset_table_versions()
+
+
+def test_per_table_key_index_is_bounded_by_cache_capacity():
+    """Signatures evicted from the cache don't accumulate in the per-table index"""
+    explain_cache.set_explain_cache(MemoryExplainCache(max_size=3, ttl=60))
+    explain_cache.reset_table_versions()
+    try:
+        with patch.object(
+            explain_cache,
+            "_read_table_versions",
+            side_effect=lambda tables: dict.fromkeys(tables, "v1"),
+        ):
+            for i in range(10):
+                explain_cache.store_plan(f"sig-{i}", ANALYSIS, ["contacts", f"table_{i}"])
+
+        assert list(explain_cache._tables_by_key) == ["sig-7", "sig-8", "sig-9"]
+        assert explain_cache._keys_by_table["contacts"] == {"sig-7", "sig-8", "sig-9"}
+        assert "table_0" not in explain_cache._keys_by_table
+        assert explain_cache.invalidate_tables(["table_8"]) == 1
+        assert explain_cache._keys_by_table["contacts"] == {"sig-7", "sig-9"}
+    finally:
+        explain_cache.set_explain_cache(None)
+        explain_cache.reset_table_versions()
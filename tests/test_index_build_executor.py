@@ -0,0 +1,319 @@
+"""Tests for the parallel index build executor"""
+
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from src import auto_indexer
+from src.index_build_executor import IndexBuildExecutor
+from src.index_candidate_catalog import TableCatalog
+
+
+@contextmanager
+def _gates(throttle=None, in_window=True, wait=(False, 0.0), budget=None):
+    """Patch the admission gates; defaults admit every build"""
+    with (
+        patch(
+            "src.cpu_throttle.should_throttle_index_creation",
+            side_effect=throttle or (lambda: (False, None, 0)),
+        ),
+        patch("src.maintenance_window.is_in_maintenance_window", return_value=in_window),
+        patch("src.maintenance_window.should_wait_for_maintenance_window", return_value=wait),
+        patch(
+            "src.storage_budget.check_storage_budget",
+            side_effect=budget or (lambda **_kwargs: {"allowed": True}),
+        ),
+    ):
+        yield
+
+
+def test_builds_serialize_per_table_and_overlap_across_tables():
+    """Two builds never run on one table at once; different tables run together"""
+    lock = threading.Lock()
+    running: dict[str, int] = {}
+    max_per_table: dict[str, int] = {}
+    overlapped = threading.Event()
+
+    def build(job):
+        with lock:
+            running[job.table_name] = running.get(job.table_name, 0) + 1
+            max_per_table[job.table_name] = max(
+                max_per_table.get(job.table_name, 0), running[job.table_name]
+            )
+            if sum(1 for count in running.values() if count) > 1:
+                overlapped.set()
+        time.sleep(0.05)
+        with lock:
+            running[job.table_name] -= 1
+        return {"success": True}
+
+    executor = IndexBuildExecutor(max_concurrent_builds=3, build_func=build)
+    with _gates():
+        futures = [
+            executor.submit("contacts", "email", "idx_contacts_email", "CREATE INDEX ..."),
+            executor.submit("contacts", "name", "idx_contacts_name", "CREATE INDEX ..."),
+            executor.submit("orgs", "name", "idx_orgs_name", "CREATE INDEX ..."),
+        ]
+        results = [future.result(timeout=5) for future in futures]
+    executor.shutdown()
+
+    assert all(result["success"] for result in results)
+    assert max_per_table == {"contacts": 1, "orgs": 1}
+    assert overlapped.is_set()
+    assert executor.get_queue_state()["counters"]["succeeded"] == 3
+
+
+def test_cpu_throttle_defers_build_until_admitted():
+    """A throttled build is re-queued and runs once the CPU gate clears"""
+    answers = iter([(True, "CPU usage too high", 0.01)])
+    build = Mock(return_value={"success": True})
+    executor = IndexBuildExecutor(build_func=build, gate_recheck_seconds=0.01)
+
+    with _gates(throttle=lambda: next(answers, (False, None, 0))):
+        result = executor.submit("contacts", "email", "idx_a", "CREATE INDEX ...").result(5)
+    executor.shutdown()
+
+    assert result["success"] is True
+    build.assert_called_once()
+    (completed,) = executor.get_queue_state()["completed"]
+    assert completed["deferrals"] == 1
+    assert completed["last_deferral_reason"].startswith("cpu_throttled")
+
+
+def test_storage_budget_rejects_build():
+    """A build that would exceed the storage budget is never started"""
+    build = Mock(return_value={"success": True})
+    executor = IndexBuildExecutor(build_func=build)
+
+    with _gates(budget=lambda **_kwargs: {"allowed": False, "reason": "Would exceed budget"}):
+        result = executor.submit("contacts", "email", "idx_a", "CREATE INDEX ...").result(5)
+    executor.shutdown()
+
+    assert result == {"success": False, "index_name": "idx_a", "reason": "Would exceed budget"}
+    build.assert_not_called()
+    assert executor.get_queue_state()["counters"]["rejected"] == 1
+
+
+def test_maintenance_window_too_far_away_rejects_build():
+    """Builds are not held longer than max_queue_wait_seconds"""
+    build = Mock(return_value={"success": True})
+    executor = IndexBuildExecutor(build_func=build, max_queue_wait_seconds=60)
+
+    with _gates(in_window=False, wait=(True, 7200.0)):
+        result = executor.submit("contacts", "email", "idx_a", "CREATE INDEX ...").result(5)
+    executor.shutdown()
+
+    assert result["success"] is False
+    assert result["reason"].startswith("outside_maintenance_window")
+    build.assert_not_called()
+
+
+def test_build_error_is_raised_from_future():
+    executor = IndexBuildExecutor(build_func=Mock(side_effect=RuntimeError("lock timeout")))
+
+    with _gates():
+        future = executor.submit("contacts", "email", "idx_a", "CREATE INDEX ...")
+        with pytest.raises(RuntimeError, match="lock timeout"):
+            future.result(5)
+    executor.shutdown()
+
+    assert executor.get_queue_state()["counters"]["failed"] == 1
+
+
+def test_unsuccessful_build_is_not_labelled_throttled():
+    """The CPU gate already ran; a build that did not complete is a build failure"""
+    executor = IndexBuildExecutor(build_func=Mock(return_value={"success": False}))
+
+    with _gates():
+        result = executor.submit("contacts", "email", "idx_a", "CREATE INDEX ...").result(5)
+    executor.shutdown()
+
+    assert result["reason"] == "build_not_completed"
+    assert result["attempted"] is True
+    assert executor.get_queue_state()["counters"]["failed"] == 1
+
+
+def _finalize_args(catalog, index_name="idx_contacts_email"):
+    return {
+        "table_name": "contacts",
+        "field_name": "email",
+        "index_name": index_name,
+        "table_catalog": catalog,
+        "total_queries": 500.0,
+    }
+
+
+@patch("src.adaptive_safeguards.record_circuit_failure")
+@patch("src.auto_indexer._finalize_created_index")
+def test_collect_reports_slow_builds_pending_and_finalizes_them_later(mock_finalize, _circuit):
+    """A cycle never blocks on the queue; late builds finish through a done-callback"""
+    catalog = TableCatalog(table_name="contacts")
+    catalog.record_index("idx_contacts_email", "CREATE INDEX ...")
+    finished, slow = Future(), Future()
+    finished.set_result({"success": True})
+    created, skipped, pending = [], [], []
+
+    auto_indexer._collect_parallel_builds(
+        [(finished, _finalize_args(catalog, "idx_done")), (slow, _finalize_args(catalog))],
+        created,
+        skipped,
+        pending,
+        wait_seconds=0.01,
+    )
+
+    assert mock_finalize.call_count == 1
+    assert [entry["index_name"] for entry in pending] == ["idx_contacts_email"]
+    assert pending[0]["reason"] == "build_pending"
+    assert skipped == []
+
+    slow.set_result({"success": True})
+    assert mock_finalize.call_count == 2
+    assert catalog.index_count == 1
+
+
+@patch("src.adaptive_safeguards.record_circuit_failure")
+@patch("src.safeguard_monitoring.track_index_creation_attempt")
+def test_failed_parallel_build_releases_slot_and_trips_circuit(mock_track, mock_circuit):
+    """Builds that ran and failed are accounted like the sequential path; gate rejections
+    only give their reserved slot back"""
+    catalog = TableCatalog(table_name="contacts")
+    failed, rejected = Future(), Future()
+    failed.set_result({"success": False, "attempted": True, "reason": "build_not_completed"})
+    rejected.set_result({"success": False, "reason": "Would exceed budget"})
+    skipped: list = []
+    for future, index_name in ((failed, "idx_a"), (rejected, "idx_b")):
+        catalog.record_index(index_name, "CREATE INDEX ...")
+        auto_indexer._collect_parallel_builds(
+            [(future, _finalize_args(catalog, index_name))], [], skipped, [], wait_seconds=1
+        )
+
+    assert catalog.index_count == 0
+    assert [entry["reason"] for entry in skipped] == ["build_not_completed", "Would exceed budget"]
+    mock_circuit.assert_called_once_with("index_creation_contacts")
+    assert all(call.kwargs["throttled"] is False for call in mock_track.call_args_list)
+
+
+def test_shutdown_cancels_queued_builds():
+    release = threading.Event()
+    started = threading.Event()
+
+    def build(_job):
+        started.set()
+        release.wait(5)
+        return {"success": True}
+
+    executor = IndexBuildExecutor(max_concurrent_builds=1, build_func=build)
+    with _gates():
+        running = executor.submit("contacts", "email", "idx_a", "CREATE INDEX ...")
+        queued = executor.submit("orgs", "name", "idx_b", "CREATE INDEX ...")
+        assert started.wait(5)
+        shutdown_thread = threading.Thread(target=executor.shutdown)
+        shutdown_thread.start()
+        release.set()
+        shutdown_thread.join(5)
+
+    assert running.result(5)["success"] is True
+    assert queued.cancelled()
+    with pytest.raises(RuntimeError):
+        executor.submit("orgs", "name", "idx_b", "CREATE INDEX ...")
+
+
+def test_duplicate_submissions_share_the_queued_build():
+    """A build already queued for the same index or table/field is not queued twice"""
+    release = threading.Event()
+    builds: list[str] = []
+
+    def build(job):
+        builds.append(job.index_name)
+        release.wait(5)
+        return {"success": True}
+
+    executor = IndexBuildExecutor(max_concurrent_builds=1, build_func=build)
+    with _gates():
+        first = executor.submit("contacts", "email", "idx_contacts_email", "CREATE INDEX ...")
+        same_name = executor.submit("contacts", "email", "idx_contacts_email", "CREATE ...")
+        same_field = executor.submit("contacts", "email", "idx_contacts_email_tenant", "...")
+        release.set()
+        assert first.result(5)["success"] is True
+        executor.shutdown(timeout=5)
+
+    assert same_name is first and same_field is first
+    assert builds == ["idx_contacts_email"]
+    assert executor.get_queue_state()["counters"]["submitted"] == 1
+
+
+@patch("src.adaptive_safeguards.record_circuit_failure")
+def test_cancelled_build_is_skipped_without_tripping_circuit(mock_circuit):
+    catalog = TableCatalog(table_name="contacts")
+    catalog.record_index("idx_contacts_email", "CREATE INDEX ...")
+    cancelled = Future()
+    cancelled.cancel()
+    skipped: list = []
+
+    auto_indexer._collect_parallel_builds(
+        [(cancelled, _finalize_args(catalog))], [], skipped, [], wait_seconds=1
+    )
+
+    assert [entry["reason"] for entry in skipped] == ["build_cancelled"]
+    assert catalog.index_count == 0
+    mock_circuit.assert_not_called()
+
+
+def test_shared_executor_shutdown_wait_is_bounded():
+    from src import index_build_executor
+
+    executor = Mock()
+    with (
+        patch.object(index_build_executor, "_executor", executor),
+        patch.object(index_build_executor, "get_build_collect_timeout_seconds", return_value=7.0),
+    ):
+        index_build_executor.shutdown_index_build_executor()
+    executor.shutdown.assert_called_once_with(timeout=7.0)
+
+
+def test_build_progress_reads_pg_stat_progress_create_index():
+    """Running builds are matched to their progress row by table"""
+    release = threading.Event()
+    started = threading.Event()
+
+    def build(_job):
+        started.set()
+        release.wait(5)
+        return {"success": True}
+
+    cursor = Mock()
+    cursor.fetchall.return_value = [
+        {
+            "table_name": "contacts",
+            "pid": 42,
+            "phase": "building index: scanning table",
+            "blocks_total": 200,
+            "blocks_done": 50,
+            "tuples_total": 0,
+            "tuples_done": 0,
+        }
+    ]
+    context_manager = MagicMock()
+    context_manager.__enter__ = Mock(return_value=cursor)
+    context_manager.__exit__ = Mock(return_value=None)
+
+    executor = IndexBuildExecutor(build_func=build)
+    try:
+        with _gates():
+            future = executor.submit("contacts", "email", "idx_a", "CREATE INDEX ...")
+            assert started.wait(5)
+            with patch("src.index_build_executor.get_cursor", return_value=context_manager):
+                (build_state,) = executor.get_build_progress()
+    finally:
+        release.set()
+        future.result(5)
+        executor.shutdown()
+
+    assert cursor.execute.call_args[0][1] == (["contacts"],)
+    assert build_state["index_name"] == "idx_a"
+    assert build_state["progress"]["phase"] == "building index: scanning table"
+    assert build_state["progress"]["progress_percent"] == 25.0
@@ -0,0 +1,147 @@
+"""Tests for the auto-indexer candidate catalog prefetch"""
+
+from unittest.mock import MagicMock, Mock, patch
+
+from src import auto_indexer
+from src.index_candidate_catalog import (
+    TableCatalog,
+    fetch_distinct_count,
+    prefetch_candidate_catalog,
+)
+
+
+def _mock_cursor_context(cursor):
+    context_manager = MagicMock()
+    context_manager.__enter__ = Mock(return_value=cursor)
+    context_manager.__exit__ = Mock(return_value=None)
+    return context_manager
+
+
+def _prefetch_cursor():
+    """Cursor answering the prefetch queries for tables contacts and orgs"""
+    cursor = Mock()
+    state: dict = {}
+
+    def execute(query, params=None):
+        text = query if isinstance(query, str) else repr(query)
+        state["text"] = text
+        if "contacts" in text and "COUNT(*)" in text:
+            state["one"] = {"total_rows": 1000}
+        elif "orgs" in text and "COUNT(*)" in text:
+            state["one"] = {"total_rows": 10}
+
+    def fetchall():
+        text = state["text"]
+        if "pg_indexes" in text:
+            return [
+                {"tablename": "contacts", "indexname": "contacts_pkey", "indexdef": "(id)"},
+                {"tablename": "orgs", "indexname": "idx_orgs_name", "indexdef": "(name)"},
+            ]
+        if "pg_class" in text:
+            return [
+                {"relname": "contacts", "table_size_bytes": 1000, "index_size_bytes": 250},
+                {"relname": "orgs", "table_size_bytes": 100, "index_size_bytes": 0},
+            ]
+        if "pg_stats" in text:
+            return [{"tablename": "contacts", "attname": "email", "n_distinct": -0.9}]
+        if "genome_catalog" in text:
+            return [{"table_name": "contacts"}]
+        return []
+
+    cursor.execute.side_effect = execute
+    cursor.fetchall.side_effect = fetchall
+    cursor.fetchone.side_effect = lambda: state.get("one")
+    return cursor
+
+
+def test_prefetch_issues_set_based_queries_per_cycle():
+    """Catalog reads are O(tables), and already indexed fields are never scanned"""
+    cursor = _prefetch_cursor()
+    with patch("src.index_candidate_catalog.get_cursor", return_value=_mock_cursor_context(cursor)):
+        catalogs = prefetch_candidate_catalog(
+            {"contacts": {"email", "status", "id"}, "orgs": {"name"}},
+            auto_indexer._candidate_index_names,
+        )
+
+    contacts = catalogs["contacts"]
+    assert contacts.row_count == 1000
+    assert contacts.candidate_fields == {"email", "status"}
+    assert contacts.distinct_counts == {}
+    assert contacts.has_tenant_field is True
+    assert contacts.index_count == 1
+    assert contacts.size_info()["index_overhead_percent"] == 25.0
+    orgs = catalogs["orgs"]
+    assert orgs.has_tenant_field is False
+    assert orgs.candidate_fields == set()
+    assert orgs.row_count == 0
+
+    # 4 set-based catalog queries + savepoint/release + 1 row count for contacts only
+    assert cursor.execute.call_count == 4 + 2 + 1
+    assert "DISTINCT" not in repr(cursor.execute.call_args_list[-1])
+
+
+def test_distinct_count_is_read_once_on_first_use():
+    cursor = Mock()
+    cursor.fetchone.return_value = {"distinct_count": 900}
+    catalog = TableCatalog(table_name="contacts", row_count=1000)
+    with patch("src.index_candidate_catalog.get_cursor", return_value=_mock_cursor_context(cursor)):
+        assert fetch_distinct_count(catalog, "email") == 900
+        assert fetch_distinct_count(catalog, "email") == 900
+
+    cursor.execute.assert_called_once()
+    assert catalog.actual_selectivity("email") == 0.9
+
+
+def test_prefetch_failure_returns_empty_catalog():
+    cursor = Mock()
+    cursor.execute.side_effect = RuntimeError("db down")
+    with patch("src.index_candidate_catalog.get_cursor", return_value=_mock_cursor_context(cursor)):
+        assert prefetch_candidate_catalog({"contacts": {"email"}}) == {}
+
+
+def test_has_index_for_field_matches_names_and_definitions():
+    catalog = TableCatalog(
+        table_name="contacts",
+        indexes=[("contacts_pkey", "CREATE UNIQUE INDEX contacts_pkey ON contacts (id)")],
+    )
+    assert catalog.has_index_for_field("id", ("idx_contacts_id",))
+    assert not catalog.has_index_for_field("email", ("idx_contacts_email",))
+
+    catalog.record_index(
+        "idx_contacts_email", "CREATE INDEX idx_contacts_email ON contacts (email)"
+    )
+    assert catalog.has_index_for_field("email", ("idx_contacts_email",))
+    catalog.forget_index("idx_contacts_email")
+    assert not catalog.has_index_for_field("email", ("idx_contacts_email",))
+
+
+@patch("src.algorithm_tracking.track_algorithm_usage")
+def test_catalog_selectivity_uses_pg_stats_when_cert_validates(_mock_track):
+    catalog = TableCatalog(
+        table_name="contacts",
+        row_count=1000,
+        distinct_counts={"email": 900},
+        stats_n_distinct={"email": -0.88},
+    )
+    assert auto_indexer._catalog_field_selectivity(catalog, "email") == 0.88
+
+
+@patch("src.algorithm_tracking.track_algorithm_usage")
+def test_catalog_selectivity_falls_back_to_exact_counts_when_stale(_mock_track):
+    catalog = TableCatalog(
+        table_name="contacts",
+        row_count=1000,
+        distinct_counts={"email": 900, "status": 2},
+        stats_n_distinct={"email": -0.1},
+    )
+    assert auto_indexer._catalog_field_selectivity(catalog, "email") == 0.9
+    # Never analyzed: exact counts, no CERT comparison
+    assert auto_indexer._catalog_field_selectivity(catalog, "status") == 0.002
+
+
+@patch("src.algorithm_tracking.track_algorithm_usage")
+@patch("src.auto_indexer.fetch_distinct_count", return_value=None)
+def test_catalog_selectivity_uses_pg_stats_when_exact_count_is_unavailable(_fetch, _track):
+    catalog = TableCatalog(table_name="contacts", row_count=1000, stats_n_distinct={"email": -0.88})
+    assert auto_indexer._catalog_field_selectivity(catalog, "email") == 0.88
+    assert auto_indexer._catalog_field_selectivity(catalog, "missing") is None
@@ -0,0 +1,66 @@
+"""Tests for per-thread interception metrics and the latency histogram"""
+
+import random
+import threading
+
+from src.interception_metrics import InterceptionMetrics, LatencyHistogram
+
+
+def test_histogram_percentiles_are_within_bucket_precision():
+    rng = random.Random(7)
+    values = sorted(rng.randint(1_000, 5_000_000) for _ in range(20000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    for percentile in (0.5, 0.9, 0.99, 0.999):
+        exact = values[int(percentile * len(values) + 0.5) - 1]
+        assert abs(histogram.percentile(percentile) - exact) <= exact / 32
+    assert histogram.percentile(1.0) == values[-1]
+
+    summary = histogram.summary()
+    assert summary["count"] == len(values)
+    assert summary["max_us"] == round(values[-1] / 1000, 3)
+
+
+def test_histogram_small_values_are_exact_and_huge_values_are_clamped():
+    histogram = LatencyHistogram()
+    for value in range(64):
+        histogram.record(value)
+    assert histogram.percentile(0.5) == 31
+
+    histogram.record(10**15)
+    assert histogram.percentile(1.0) == histogram.max_ns
+    assert LatencyHistogram().percentile(0.99) == 0
+
+
+def test_counters_from_all_threads_are_aggregated():
+    metrics = InterceptionMetrics()
+
+    def work():
+        for _ in range(1000):
+            metrics.record_interception(2_000)
+            metrics.record_verdict_cache_lookup(hit=True)
+        metrics.record_blocked("QUERY_COST_TOO_HIGH")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    metrics.record_analysis(3_000_000)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["total_interceptions"] == 4000
+    assert snapshot["verdict_cache_hits"] == 4000
+    assert snapshot["total_blocked"] == 4
+    assert snapshot["blocked_by_reason"] == {"QUERY_COST_TOO_HIGH": 4}
+    assert snapshot["total_analyzed"] == 1
+    assert snapshot["total_analysis_time_ms"] == 3.0
+    assert snapshot["interception_overhead"]["count"] == 4000
+    # Exited threads are folded into the retired totals; only this thread is live
+    assert snapshot["threads"] == 1
+    assert metrics.snapshot()["total_interceptions"] == 4000
+
+    metrics.reset()
+    assert metrics.snapshot()["total_interceptions"] == 0
@@ -0,0 +1,130 @@
+"""Tests for sustained/spike pattern detection, per field and batched"""
+
+import random
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.pattern_detection import (
+    _classify_period_counts,
+    _classify_series_numpy,
+    _classify_series_python,
+    detect_sustained_pattern,
+    detect_sustained_patterns,
+    should_create_index_based_on_pattern,
+)
+
+DAY = datetime(2026, 10, 10)
+
+
+def _random_series(rng):
+    length = rng.choice([0, 1, 2, 3, 5, 7])
+    positions = rng.sample(range(100, 110), length)
+    base = rng.choice([5, 20, 80])
+    return {x: max(1, int(rng.gauss(base, base / 3))) for x in positions}
+
+
+@pytest.mark.parametrize("hourly", [True, False])
+def test_vectorized_classification_matches_per_field_rules(hourly):
+    rng = random.Random(11)
+    series_by_field = [_random_series(rng) for _ in range(300)]
+    series_by_field.append({100: 10, 101: 10, 102: 10, 103: 10, 104: 500})  # spike
+
+    vectorized = _classify_series_numpy(series_by_field, hourly)
+    fallback = _classify_series_python(series_by_field, hourly)
+
+    for series, fast, slow in zip(series_by_field, vectorized, fallback, strict=True):
+        expected = _classify_period_counts([series[x] for x in sorted(series)], hourly)
+        assert {k: v for k, v in fast.items() if k in expected} == pytest.approx(expected)
+        assert fast["trend_ratio"] == pytest.approx(slow["trend_ratio"])
+        assert fast["temporal_profile"] == slow["temporal_profile"]
+    assert vectorized[-1]["is_spike"] is True
+    assert vectorized[-1]["temporal_profile"] == "spike"
+
+
+def _rows(table, field, counts, start=DAY, step=timedelta(days=1)):
+    return [
+        {
+            "table_name": table,
+            "field_name": field,
+            "query_period": start + step * offset,
+            "query_count": count,
+        }
+        for offset, count in enumerate(counts)
+    ]
+
+
+@patch("src.stats.get_field_period_counts")
+def test_batch_detection_reads_all_fields_in_one_query(mock_counts):
+    mock_counts.return_value = (
+        _rows("contacts", "email", [100, 110, 95, 105, 100])
+        + _rows("contacts", "phone", [60, 120, 180, 240, 300])
+        + _rows("orders", "status", [5, 5, 900])
+    )
+    fields_by_table = {"contacts": {"email", "phone", "name"}, "orders": {"status"}}
+
+    patterns = detect_sustained_patterns(fields_by_table)
+
+    mock_counts.assert_called_once()
+    fields, window_hours, period = mock_counts.call_args.args
+    assert sorted(fields) == [
+        ("contacts", "email"),
+        ("contacts", "name"),
+        ("contacts", "phone"),
+        ("orders", "status"),
+    ]
+    assert (window_hours, period) == (7 * 24, "day")
+
+    assert patterns[("contacts", "email")]["is_sustained"] is True
+    assert patterns[("contacts", "email")]["temporal_profile"] == "steady"
+    assert patterns[("contacts", "phone")]["temporal_profile"] == "growing"
+    assert patterns[("orders", "status")]["is_spike"] is False  # 900 < 3x the 303 average
+    assert patterns[("orders", "status")]["reason"] == "only_1_days_above_threshold"
+    assert patterns[("contacts", "name")]["reason"] == "Insufficient data: 0 days"
+    assert patterns[("contacts", "name")]["temporal_profile"] == "insufficient_data"
+
+
+@patch("src.stats.get_field_period_counts")
+def test_batch_detection_uses_hours_for_simulation_windows(mock_counts):
+    mock_counts.return_value = _rows("contacts", "email", [12, 15], step=timedelta(hours=1))
+
+    patterns = detect_sustained_patterns({"contacts": {"email"}}, time_window_hours=6)
+
+    assert mock_counts.call_args.args[1:] == (6, "hour")
+    assert patterns[("contacts", "email")]["is_sustained"] is True
+
+
+@patch("src.stats.get_field_period_counts", side_effect=RuntimeError("db down"))
+def test_batch_detection_failure_returns_empty(_mock_counts):
+    assert detect_sustained_patterns({"contacts": {"email"}}) == {}
+    assert detect_sustained_patterns({}) == {}
+
+
+@patch("src.pattern_detection.detect_sustained_pattern")
+def test_precomputed_pattern_skips_the_per_field_query(mock_detect):
+    pattern = _classify_period_counts([100, 100, 100, 100], hourly=False)
+
+    assert should_create_index_based_on_pattern("contacts", "email", 1000, pattern=pattern) == (
+        True,
+        "sustained_pattern_detected",
+    )
+    mock_detect.assert_not_called()
+
+
+@patch("src.validation.validate_field_name", side_effect=lambda field, _table: field)
+@patch("src.validation.validate_table_name", side_effect=lambda table: table)
+@patch("src.stats.get_field_period_counts")
+def test_per_field_detection_reads_the_same_period_counts(mock_counts, _table, _field):
+    """The per-field fallback sees rollup counts, e.g. in aggregate mode"""
+    # Rolled-up and raw rows for one period are added together
+    mock_counts.return_value = _rows("contacts", "email", [100, 110, 95, 105]) + _rows(
+        "contacts", "email", [5]
+    )
+
+    pattern = detect_sustained_pattern("contacts", "email", days=7)
+
+    mock_counts.assert_called_once_with([("contacts", "email")], 7 * 24, "day")
+    assert pattern["days_analyzed"] == 4
+    assert pattern["max_queries_per_day"] == 110
+    assert pattern["is_sustained"] is True
@@ -0,0 +1,412 @@
+"""Tests for the application-level query result cache"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src import production_cache
+from src.cache_eviction import CountMinSketch
+from src.production_cache import ProductionCache, query_table_tags
+
+
+def _recomputed_bytes(cache: ProductionCache) -> int:
+    return sum(entry[3] for entry in cache.cache.values())
+
+
+def test_memory_accounting_tracks_insert_replace_and_remove():
+    """The running byte total always equals the sum of the live entries"""
+    cache = ProductionCache(max_size=100, max_memory_mb=None)
+    cache.set("SELECT * FROM contacts", (1,), [{"name": "a" * 100}])
+    cache.set("SELECT * FROM orgs", (1,), "x" * 50)
+    # Replacing an entry must not double count it
+    cache.set("SELECT * FROM contacts", (1,), [{"name": "b"}])
+    assert cache._total_bytes == _recomputed_bytes(cache)
+
+    cache.invalidate_table("contacts")
+    assert cache._total_bytes == _recomputed_bytes(cache)
+
+    cache.clear()
+    assert cache._total_bytes == 0
+    assert cache.get_stats()["memory_mb"] == 0
+
+
+def test_memory_limit_evicts_least_recently_used():
+    entry_value = "x" * 200_000
+    cache = ProductionCache(max_size=100, max_memory_mb=1)
+    for i in range(10):
+        cache.set(f"SELECT * FROM t{i}", None, entry_value)
+
+    assert cache._total_bytes <= 1024 * 1024
+    assert cache._total_bytes == _recomputed_bytes(cache)
+    assert cache.get("SELECT * FROM t9") == entry_value
+    assert cache.get("SELECT * FROM t0") is None
+    assert cache.evictions > 0
+
+
+def test_invalidate_table_removes_only_referencing_entries():
+    cache = ProductionCache(max_size=100, max_memory_mb=None)
+    cache.set("SELECT * FROM contacts JOIN orgs ON orgs.id = contacts.org_id", None, 1)
+    cache.set("SELECT * FROM contacts", None, 2)
+    cache.set("SELECT * FROM orgs", None, 3)
+    cache.set("SELECT * FROM users", None, 4)
+
+    cache.invalidate_tables(["orgs"])
+
+    assert cache.get("SELECT * FROM contacts") == 2
+    assert cache.get("SELECT * FROM users") == 4
+    assert cache.get("SELECT * FROM orgs") is None
+    assert cache.invalidations == 2
+    # The reverse index no longer points at removed keys
+    assert "orgs" not in cache._keys_by_table
+    assert all(len(keys) == 1 for keys in cache._keys_by_table.values())
+
+
+def test_evicted_and_expired_entries_leave_the_table_index():
+    cache = ProductionCache(max_size=2, max_memory_mb=None)
+    cache.set("SELECT * FROM a", None, 1)
+    cache.set("SELECT * FROM b", None, 2)
+    cache.set("SELECT * FROM c", None, 3)
+    assert "a" not in cache._keys_by_table
+
+    cache.set("SELECT * FROM d", None, 4, ttl=-1)
+    cache.cleanup_expired()
+    assert "d" not in cache._keys_by_table
+    assert cache._total_bytes == _recomputed_bytes(cache)
+
+
+def _hot_hit_ratio_after_scan(policy: str) -> float:
+    """Hit ratio on a hot working set re-read after each scan of distinct queries"""
+    cache = ProductionCache(max_size=100, max_memory_mb=None, eviction_policy=policy)
+    hot = [f"SELECT * FROM hot WHERE id = {i}" for i in range(50)]
+    for _ in range(3):
+        for query in hot:
+            if cache.get(query) is None:
+                cache.set(query, None, 1)
+
+    hits = 0
+    lookups = 0
+    for round_number in range(5):
+        for i in range(200):
+            scan_query = f"SELECT * FROM events WHERE id = {round_number * 200 + i}"
+            if cache.get(scan_query) is None:
+                cache.set(scan_query, None, 1)
+        for query in hot:
+            if cache.get(query) is None:
+                cache.set(query, None, 1)
+            else:
+                hits += 1
+            lookups += 1
+    return hits / lookups
+
+
+def test_scan_resistant_policies_keep_the_hot_set():
+    """A scan of distinct queries flushes LRU but not SLRU or W-TinyLFU"""
+    assert _hot_hit_ratio_after_scan("lru") < 0.1
+    assert _hot_hit_ratio_after_scan("slru") > 0.9
+    assert _hot_hit_ratio_after_scan("w-tinylfu") > 0.9
+
+
+def test_stats_report_shadow_policy_hit_ratios():
+    cache = ProductionCache(
+        max_size=10, max_memory_mb=None, shadow_policies=["w_tinylfu", "slru", "lru"]
+    )
+    cache.set("SELECT * FROM a", None, 1)
+    cache.get("SELECT * FROM a")
+    cache.get("SELECT * FROM b")
+
+    stats = cache.get_stats()
+    assert stats["eviction_policy"] == "lru"
+    # The active policy is not duplicated as a shadow
+    assert stats["policy_hit_ratios"] == {"lru": 50.0, "w-tinylfu": 50.0, "slru": 50.0}
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError, match="Unknown cache eviction policy"):
+        ProductionCache(eviction_policy="fifo")
+
+
+def test_count_min_sketch_estimates_and_ages():
+    sketch = CountMinSketch(capacity=64)
+    for _ in range(5):
+        sketch.increment("hot")
+    sketch.increment("cold")
+    assert sketch.estimate("hot") >= 5
+    assert sketch.estimate("cold") <= sketch.estimate("hot")
+    assert sketch.estimate("never") <= 1
+
+    # Counters saturate, and are halved once sample_size increments have been seen
+    for _ in range(20):
+        sketch.increment("hot")
+    assert sketch.estimate("hot") == sketch.max_count
+    sketch._additions = sketch.sample_size - 1
+    sketch.increment("cold")
+    assert sketch.estimate("hot") == sketch.max_count // 2
+
+
+def test_tenants_are_cached_separately():
+    cache = ProductionCache(max_size=100, max_memory_mb=None)
+    cache.set("SELECT * FROM contacts", None, "tenant 1 rows", tenant_id=1)
+    cache.set("SELECT * FROM contacts", None, "tenant 2 rows", tenant_id=2)
+
+    assert cache.get("SELECT * FROM contacts", tenant_id=1) == "tenant 1 rows"
+    assert cache.get("SELECT * FROM contacts", tenant_id=2) == "tenant 2 rows"
+    assert cache.get("SELECT * FROM contacts") is None
+
+    # Table invalidation still reaches every tenant's entries
+    cache.invalidate_table("contacts")
+    assert cache.get("SELECT * FROM contacts", tenant_id=1) is None
+    assert cache._total_bytes == _recomputed_bytes(cache)
+
+
+def test_tenant_quota_evicts_only_that_tenants_entries():
+    cache = ProductionCache(
+        max_size=100,
+        max_memory_mb=None,
+        tenant_quota_resolver=lambda tenant_id: {"max_entries": 2} if tenant_id == 1 else {},
+    )
+    cache.set("SELECT * FROM contacts WHERE id = 0", None, 0, tenant_id=2)
+    for i in range(5):
+        cache.set(f"SELECT * FROM contacts WHERE id = {i}", None, i, tenant_id=1)
+
+    tenants = cache.get_stats()["tenants"]
+    assert tenants["1"]["size"] == 2
+    assert tenants["1"]["evictions"] == 3
+    assert tenants["2"]["size"] == 1
+    assert cache.get("SELECT * FROM contacts WHERE id = 4", tenant_id=1) == 4
+    assert cache.get("SELECT * FROM contacts WHERE id = 0", tenant_id=2) == 0
+
+    # Tightening the quota takes effect immediately
+    cache.set_tenant_quota(1, max_entries=1)
+    assert cache.get_stats()["tenants"]["1"]["size"] == 1
+
+
+def test_tenant_partitions_only_live_while_they_hold_entries():
+    """Lookups for unseen tenants allocate nothing; emptied partitions are dropped"""
+    cache = ProductionCache(max_size=100, max_memory_mb=None, eviction_policy="w-tinylfu")
+    for tenant_id in range(1000):
+        assert cache.get("SELECT * FROM contacts", tenant_id=tenant_id) is None
+    assert list(cache._partitions) == [None]
+    assert cache.misses == 1000
+
+    cache.set("SELECT * FROM contacts", None, 1, tenant_id=1)
+    cache.set("SELECT * FROM orgs", None, 2, tenant_id=2)
+    cache.set_tenant_quota(3, max_entries=5)
+    # Every partition shares the cache-wide frequency sketch
+    assert len({id(partition.policy.sketch) for partition in cache._partitions.values()}) == 1
+
+    cache.invalidate_table("contacts")
+    assert set(cache._partitions) == {None, 2, 3}
+    cache.clear()
+    # Explicit quotas survive; the partition is kept for them
+    assert set(cache._partitions) == {None, 3}
+    assert cache.get_stats()["tenants"]["3"]["max_entries"] == 5
+
+
+def test_global_limit_evicts_the_tenant_over_its_fair_share():
+    """A noisy tenant filling the cache evicts its own entries, not a quiet tenant's"""
+    cache = ProductionCache(max_size=10, max_memory_mb=None)
+    for i in range(3):
+        cache.set(f"SELECT * FROM orgs WHERE id = {i}", None, i, tenant_id="quiet")
+    for i in range(50):
+        cache.set(f"SELECT * FROM events WHERE id = {i}", None, i, tenant_id="noisy")
+
+    tenants = cache.get_stats()["tenants"]
+    assert tenants["quiet"]["size"] == 3
+    assert tenants["quiet"]["evictions"] == 0
+    assert tenants["noisy"]["size"] == 7
+    assert len(cache.cache) == 10
+
+
+def test_weighted_fair_share_under_memory_limit():
+    entry_value = "x" * 100_000
+    cache = ProductionCache(max_size=100, max_memory_mb=1)
+    cache.set_tenant_quota("big", weight=3.0)
+    for i in range(10):
+        cache.set(f"SELECT * FROM a WHERE id = {i}", None, entry_value, tenant_id="big")
+        cache.set(f"SELECT * FROM b WHERE id = {i}", None, entry_value, tenant_id="small")
+
+    tenants = cache.get_stats()["tenants"]
+    assert cache._total_bytes <= 1024 * 1024
+    assert tenants["big"]["size"] > 2 * tenants["small"]["size"]
+
+
+def test_stats_report_per_tenant_hit_rates():
+    cache = ProductionCache(max_size=100, max_memory_mb=None)
+    cache.set("SELECT * FROM contacts", None, 1, tenant_id=7)
+    cache.get("SELECT * FROM contacts", tenant_id=7)
+    cache.get("SELECT * FROM orgs", tenant_id=7)
+    cache.get("SELECT * FROM orgs")
+
+    stats = cache.get_stats()
+    assert stats["tenants"]["7"]["hit_rate_pct"] == 50.0
+    assert stats["tenants"]["7"]["memory_mb"] >= 0
+    assert stats["tenants"]["shared"]["misses"] == 1
+    assert stats["hit_rate_pct"] == round(1 / 3 * 100, 2)
+
+
+def test_tenant_quota_is_memoized_across_partition_lifetimes():
+    """Emptying a partition does not make the next store hit the resolver again"""
+    resolver = Mock(return_value={"max_entries": 2})
+    cache = ProductionCache(max_size=100, max_memory_mb=None, tenant_quota_resolver=resolver)
+    for _ in range(3):
+        cache.set("SELECT * FROM contacts", None, 1, tenant_id=1)
+        cache.invalidate_table("contacts")
+    assert resolver.call_count == 1
+
+    cache.invalidate_tenant_quota(1)
+    cache.set("SELECT * FROM contacts", None, 1, tenant_id=1)
+    assert resolver.call_count == 2
+
+    cache.invalidate_table("contacts")
+    cache.tenant_quota_ttl_seconds = 0
+    cache.set("SELECT * FROM contacts", None, 1, tenant_id=1)
+    assert resolver.call_count == 3
+
+
+def test_tenant_lookup_counts_survive_partition_removal():
+    cache = ProductionCache(max_size=100, max_memory_mb=None)
+    cache.get_or_compute("SELECT * FROM contacts", None, lambda: 1, tenant_id=5)
+    cache.get_or_compute("SELECT * FROM contacts", None, lambda: 1, tenant_id=5)
+    cache.invalidate_table("contacts")
+    cache.get("SELECT * FROM contacts", tenant_id=5)
+
+    tenant = cache.get_stats()["tenants"]["5"]
+    assert (tenant["hits"], tenant["misses"], tenant["size"]) == (1, 2, 0)
+
+
+def _run_concurrently(count: int, target) -> list:
+    results: list = [None] * count
+
+    def run(i: int):
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_misses_compute_once():
+    cache = ProductionCache(max_size=100, max_memory_mb=None)
+    calls = 0
+
+    def compute():
+        nonlocal calls
+        calls += 1
+        time.sleep(0.1)
+        return [{"id": 1}]
+
+    results = _run_concurrently(
+        8, lambda: cache.get_or_compute("SELECT * FROM contacts", None, compute)
+    )
+
+    assert calls == 1
+    assert results == [[{"id": 1}]] * 8
+    assert cache.get_stats()["coalesced"] == 7
+    assert cache.get("SELECT * FROM contacts") == [{"id": 1}]
+    assert not cache._in_flight
+
+
+def test_compute_error_reaches_every_waiter_and_is_not_cached():
+    cache = ProductionCache(max_size=100, max_memory_mb=None)
+
+    def compute():
+        time.sleep(0.1)
+        raise RuntimeError("connection lost")
+
+    results = _run_concurrently(
+        4, lambda: cache.get_or_compute("SELECT * FROM contacts", None, compute)
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.get("SELECT * FROM contacts") is None
+    assert cache.get_or_compute("SELECT * FROM contacts", None, lambda: 1) == 1
+
+
+def test_stale_while_revalidate_serves_stale_and_refreshes_in_background():
+    cache = ProductionCache(max_size=100, max_memory_mb=None, stale_while_revalidate_seconds=60)
+    cache.set("SELECT * FROM contacts", None, "old", ttl=-1)
+    refreshed = threading.Event()
+
+    def compute():
+        refreshed.wait(5)
+        return "new"
+
+    # Served stale while the single background refresh runs
+    assert cache.get_or_compute("SELECT * FROM contacts", None, compute) == "old"
+    assert cache.get_or_compute("SELECT * FROM contacts", None, compute) == "old"
+    assert cache.get("SELECT * FROM contacts") is None
+    refreshed.set()
+    for _ in range(100):
+        if cache.get("SELECT * FROM contacts") == "new":
+            break
+        time.sleep(0.01)
+
+    stats = cache.get_stats()
+    assert cache.get("SELECT * FROM contacts") == "new"
+    assert stats["stale_hits"] == 2
+    assert stats["background_refreshes"] == 1
+
+
+def test_expired_entries_are_not_served_without_stale_window():
+    cache = ProductionCache(max_size=100, max_memory_mb=None)
+    cache.set("SELECT * FROM contacts", None, "old", ttl=-1)
+    assert cache.get_or_compute("SELECT * FROM contacts", None, lambda: "new") == "new"
+
+
+def test_result_computed_across_an_invalidation_is_not_cached():
+    cache = ProductionCache(max_size=100, max_memory_mb=None)
+
+    def compute():
+        # A write to the table lands while the query is running
+        cache.invalidate_table("contacts")
+        return "possibly stale"
+
+    assert cache.get_or_compute("SELECT * FROM contacts", None, compute) == "possibly stale"
+    assert cache.get("SELECT * FROM contacts") is None
+    assert cache.get_or_compute("SELECT * FROM contacts", None, lambda: "fresh") == "fresh"
+    assert cache.get("SELECT * FROM contacts") == "fresh"
+
+
+def test_table_tags_handle_schemas_ctes_and_quoted_identifiers():
+    assert query_table_tags(
+        'WITH recent AS (SELECT * FROM app."Contacts" WHERE created_at > $1) '
+        "SELECT * FROM recent JOIN public.orgs o ON o.id = recent.org_id"
+    ) == {"contacts", "orgs"}
+    assert query_table_tags(
+        "UPDATE contacts SET name = %s WHERE org_id IN (SELECT id FROM orgs)"
+    ) == {"contacts", "orgs"}
+    # Unparseable SQL falls back to pattern matching
+    assert query_table_tags("SELECT * FROM contacts WHERE ???") == {"contacts"}
+
+
+def test_table_tags_are_parsed_once_per_query_shape(monkeypatch):
+    calls = []
+    real_parse = production_cache._parse_table_tags
+    monkeypatch.setattr(
+        production_cache,
+        "_parse_table_tags",
+        lambda shape: calls.append(shape) or real_parse(shape),
+    )
+    for i in range(5):
+        query_table_tags(f"SELECT * FROM shape_test WHERE id = {i} AND name = 'n{i}'")
+
+    assert calls == ["SELECT * FROM shape_test WHERE id = ? AND name = ?"]
+
+
+def test_qualified_invalidation_matches_unqualified_reads():
+    cache = ProductionCache(max_size=100, max_memory_mb=None)
+    cache.set('SELECT * FROM "Contacts"', None, 1)
+    cache.set("SELECT * FROM public.contacts WHERE id = 1", None, 2)
+
+    cache.invalidate_table("public.contacts")
+
+    assert cache.get('SELECT * FROM "Contacts"') is None
+    assert cache.get("SELECT * FROM public.contacts WHERE id = 1") is None
@@ -0,0 +1,92 @@
+"""Tests for EXPLAIN plan analysis helpers"""
+
+import json
+from unittest.mock import MagicMock, Mock, patch
+
+from src import query_analyzer
+
+
+def _plan_row(total_cost: float, node_type: str = "Seq Scan") -> dict:
+    return {
+        "QUERY PLAN": json.dumps([{"Plan": {"Node Type": node_type, "Total Cost": total_cost}}])
+    }
+
+
+def _fake_connection(explained: list[str]):
+    """Connection whose cursor returns a plan with cost = len(query)"""
+    cursor = Mock()
+    state: dict = {}
+
+    def execute(sql, params=None):
+        if sql.startswith("EXPLAIN"):
+            query = sql[len("EXPLAIN (FORMAT JSON) ") :]
+            explained.append(query)
+            if "broken" in query:
+                raise RuntimeError("syntax error")
+            state["row"] = _plan_row(float(len(query)))
+
+    cursor.execute.side_effect = execute
+    cursor.fetchone.side_effect = lambda: state.get("row")
+    conn = Mock()
+    conn.autocommit = False
+    conn.cursor.return_value = cursor
+    context_manager = MagicMock()
+    context_manager.__enter__ = Mock(return_value=conn)
+    context_manager.__exit__ = Mock(return_value=None)
+    return context_manager
+
+
+def test_extract_plan_node_handles_json_string_and_decoded_rows():
+    """Plan rows may arrive as JSON text or already-decoded lists"""
+    node = {"Node Type": "Seq Scan", "Total Cost": 1.0}
+    assert query_analyzer._extract_plan_node({"QUERY PLAN": json.dumps([{"Plan": node}])}) == node
+    assert query_analyzer._extract_plan_node(([{"Plan": node}],)) == node
+    assert query_analyzer._extract_plan_node({"QUERY PLAN": "not json"}) is None
+    assert query_analyzer._extract_plan_node(None) is None
+
+
+@patch("src.materialized_view_support.find_materialized_views", return_value=[])
+def test_batch_explain_dedupes_and_preserves_input_order(_mock_mvs):
+    """Identical signatures are explained once; results line up with the input"""
+    explained: list[str] = []
+    queries = ["SELECT 1", "SELECT 22", "SELECT 1", "SELECT broken", "SELECT 333"]
+
+    with patch(
+        "src.query_analyzer.get_connection", side_effect=lambda: _fake_connection(explained)
+    ):
+        results = query_analyzer.analyze_query_plans_fast_batch(
+            queries, use_cache=False, max_workers=2
+        )
+
+    assert sorted(explained) == sorted(["SELECT 1", "SELECT 22", "SELECT broken", "SELECT 333"])
+    assert [r["total_cost"] if r else None for r in results] == [8.0, 9.0, 8.0, None, 10.0]
+
+
+@patch("src.materialized_view_support.find_materialized_views", return_value=[])
+def test_batch_explain_uses_and_fills_cache(_mock_mvs):
+    """Cached signatures skip the database; new results are cached"""
+    explained: list[str] = []
+    query_analyzer.clear_explain_cache()
+    try:
+        with patch(
+            "src.query_analyzer.get_connection", side_effect=lambda: _fake_connection(explained)
+        ):
+            query_analyzer.analyze_query_plans_fast_batch(["SELECT 1"], max_workers=1)
+            results = query_analyzer.analyze_query_plans_fast_batch(
+                ["SELECT 1", "SELECT 22"], max_workers=1
+            )
+    finally:
+        query_analyzer.clear_explain_cache()
+
+    assert explained == ["SELECT 1", "SELECT 22"]
+    assert all(result is not None for result in results)
+
+
+@patch("src.materialized_view_support.find_materialized_views", return_value=[])
+@patch("src.query_analyzer.get_connection", side_effect=ConnectionError("pool exhausted"))
+def test_single_worker_batch_connection_failure_returns_none_per_query(_mock_conn, _mock_mvs):
+    """A connection failure with one worker is handled like a failed parallel chunk"""
+    results = query_analyzer.analyze_query_plans_fast_batch(
+        ["SELECT 1", "SELECT 22"], use_cache=False, max_workers=1
+    )
+    assert results == [None, None]
@@ -0,0 +1,240 @@
+"""Tests for the query interceptor"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src import query_interceptor
+from src.error_handler import QueryBlockedError
+from src.query_interceptor import (
+    _check_query_lists,
+    add_query_to_blacklist,
+    add_query_to_whitelist,
+    configure_interceptor,
+    intercept_query,
+    intercept_query_async,
+    remove_query_from_blacklist,
+    set_per_table_thresholds,
+    should_block_query,
+    should_block_query_async,
+)
+
+QUERY = "SELECT * FROM contacts c JOIN orgs o ON o.id = c.org_id WHERE c.email = %s"
+
+
+@pytest.fixture(autouse=True)
+def _empty_query_lists(monkeypatch):
+    monkeypatch.setattr(query_interceptor, "_query_whitelist", set())
+    monkeypatch.setattr(query_interceptor, "_query_blacklist", set())
+    monkeypatch.setattr(query_interceptor, "_query_whitelist_matcher", None)
+    monkeypatch.setattr(query_interceptor, "_query_blacklist_matcher", None)
+    monkeypatch.setattr(query_interceptor, "_verdict_cache", {})
+    monkeypatch.setattr(query_interceptor, "_config", dict(query_interceptor._config))
+    monkeypatch.setattr(query_interceptor, "_per_table_thresholds", {})
+
+
+@pytest.fixture
+def plan_calls(monkeypatch):
+    """Count EXPLAIN analyses; each plan costs 500 (allowed by default thresholds)"""
+    calls = []
+
+    def analyze(query, params=None):
+        calls.append(query)
+        return {"total_cost": 500.0, "has_seq_scan": True, "node_type": "Seq Scan"}
+
+    monkeypatch.setattr(query_interceptor, "_pattern_learning_enabled", False)
+    monkeypatch.setattr(query_interceptor, "analyze_query_plan_fast", analyze)
+    monkeypatch.setattr(query_interceptor, "check_query_rate_limit", lambda _tenant: (True, 0.0))
+    return calls
+
+
+def test_query_lists_match_substrings_and_regexes():
+    add_query_to_blacklist("DELETE FROM audit_log")
+    add_query_to_blacklist(r"from\s+pg_\w+")
+    add_query_to_whitelist("from health_check")
+
+    assert _check_query_lists("delete from AUDIT_LOG where id = 1") == (True, "BLACKLISTED")
+    assert _check_query_lists("SELECT * FROM   pg_stat_activity") == (True, "BLACKLISTED")
+    assert _check_query_lists("SELECT 1 FROM health_check") == (False, "WHITELISTED")
+    assert _check_query_lists("SELECT * FROM contacts") is None
+
+
+def test_blacklist_takes_precedence_over_whitelist():
+    add_query_to_whitelist("from contacts")
+    add_query_to_blacklist("from contacts where")
+
+    assert _check_query_lists("SELECT * FROM contacts WHERE id = 1") == (True, "BLACKLISTED")
+    assert _check_query_lists("SELECT * FROM contacts") == (False, "WHITELISTED")
+
+
+def test_list_changes_recompile_the_matcher():
+    add_query_to_blacklist("from contacts")
+    assert _check_query_lists("SELECT * FROM contacts") == (True, "BLACKLISTED")
+
+    remove_query_from_blacklist("from contacts")
+    assert _check_query_lists("SELECT * FROM contacts") is None
+
+
+def test_overlapping_and_special_patterns():
+    # A literal that extends another, regex metacharacters matched literally,
+    # and an invalid regex that still matches as a substring
+    add_query_to_blacklist("from orders")
+    add_query_to_blacklist("from orders_archive")
+    add_query_to_blacklist("select count(*)")
+    add_query_to_blacklist("where (unclosed")
+
+    assert _check_query_lists("SELECT * FROM orders_archive") == (True, "BLACKLISTED")
+    assert _check_query_lists("SELECT COUNT(*) FROM contacts") == (True, "BLACKLISTED")
+    assert _check_query_lists("SELECT 1 WHERE (unclosed") == (True, "BLACKLISTED")
+    assert _check_query_lists("SELECT * FROM order_items") is None
+
+
+def test_regexes_that_cannot_be_combined_are_checked_individually():
+    add_query_to_blacklist(r"(\w+) = \1")
+    add_query_to_blacklist(r"(a)(b)\2")
+
+    assert _check_query_lists("SELECT * FROM t WHERE x = x") == (True, "BLACKLISTED")
+    assert _check_query_lists("SELECT 'abb'") == (True, "BLACKLISTED")
+    assert _check_query_lists("SELECT * FROM t WHERE x = y") is None
+
+
+def test_repeat_query_shapes_reuse_the_cached_verdict(plan_calls):
+    first = should_block_query(QUERY, ("a@example.com",), tenant_id="1")
+    second = should_block_query(QUERY, ("b@example.com",), tenant_id="2")
+
+    assert first == second == (False, None, first[2])
+    assert len(plan_calls) == 1
+    metrics = query_interceptor.get_interceptor_metrics()
+    assert metrics["verdict_cache_size"] == 1
+
+
+def test_rate_limit_is_checked_on_every_call(plan_calls, monkeypatch):
+    should_block_query(QUERY, ("a@example.com",), tenant_id="1")
+    monkeypatch.setattr(query_interceptor, "check_query_rate_limit", lambda _tenant: (False, 2.0))
+
+    should_block, reason, details = should_block_query(QUERY, ("a@example.com",), tenant_id="1")
+
+    assert (should_block, reason) == (True, "RATE_LIMIT_EXCEEDED")
+    assert details["retry_after_seconds"] == 2.0
+    assert len(plan_calls) == 1
+
+
+def test_threshold_and_list_changes_invalidate_verdicts(plan_calls):
+    assert should_block_query(QUERY)[0] is False
+
+    set_per_table_thresholds("contacts", {"max_query_cost": 100.0})
+    assert should_block_query(QUERY)[:2] == (True, "QUERY_COST_TOO_HIGH")
+
+    configure_interceptor(enable_blocking=False)
+    assert should_block_query(QUERY)[0] is False
+
+    add_query_to_blacklist("from contacts c join orgs")
+    assert should_block_query(QUERY)[:2] == (True, "BLACKLISTED")
+    assert len(plan_calls) == 2
+
+
+def test_expired_and_failed_verdicts_are_re_evaluated(plan_calls, monkeypatch):
+    monkeypatch.setitem(query_interceptor._config, "verdict_cache_ttl", 0.0)
+    should_block_query(QUERY)
+    should_block_query(QUERY)
+    assert len(plan_calls) == 2
+
+    # A failed EXPLAIN may be transient, so its verdict is not cached
+    monkeypatch.setitem(query_interceptor._config, "verdict_cache_ttl", 60.0)
+    monkeypatch.setattr(query_interceptor, "analyze_query_plan_fast", lambda *_args: None)
+    complex_query = "SELECT * FROM a JOIN b ON a.id = b.id JOIN c ON b.id = c.id ORDER BY 1"
+    assert should_block_query(complex_query)[1] == "plan_analysis_failed"
+    assert complex_query not in query_interceptor._verdict_cache
+
+
+def test_interceptions_from_worker_threads_are_totalled(plan_calls):
+    query_interceptor.reset_interceptor_metrics()
+    threads = [
+        threading.Thread(target=lambda: [intercept_query(QUERY) for _ in range(50)])
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = query_interceptor.get_interceptor_metrics()
+    assert metrics["total_interceptions"] == 150
+    assert metrics["total_analyzed"] == len(plan_calls) >= 1
+    overhead = metrics["interception_overhead"]
+    assert overhead["count"] == 150
+    assert 0 < overhead["p50_us"] <= overhead["p99_us"] <= overhead["max_us"]
+
+
+def test_async_verdicts_and_metrics_match_sync(plan_calls, monkeypatch):
+    monkeypatch.setattr(query_interceptor, "log_audit_event", lambda *_args, **_kwargs: True)
+    set_per_table_thresholds("contacts", {"max_query_cost": 100.0})
+    sync_verdict = should_block_query(QUERY, ("a@example.com",), tenant_id="1")
+    query_interceptor.invalidate_verdict_cache()
+
+    async_verdict = asyncio.run(should_block_query_async(QUERY, ("a@example.com",), "1"))
+    assert async_verdict == sync_verdict
+
+    blocked_before = query_interceptor.get_interceptor_metrics()["total_blocked"]
+    with pytest.raises(QueryBlockedError):
+        intercept_query(QUERY, ("a@example.com",), tenant_id="1")
+    with pytest.raises(QueryBlockedError) as excinfo:
+        asyncio.run(intercept_query_async(QUERY, ("a@example.com",), tenant_id="1"))
+    assert excinfo.value.reason == "QUERY_COST_TOO_HIGH"
+    assert query_interceptor.get_interceptor_metrics()["total_blocked"] == blocked_before + 2
+
+
+def test_async_interception_does_not_block_the_event_loop(plan_calls, monkeypatch):
+    def slow_explain(query, params=None):
+        time.sleep(0.2)
+        return {"total_cost": 5.0}
+
+    monkeypatch.setattr(query_interceptor, "analyze_query_plan_fast", slow_explain)
+
+    async def run() -> int:
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        await intercept_query_async(QUERY, ("a@example.com",), tenant_id="1")
+        ticker_task.cancel()
+        return ticks
+
+    assert asyncio.run(run()) >= 5
+
+
+def test_async_fast_path_serves_the_cached_verdict_only(plan_calls, monkeypatch):
+    """A cached verdict is returned as read, even if the cache is invalidated meanwhile"""
+    monkeypatch.setitem(query_interceptor._config, "enable_rate_limiting", False)
+    verdict = should_block_query(QUERY, ("a@example.com",))
+    assert len(plan_calls) == 1
+
+    def evaluate_on_loop(*_args, **_kwargs):
+        raise AssertionError("full evaluation ran on the event loop")
+
+    monkeypatch.setattr(query_interceptor, "should_block_query", evaluate_on_loop)
+    assert asyncio.run(should_block_query_async(QUERY, ("a@example.com",))) == verdict
+    assert len(plan_calls) == 1
+
+
+def test_async_shutdown_is_bounded_and_refuses_new_work(monkeypatch):
+    monkeypatch.setattr(query_interceptor, "_async_executor", None)
+    monkeypatch.setattr(query_interceptor, "_async_shutdown_started", False)
+    monkeypatch.setattr(query_interceptor, "_async_shutdown_registered", True)
+    release = threading.Event()
+    query_interceptor._get_async_executor().submit(release.wait, 5)
+
+    start = time.monotonic()
+    query_interceptor.shutdown_async_interception(timeout=0.1)
+    assert time.monotonic() - start < 2
+    release.set()
+
+    with pytest.raises(RuntimeError, match="shut down"):
+        query_interceptor._get_async_executor()
@@ -0,0 +1,79 @@
+"""Tests for the single-pass query normalizer"""
+
+import pytest
+
+from src.query_interceptor import _analyze_query_complexity, _normalize_query_signature
+from src.query_normalizer import (
+    analyze_query_text,
+    clear_query_features_cache,
+    get_query_normalizer_stats,
+)
+from src.workload_analysis import extract_query_template
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_query_features_cache()
+    yield
+    clear_query_features_cache()
+
+
+def test_signature_collapses_whitespace_and_placeholders_and_drops_comments():
+    query = "  SELECT id,  name -- lookup\n FROM contacts /* hot */ WHERE id = %s AND org = $2  "
+    assert _normalize_query_signature(query) == (
+        "SELECT id, name FROM contacts WHERE id = ? AND org = ?"
+    )
+    # Literals and case are part of the signature
+    assert _normalize_query_signature("select 1") != _normalize_query_signature("SELECT 2")
+
+
+def test_signature_keeps_comment_markers_inside_string_literals():
+    query = "SELECT * FROM notes WHERE body = '-- not a comment' AND id = 1"
+    assert _normalize_query_signature(query) == query
+
+
+def test_template_replaces_literals():
+    query = "select * from contacts\n where id = 42 and email = 'a@b.com' and \"Name\" = 'it''s'"
+    assert extract_query_template(query) == (
+        "SELECT * FROM CONTACTS WHERE ID = ? AND EMAIL = ? AND ? = ?"
+    )
+    # Digits inside identifiers are kept
+    assert (
+        extract_query_template("SELECT * FROM table_1 LIMIT 5") == "SELECT * FROM TABLE_1 LIMIT ?"
+    )
+    assert extract_query_template("") == ""
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        (
+            "SELECT * FROM a LEFT JOIN b ON a.id = b.a_id INNER JOIN c ON b.id = c.b_id",
+            {"join_count": 2, "has_cartesian_risk": False, "complexity_score": 4},
+        ),
+        ("SELECT * FROM a CROSS JOIN b", {"join_count": 1, "has_cartesian_risk": True}),
+        (
+            "SELECT * FROM a WHERE id IN ( SELECT a_id FROM b ) UNION ALL SELECT * FROM c",
+            {"subquery_count": 1, "union_count": 1, "has_missing_where": False},
+        ),
+        ("SELECT * FROM a", {"has_missing_where": True, "complexity_score": 0}),
+        ("SELECT * FROM a LIMIT 10", {"has_missing_where": False}),
+        ("UPDATE a SET x = 1", {"has_missing_where": False}),
+    ],
+)
+def test_complexity_features(query, expected):
+    complexity = _analyze_query_complexity(query)
+    for key, value in expected.items():
+        assert complexity[key] == value, key
+
+
+def test_features_are_memoized_per_query_text():
+    query = "SELECT * FROM contacts WHERE id = 1"
+    first = analyze_query_text(query)
+    assert analyze_query_text(query) is first
+    assert first.from_table == "contacts"
+
+    stats = get_query_normalizer_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
@@ -0,0 +1,133 @@
+"""Tests for query_stats partition management"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+from src.query_stats_partitions import (
+    delete_expired_query_stats_rollups,
+    drop_expired_query_stats_partitions,
+    ensure_query_stats_partitions,
+    parse_partition_name,
+    partition_name,
+    partition_start,
+)
+
+NOW = datetime(2026, 10, 16, 13, 45)
+
+
+class _FakeCursor:
+    """Answers the catalog queries the partition manager issues"""
+
+    def __init__(self, partitions, relkind="p"):
+        self.partitions = list(partitions)
+        self.relkind = relkind
+        self.statements: list[tuple[str, tuple | None]] = []
+        self.rowcount = 0
+        self._result: list[dict] = []
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self.statements.append((sql, params))
+        if sql.startswith("SELECT relkind"):
+            self._result = [{"relkind": self.relkind}] if self.relkind else []
+        elif "FROM pg_inherits" in sql:
+            self._result = [{"partition_name": name} for name in self.partitions]
+        elif sql.startswith("DELETE FROM query_stats_default"):
+            self.rowcount = 7
+        elif sql.startswith("DELETE FROM query_stats_"):
+            self.rowcount = 3
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+    def ddl(self, prefix):
+        return [sql for sql, _params in self.statements if sql.startswith(prefix)]
+
+
+def _config(**overrides):
+    config = {"enabled": True, "interval": "day", "premake": 2, "retention_days": 30}
+    config.update(overrides)
+    return patch("src.query_stats_partitions.get_partitioning_config", return_value=config)
+
+
+def test_partition_names_round_trip():
+    day = partition_start(NOW, "day")
+    hour = partition_start(NOW, "hour")
+    assert partition_name(day, "day") == "query_stats_p20261016"
+    assert partition_name(hour, "hour") == "query_stats_p2026101613"
+    assert parse_partition_name("query_stats_p20261016") == (day, "day")
+    assert parse_partition_name("query_stats_p2026101613") == (hour, "hour")
+    assert parse_partition_name("query_stats_default") is None
+
+
+def test_missing_partitions_are_created_around_now():
+    cursor = _FakeCursor(["query_stats_default", "query_stats_p20261016"])
+    with _config():
+        created = ensure_query_stats_partitions(cursor, NOW)
+
+    assert created == [
+        "query_stats_p20261014",
+        "query_stats_p20261015",
+        "query_stats_p20261017",
+        "query_stats_p20261018",
+    ]
+    bounds = [params for sql, params in cursor.statements if sql.startswith("CREATE TABLE")]
+    assert bounds[0] == (datetime(2026, 10, 14), datetime(2026, 10, 15))
+
+
+def test_unpartitioned_table_is_left_alone():
+    cursor = _FakeCursor([], relkind="r")
+    with _config():
+        assert ensure_query_stats_partitions(cursor, NOW) == []
+        assert drop_expired_query_stats_partitions(cursor, NOW) == ([], 0)
+    assert not cursor.ddl("CREATE TABLE")
+    assert not cursor.ddl("DROP TABLE")
+
+
+def test_expired_partitions_are_dropped_not_deleted():
+    cursor = _FakeCursor(
+        [
+            "query_stats_default",
+            "query_stats_p20260915",  # ends 2026-09-16, before the 09-16 13:45 cutoff
+            "query_stats_p20260916",
+            "query_stats_p2026091423",
+            "query_stats_archive",
+        ]
+    )
+    with _config():
+        dropped, default_rows_deleted = drop_expired_query_stats_partitions(cursor, NOW)
+
+    assert dropped == ["query_stats_p2026091423", "query_stats_p20260915"]
+    assert cursor.ddl("DROP TABLE") == [
+        "DROP TABLE IF EXISTS query_stats_p2026091423",
+        "DROP TABLE IF EXISTS query_stats_p20260915",
+    ]
+    # Only the catch-all partition is pruned row by row
+    assert default_rows_deleted == 7
+    assert len(cursor.ddl("DELETE")) == 1
+
+
+def test_retention_zero_keeps_everything():
+    cursor = _FakeCursor(["query_stats_p20200101"])
+    with _config(retention_days=0):
+        assert drop_expired_query_stats_partitions(cursor, NOW) == ([], 0)
+    assert not cursor.ddl("DROP TABLE")
+
+
+def test_rollup_tables_are_pruned_to_the_same_retention():
+    cursor = _FakeCursor([])
+    with _config():
+        deleted = delete_expired_query_stats_rollups(cursor, NOW)
+    assert deleted == {"query_stats_rollup": 3, "query_stats_hourly": 3}
+    assert [params for _sql, params in cursor.statements] == [
+        (datetime(2026, 9, 16, 13, 45),),
+        (datetime(2026, 9, 16, 13, 45),),
+    ]
+
+    cursor = _FakeCursor([])
+    with _config(retention_days=0):
+        assert delete_expired_query_stats_rollups(cursor, NOW) == {}
+    assert not cursor.ddl("DELETE")
@@ -0,0 +1,82 @@
+"""Tests for the sql_parser parse / fingerprint / pattern cache"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src import sql_parser
+from src.sql_parser import (
+    SQLPatternError,
+    canonical_query_fingerprint,
+    clear_sql_parse_cache,
+    extract_postgres_query_pattern,
+    get_sql_parse_cache_stats,
+    parse_read_only_query,
+    read_only_query_fingerprint,
+)
+
+TABLE_COLUMNS = {
+    ("public", "orders"): {"id", "tenant_id", "status", "created_at"},
+    ("public", "tenants"): {"id", "name"},
+}
+QUERY = "SELECT id FROM orders WHERE tenant_id = $1 AND created_at >= $2"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_sql_parse_cache()
+    yield
+    clear_sql_parse_cache()
+
+
+def test_repeated_query_is_parsed_once_and_callers_get_copies():
+    with patch("src.sql_parser.parse_read_only_query", wraps=parse_read_only_query) as parse:
+        first = extract_postgres_query_pattern(QUERY, TABLE_COLUMNS)
+        first["candidate_columns"].append("mutated")
+        second = extract_postgres_query_pattern(QUERY, TABLE_COLUMNS)
+
+    assert parse.call_count == 1
+    assert second["candidate_columns"] == ["tenant_id", "created_at"]
+    assert second["query_fingerprint"] == read_only_query_fingerprint(QUERY)
+    assert second["query_fingerprint"] == canonical_query_fingerprint(parse_read_only_query(QUERY))
+
+    stats = get_sql_parse_cache_stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (1, 2, 1)
+    assert stats["hit_rate"] == pytest.approx(66.67)
+
+
+def test_pattern_is_re_evaluated_when_the_touched_catalog_changes():
+    assert extract_postgres_query_pattern(QUERY, TABLE_COLUMNS) is not None
+    # Only the slice of the catalog the query touches is part of the key
+    unrelated = {**TABLE_COLUMNS, ("public", "tenants"): {"id"}}
+    assert extract_postgres_query_pattern(QUERY, unrelated) is not None
+    assert extract_postgres_query_pattern(QUERY, {("public", "orders"): {"id"}}) is None
+    assert extract_postgres_query_pattern(QUERY, TABLE_COLUMNS, default_schema="app") is None
+    assert get_sql_parse_cache_stats()["misses"] == 1
+
+
+def test_rejected_queries_are_cached_too():
+    for _ in range(2):
+        assert extract_postgres_query_pattern("DELETE FROM orders", TABLE_COLUMNS) is None
+        with pytest.raises(SQLPatternError, match="^non_select_statement$"):
+            read_only_query_fingerprint("DELETE FROM orders")
+
+    stats = get_sql_parse_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_parser_version_is_part_of_the_key():
+    read_only_query_fingerprint(QUERY)
+    with patch("src.sql_parser._PARSER_VERSION", "sqlglot_postgres_ast/next"):
+        read_only_query_fingerprint(QUERY)
+    assert get_sql_parse_cache_stats()["misses"] == 2
+
+
+def test_cache_is_bounded():
+    with patch("src.sql_parser.MAX_CACHED_PARSES", 3):
+        for value in range(5):
+            read_only_query_fingerprint(f"SELECT {value}")
+        assert len(sql_parser._parse_cache) == 3
+    # Oldest entries are evicted first
+    read_only_query_fingerprint("SELECT 4")
+    assert get_sql_parse_cache_stats()["hits"] == 1
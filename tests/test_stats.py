@@ -0,0 +1,197 @@
+"""Tests for query stats buffering and flushing"""
+
+import csv
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from psycopg2.errors import InsufficientPrivilege
+
+from src import stats
+
+
+def _mock_connection():
+    """Return (get_connection mock return value, connection, cursor)"""
+    cursor = Mock()
+    conn = Mock()
+    conn.cursor.return_value = cursor
+    context_manager = MagicMock()
+    context_manager.__enter__ = Mock(return_value=conn)
+    context_manager.__exit__ = Mock(return_value=None)
+    return context_manager, conn, cursor
+
+
+def test_stats_rows_to_csv_writes_nulls_as_empty_fields():
+    """COPY (FORMAT csv) loads unquoted empty fields as NULL"""
+    rows = [("", "contacts", None, "READ", 1.5), ("7", "contacts", "email", "WRITE", 2.0)]
+    parsed = list(csv.reader(stats._stats_rows_to_csv(rows)))
+    assert parsed == [
+        ["", "contacts", "", "READ", "1.5"],
+        ["7", "contacts", "email", "WRITE", "2.0"],
+    ]
+
+
+def test_insert_query_stats_rows_copy_streams_buffer():
+    """The COPY backend issues a single copy_expert call"""
+    cursor = Mock()
+    method = stats.insert_query_stats_rows(
+        cursor, [("1", "contacts", "email", "READ", 1.0)] * 3, stats.FLUSH_METHOD_COPY
+    )
+    assert method == stats.FLUSH_METHOD_COPY
+    cursor.copy_expert.assert_called_once()
+    assert "FROM STDIN" in cursor.copy_expert.call_args[0][0]
+    cursor.executemany.assert_not_called()
+
+
+@patch("src.stats.is_stats_aggregation_enabled", return_value=False)
+@patch("src.stats.get_stats_flush_method", return_value=stats.FLUSH_METHOD_COPY)
+@patch("src.stats.get_connection")
+def test_copy_failure_falls_back_to_execute_values(mock_get_connection, _method, _mode):
+    """A role that cannot COPY still gets its stats flushed"""
+    context_manager, conn, cursor = _mock_connection()
+    mock_get_connection.return_value = context_manager
+    cursor.copy_expert.side_effect = InsufficientPrivilege("permission denied")
+
+    with (
+        patch.object(stats, "_copy_unavailable", False),
+        patch("src.stats.execute_values") as mock_execute_values,
+    ):
+        stats.flush_query_stats_buffer([("1", "contacts", "email", "READ", 1.0)])
+        mock_execute_values.assert_called_once()
+        assert stats._copy_unavailable is True
+
+    conn.rollback.assert_called_once()
+    conn.commit.assert_called_once()
+
+
+@patch("src.stats.is_stats_aggregation_enabled", return_value=False)
+@patch("src.stats.get_stats_flush_method", return_value=stats.FLUSH_METHOD_COPY)
+@patch("src.stats.get_connection")
+def test_transient_copy_failure_retries_copy_without_disabling_it(
+    mock_get_connection, _method, _mode
+):
+    """A deadlock or dropped connection must not turn COPY off for the process"""
+    context_manager, conn, cursor = _mock_connection()
+    mock_get_connection.return_value = context_manager
+    cursor.copy_expert.side_effect = [Exception("deadlock detected"), None]
+
+    with (
+        patch.object(stats, "_copy_unavailable", False),
+        patch("src.stats.execute_values") as mock_execute_values,
+    ):
+        stats.flush_query_stats_buffer([("1", "contacts", "email", "READ", 1.0)])
+        mock_execute_values.assert_not_called()
+        assert stats._copy_unavailable is False
+
+    assert cursor.copy_expert.call_count == 2
+    conn.commit.assert_called_once()
+
+
+def test_striped_buffer_returns_stripe_rows_at_batch_size():
+    """A stripe hands back its rows once it reaches the batch size"""
+    from src.stats_buffer import StripedStatsBuffer
+
+    buffer = StripedStatsBuffer(stripes=4, max_size=1000)
+    row = ("1", "contacts", "email", "READ", 1.0)
+    assert buffer.append(row, batch_size=3) is None
+    assert buffer.append(row, batch_size=3) is None
+    assert buffer.append(row, batch_size=3) == [row] * 3
+    assert len(buffer) == 0
+
+
+def test_striped_buffer_drain_collects_rows_from_all_threads():
+    """Rows appended from many threads are all returned by drain()"""
+    import threading
+
+    from src.stats_buffer import StripedStatsBuffer
+
+    buffer = StripedStatsBuffer(stripes=4, max_size=100000)
+
+    def worker(thread_id):
+        for i in range(250):
+            buffer.append((str(thread_id), "contacts", "email", "READ", float(i)), batch_size=10**6)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    drained = buffer.drain()
+    assert len(drained) == 8 * 250
+    assert buffer.drain() == []
+
+
+@patch("src.validation.validate_field_name", side_effect=lambda field, table=None: field)
+@patch("src.validation.validate_table_name", side_effect=lambda table: table)
+def test_identifier_validation_is_memoized_until_schema_change(mock_table, mock_field):
+    """Repeat (table, field) pairs skip genome_catalog validation"""
+    from src.validation import clear_validation_cache
+
+    stats.clear_stats_validation_cache()
+    for _ in range(5):
+        assert stats._validate_stat_identifiers("contacts", "email") == ("contacts", "email")
+    assert mock_table.call_count == 1
+    assert mock_field.call_count == 1
+
+    # Schema change detection / evolution clear the validation cache
+    clear_validation_cache()
+    stats._validate_stat_identifiers("contacts", "email")
+    assert mock_table.call_count == 2
+
+
+@patch("src.validation.validate_table_name", side_effect=ValueError("bad table"))
+def test_identifier_validation_failures_are_not_cached(mock_table):
+    """Invalid identifiers are rejected on every call"""
+    stats.clear_stats_validation_cache()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            stats._validate_stat_identifiers("nope", "email")
+    assert mock_table.call_count == 2
+
+
+def test_flusher_shutdown_handler_is_registered_once():
+    """Re-creating the flusher after a stop must not stack shutdown handlers"""
+    with (
+        patch.object(stats, "_stats_flusher", None),
+        patch.object(stats, "_flusher_shutdown_registered", False),
+        patch("src.stats.register_shutdown_handler") as mock_register,
+        patch("src.stats.flush_query_stats"),
+    ):
+        for _ in range(3):
+            stats._get_stats_flusher()
+            stats.stop_stats_flusher(timeout=1.0)
+
+    mock_register.assert_called_once_with(stats.stop_stats_flusher, priority=20)
+
+
+def test_shutdown_handler_drains_buffered_rows_through_a_real_shutdown():
+    """The flusher's shutdown handler still writes after get_connection() starts refusing"""
+    from src import graceful_shutdown
+
+    _context_manager, conn, _cursor = _mock_connection()
+    conn.autocommit = False
+    pool = Mock()
+    pool.getconn.return_value = conn
+    with (
+        patch.object(stats, "_stats_flusher", None),
+        patch.object(stats, "_flusher_shutdown_registered", False),
+        patch.object(graceful_shutdown, "_shutdown_handlers", []),
+        patch.object(graceful_shutdown, "_shutdown_in_progress", False),
+        patch("src.db.get_connection_pool", return_value=pool),
+        patch("src.adapters.get_host_database_adapter", side_effect=ImportError),
+        patch("src.stats.is_stats_aggregation_enabled", return_value=False),
+        patch("src.stats.insert_query_stats_rows") as mock_insert,
+    ):
+        flusher = stats._get_stats_flusher()
+        flusher.stop(timeout=1.0)  # Keep the rows queued for the shutdown handler
+        flusher.submit(("1", "contacts", "email", "READ", 1.5))
+
+        graceful_shutdown._execute_shutdown_handlers()
+
+        assert graceful_shutdown.is_shutting_down()
+        with pytest.raises(ConnectionError, match="shutting down"), stats.get_connection():
+            pass
+
+    assert mock_insert.call_args.args[1] == [("1", "contacts", "email", "READ", 1.5)]
+    conn.commit.assert_called()
+    assert flusher.get_metrics()["flushed_rows"] == 1
@@ -0,0 +1,159 @@
+"""Tests for in-memory query stats pre-aggregation"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.stats_aggregation import (
+    DURATION_HISTOGRAM_BOUNDS_MS,
+    HISTOGRAM_BUCKET_COUNT,
+    QueryStatsAggregator,
+    histogram_bucket_index,
+    histogram_percentile,
+    merge_histograms,
+)
+
+
+def test_histogram_bucket_index_boundaries():
+    """Durations land in the first bucket whose upper bound covers them"""
+    assert histogram_bucket_index(0.0) == 0
+    assert histogram_bucket_index(0.1) == 0
+    assert histogram_bucket_index(0.15) == 1
+    assert (
+        histogram_bucket_index(DURATION_HISTOGRAM_BOUNDS_MS[-1] * 10) == HISTOGRAM_BUCKET_COUNT - 1
+    )
+
+
+def test_aggregator_rolls_rows_up_per_key_and_bucket():
+    """Many raw rows for the same key collapse into one rollup entry"""
+    aggregator = QueryStatsAggregator(bucket_seconds=60)
+    rows = [("1", "contacts", "email", "READ", 2.0)] * 50 + [
+        ("2", "contacts", "email", "READ", 8.0)
+    ]
+    aggregator.add_rows(rows, timestamp=120.0)
+    aggregator.add_rows([("1", "contacts", "email", "READ", 4.0)], timestamp=150.0)
+
+    drained = dict(aggregator.drain())
+    assert len(drained) == 2
+
+    counters = drained[(120.0, 1, "contacts", "email", "READ")]
+    assert counters.query_count == 51
+    assert counters.total_duration_ms == 104.0
+    assert counters.min_duration_ms == 2.0
+    assert counters.max_duration_ms == 4.0
+    assert sum(counters.histogram) == 51
+
+    # Drain resets the aggregator
+    assert aggregator.drain() == []
+
+
+def test_aggregator_normalizes_missing_tenant_and_field():
+    """Empty tenant/field strings map to NULL rollup keys"""
+    aggregator = QueryStatsAggregator(bucket_seconds=10)
+    aggregator.add_rows([("", "contacts", "", "READ", 1.0)], timestamp=25.0)
+    ((key, _counters),) = aggregator.drain()
+    assert key == (20.0, None, "contacts", None, "READ")
+
+
+def test_histogram_percentile_interpolates_and_caps_at_max():
+    """Percentiles stay within the observed range"""
+    histogram = [0] * HISTOGRAM_BUCKET_COUNT
+    histogram[histogram_bucket_index(3.0)] = 100
+    p95 = histogram_percentile(histogram, 0.95, max_ms=3.0)
+    assert 2.0 <= p95 <= 3.0
+    assert histogram_percentile([0] * HISTOGRAM_BUCKET_COUNT, 0.95) == 0.0
+
+
+def test_merge_histograms_adds_bucket_counts():
+    """Histograms from different buckets merge by addition"""
+    target = [1] * HISTOGRAM_BUCKET_COUNT
+    merge_histograms(target, [2] * HISTOGRAM_BUCKET_COUNT)
+    assert target == [3] * HISTOGRAM_BUCKET_COUNT
+
+
+@patch("src.stats.get_connection")
+@patch("src.stats.is_stats_aggregation_enabled", return_value=True)
+def test_flush_in_aggregate_mode_folds_without_writing_raw_rows(_mock_enabled, mock_conn):
+    """Aggregate mode never issues per-query INSERTs into query_stats"""
+    from src import stats
+
+    stats._aggregator.drain()
+    with patch.object(stats._aggregator, "seconds_since_drain", return_value=0.0):
+        stats.flush_query_stats_buffer([("1", "contacts", "email", "READ", 1.0)] * 10)
+
+    mock_conn.assert_not_called()
+    assert stats._aggregator.pending_keys() == 1
+    stats._aggregator.drain()
+
+
+@patch("src.stats.get_connection", side_effect=RuntimeError("database unavailable"))
+def test_failed_rollup_flush_restores_drained_counters(_mock_conn):
+    """A failed upsert merges the drained window back instead of dropping it"""
+    from src import stats
+
+    stats._aggregator.drain()
+    stats._aggregator.add_rows([("1", "contacts", "email", "READ", 2.0)] * 3, timestamp=120.0)
+    with pytest.raises(RuntimeError):
+        stats.flush_query_stats_rollup()
+    # Rows folded while the write was failing land on the same key
+    stats._aggregator.add_rows([("1", "contacts", "email", "READ", 6.0)], timestamp=130.0)
+
+    ((key, counters),) = stats._aggregator.drain()
+    assert key == (120.0, 1, "contacts", "email", "READ")
+    assert counters.query_count == 4
+    assert (counters.min_duration_ms, counters.max_duration_ms) == (2.0, 6.0)
+    assert sum(counters.histogram) == 4
+    assert counters.latency.count == 4
+
+
+def test_rollup_counters_keep_a_latency_sketch():
+    """Each rollup key carries a DDSketch of its durations"""
+    aggregator = QueryStatsAggregator(bucket_seconds=60)
+    aggregator.add_rows([("1", "contacts", "email", "READ", float(d)) for d in range(1, 101)])
+    ((_key, counters),) = aggregator.drain()
+    assert counters.latency.count == 100
+    assert abs(counters.latency.quantile(0.95) - 95.0) <= 95.0 * 0.01
+
+
+@patch("src.stats.is_stats_aggregation_enabled", return_value=True)
+def test_field_latency_stats_prefer_sketches_and_fall_back_for_old_rows(_mock_enabled):
+    """Keys whose rollup rows predate latency sketches use the histogram instead"""
+    from src import stats
+    from src.sketches import DDSketch
+
+    sketch = DDSketch()
+    histogram = [0] * HISTOGRAM_BUCKET_COUNT
+    for duration in range(1, 101):
+        sketch.add(float(duration))
+        histogram[histogram_bucket_index(float(duration))] += 1
+
+    def row(field_name, latency_sketch):
+        return {
+            "table_name": "contacts",
+            "field_name": field_name,
+            "query_type": "READ",
+            "query_count": 100,
+            "total_duration_ms": 5050.0,
+            "max_duration_ms": 100.0,
+            "duration_histogram": histogram,
+            "latency_sketch": latency_sketch,
+        }
+
+    rows = [row("email", sketch.to_dict()), row("phone", {})]
+    with patch("src.stats._get_rollup_latency_rows", return_value=rows):
+        results = {r["field_name"]: r for r in stats.get_field_latency_stats(by_query_type=False)}
+
+    assert set(results["email"]) == {
+        "table_name",
+        "field_name",
+        "query_count",
+        "avg_duration_ms",
+        "p50_duration_ms",
+        "p95_duration_ms",
+        "p99_duration_ms",
+        "max_duration_ms",
+    }
+    assert abs(results["email"]["p95_duration_ms"] - 95.0) <= 1.0
+    assert results["email"]["avg_duration_ms"] == 50.5
+    # The histogram bucket holding p95 spans 50-100ms
+    assert 50.0 <= results["phone"]["p95_duration_ms"] <= 100.0
@@ -0,0 +1,77 @@
+"""Tests for the background query stats flusher"""
+
+import threading
+import time
+
+from src.stats_flusher import StatsFlusher
+
+ROW = ("1", "contacts", "email", "READ", 1.0)
+
+
+def test_submit_drops_and_counts_when_queue_full():
+    """A full queue drops rows instead of blocking the caller"""
+    flusher = StatsFlusher(lambda rows: None, batch_size=2, max_queue_size=2)
+    assert flusher.submit(ROW) is True
+    assert flusher.submit(ROW) is True
+    assert flusher.submit(ROW) is False
+
+    metrics = flusher.get_metrics()
+    assert metrics["queue_depth"] == 2
+    assert metrics["dropped"] == 1
+    assert metrics["submitted"] == 3
+
+
+def test_thread_flushes_when_batch_size_reached():
+    """Reaching batch_size wakes the flusher thread before the interval elapses"""
+    flushed: list = []
+    done = threading.Event()
+
+    def callback(rows):
+        flushed.extend(rows)
+        done.set()
+
+    flusher = StatsFlusher(callback, batch_size=3, flush_interval=60.0)
+    flusher.start()
+    try:
+        for _ in range(3):
+            flusher.submit(ROW)
+        assert done.wait(timeout=5.0)
+    finally:
+        flusher.stop(timeout=5.0)
+
+    assert flushed == [ROW] * 3
+    assert flusher.get_metrics()["flush_count"] >= 1
+
+
+def test_stop_drains_remaining_rows():
+    """Shutdown writes out whatever is still queued"""
+    flushed: list = []
+    flusher = StatsFlusher(flushed.extend, batch_size=100, flush_interval=60.0)
+    flusher.start()
+    flusher.submit(ROW)
+    flusher.stop(timeout=5.0)
+
+    assert flushed == [ROW]
+    assert not flusher.is_running()
+
+
+def test_flush_failure_is_counted_and_thread_survives():
+    """A failing database flush is recorded, not raised into the flusher loop"""
+    calls = []
+
+    def failing(rows):
+        calls.append(rows)
+        raise RuntimeError("db down")
+
+    flusher = StatsFlusher(failing, batch_size=1, flush_interval=0.05)
+    flusher.start()
+    try:
+        flusher.submit(ROW)
+        deadline = time.time() + 5.0
+        while not calls and time.time() < deadline:
+            time.sleep(0.01)
+        assert flusher.is_running()
+    finally:
+        flusher.stop(timeout=5.0)
+
+    assert flusher.get_metrics()["flush_failures"] == 1
@@ -0,0 +1,342 @@
+"""Tests for hourly query_stats rollups and the HyperLogLog / DDSketch summaries"""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.sketches import DDSketch, HyperLogLog
+from src.stats_aggregation import HISTOGRAM_BUCKET_COUNT, LatencyStats
+from src.stats_rollup import (
+    fold_hourly_rows,
+    fold_latency_rows,
+    get_field_usage_stats_from_rollups,
+    get_latency_stats_from_rollups,
+    get_period_counts_from_rollups,
+    hour_ceil,
+    hour_floor,
+    merge_field_usage,
+)
+
+NOW = datetime(2026, 10, 16, 13, 45)
+
+
+def _sketch(values):
+    sketch = HyperLogLog()
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+def test_hll_estimates_are_close_and_small_counts_near_exact():
+    assert HyperLogLog().estimate() == 0
+    assert _sketch(range(10)).estimate() == 10
+    assert abs(_sketch(range(100)).estimate() - 100) <= 5
+
+    estimate = _sketch(range(50000)).estimate()
+    assert abs(estimate - 50000) / 50000 < 0.05
+
+
+def test_hll_merge_and_round_trip():
+    left = _sketch(range(0, 3000))
+    right = _sketch(range(2000, 5000))
+    left.merge(HyperLogLog.from_bytes(memoryview(right.to_bytes())))
+    assert abs(left.estimate() - 5000) / 5000 < 0.05
+
+    restored = HyperLogLog.from_bytes(left.to_bytes())
+    assert restored.precision == left.precision
+    assert restored.estimate() == left.estimate()
+
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(precision=8))
+
+
+def test_hour_bounds():
+    assert hour_floor(NOW) == datetime(2026, 10, 16, 13)
+    assert hour_ceil(NOW) == datetime(2026, 10, 16, 14)
+    assert hour_ceil(datetime(2026, 10, 16, 13)) == datetime(2026, 10, 16, 13)
+
+
+def _raw_group(tenant_id, bucket, count, total, low, high, hour=13):
+    return {
+        "bucket_start": datetime(2026, 10, 16, hour),
+        "table_name": "contacts",
+        "field_name": "email",
+        "query_type": "READ",
+        "tenant_id": tenant_id,
+        "histogram_bucket": bucket,
+        "query_count": count,
+        "total_duration_ms": total,
+        "min_duration_ms": low,
+        "max_duration_ms": high,
+    }
+
+
+def test_fold_hourly_rows_combines_tenants_and_histogram_buckets():
+    folded = fold_hourly_rows(
+        [
+            _raw_group(1, 2, 3, 6.0, 1.5, 2.5),
+            _raw_group(2, 5, 1, 40.0, 40.0, 40.0),
+            _raw_group(None, 2, 2, 4.0, 1.0, 3.0),
+            _raw_group(1, 2, 1, 2.0, 2.0, 2.0, hour=14),
+        ]
+    )
+
+    assert len(folded) == 2
+    counters, tenants = folded[(datetime(2026, 10, 16, 13), "contacts", "email", "READ")]
+    assert counters.query_count == 6
+    assert counters.total_duration_ms == 50.0
+    assert (counters.min_duration_ms, counters.max_duration_ms) == (1.0, 40.0)
+    assert len(counters.histogram) == HISTOGRAM_BUCKET_COUNT
+    assert counters.histogram[2] == 5
+    assert counters.histogram[5] == 1
+    assert tenants.estimate() == 2
+
+
+def _rollup_row(field_name, count, total, tenants):
+    return {
+        "table_name": "contacts",
+        "field_name": field_name,
+        "query_count": count,
+        "total_duration_ms": total,
+        "tenant_hll": _sketch(tenants).to_bytes(),
+    }
+
+
+def _raw_row(field_name, count, total, tenant_ids):
+    return {
+        "table_name": "contacts",
+        "field_name": field_name,
+        "total_queries": count,
+        "total_duration_ms": total,
+        "tenant_ids": tenant_ids,
+    }
+
+
+def test_merge_field_usage_unions_tenants_across_sources():
+    results = merge_field_usage(
+        [_rollup_row("email", 10, 50.0, [1, 2, 3]), _rollup_row("email", 5, 25.0, [3, 4])],
+        [_raw_row("email", 5, 5.0, [4, 5]), _raw_row("phone", 30, 30.0, [1, 2])],
+    )
+
+    assert [row["field_name"] for row in results] == ["phone", "email"]
+    phone, email = results
+    assert phone["tenant_count"] == 2
+    assert phone["avg_duration_ms"] == 1.0
+    assert email["total_queries"] == 20
+    assert email["total_duration_ms"] == 80.0
+    assert email["avg_duration_ms"] == 4.0
+    assert email["tenant_count"] == 5
+
+
+class _FakeCursor:
+    def __init__(self, state, rollup_rows=(), raw_rows=()):
+        self.state = state
+        self.rollup_rows = list(rollup_rows)
+        self.raw_rows = list(raw_rows)
+        self.params: list[tuple] = []
+        self._result: list[dict] = []
+
+    def execute(self, sql, params=None):
+        self.params.append(params)
+        if "query_stats_rollup_watermark" in sql:
+            self._result = [self.state]
+        elif "FROM query_stats_hourly" in sql:
+            self._result = self.rollup_rows
+        else:
+            self._result = self.raw_rows
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+
+def test_rollup_read_without_watermark_falls_back():
+    cursor = _FakeCursor({"now": NOW, "covered_from": None, "rolled_up_to": None})
+    assert get_field_usage_stats_from_rollups(cursor, 24) is None
+
+    # Watermark entirely before the window
+    cursor = _FakeCursor(
+        {
+            "now": NOW,
+            "covered_from": NOW - timedelta(days=3),
+            "rolled_up_to": NOW - timedelta(days=2),
+        }
+    )
+    assert get_field_usage_stats_from_rollups(cursor, 24) is None
+
+
+def test_rollup_read_splits_window_between_rollups_and_raw_rows():
+    cursor = _FakeCursor(
+        {
+            "now": NOW,
+            "covered_from": datetime(2026, 10, 15, 20),
+            "rolled_up_to": datetime(2026, 10, 16, 13),
+        },
+        rollup_rows=[_rollup_row("email", 10, 50.0, [1, 2])],
+        raw_rows=[_raw_row("email", 2, 2.0, [3]), _raw_row("phone", 1, 1.0, [1])],
+    )
+
+    results = get_field_usage_stats_from_rollups(cursor, 24, limit=1)
+
+    assert results == [
+        {
+            "table_name": "contacts",
+            "field_name": "email",
+            "total_queries": 12,
+            "tenant_count": 3,
+            "avg_duration_ms": 52.0 / 12,
+            "total_duration_ms": 52.0,
+        }
+    ]
+    # Rollups start where they are available; raw rows cover the rest of the window
+    assert cursor.params[1] == (datetime(2026, 10, 15, 20), datetime(2026, 10, 16, 13))
+    assert cursor.params[2] == (
+        datetime(2026, 10, 15, 13, 45),
+        datetime(2026, 10, 15, 20),
+        datetime(2026, 10, 16, 13),
+    )
+
+
+def test_ddsketch_quantiles_are_within_relative_accuracy():
+    rng = random.Random(3)
+    values = sorted(rng.lognormvariate(2, 1.5) for _ in range(20000))
+    sketch = DDSketch()
+    for value in values:
+        sketch.add(value)
+    sketch.add(0.0)
+    values.insert(0, 0.0)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= exact * 0.01
+    assert sketch.quantile(0.0) == 0.0
+    assert DDSketch().quantile(0.5) == 0.0
+
+
+def test_ddsketch_merge_matches_single_sketch_and_round_trips():
+    whole, left, right = DDSketch(), DDSketch(), DDSketch()
+    for value in range(1, 2001):
+        whole.add(value / 10)
+        (left if value % 2 else right).add(value / 10)
+    left.merge(DDSketch.from_dict(json.dumps(right.to_dict())))
+
+    assert left.count == whole.count
+    assert left.to_dict() == whole.to_dict()
+    assert left.quantile(0.95) == whole.quantile(0.95)
+
+    slow = whole.between(lower=150.0)
+    # Only the bin straddling the threshold is ambiguous (values within ~2% of it)
+    assert 471 <= slow.count <= 531
+    assert slow.quantile(0.0) >= 150.0 * 0.99
+
+    with pytest.raises(ValueError):
+        left.merge(DDSketch(relative_accuracy=0.02))
+
+
+def test_latency_stats_caps_percentiles_at_observed_max():
+    latency = LatencyStats()
+    sketch = DDSketch()
+    for _ in range(10):
+        sketch.add(10.0)
+    latency.add(10, 100.0, 10.0, sketch)
+
+    summary = latency.summary()
+    assert summary["query_count"] == 10
+    assert summary["avg_duration_ms"] == 10.0
+    assert summary["p99_duration_ms"] == 10.0
+    assert abs(summary["p50_duration_ms"] - 10.0) <= 0.1
+
+
+def test_fold_latency_rows_fills_hourly_sketches():
+    folded = fold_hourly_rows([_raw_group(1, 2, 3, 6.0, 1.5, 2.5)])
+    bins = DDSketch()
+    fold_latency_rows(
+        [
+            {**_raw_group(1, 2, 0, 0, 0, 0), "sketch_bin": bins.bin_index(2.0), "query_count": 2},
+            {**_raw_group(1, 2, 0, 0, 0, 0), "sketch_bin": None, "query_count": 1},
+            {**_raw_group(1, 2, 0, 0, 0, 0, hour=9), "sketch_bin": 5, "query_count": 4},
+        ],
+        folded,
+    )
+
+    ((counters, _tenants),) = folded.values()
+    assert counters.latency.count == 3
+    assert counters.latency.zero_count == 1
+
+
+def test_latency_read_merges_rollup_sketches_with_raw_bins():
+    hourly_sketch = DDSketch()
+    for value in (5.0, 5.0, 80.0):
+        hourly_sketch.add(value)
+    cursor = _FakeCursor(
+        {
+            "now": NOW,
+            "covered_from": datetime(2026, 10, 15, 20),
+            "rolled_up_to": datetime(2026, 10, 16, 13),
+        },
+        rollup_rows=[
+            {
+                "table_name": "contacts",
+                "field_name": "email",
+                "query_type": "READ",
+                "query_count": 3,
+                "total_duration_ms": 90.0,
+                "max_duration_ms": 80.0,
+                "latency_sketch": hourly_sketch.to_dict(),
+            }
+        ],
+        raw_rows=[
+            {
+                "table_name": "contacts",
+                "field_name": "email",
+                "query_type": "READ",
+                "sketch_bin": hourly_sketch.bin_index(100.0),
+                "query_count": 1,
+                "total_duration_ms": 100.0,
+                "max_duration_ms": 100.0,
+            }
+        ],
+    )
+
+    merged = get_latency_stats_from_rollups(cursor, 24, table_name="contacts")
+
+    latency = merged[("contacts", "email", "READ")]
+    assert latency.query_count == 4
+    assert latency.sketch.count == 4
+    assert latency.max_duration_ms == 100.0
+    assert latency.percentile(1.0) == 100.0
+    assert abs(latency.percentile(0.0) - 5.0) <= 0.05
+    assert cursor.params[1] == (datetime(2026, 10, 15, 20), datetime(2026, 10, 16, 13), "contacts")
+
+    with pytest.raises(ValueError):
+        get_latency_stats_from_rollups(cursor, 24, key_columns=("tenant_id",))
+
+
+def test_period_counts_read_everything_raw_without_rollup_coverage():
+    cursor = _FakeCursor({"now": NOW, "covered_from": None, "rolled_up_to": None})
+
+    get_period_counts_from_rollups(cursor, [("contacts", "email"), ("orders", "id")], 48, "day")
+
+    params = cursor.params[1]
+    window_start = NOW - timedelta(hours=48)
+    assert params[:5] == (
+        "day",
+        ["contacts", "orders"],
+        ["email", "id"],
+        window_start,
+        window_start,
+    )
+    assert params[5:] == (
+        "day",
+        ["contacts", "orders"],
+        ["email", "id"],
+        window_start,
+        window_start,
+        window_start,
+    )
+    with pytest.raises(ValueError):
+        get_period_counts_from_rollups(cursor, [("contacts", "email")], 48, "week")